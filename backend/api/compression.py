@@ -0,0 +1,129 @@
+"""
+Response Compression
+JSON / 텍스트 응답을 Accept-Encoding에 맞춰 brotli 또는 gzip으로 압축하는 ASGI 미들웨어
+
+- RESPONSE_COMPRESSION: 사용할 인코딩 (우선순위 순, 기본 "br,gzip", 빈 값이면 미들웨어 끔)
+  brotli 패키지가 없으면 br은 자동으로 빠짐 (선택 의존성)
+- RESPONSE_COMPRESSION_MIN_BYTES 이상인 응답만 압축 (작은 응답은 압축 비용이 더 큼)
+- 본문을 한 번에 보내는 응답만 대상 (FileResponse 같은 스트리밍 / Range 응답은 그대로 통과)
+- 큰 본문은 스레드풀에서 압축해서 이벤트 루프를 막지 않음
+"""
+import os
+import gzip
+from typing import Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "br,gzip")
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "1"))  # JSON은 낮은 레벨로도 잘 줄어듦, CPU 시간 우선
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+
+# 이보다 큰 본문은 스레드풀에서 압축
+_THREADPOOL_MIN_BYTES = 256 * 1024
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def enabled_encodings(setting: str = RESPONSE_COMPRESSION) -> Tuple[str, ...]:
+    """설정에서 실제로 쓸 수 있는 인코딩만 (우선순위 순)"""
+    encodings = [e.strip() for e in setting.split(",") if e.strip()]
+    return tuple(e for e in encodings if e == "gzip" or (e == "br" and brotli is not None))
+
+
+def _accepted(accept_encoding: str) -> set:
+    """Accept-Encoding 헤더에서 q=0이 아닌 인코딩 집합"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(name.strip())
+    return accepted
+
+
+def _compress(encoding: str, body: bytes) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """응답 압축 미들웨어 (main.py에서 등록)"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Tuple[str, ...] = None,
+        minimum_size: int = RESPONSE_COMPRESSION_MIN_BYTES
+    ) -> None:
+        self.app = app
+        self.encodings = enabled_encodings() if encodings is None else encodings
+        self.minimum_size = minimum_size
+
+    def _choose(self, scope: Scope) -> Optional[str]:
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        if not accept_encoding:
+            return None
+        accepted = _accepted(accept_encoding)
+        for encoding in self.encodings:
+            if encoding in accepted:
+                return encoding
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = self._choose(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # 본문 첫 조각을 보고 압축 여부를 정할 때까지 보류
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                # http.response.pathsend(FileResponse) 같은 본문 외 메시지는 압축 대상이 아님,
+                # 보류한 start를 먼저 보내서 ASGI 순서(start → 본문)를 지킴
+                if start_message is not None:
+                    start, start_message = start_message, None
+                    await send(start)
+                await send(message)
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start)
+            if (
+                not message.get("more_body", False)
+                and len(body) >= self.minimum_size
+                and start["status"] not in (204, 206, 304)
+                and "content-encoding" not in headers
+                and headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+            ):
+                if len(body) >= _THREADPOOL_MIN_BYTES:
+                    body = await run_in_threadpool(_compress, encoding, body)
+                else:
+                    body = _compress(encoding, body)
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                message = {**message, "body": body}
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
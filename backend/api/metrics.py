@@ -0,0 +1,266 @@
+"""
+Metrics
+Prometheus 형식 /metrics 용 요청 계측 미들웨어 + DB 풀 / 캐시 게이지
+
+- 라우트 템플릿(/api/v1/documents/{doc_id}) 단위로 요청 수, 지연 시간, 응답 크기 기록
+  (매칭되지 않은 경로는 "<unmatched>" 하나로 묶어서 라벨 수가 늘어나지 않게 함)
+- 처리 중인 요청 수 (in-flight)
+- DB 풀 / 조회 캐시 / 비밀번호 해시 풀 / 로그인 제한 상태는 게이지로, 업로드 처리량은 services.file_storage의 카운터로 노출
+- 여러 워커 프로세스: PROMETHEUS_MULTIPROC_DIR(빈 디렉터리)을 지정하고 워커를 띄우면
+  prometheus_client가 프로세스별 파일에 기록하고, /metrics는 모든 워커 값을 합쳐서 응답
+  (게이지는 워커마다 METRICS_REFRESH_SEC 주기로 갱신, 종료한 워커 값은 mark_process_dead로 정리)
+- METRICS_ENABLED=false 면 미들웨어와 /metrics를 등록하지 않음
+"""
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from repositories.connection_pool import pool_stats
+from repositories.lookup_cache import cache_stats
+from services.login_throttle import throttle_stats
+from services.password_hasher import hasher_stats
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+METRICS_PATH = "/metrics"
+METRICS_REFRESH_SEC = float(os.getenv("METRICS_REFRESH_SEC", "5"))
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# ==========================
+# HTTP 요청 메트릭
+# ==========================
+REQUESTS = Counter(
+    "http_requests_total", "처리한 HTTP 요청 수",
+    ["method", "route", "status"]
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "처리 중인 HTTP 요청 수",
+    multiprocess_mode="livesum"
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간 (응답 본문 전송까지)",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "HTTP 응답 본문 크기 (압축 후)",
+    ["method", "route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+)
+
+# ==========================
+# DB 풀 / 캐시 게이지 (워커별 값을 합산)
+# ==========================
+POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "DB 풀 커넥션 수",
+    ["pool", "state"],
+    multiprocess_mode="livesum"
+)
+POOL_WAITING = Gauge(
+    "db_pool_requests_waiting", "커넥션을 기다리는 요청 수",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+POOL_REQUESTS = Gauge(
+    "db_pool_requests", "풀에서 커넥션을 빌린 누적 횟수 (워커 재시작 시 0부터)",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+POOL_WAIT_SECONDS = Gauge(
+    "db_pool_wait_seconds", "커넥션 대기 누적 시간 (워커 재시작 시 0부터)",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+CACHE_ENTRIES = Gauge(
+    "lookup_cache_entries", "조회 캐시 항목 수",
+    ["cache"],
+    multiprocess_mode="livesum"
+)
+CACHE_LOOKUPS = Gauge(
+    "lookup_cache_lookups", "조회 캐시 조회 누적 횟수 (워커 재시작 시 0부터)",
+    ["cache", "result"],
+    multiprocess_mode="livesum"
+)
+PASSWORD_HASH_QUEUE = Gauge(
+    "password_hash_queue_depth", "비밀번호 해시 비교 대기 / 실행 중 개수",
+    ["state"],
+    multiprocess_mode="livesum"
+)
+PASSWORD_HASH_CHECKS = Gauge(
+    "password_hash_checks", "비밀번호 해시 비교 누적 횟수 (워커 재시작 시 0부터)",
+    ["result"],
+    multiprocess_mode="livesum"
+)
+LOGIN_THROTTLED = Gauge(
+    "login_throttled", "시도 횟수 제한으로 거절한 로그인 누적 횟수 (워커 재시작 시 0부터)",
+    ["scope"],
+    multiprocess_mode="livesum"
+)
+
+
+def _set_pool_gauges(name: str, stats: dict) -> None:
+    POOL_CONNECTIONS.labels(name, "checked_out").set(stats.get("checked_out", 0))
+    POOL_CONNECTIONS.labels(name, "available").set(stats.get("available", 0))
+    POOL_WAITING.labels(name).set(stats.get("waiting", 0))
+    POOL_REQUESTS.labels(name).set(stats.get("requests_total", 0))
+    POOL_WAIT_SECONDS.labels(name).set(stats.get("wait_ms_total", 0) / 1000)
+
+
+def refresh_gauges() -> None:
+    """이 워커의 DB 풀 / 캐시 상태를 게이지에 반영"""
+    pools = pool_stats()
+    if pools.get("enabled"):
+        _set_pool_gauges("sync", pools)
+    if "async" in pools:
+        _set_pool_gauges("async", pools["async"])
+
+    for name, stats in cache_stats().items():
+        if not isinstance(stats, dict):
+            continue
+        CACHE_ENTRIES.labels(name).set(stats["size"])
+        CACHE_LOOKUPS.labels(name, "hit").set(stats["hits"])
+        CACHE_LOOKUPS.labels(name, "miss").set(stats["misses"])
+
+    hasher = hasher_stats()
+    PASSWORD_HASH_QUEUE.labels("queued").set(hasher["queued"])
+    PASSWORD_HASH_QUEUE.labels("running").set(hasher["running"])
+    for result in ("matched", "mismatched", "unsupported", "rejected"):
+        PASSWORD_HASH_CHECKS.labels(result).set(hasher[result])
+
+    throttle = throttle_stats()
+    LOGIN_THROTTLED.labels("email").set(throttle["throttled_email"])
+    LOGIN_THROTTLED.labels("ip").set(throttle["throttled_ip"])
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """/metrics 응답 본문과 Content-Type"""
+    refresh_gauges()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+# ==========================
+# 워커 게이지 주기 갱신 (multiprocess 모드)
+# ==========================
+_refresh_task: Optional[asyncio.Task] = None
+
+
+async def _refresh_forever() -> None:
+    while True:
+        try:
+            refresh_gauges()
+        except Exception:
+            logger.exception("Metrics gauge refresh failed")
+        await asyncio.sleep(METRICS_REFRESH_SEC)
+
+
+async def start_metrics() -> None:
+    """
+    앱 시작 시 호출
+    multiprocess 모드에서는 /metrics를 받은 워커가 다른 워커의 풀 상태를 읽을 수 없으므로
+    각 워커가 주기적으로 자기 게이지를 파일에 기록
+    """
+    global _refresh_task
+    if METRICS_ENABLED and MULTIPROCESS and _refresh_task is None:
+        _refresh_task = asyncio.create_task(_refresh_forever())
+
+
+async def stop_metrics() -> None:
+    """앱 종료 시 호출: 갱신 태스크 종료 + 이 워커의 live 게이지 정리"""
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+# ==========================
+# 요청 계측 미들웨어
+# ==========================
+# (route 객체, 요청 경로 세그먼트 수) → 전체 라우트 템플릿
+_templates: Dict[Tuple[int, int], str] = {}
+
+# (method, route, status) → 라벨을 붙인 메트릭 (labels() 조회 비용을 요청마다 내지 않도록)
+_children: Dict[Tuple[str, str, int], tuple] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """
+    라우팅이 끝난 scope에서 prefix까지 포함한 라우트 템플릿 계산
+
+    scope["route"]의 path_format에는 include_router prefix가 빠져 있으므로
+    요청 경로의 앞쪽 세그먼트(= prefix)를 붙인다. ({x:path} 파라미터가 있는 라우트는 없음)
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return UNMATCHED_ROUTE
+
+    segments = scope["path"].split("/")
+    key = (id(route), len(segments))
+    template = _templates.get(key)
+    if template is None:
+        prefix_len = len(segments) - len(path_format.split("/")) + 1
+        template = _templates[key] = "/".join(segments[:prefix_len]) + path_format
+    return template
+
+
+class MetricsMiddleware:
+    """요청 수 / 처리 중 / 지연 시간 / 응답 크기 기록 (main.py에서 가장 바깥에 등록)"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_PROGRESS.dec()
+            key = (scope["method"], route_template(scope), status_code)
+            children = _children.get(key)
+            if children is None:
+                method, route, _ = key
+                children = _children[key] = (
+                    REQUESTS.labels(method, route, str(status_code)),
+                    LATENCY.labels(method, route),
+                    RESPONSE_SIZE.labels(method, route),
+                )
+            children[0].inc()
+            children[1].observe(elapsed)
+            children[2].observe(size)
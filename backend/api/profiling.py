@@ -0,0 +1,260 @@
+"""
+Request Profiling
+요청 1건을 샘플링 프로파일러로 측정해서 flamegraph용 folded stack 파일로 저장하는 ASGI 미들웨어
+
+켜는 방법 (둘 다 설정하지 않으면 main.py가 미들웨어를 등록하지 않음 → 비용 0)
+- PROFILE_TOKEN: 요청 헤더 X-Profile 값이 이 토큰과 같으면 그 요청을 프로파일
+- PROFILE_SAMPLE_RATE: 0~1, 이 비율만큼 무작위로 프로파일 (예: 0.001)
+
+동작
+- 백그라운드 스레드가 PROFILE_INTERVAL_MS 마다 그 요청을 처리하는 asyncio task의 스택을 기록 (wall-clock)
+  - task가 실행 중이면 이벤트 루프 스레드의 스택
+  - await 중이면 코루틴 await 체인 (DB 응답 대기 등) + run_in_threadpool 대기면 그 작업을 실행 중인 워커 스레드 스택
+  같은 이벤트 루프의 다른 요청 시간은 섞이지 않는다.
+- 결과: PROFILE_DIR/<시각>-<request_id>.folded
+  (한 줄에 "frame;frame;frame 마이크로초", flamegraph.pl / speedscope / inferno에서 바로 열림)
+- 스택마다 가장 안쪽 프레임 기준으로 sql / dto / serialization / file_io / other 로 분류해서
+  응답 헤더 Server-Timing 과 로그(api.profiling)에 기록, X-Profile-File 헤더로 파일 이름을 돌려줌
+  (Server-Timing은 응답 시작 시점까지, 파일과 로그는 본문 전송까지 포함)
+"""
+import os
+import sys
+import hmac
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app_logging import request_id_var
+from api.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+
+PROFILE_HEADER = b"x-profile"
+
+# 분류 규칙: 스택의 안쪽 프레임부터 처음 맞는 규칙의 분류
+# (라벨 "모듈:함수"의 접두사, 모든 스택에 들어 있는 미들웨어 프레임에는 걸리지 않도록 함수까지 지정)
+CATEGORY_RULES = (
+    ("sql", ("psycopg",)),
+    ("dto", ("pydantic", "repositories.base_repository:trusted_dto", "dto.")),
+    ("serialization", (
+        "api.responses:dumps", "api.responses:_default", "api.responses:FastJSONResponse",
+        "api.compression:_compress", "fastapi.encoders:", "fastapi.routing:serialize_response",
+        "starlette.responses:JSONResponse.render", "json.", "json:", "gzip:", "brotli",
+    )),
+    ("file_io", (
+        "services.file_storage:", "shutil:", "tempfile:", "starlette.datastructures:UploadFile",
+        "starlette.formparsers:", "starlette.responses:FileResponse", "python_multipart", "multipart",
+    )),
+)
+CATEGORIES = tuple(category for category, _ in CATEGORY_RULES) + ("other",)
+
+_RUN_IN_THREADPOOL_CODE = run_in_threadpool.__code__
+
+_active = 0
+_active_lock = threading.Lock()
+
+
+def profiling_enabled() -> bool:
+    """미들웨어를 등록할지 (토큰이나 샘플링 비율이 설정된 경우만)"""
+    return bool(PROFILE_TOKEN) or PROFILE_SAMPLE_RATE > 0
+
+
+def _label(frame) -> str:
+    # co_qualname은 3.11+ (3.10에서는 함수 이름만이라 Class.method 형태의 분류 규칙은 other로 잡힘)
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def categorize(stack: List[str]) -> str:
+    """folded stack 1개(바깥 → 안쪽 프레임 라벨)의 분류"""
+    for label in reversed(stack):
+        label = label.removeprefix("[thread] ")
+        for category, prefixes in CATEGORY_RULES:
+            if label.startswith(prefixes):
+                return category
+    return "other"
+
+
+class _Sampler(threading.Thread):
+    """요청 task 1개의 스택을 주기적으로 기록하는 스레드"""
+
+    def __init__(self, task: asyncio.Task, root_frame, loop_thread_id: int) -> None:
+        super().__init__(name="request-profiler", daemon=True)
+        self.task = task
+        self.root_code = root_frame.f_code
+        self.loop_thread_id = loop_thread_id
+        self.interval = PROFILE_INTERVAL_MS / 1000
+        self.samples: Dict[str, float] = defaultdict(float)  # folded stack → 마이크로초
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        last = time.perf_counter()
+        while not self.stopped.wait(self.interval):
+            now = time.perf_counter()
+            stack = self._sample()
+            if stack:
+                self.samples[";".join(stack)] += (now - last) * 1e6
+            last = now
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+    def _sample(self) -> List[str]:
+        coro = self.task.get_coro()
+        if getattr(coro, "cr_running", False):
+            return self._running_stack()
+        return self._awaiting_stack(coro)
+
+    def _running_stack(self) -> List[str]:
+        """task가 실행 중: 이벤트 루프 스레드의 현재 스택 (미들웨어 프레임부터)"""
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(_label(frame))
+            if frame.f_code is self.root_code:
+                stack.reverse()
+                return stack
+            frame = frame.f_back
+        return []
+
+    def _awaiting_stack(self, coro) -> List[str]:
+        """task가 await 중: 코루틴 await 체인 (미들웨어 프레임부터)"""
+        stack = []
+        awaitable = coro
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+            if frame is None:
+                stack.append(f"<await {type(awaitable).__name__}>")
+                break
+            if stack or frame.f_code is self.root_code:
+                stack.append(_label(frame))
+            if frame.f_code is _RUN_IN_THREADPOOL_CODE:
+                stack.extend(self._worker_stack(frame.f_locals.get("func")))
+                break
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+        return stack
+
+    def _worker_stack(self, func) -> List[str]:
+        """run_in_threadpool로 넘긴 함수를 실행 중인 워커 스레드의 스택"""
+        func = getattr(func, "func", func)  # functools.partial
+        code = getattr(func, "__code__", None)
+        if code is None:
+            return [f"[thread] {getattr(func, '__module__', '?')}:{getattr(func, '__qualname__', repr(func))}"]
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id in (self.loop_thread_id, self.ident):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(f"[thread] {_label(frame)}")
+                if frame.f_code is code:
+                    stack.reverse()
+                    return stack
+                frame = frame.f_back
+        return [f"[thread] {func.__module__}:{func.__qualname__} <queued>"]
+
+    def breakdown_ms(self) -> Dict[str, float]:
+        totals = dict.fromkeys(CATEGORIES, 0.0)
+        for stack, micros in list(self.samples.items()):
+            totals[categorize(stack.split(";"))] += micros / 1000
+        return totals
+
+
+def _server_timing(breakdown: Dict[str, float]) -> str:
+    return ", ".join(f"{category};dur={ms:.1f}" for category, ms in breakdown.items())
+
+
+def write_profile(sampler: _Sampler, path: str) -> None:
+    """folded stack 파일 저장 (마이크로초 단위 정수)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, micros in sorted(sampler.samples.items()):
+            if micros >= 1:
+                f.write(f"{stack} {int(micros)}\n")
+
+
+class ProfilingMiddleware:
+    """선택된 요청만 프로파일 (main.py에서 profiling_enabled()일 때만 등록)"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    def _wanted(self, scope: Scope) -> bool:
+        if PROFILE_TOKEN:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, PROFILE_TOKEN.encode())
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        global _active
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        with _active_lock:
+            if _active >= PROFILE_MAX_CONCURRENT:
+                busy = True
+            else:
+                busy = False
+                _active += 1
+        if busy:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = request_id_var.get() or f"{os.getpid()}-{time.monotonic_ns()}"
+        filename = f"{datetime.now():%Y%m%d-%H%M%S}-{request_id}.folded"
+        sampler = _Sampler(asyncio.current_task(), sys._getframe(), threading.get_ident())
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["server-timing"] = _server_timing(sampler.breakdown_ms())
+                headers["x-profile-file"] = filename
+            await send(message)
+
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            sampler.stopped.set()  # 파일 저장 시간은 샘플에 넣지 않음
+            await run_in_threadpool(self._finish, sampler, scope, filename, elapsed_ms)
+
+    @staticmethod
+    def _finish(sampler: _Sampler, scope: Scope, filename: str, elapsed_ms: float) -> None:
+        global _active
+        try:
+            sampler.stop()
+            write_profile(sampler, os.path.join(PROFILE_DIR, filename))
+            logger.info(
+                "Request profiled",
+                extra={
+                    "method": scope["method"],
+                    "route": route_template(scope),
+                    "ms": round(elapsed_ms, 2),
+                    "profile_file": filename,
+                    "breakdown_ms": {k: round(v, 2) for k, v in sampler.breakdown_ms().items()},
+                }
+            )
+        except Exception:
+            logger.exception("Writing request profile failed")
+        finally:
+            with _active_lock:
+                _active -= 1
@@ -0,0 +1,76 @@
+"""
+Request ID
+요청마다 ID를 정해서 로그 / 응답 헤더에 붙이는 ASGI 미들웨어 + 구조화 접근 로그
+
+- 클라이언트(또는 앞단 프록시)가 보낸 X-Request-ID가 있으면 그대로 사용, 없으면 새로 생성
+- 응답 헤더에 X-Request-ID를 돌려줌 (프런트 / 프록시 로그와 맞춰볼 수 있게)
+- 요청 처리 중 남긴 모든 로그에 request_id 필드가 붙음 (app_logging.request_id_var)
+  sync 라우트 / 서비스는 스레드풀에서 실행되지만 contextvar가 복사되므로 같은 ID가 보임
+- 요청이 끝나면 api.access 로거로 method / route / status / ms 한 줄 기록
+"""
+import re
+import time
+import uuid
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app_logging import request_id_var
+from api.metrics import route_template
+
+access_logger = logging.getLogger("api.access")
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# 외부에서 받은 ID는 로그를 오염시키지 않도록 길이 / 문자를 제한
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._\-]{1,128}$")
+
+
+def _incoming_request_id(scope: Scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            request_id = value.decode("latin-1")
+            if _VALID_REQUEST_ID.match(request_id):
+                return request_id
+            break
+    return uuid.uuid4().hex
+
+
+class RequestIdMiddleware:
+    """요청 ID 설정 + 접근 로그 (main.py에서 등록)"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope)
+        token = request_id_var.set(request_id)
+        status_code = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            if access_logger.isEnabledFor(logging.INFO):
+                access_logger.info(
+                    "request",
+                    extra={
+                        "method": scope["method"],
+                        "route": route_template(scope),
+                        "status": status_code,
+                        "ms": round((time.perf_counter() - started) * 1000, 2),
+                    }
+                )
+            request_id_var.reset(token)
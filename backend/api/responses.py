@@ -0,0 +1,97 @@
+"""
+Fast JSON Response
+v1 라우터 공용 응답 클래스 / 라우트 클래스
+
+- FastJSONResponse: orjson으로 직렬화, pydantic DTO와 datetime을 중간 dict 변환 없이 바로 씀
+- FastJSONRoute: 엔드포인트가 response_model과 정확히 같은 타입의 DTO를 돌려주면
+  FastAPI의 응답 직렬화(TypeAdapter.dump_json)를 건너뛰고 FastJSONResponse로 바로 응답
+  (dict / None / Response 등 다른 값은 기존 FastAPI 경로 그대로)
+- FAST_JSON_RESPONSE=false 로 끄면 FastAPI 기본 경로만 사용
+
+app의 default_response_class로 지정하지 않는 이유:
+FastAPI는 기본 응답 클래스일 때만 pydantic Rust 직렬화(dump_json)를 쓰므로,
+응답 클래스를 바꾸면 오히려 dict 변환 + 인코딩 2단계로 느려진다.
+"""
+import os
+import inspect
+import functools
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+import orjson
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+FAST_JSON_RESPONSE = os.getenv("FAST_JSON_RESPONSE", "true").lower() in ("1", "true", "yes")
+
+# pydantic과 같은 형식: UTC는 "Z"로
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+# 모델 클래스별: __dict__를 그대로 써도 되는지 (alias / 직렬화 커스터마이즈가 없는지)
+_plain_models: Dict[type, bool] = {}
+
+
+def _is_plain_model(model_cls: type) -> bool:
+    plain = _plain_models.get(model_cls)
+    if plain is None:
+        decorators = model_cls.__pydantic_decorators__
+        plain = not (
+            model_cls.model_computed_fields
+            or decorators.field_serializers
+            or decorators.model_serializers
+            or model_cls.model_config.get("extra") == "allow"
+            or any(
+                field.serialization_alias or field.alias or field.exclude
+                for field in model_cls.model_fields.values()
+            )
+        )
+        _plain_models[model_cls] = plain
+    return plain
+
+
+def _default(obj: Any) -> Any:
+    """orjson이 모르는 타입 처리 (중첩 DTO는 orjson이 다시 이 함수를 호출)"""
+    if isinstance(obj, BaseModel):
+        if _is_plain_model(type(obj)):
+            return obj.__dict__
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """orjson 직렬화 (pydantic DTO 지원)"""
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 기반 JSON 응답"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class FastJSONRoute(APIRoute):
+    """response_model 타입의 DTO를 돌려주는 엔드포인트를 FastJSONResponse로 응답하는 라우트"""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if FAST_JSON_RESPONSE and inspect.iscoroutinefunction(endpoint):
+            endpoint = self._wrap_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def _wrap_endpoint(self, endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        # functools.wraps가 __wrapped__를 남기므로 FastAPI는 원래 함수의 시그니처 / 반환 타입을 그대로 읽음
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = await endpoint(*args, **kwargs)
+            # 하위 클래스는 response_model에 없는 필드를 가질 수 있으므로 정확히 같은 타입만
+            if self.response_model is not None and type(result) is self.response_model:
+                return FastJSONResponse(result, status_code=self.status_code or 200)
+            return result
+
+        return wrapper
+
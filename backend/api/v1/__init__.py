@@ -6,6 +6,7 @@ from fastapi import APIRouter
 from .folders import router as folders_router
 from .documents import router as documents_router
 from .auth import router as auth_router
+from .search import router as search_router
 
 
 # v1 라우터 생성
@@ -14,4 +15,5 @@ router = APIRouter(prefix="/v1")
 # 각 도메인별 라우터 등록
 router.include_router(folders_router)
 router.include_router(documents_router)
-router.include_router(auth_router)
\ No newline at end of file
+router.include_router(auth_router)
+router.include_router(search_router)
\ No newline at end of file
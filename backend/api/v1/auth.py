@@ -3,20 +3,31 @@ Auth Router
 로그인 관련 API 엔드포인트
 """
 from fastapi import APIRouter, HTTPException, status, Depends
-from typing import Annotated
-from services.auth_service import AuthService
-from dto.user_dto import LoginRequestDTO, LoginResponseDTO
+from typing import Annotated, Optional
+from services.auth_service import AsyncAuthService
+from services.login_throttle import LoginThrottledError
+from services.password_hasher import PasswordHashBusyError
+from services.token_service import InvalidTokenError, TokenClaims, TokenService
+from dto.user_dto import LoginRequestDTO, LoginResponseDTO, RefreshRequestDTO, LogoutRequestDTO
+from .dependencies import require_token_claims, get_client_ip
+from api.responses import FastJSONRoute
 
 
 router = APIRouter(
     prefix="/auth",
-    tags=["auth"]
+    tags=["auth"],
+    route_class=FastJSONRoute
 )
 
 
-def get_auth_service() -> AuthService:
-    """AuthService 의존성 주입"""
-    return AuthService()
+def get_auth_service() -> AsyncAuthService:
+    """AsyncAuthService 의존성 주입"""
+    return AsyncAuthService()
+
+
+def get_token_service() -> TokenService:
+    """TokenService 의존성 주입"""
+    return TokenService()
 
 
 @router.post(
@@ -24,11 +35,13 @@ def get_auth_service() -> AuthService:
     response_model=LoginResponseDTO,
     status_code=status.HTTP_200_OK,
     summary="로그인",
-    description="이메일과 비밀번호로 사용자 로그인"
+    description="이메일과 비밀번호로 사용자 로그인, access / refresh 토큰 발급"
 )
-def login(
+async def login(
     login_dto: LoginRequestDTO,
-    auth_service: Annotated[AuthService, Depends(get_auth_service)],
+    auth_service: Annotated[AsyncAuthService, Depends(get_auth_service)],
+    token_service: Annotated[TokenService, Depends(get_token_service)],
+    client_ip: Annotated[Optional[str], Depends(get_client_ip)],
 ):
     """
     로그인 엔드포인트
@@ -40,8 +53,20 @@ def login(
         }
     """
     try:
-        user = auth_service.login(login_dto.email, login_dto.password)
-        return LoginResponseDTO(user_id=user.user_id, email=user.email)
+        user = await auth_service.login(login_dto.email, login_dto.password, client_ip=client_ip)
+        return token_service.issue(user.user_id, user.email)
+    except LoginThrottledError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except PasswordHashBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except ValueError as e:
         # 인증 실패
         raise HTTPException(
@@ -54,3 +79,40 @@ def login(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="로그인 처리 중 오류가 발생했습니다."
         )
+
+
+@router.post(
+    "/refresh",
+    response_model=LoginResponseDTO,
+    status_code=status.HTTP_200_OK,
+    summary="토큰 갱신",
+    description="refresh 토큰으로 새 access / refresh 토큰 발급 (사용한 refresh 토큰은 폐기)"
+)
+async def refresh(
+    refresh_dto: RefreshRequestDTO,
+    token_service: Annotated[TokenService, Depends(get_token_service)],
+):
+    """토큰 갱신 엔드포인트 (DB 조회 없음)"""
+    try:
+        return token_service.refresh(refresh_dto.refresh_token)
+    except InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="로그아웃",
+    description="현재 access 토큰과 (보낸 경우) refresh 토큰 폐기, all_sessions=true면 이 사용자의 모든 토큰 폐기"
+)
+async def logout(
+    claims: Annotated[TokenClaims, Depends(require_token_claims)],
+    token_service: Annotated[TokenService, Depends(get_token_service)],
+    logout_dto: LogoutRequestDTO = LogoutRequestDTO(),
+) -> None:
+    """로그아웃 엔드포인트"""
+    token_service.revoke(claims, logout_dto.refresh_token, all_sessions=logout_dto.all_sessions)
@@ -0,0 +1,108 @@
+"""
+API v1 공통 의존성
+라우터 간에 공유하는 FastAPI 의존성
+"""
+import os
+from typing import Annotated, AsyncIterator, Optional
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from repositories.unit_of_work import AsyncUnitOfWork
+from services.token_service import AUTH_REQUIRED, InvalidTokenError, TokenClaims, TokenService
+from dto.user_dto import AuthUserDTO
+
+# 리버스 프록시 뒤에서 실제 클라이언트 IP를 담는 헤더 (예: X-Forwarded-For, 비우면 소켓 주소 사용)
+# 프록시가 덧붙인 마지막 값을 쓰므로, 프록시를 거치지 않는 요청이 없을 때만 설정할 것
+CLIENT_IP_HEADER = os.getenv("CLIENT_IP_HEADER", "").lower()
+
+# Authorization: Bearer <access 토큰> (없어도 여기서는 에러를 내지 않고 AUTH_REQUIRED로 판단)
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_unit_of_work(request: Request) -> AsyncIterator[AsyncUnitOfWork]:
+    """
+    요청 단위 Unit of Work 의존성
+
+    - 요청 동안 커넥션 1개를 모든 Repository 호출에 공유
+    - 라우터가 정상 반환하면 commit, 예외(HTTPException 포함)면 rollback
+    - Depends(..., scope="function")로 사용해야 응답 전송 전에 commit 결과가 반영됨
+    """
+    route = request.scope.get("route")
+    name = f"{request.method} {route.path if route else request.url.path}"
+    async with AsyncUnitOfWork(name=name) as uow:
+        yield uow
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+async def get_token_claims(
+    credentials: Annotated[Optional[HTTPAuthorizationCredentials], Depends(bearer_scheme)]
+) -> Optional[TokenClaims]:
+    """
+    access 토큰 검증 의존성 (서명 / 만료 / 폐기 확인, DB 조회 없음)
+    CPU 몇 마이크로초라서 스레드풀로 넘기지 않도록 async로 선언
+
+    - 토큰이 있으면 항상 검증 (잘못된 토큰은 401)
+    - 토큰이 없으면 401 (AUTH_REQUIRED=false로 끈 경우에만 None, 예전 클라이언트 호환)
+    """
+    if credentials is None:
+        if AUTH_REQUIRED:
+            raise _unauthorized("인증이 필요합니다.")
+        return None
+    try:
+        return TokenService().verify(credentials.credentials)
+    except InvalidTokenError as e:
+        raise _unauthorized(str(e))
+
+
+async def get_current_user(
+    claims: Annotated[Optional[TokenClaims], Depends(get_token_claims)]
+) -> Optional[AuthUserDTO]:
+    """현재 사용자 (토큰이 없고 AUTH_REQUIRED=false면 None)"""
+    if claims is None:
+        return None
+    return AuthUserDTO(user_id=claims.user_id, email=claims.email)
+
+
+async def require_token_claims(
+    claims: Annotated[Optional[TokenClaims], Depends(get_token_claims)]
+) -> TokenClaims:
+    """토큰이 반드시 있어야 하는 라우트용 (로그아웃 등)"""
+    if claims is None:
+        raise _unauthorized("인증이 필요합니다.")
+    return claims
+
+
+async def get_current_user_id(
+    current_user: Annotated[Optional[AuthUserDTO], Depends(get_current_user)]
+) -> Optional[int]:
+    """
+    id로 지정한 문서 / 폴더의 소유자 확인용 사용자 ID
+
+    서비스는 이 값과 자원의 user_id가 다르면 없는 자원과 같이 404를 낸다 (다른 사용자의 id 존재 여부를 숨김).
+    토큰이 없고 AUTH_REQUIRED=false면 None (확인 생략, 기존 클라이언트 호환)
+    """
+    return current_user.user_id if current_user else None
+
+
+def ensure_user_access(current_user: Optional[AuthUserDTO], user_id: int) -> None:
+    """클라이언트가 보낸 user_id가 토큰의 사용자와 다르면 403 (토큰이 없으면 통과, AUTH_REQUIRED=false일 때만 해당)"""
+    if current_user is not None and current_user.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="다른 사용자의 데이터에는 접근할 수 없습니다."
+        )
+
+
+async def get_client_ip(request: Request) -> Optional[str]:
+    """클라이언트 IP (로그인 시도 제한 키)"""
+    if CLIENT_IP_HEADER:
+        value = request.headers.get(CLIENT_IP_HEADER)
+        if value:
+            return value.rsplit(",", 1)[-1].strip()
+    return request.client.host if request.client else None
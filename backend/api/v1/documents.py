@@ -1,18 +1,33 @@
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
-from typing import Annotated
-from services.document_service import DocumentService
-from dto.document_dto import DocumentDTO, DocumentCreateDTO, DocumentListDTO, DocumentRenameDTO, DocumentMoveDTO
+import os
+from email.utils import parsedate_to_datetime
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form, Query, Request
+from fastapi.responses import FileResponse, Response
+from typing import Annotated, Optional
+from repositories.unit_of_work import AsyncUnitOfWork
+from .dependencies import get_unit_of_work, get_current_user, get_current_user_id, ensure_user_access
+from api.responses import FastJSONRoute
+from services.document_service import AsyncDocumentService
+from services.pagination import InvalidCursorError, MAX_PAGE_SIZE
+from services.file_storage import FileTooLargeError, TooManyFilesError
+from dto.document_dto import (
+    DocumentDTO, DocumentCreateDTO, DocumentListDTO, DocumentRenameDTO, DocumentMoveDTO, DocumentBatchUploadDTO
+)
+from dto.ingestion_dto import IngestionStatusDTO
+from dto.user_dto import AuthUserDTO
 
 
 router = APIRouter(
     prefix="/documents",
-    tags=["documents"]
+    tags=["documents"],
+    route_class=FastJSONRoute
 )
 
 
-def get_document_service() -> DocumentService:
-    """DocumentService 의존성 주입"""
-    return DocumentService()
+def get_document_service(
+    uow: Annotated[AsyncUnitOfWork, Depends(get_unit_of_work, scope="function")]
+) -> AsyncDocumentService:
+    """AsyncDocumentService 의존성 주입 (요청 단위 Unit of Work 공유)"""
+    return AsyncDocumentService(uow)
 
 #문서 업로드 + 파일 저장
 @router.post(
@@ -27,7 +42,8 @@ async def upload_document(
     user_id: int = Form(...),
     folder_id: int = Form(...),
     filename: str = Form(None),
-    document_service: DocumentService = Depends(get_document_service)
+    document_service: AsyncDocumentService = Depends(get_document_service),
+    current_user: Optional[AuthUserDTO] = Depends(get_current_user)
 ) -> DocumentDTO:
     """
     문서 업로드
@@ -38,25 +54,26 @@ async def upload_document(
         folder_id: 폴더 ID
         filename: 사용자 지정 파일명 (확장자 제외, 선택사항)
         document_service: 문서 서비스 (의존성 주입)
+        current_user: 토큰의 사용자 (있으면 user_id와 같아야 함)
 
     Returns:
         DocumentDTO: 생성된 문서 정보
 
     Raises:
-        HTTPException: 폴더가 존재하지 않거나 업로드 실패 시
+        HTTPException: 다른 사용자 (403), 폴더가 없거나 user_id의 폴더가 아니거나 (404) 파일이 너무 크거나 (413) 업로드 실패 시
     """
-    print(f"[문서 업로드 API] 요청 받음")
-    print(f"  - file: {file}")
-    print(f"  - user_id: {user_id}")
-    print(f"  - folder_id: {folder_id}")
-    print(f"  - filename: {filename}")
-
+    ensure_user_access(current_user, user_id)
     try:
         create_dto = DocumentCreateDTO(
             user_id=user_id,
             folder_id=folder_id
         )
-        return document_service.upload_file(file, create_dto, custom_filename=filename)
+        return await document_service.upload_file(file, create_dto, custom_filename=filename)
+    except FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -69,20 +86,75 @@ async def upload_document(
         )
 
 
+#문서 일괄 업로드
+@router.post(
+    "/upload/batch",
+    response_model=DocumentBatchUploadDTO,
+    status_code=status.HTTP_201_CREATED,
+    summary="문서 일괄 업로드",
+    description=(
+        "여러 PDF 파일을 한 번에 업로드합니다. 폴더 확인과 DB 저장은 한 번씩만 하고, "
+        "파일별 성공/실패 결과를 요청 순서대로 반환합니다."
+    )
+)
+async def upload_documents(
+    files: list[UploadFile] = File(...),
+    user_id: int = Form(...),
+    folder_id: int = Form(...),
+    document_service: AsyncDocumentService = Depends(get_document_service),
+    current_user: Optional[AuthUserDTO] = Depends(get_current_user)
+) -> DocumentBatchUploadDTO:
+    """
+    문서 일괄 업로드
+
+    Raises:
+        HTTPException: 파일 수 초과 (400), 다른 사용자 (403), 폴더가 없거나 user_id의 폴더가 아니거나 (404) 업로드 실패 시 (500)
+    """
+    ensure_user_access(current_user, user_id)
+    try:
+        create_dto = DocumentCreateDTO(
+            user_id=user_id,
+            folder_id=folder_id
+        )
+        return await document_service.upload_files(files, create_dto)
+    except TooManyFilesError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload documents: {str(e)}"
+        )
+
 # 폴더 내 문서 목록 조회 라우터 
 @router.get(
     "/folder/{folder_id}",
     response_model=DocumentListDTO,
     status_code=status.HTTP_200_OK,
     summary="폴더 내 문서 목록 조회",
-    description="특정 폴더에 속한 모든 문서를 조회"
+    description="특정 폴더에 속한 문서를 조회 (limit/cursor로 키셋 페이지네이션, 생략하면 전체)"
 )
 async def get_documents_by_folder(
     folder_id: int,
-    document_service: Annotated[DocumentService, Depends(get_document_service)]
+    document_service: Annotated[AsyncDocumentService, Depends(get_document_service)],
+    owner_id: Annotated[Optional[int], Depends(get_current_user_id)],
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE, description="페이지 크기")] = None,
+    cursor: Annotated[Optional[str], Query(description="이전 응답의 next_cursor")] = None
 ) -> DocumentListDTO:
     try:
-        return document_service.get_documents_by_folder(folder_id)
+        return await document_service.get_documents_by_folder(folder_id, limit=limit, cursor=cursor, owner_id=owner_id)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -104,10 +176,11 @@ async def get_documents_by_folder(
 )
 async def get_document_detail(
     doc_id : int,
-    document_service : Annotated[DocumentService , Depends(get_document_service)]
+    document_service : Annotated[AsyncDocumentService , Depends(get_document_service)],
+    owner_id : Annotated[Optional[int], Depends(get_current_user_id)]
     ) -> DocumentDTO :
     try:
-        return document_service.get_document_detail(doc_id)
+        return await document_service.get_document_detail(doc_id, owner_id)
     except ValueError as e:
         raise HTTPException(
              status_code = status.HTTP_404_NOT_FOUND,
@@ -119,6 +192,119 @@ async def get_document_detail(
             detail = f"Failed to retrieve documents : {str(e)}"
         )
 
+# 문서 텍스트 추출 진행 상황
+@router.get(
+    "/{doc_id}/ingestion",
+    response_model=IngestionStatusDTO,
+    status_code=status.HTTP_200_OK,
+    summary="문서 텍스트 추출 진행 상황",
+    description="업로드 후 백그라운드에서 진행되는 PDF 텍스트 추출의 상태(pending / running / done / failed)와 진행률을 조회합니다."
+)
+async def get_ingestion_status(
+    doc_id: int,
+    document_service: Annotated[AsyncDocumentService, Depends(get_document_service)],
+    owner_id: Annotated[Optional[int], Depends(get_current_user_id)]
+) -> IngestionStatusDTO:
+    try:
+        return await document_service.get_ingestion_status(doc_id, owner_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve ingestion status: {str(e)}"
+        )
+
+# 문서 파일 다운로드 / 미리보기
+@router.api_route(
+    "/{doc_id}/file",
+    methods=["GET", "HEAD"],
+    response_class=FileResponse,
+    status_code=status.HTTP_200_OK,
+    summary="문서 파일 다운로드",
+    description=(
+        "저장된 PDF 파일을 스트리밍합니다. Range 요청(206)으로 필요한 페이지만 받을 수 있고, "
+        "If-None-Match / If-Modified-Since가 맞으면 본문 없이 304를 반환합니다."
+    ),
+    responses={
+        200: {"content": {"application/pdf": {}}},
+        206: {"description": "Range 요청에 대한 부분 응답"},
+        304: {"description": "캐시된 파일이 최신"},
+        416: {"description": "만족할 수 없는 Range"},
+    }
+)
+async def get_document_file(
+    doc_id: int,
+    request: Request,
+    document_service: Annotated[AsyncDocumentService, Depends(get_document_service)],
+    owner_id: Annotated[Optional[int], Depends(get_current_user_id)]
+) -> Response:
+    """
+    문서 파일 다운로드
+
+    - 파일을 메모리에 올리지 않고 FileResponse가 청크 단위로 전송
+      (서버가 http.response.pathsend를 지원하면 sendfile로 zero-copy 전송)
+    - Range / If-Range / HEAD / Content-Length 처리는 FileResponse가 담당
+    - ETag는 내용 해시 (content_hash가 없는 예전 문서는 mtime+size 기반)
+    - 다른 사용자의 문서는 없는 문서와 같이 404
+    """
+    try:
+        doc, stat_result = await document_service.get_document_file(doc_id, owner_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve document file: {str(e)}"
+        )
+
+    headers = {"cache-control": "private, no-cache"}
+    if doc.content_hash:
+        headers["etag"] = f'"{doc.content_hash}"'
+
+    response = FileResponse(
+        doc.storage_path,
+        headers=headers,
+        filename=doc.filename,
+        stat_result=stat_result,
+        content_disposition_type="inline"
+    )
+
+    if _is_not_modified(request, response.headers["etag"], stat_result):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={
+                "etag": response.headers["etag"],
+                "last-modified": response.headers["last-modified"],
+                "cache-control": headers["cache-control"],
+            }
+        )
+    return response
+
+
+def _is_not_modified(request: Request, etag: str, stat_result: os.stat_result) -> bool:
+    """조건부 요청 헤더 검사 (If-None-Match가 있으면 If-Modified-Since는 무시, RFC 9110)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(stat_result.st_mtime) <= since
+
+    return False
+
 # 폴더 내 문서 삭제 (업로드한 파일도 삭제)
 @router.delete(
     "/{doc_id}",
@@ -129,10 +315,11 @@ async def get_document_detail(
 
 async def delete_document(
     doc_id: int,
-    document_service: Annotated[DocumentService, Depends(get_document_service)]
+    document_service: Annotated[AsyncDocumentService, Depends(get_document_service)],
+    owner_id: Annotated[Optional[int], Depends(get_current_user_id)]
 ):
     try:
-        document_service.delete_document(doc_id)
+        await document_service.delete_document(doc_id, owner_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -156,10 +343,11 @@ async def delete_document(
 async def rename_document(
     doc_id: int,
     rename_dto: DocumentRenameDTO,
-    document_service: Annotated[DocumentService, Depends(get_document_service)]
+    document_service: Annotated[AsyncDocumentService, Depends(get_document_service)],
+    owner_id: Annotated[Optional[int], Depends(get_current_user_id)]
 ) -> DocumentDTO:
     try:
-        return document_service.rename_document(doc_id, rename_dto.new_name)
+        return await document_service.rename_document(doc_id, rename_dto.new_name, owner_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -183,10 +371,11 @@ async def rename_document(
 async def move_document(
     doc_id: int,
     move_dto: DocumentMoveDTO,
-    document_service: Annotated[DocumentService, Depends(get_document_service)]
+    document_service: Annotated[AsyncDocumentService, Depends(get_document_service)],
+    owner_id: Annotated[Optional[int], Depends(get_current_user_id)]
 ) -> DocumentDTO:
     try:
-        return document_service.move_document(doc_id, move_dto.new_folder_id)
+        return await document_service.move_document(doc_id, move_dto.new_folder_id, owner_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2,21 +2,29 @@
 Folders Router
 폴더 관련 API 엔드포인트
 """
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import Annotated
-from services.folder_service import FolderService
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import Annotated, Optional
+from repositories.unit_of_work import AsyncUnitOfWork
+from .dependencies import get_unit_of_work, get_current_user, get_current_user_id, ensure_user_access
+from api.responses import FastJSONRoute
+from services.folder_service import AsyncFolderService
+from services.pagination import InvalidCursorError, MAX_PAGE_SIZE
 from dto.folder_dto import FolderListDTO, FolderDTO, FolderCreateDTO, FolderRenameDTO
+from dto.user_dto import AuthUserDTO
 
 
 router = APIRouter(
     prefix="/folders",
-    tags=["folders"]
+    tags=["folders"],
+    route_class=FastJSONRoute
 )
 
 
-def get_folder_service() -> FolderService:
-    """FolderService 의존성 주입"""
-    return FolderService()
+def get_folder_service(
+    uow: Annotated[AsyncUnitOfWork, Depends(get_unit_of_work, scope="function")]
+) -> AsyncFolderService:
+    """AsyncFolderService 의존성 주입 (요청 단위 Unit of Work 공유)"""
+    return AsyncFolderService(uow)
 
 
 @router.get(
@@ -24,11 +32,15 @@ def get_folder_service() -> FolderService:
     response_model=FolderListDTO,
     status_code=status.HTTP_200_OK,
     summary="사용자 폴더 목록 조회",
-    description="특정 사용자의 모든 폴더를 조회합니다."
+    description="특정 사용자의 폴더를 조회합니다. (limit/cursor로 키셋 페이지네이션, 생략하면 전체)"
 )
 async def get_user_folders(
     user_id: int,
-    folder_service: Annotated[FolderService, Depends(get_folder_service)]
+    folder_service: Annotated[AsyncFolderService, Depends(get_folder_service)],
+    current_user: Annotated[Optional[AuthUserDTO], Depends(get_current_user)],
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE, description="페이지 크기")] = None,
+    cursor: Annotated[Optional[str], Query(description="이전 응답의 next_cursor")] = None,
+    include_total: Annotated[bool, Query(description="페이지 조회 시 전체 개수 포함 여부")] = True
 ) -> FolderListDTO:
     """
     사용자의 폴더 목록 조회
@@ -36,15 +48,24 @@ async def get_user_folders(
     Args:
         user_id: 사용자 ID
         folder_service: 폴더 서비스 (의존성 주입)
+        current_user: 토큰의 사용자 (있으면 user_id와 같아야 함)
+        limit: 페이지 크기 (생략하면 전체 조회)
+        cursor: 이전 응답의 next_cursor
+        include_total: 페이지 조회 시 전체 개수 포함 여부
 
     Returns:
-        FolderListDTO: 폴더 목록 및 총 개수
+        FolderListDTO: 폴더 목록, 총 개수, 다음 페이지 커서
 
     Raises:
-        HTTPException: 서버 오류 발생 시
+        HTTPException: 잘못된 cursor (400), 다른 사용자의 폴더 (403) 또는 서버 오류 발생 시
     """
+    ensure_user_access(current_user, user_id)
     try:
-        return folder_service.get_folders_by_user(user_id)
+        return await folder_service.get_folders_by_user(
+            user_id, limit=limit, cursor=cursor, include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -61,7 +82,8 @@ async def get_user_folders(
 )
 async def get_folder(
     folder_id: int,
-    folder_service: Annotated[FolderService, Depends(get_folder_service)]
+    folder_service: Annotated[AsyncFolderService, Depends(get_folder_service)],
+    owner_id: Annotated[Optional[int], Depends(get_current_user_id)]
 ) -> FolderDTO:
     """
     폴더 ID로 단건 조회
@@ -69,15 +91,16 @@ async def get_folder(
     Args:
         folder_id: 폴더 ID
         folder_service: 폴더 서비스 (의존성 주입)
+        owner_id: 토큰의 사용자 ID (있으면 그 사용자의 폴더만 조회)
 
     Returns:
         FolderDTO: 폴더 정보
 
     Raises:
-        HTTPException: 폴더가 존재하지 않거나 서버 오류 발생 시
+        HTTPException: 폴더가 존재하지 않거나 다른 사용자의 폴더 (404) 또는 서버 오류 발생 시
     """
     try:
-        return folder_service.get_folder_by_id(folder_id)
+        return await folder_service.get_folder_by_id(folder_id, owner_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -90,16 +113,22 @@ async def get_folder(
         )
 
 @router.post("", response_model=FolderDTO, status_code=status.HTTP_201_CREATED)
-def create_folder(payload: FolderCreateDTO, folder_service: FolderService = Depends(get_folder_service)):
+async def create_folder(
+    payload: FolderCreateDTO,
+    folder_service: AsyncFolderService = Depends(get_folder_service),
+    current_user: Optional[AuthUserDTO] = Depends(get_current_user)
+):
     """
     폴더 생성
     - 요청 검증: Pydantic(FolderCreateDTO)
     - 비즈니스 로직: Service에 위임
     - 응답: DTO 직렬화
+    - 토큰이 있으면 payload.user_id가 토큰의 사용자와 같아야 함 (403)
     """
+    ensure_user_access(current_user, payload.user_id)
     try:
-        return folder_service.create_folder(
-            user_id=payload.user_id,   # Phase 2에서 토큰/세션에서 추출하도록 변경 권장
+        return await folder_service.create_folder(
+            user_id=payload.user_id,
             folder_name=payload.folder_name
         )
     except ValueError as e:
@@ -124,11 +153,12 @@ def create_folder(payload: FolderCreateDTO, folder_service: FolderService = Depe
 async def rename_folder(
     folder_id: int,
     body: FolderRenameDTO, # 변경하고 싶은 필드 값
-    folder_service: Annotated[FolderService, Depends(get_folder_service)]
+    folder_service: Annotated[AsyncFolderService, Depends(get_folder_service)],
+    owner_id: Annotated[Optional[int], Depends(get_current_user_id)] # 토큰의 사용자 (다른 사용자의 폴더면 404)
 ) -> FolderDTO:
     try:
         # 서비스 시그니처를 folder_id + new_name 형태로 맞추는 것을 권장합니다.
-        return folder_service.rename_folder(folder_id, body.new_name)
+        return await folder_service.rename_folder(folder_id, body.new_name, owner_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -144,10 +174,11 @@ async def rename_folder(
 )
 async def delete_folder(
     folder_id: int,
-    folder_service: Annotated[FolderService, Depends(get_folder_service)]
+    folder_service: Annotated[AsyncFolderService, Depends(get_folder_service)],
+    owner_id: Annotated[Optional[int], Depends(get_current_user_id)]
 ) -> None:
     try:
-        folder_service.remove_folder(folder_id)
+        await folder_service.remove_folder(folder_id, owner_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -0,0 +1,74 @@
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import Annotated, Literal, Optional
+from repositories.unit_of_work import AsyncUnitOfWork
+from .dependencies import get_unit_of_work, get_current_user, ensure_user_access
+from api.responses import FastJSONRoute
+from services.embedding_backends import EmbeddingError
+from services.search_service import AsyncSearchService, SEARCH_DEFAULT_K, SEARCH_MAX_K, SEARCH_MAX_EF_SEARCH
+from dto.search_dto import SearchResultDTO
+from dto.user_dto import AuthUserDTO
+
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"],
+    route_class=FastJSONRoute
+)
+
+
+def get_search_service(
+    uow: Annotated[AsyncUnitOfWork, Depends(get_unit_of_work, scope="function")]
+) -> AsyncSearchService:
+    """AsyncSearchService 의존성 주입 (요청 단위 Unit of Work 공유)"""
+    return AsyncSearchService(uow)
+
+
+# 청크 벡터 검색
+@router.get(
+    "",
+    response_model=SearchResultDTO,
+    status_code=status.HTTP_200_OK,
+    summary="문서 내용 검색",
+    description=(
+        "질문과 의미가 가까운 청크를 페이지 번호와 함께 반환합니다. "
+        "사용자 전체 / 폴더(folder_id) / 문서(doc_id) 범위로 검색하고, "
+        "범위가 크면 HNSW 인덱스를 사용합니다 (ef_search가 클수록 정확하고 느림)."
+    )
+)
+async def search_chunks(
+    search_service: Annotated[AsyncSearchService, Depends(get_search_service)],
+    current_user: Annotated[Optional[AuthUserDTO], Depends(get_current_user)],
+    user_id: Annotated[int, Query(description="사용자 ID")],
+    q: Annotated[str, Query(min_length=1, max_length=2000, description="질문")],
+    folder_id: Annotated[Optional[int], Query(description="이 폴더의 문서만")] = None,
+    doc_id: Annotated[Optional[int], Query(description="이 문서만")] = None,
+    k: Annotated[int, Query(ge=1, le=SEARCH_MAX_K, description="결과 수")] = SEARCH_DEFAULT_K,
+    strategy: Annotated[Literal["auto", "exact", "ann"], Query(description="검색 방법 (auto: 범위 크기로 결정)")] = "auto",
+    ef_search: Annotated[Optional[int], Query(ge=1, le=SEARCH_MAX_EF_SEARCH, description="HNSW 후보 수 하한")] = None
+) -> SearchResultDTO:
+    """
+    청크 벡터 검색
+
+    Raises:
+        HTTPException: 다른 사용자 (403), 폴더 / 문서가 없거나 (404) 질문 임베딩 실패 (503) 검색 실패 시 (500)
+    """
+    ensure_user_access(current_user, user_id)
+    try:
+        return await search_service.search(
+            user_id, q, k=k, folder_id=folder_id, doc_id=doc_id, strategy=strategy, ef_search=ef_search
+        )
+    except EmbeddingError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to embed query: {str(e)}"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search documents: {str(e)}"
+        )
@@ -0,0 +1,174 @@
+"""
+App Logging
+애플리케이션 로깅 설정 (큐 기반 비동기 출력 + 구조화 JSON + 요청 ID)
+
+- 로그를 남기는 쪽(이벤트 루프 / 스레드풀)은 레코드를 메모리 큐에 넣기만 하고,
+  실제 stdout 쓰기는 QueueListener 백그라운드 스레드가 담당 (터미널 / 파이프가 느려도 요청이 멈추지 않음)
+- 큐가 가득 차면 기다리지 않고 버림 (버린 개수는 logging_stats()로 확인)
+- LOG_FORMAT=json(기본): 한 줄에 JSON 하나 {"ts", "level", "logger", "msg", "request_id", ...extra}
+  LOG_FORMAT=text: 개발용 사람이 읽는 형식
+- LOG_LEVEL(기본 INFO)로 레벨 조절, 모듈별로는 LOG_LEVELS="repositories.query_stats=DEBUG,uvicorn.access=WARNING"
+- request_id는 api.request_id.RequestIdMiddleware가 요청마다 contextvar에 설정
+
+사용하는 쪽은 평소처럼 logging.getLogger(__name__)을 쓰고,
+구조화 필드는 extra={"doc_id": 1}로 넘긴다 (메시지는 고정 문자열 → 레벨이 꺼져 있으면 포맷 비용 없음).
+"""
+import os
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional, TextIO
+
+import orjson
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# 요청 ID (요청 밖에서는 None)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord 기본 속성 (이 밖의 속성은 extra로 넘어온 구조화 필드)
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """레코드에 현재 요청 ID 기록 (큐에 넣기 전, 로그를 남긴 쪽의 context에서 실행)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 포맷"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    큐가 가득 차도 기다리지 않는 QueueHandler
+
+    같은 프로세스 안의 큐이므로 레코드를 pickle 하지 않고,
+    메시지 / 예외 문자열만 지금 확정해서 넘긴다 (나중에 바뀔 수 있는 args 객체를 잡아두지 않도록).
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_exception_formatter = logging.Formatter()
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_root_handler: Optional[logging.Handler] = None
+
+
+def setup_logging(
+    level: str = LOG_LEVEL,
+    fmt: str = LOG_FORMAT,
+    stream: Optional[TextIO] = None,
+    use_queue: bool = True
+) -> None:
+    """
+    루트 로거 설정 (main.py import 시 1번, 다시 부르면 기존 설정을 교체)
+
+    Args:
+        level: 루트 로그 레벨
+        fmt: "json" 또는 "text"
+        stream: 출력 대상 (기본 stdout)
+        use_queue: False면 큐 없이 바로 출력 (벤치마크 비교용)
+    """
+    global _queue_handler, _listener, _root_handler
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(logging.Formatter(TEXT_FORMAT) if fmt == "text" else JsonFormatter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    if use_queue:
+        _queue_handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        _queue_handler.addFilter(RequestIdFilter())
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, output, respect_handler_level=True)
+        _listener.start()
+        _root_handler = _queue_handler
+    else:
+        output.addFilter(RequestIdFilter())
+        _root_handler = output
+    root.addHandler(_root_handler)
+
+    for item in LOG_LEVELS.split(","):
+        name, _, logger_level = item.partition("=")
+        if name.strip() and logger_level.strip():
+            logging.getLogger(name.strip()).setLevel(logger_level.strip().upper())
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 출력하고 백그라운드 스레드 종료 (setup_logging이 붙인 핸들러 제거)"""
+    global _queue_handler, _listener, _root_handler
+    if _root_handler is not None:
+        logging.getLogger().removeHandler(_root_handler)
+        _root_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    _queue_handler = None
+
+
+def logging_stats() -> dict:
+    """큐 상태 (/health 용)"""
+    if _queue_handler is None:
+        return {"queued": False}
+    return {
+        "queued": True,
+        "level": logging.getLevelName(logging.getLogger().level),
+        "queue_size": _queue_handler.queue.qsize(),
+        "queue_max": LOG_QUEUE_SIZE,
+        "dropped": _queue_handler.dropped,
+    }
+
+
+atexit.register(shutdown_logging)
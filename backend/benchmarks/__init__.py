@@ -0,0 +1 @@
+# Benchmarks (python -m benchmarks.<name> 로 backend/ 에서 실행)
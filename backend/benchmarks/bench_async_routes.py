@@ -0,0 +1,107 @@
+"""
+Async vs Sync Service Benchmark
+async 라우터 안에서 sync 서비스(블로킹 psycopg)와 async 서비스를 호출할 때의
+동시 요청 지연 시간 비교
+
+실행 (backend/ 에서, .env 의 DB_* 사용):
+    python -m benchmarks.bench_async_routes --user-id 1 --concurrency 50
+    python -m benchmarks.bench_async_routes --sleep-ms 50 --concurrency 50   # 느린 쿼리 흉내
+
+측정 항목:
+    - 요청별 지연 시간 p50/p99
+    - 전체 소요 시간
+    - 이벤트 루프 최대 지연 (다른 요청이 얼마나 멈췄는지)
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from repositories.base_repository import BaseRepository, AsyncBaseRepository
+from repositories.connection_pool import open_pool, close_pool, open_async_pool, close_async_pool
+from services.folder_service import FolderService, AsyncFolderService
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _loop_lag_monitor(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """이벤트 루프가 interval 보다 얼마나 늦게 깨어나는지 최대값(ms) 측정"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, (time.perf_counter() - start - interval) * 1000)
+    return worst
+
+
+async def _run(mode: str, args) -> dict:
+    sleep_sql = "SELECT pg_sleep(%s) AS slept"
+
+    async def one_request() -> float:
+        # 모든 요청이 동시에 도착했다고 보고, 배치 시작 시점부터의 지연을 잰다
+        start = batch_start
+        if args.sleep_ms:
+            if mode == "sync":
+                # 기존 방식: async 라우터 안에서 블로킹 호출
+                BaseRepository.execute_query(sleep_sql, (args.sleep_ms / 1000,))
+            else:
+                await AsyncBaseRepository.execute_query(sleep_sql, (args.sleep_ms / 1000,))
+        else:
+            if mode == "sync":
+                FolderService().get_folders_by_user(args.user_id)
+            else:
+                await AsyncFolderService().get_folders_by_user(args.user_id)
+        return (time.perf_counter() - start) * 1000
+
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_loop_lag_monitor(stop))
+
+    batch_start = time.perf_counter()
+    latencies = await asyncio.gather(*(one_request() for _ in range(args.concurrency)))
+    wall_ms = (time.perf_counter() - batch_start) * 1000
+
+    stop.set()
+    max_lag = await monitor
+
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "wall_ms": round(wall_ms, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p99_ms": round(_percentile(latencies, 99), 1),
+        "max_loop_lag_ms": round(max_lag, 1),
+    }
+
+
+async def main(args) -> None:
+    open_pool()
+    await open_async_pool()
+    try:
+        for mode in ("sync", "async"):
+            # 워밍업 (풀 커넥션 생성)
+            saved = args.concurrency
+            args.concurrency = 2
+            await _run(mode, args)
+            args.concurrency = saved
+
+            result = await _run(mode, args)
+            print(
+                f"{result['mode']:>5}  requests={result['requests']}  wall={result['wall_ms']}ms  "
+                f"p50={result['p50_ms']}ms  p99={result['p99_ms']}ms  "
+                f"max_loop_lag={result['max_loop_lag_ms']}ms"
+            )
+    finally:
+        await close_async_pool()
+        close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="async vs sync service latency benchmark")
+    parser.add_argument("--user-id", type=int, default=1, help="폴더 목록을 조회할 사용자 ID")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 요청 수")
+    parser.add_argument("--sleep-ms", type=int, default=0, help="0보다 크면 pg_sleep 쿼리로 느린 쿼리 흉내")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,100 @@
+"""
+Batch Upload Benchmark
+파일 N개를 POST /documents/upload 로 하나씩 올릴 때와
+POST /documents/upload/batch 로 한 번에 올릴 때의 처리량 비교
+
+실행 (backend/ 에서, .env 의 DB_* 사용):
+    python -m benchmarks.bench_batch_upload --user-id 1 --folder-id 1
+    python -m benchmarks.bench_batch_upload --files 50 --size-kb 512 --rounds 5
+
+- 앱을 프로세스 안에서 ASGI로 직접 호출 (네트워크 제외, 서버 쪽 비용만 측정)
+- 파일 내용은 매번 랜덤이라 blob 중복 제거 효과는 빠져 있음
+- 라운드가 끝날 때마다 만든 문서를 삭제
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+from main import app
+from services.token_service import TokenService
+from repositories.connection_pool import open_pool, close_pool, open_async_pool, close_async_pool
+
+API = "/api/v1/documents"
+
+
+def _make_files(count: int, size_kb: int) -> list:
+    return [(f"bench_{i}.pdf", b"%PDF-1.4\n" + os.urandom(size_kb * 1024)) for i in range(count)]
+
+
+async def _per_file(client: httpx.AsyncClient, files: list, args) -> list:
+    """기존 방식: 파일마다 업로드 요청 1번"""
+    doc_ids = []
+    for name, data in files:
+        r = await client.post(
+            f"{API}/upload",
+            files={"file": (name, data, "application/pdf")},
+            data={"user_id": args.user_id, "folder_id": args.folder_id}
+        )
+        r.raise_for_status()
+        doc_ids.append(r.json()["doc_id"])
+    return doc_ids
+
+
+async def _batch(client: httpx.AsyncClient, files: list, args) -> list:
+    """일괄 업로드 요청 1번"""
+    r = await client.post(
+        f"{API}/upload/batch",
+        files=[("files", (name, data, "application/pdf")) for name, data in files],
+        data={"user_id": args.user_id, "folder_id": args.folder_id}
+    )
+    r.raise_for_status()
+    return [result["document"]["doc_id"] for result in r.json()["results"] if result["ok"]]
+
+
+async def _cleanup(client: httpx.AsyncClient, doc_ids: list) -> None:
+    for doc_id in doc_ids:
+        await client.delete(f"{API}/{doc_id}")
+
+
+async def main(args) -> None:
+    open_pool()
+    await open_async_pool()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        # 라우트는 토큰이 필요하므로 --user-id 사용자의 access 토큰을 직접 발급해서 보냄
+        token = TokenService().issue(args.user_id, "bench@example.com").access_token
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}) as client:
+            # 워밍업 (풀 커넥션 생성)
+            await _cleanup(client, await _per_file(client, _make_files(2, 1), args))
+
+            for mode, run in (("per-file", _per_file), ("batch", _batch)):
+                timings = []
+                for _ in range(args.rounds):
+                    files = _make_files(args.files, args.size_kb)
+                    start = time.perf_counter()
+                    doc_ids = await run(client, files, args)
+                    timings.append(time.perf_counter() - start)
+                    await _cleanup(client, doc_ids)
+
+                median = statistics.median(timings)
+                print(
+                    f"{mode:>8}  files={args.files}  size={args.size_kb}KB  rounds={args.rounds}  "
+                    f"median={median * 1000:.1f}ms  throughput={args.files / median:.1f} files/s"
+                )
+    finally:
+        await close_async_pool()
+        close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="per-file vs batch upload throughput benchmark")
+    parser.add_argument("--user-id", type=int, default=1, help="업로드할 사용자 ID")
+    parser.add_argument("--folder-id", type=int, default=1, help="업로드할 폴더 ID")
+    parser.add_argument("--files", type=int, default=50, help="라운드당 파일 수")
+    parser.add_argument("--size-kb", type=int, default=256, help="파일 1개 크기 (KB)")
+    parser.add_argument("--rounds", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,131 @@
+"""
+Chunker Benchmark
+services.chunker 처리량과 메모리 사용량을 페이지 수별로 측정 + 청크 규칙 확인
+
+실행 (backend/ 에서, DB 필요 없음):
+    python -m benchmarks.bench_chunker
+    python -m benchmarks.bench_chunker --pages 100,500,2000 --max-tokens 300 --overlap 30
+
+- 입력: --pdf (기본: pdf_files/ 아래 첫 번째 PDF)의 페이지 텍스트를 돌려 가며 --pages 페이지만큼 generator로 공급
+  (입력도 한 페이지씩만 만들어서 분할기가 들고 있는 메모리만 잼)
+- 결과: 페이지/초, 청크/초, 글자/초, tracemalloc 최대 메모리 (페이지 수가 늘어도 거의 같아야 함)
+- 매 실행마다 모든 청크에 대해 규칙 확인 (하나라도 어기면 종료 코드 1)
+  - 토큰 수 ≤ max_tokens, 빈 청크 없음
+  - 시작 / 끝 페이지가 문서 순서대로 (page_number ≤ page_end, 이전 청크보다 앞으로 가지 않음)
+  - 겹침을 뺀 청크 텍스트를 이으면 원문과 같음 (공백 제외, 해시로 비교해서 원문을 모으지 않음)
+  - 앞 청크 끝과 다음 청크의 겹침 부분이 같음
+"""
+import argparse
+import glob
+import hashlib
+import os
+import re
+import sys
+import time
+import tracemalloc
+from typing import Iterator, List, Tuple
+
+from services import pdf_extractor
+from services.chunker import Chunker, estimate_tokens
+
+_SPACES = re.compile(r"\s+")
+
+
+def _sample_pages(path: str) -> List[Tuple[int, str]]:
+    total = pdf_extractor.page_count(path)
+    return pdf_extractor.extract_pages(path, 1, total + 1)
+
+
+def _pages(sample: List[Tuple[int, str]], count: int, source_hash) -> Iterator[Tuple[int, str]]:
+    """샘플 페이지를 돌려 가며 count 페이지 (원문 해시도 같이 갱신)"""
+    for number in range(1, count + 1):
+        text = sample[(number - 1) % len(sample)][1]
+        source_hash.update(_SPACES.sub("", text).encode())
+        yield number, text
+
+
+def _run(sample: List[Tuple[int, str]], pages: int, args, check: bool) -> dict:
+    source_hash = hashlib.sha256()
+    chunk_hash = hashlib.sha256()
+    errors: List[str] = []
+    count = 0
+    chars = 0
+    last_page = 0
+    previous = None
+
+    def inspect(chunk) -> None:
+        nonlocal last_page, previous
+        if not check:
+            return
+        if not chunk.text.strip():
+            errors.append(f"chunk {chunk.index}: empty")
+        if chunk.tokens > args.max_tokens or estimate_tokens(chunk.text) > args.max_tokens:
+            errors.append(f"chunk {chunk.index}: {chunk.tokens} tokens > {args.max_tokens}")
+        if not (last_page <= chunk.page_number <= chunk.page_end):
+            errors.append(f"chunk {chunk.index}: pages {chunk.page_number}-{chunk.page_end} after {last_page}")
+        if chunk.overlap_chars:
+            overlap = chunk.text[:chunk.overlap_chars].strip()
+            if previous is None or not previous.text.endswith(overlap):
+                errors.append(f"chunk {chunk.index}: overlap does not match previous chunk")
+        last_page = chunk.page_number
+        previous = chunk
+        chunk_hash.update(_SPACES.sub("", chunk.text[chunk.overlap_chars:]).encode())
+
+    chunker = Chunker(args.max_tokens, args.overlap)
+    if check:
+        tracemalloc.start()
+    started = time.perf_counter()
+    for number, text in _pages(sample, pages, source_hash):
+        chars += len(text)
+        for chunk in chunker.feed(number, text):
+            count += 1
+            inspect(chunk)
+    for chunk in chunker.flush():
+        count += 1
+        inspect(chunk)
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if check:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    if check and source_hash.digest() != chunk_hash.digest():
+        errors.append("chunks without overlap do not reproduce the source text")
+    return {"chunks": count, "chars": chars, "elapsed": elapsed, "peak": peak, "errors": errors}
+
+
+def main(args) -> int:
+    if args.pdf:
+        path = args.pdf
+    else:
+        paths = sorted(glob.glob(os.path.join("pdf_files", "**", "*.pdf"), recursive=True))
+        if not paths:
+            raise SystemExit("pdf_files/ 아래에 PDF가 없습니다 (--pdf로 지정)")
+        path = paths[0]
+    sample = _sample_pages(path)
+    print(f"PDF: {path} ({len(sample)} pages) max_tokens={args.max_tokens} overlap={args.overlap}")
+
+    failed = False
+    for pages in (int(p) for p in args.pages.split(",")):
+        # 규칙 확인 없이 한 번 (순수 분할 비용), 확인 + 메모리 추적하면서 한 번
+        result = _run(sample, pages, args, check=False)
+        checked = _run(sample, pages, args, check=True)
+        print(
+            f"  pages={pages:<6} chunks={result['chunks']:<6} {result['elapsed'] * 1000:9.1f}ms  "
+            f"{pages / result['elapsed']:9.0f} pages/s  {result['chunks'] / result['elapsed']:8.0f} chunks/s  "
+            f"{result['chars'] / result['elapsed'] / 1e6:6.2f} M chars/s  peak {checked['peak'] / 1024:8.1f} KiB  "
+            f"checks={'ok' if not checked['errors'] else len(checked['errors'])}"
+        )
+        for error in checked["errors"][:5]:
+            print(f"    {error}")
+        failed = failed or bool(checked["errors"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스트리밍 청크 분할기 벤치마크")
+    parser.add_argument("--pdf", help="샘플 PDF (기본: pdf_files/ 아래 첫 번째 PDF)")
+    parser.add_argument("--pages", default="28,280,1000", help="측정할 페이지 수 (쉼표로 여러 개)")
+    parser.add_argument("--max-tokens", type=int, default=500)
+    parser.add_argument("--overlap", type=int, default=50)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+"""
+DTO Path Benchmark
+DB 행 → DTO 변환 비용과 목록 API 전체 지연 시간을 문서 수별(기본 10 / 1k / 10k)로 측정
+
+실행 (backend/ 에서, .env 의 DB_* 사용):
+    python -m benchmarks.bench_dto_path --user-id 1
+    python -m benchmarks.bench_dto_path --sizes 10 1000 10000 --rounds 20
+
+- validated: DocumentDTO(**row) (pydantic 검증)
+- trusted:   trusted_dtos(DocumentDTO, rows) (검증 생략, Repository가 쓰는 경로)
+- endpoint:  GET /documents/folder/{folder_id} 전체 목록 (ASGI 직접 호출, 응답 직렬화 포함)
+- 크기마다 임시 폴더에 문서 행만 넣고(파일 없음) 끝나면 삭제
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from main import app
+from services.token_service import TokenService
+from dto.document_dto import DocumentDTO
+from repositories.base_repository import BaseRepository, trusted_dtos
+from repositories.documents_repository import DocumentsRepository, FIND_ALL_BY_FOLDER_ID_SQL
+from repositories.folder_repository import FolderRepository
+from repositories.connection_pool import open_pool, close_pool, open_async_pool, close_async_pool
+
+API = "/api/v1/documents"
+
+
+def _seed(user_id: int, count: int) -> int:
+    """임시 폴더 + 문서 count개 생성, folder_id 반환"""
+    conn = BaseRepository.get_connection()
+    try:
+        folder = FolderRepository.create_folder_by_user_id(user_id, f"bench_dto_{count}_{time.time_ns()}", conn)
+        DocumentsRepository.insert_many([
+            {
+                "user_id": user_id,
+                "folder_id": folder.folder_id,
+                "filename": f"bench_{i}.pdf",
+                "storage_path": f"bench/{i}.pdf",
+                "summary_text": "",
+                "file_size": 1024,
+            }
+            for i in range(count)
+        ], conn)
+        conn.commit()
+        return folder.folder_id
+    finally:
+        conn.close()
+
+
+def _cleanup(folder_id: int) -> None:
+    conn = BaseRepository.get_connection()
+    try:
+        BaseRepository.execute_update("DELETE FROM documents WHERE folder_id = %s", (folder_id,), conn)
+        FolderRepository.remove_folder_by_user_id(folder_id, conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _median_ms(func, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def _endpoint_ms(client: httpx.AsyncClient, folder_id: int, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        r = await client.get(f"{API}/folder/{folder_id}")
+        r.raise_for_status()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def main(args) -> None:
+    open_pool()
+    await open_async_pool()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        # 라우트는 토큰이 필요하므로 --user-id 사용자의 access 토큰을 직접 발급해서 보냄
+        token = TokenService().issue(args.user_id, "bench@example.com").access_token
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}) as client:
+            for size in args.sizes:
+                folder_id = _seed(args.user_id, size)
+                try:
+                    rows = BaseRepository.execute_query(FIND_ALL_BY_FOLDER_ID_SQL, (folder_id,))
+                    # trusted 경로는 행 dict를 그대로 가져가므로 라운드마다 새 행을 넘김
+                    validated = _median_ms(lambda: [DocumentDTO(**row) for row in rows], args.rounds)
+                    trusted = _median_ms(lambda: trusted_dtos(DocumentDTO, [dict(row) for row in rows]), args.rounds)
+                    copy_only = _median_ms(lambda: [dict(row) for row in rows], args.rounds)
+                    repo = _median_ms(lambda: DocumentsRepository.find_all_by_folder_id(folder_id), args.rounds)
+
+                    await client.get(f"{API}/folder/{folder_id}")  # 워밍업
+                    endpoint = await _endpoint_ms(client, folder_id, args.rounds)
+
+                    print(
+                        f"rows={size:>6}  validated={validated:8.2f}ms  trusted={trusted - copy_only:8.2f}ms  "
+                        f"repository={repo:8.2f}ms  endpoint={endpoint:8.2f}ms"
+                    )
+                finally:
+                    _cleanup(folder_id)
+    finally:
+        await close_async_pool()
+        close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="row → DTO 변환 / 목록 API 벤치마크")
+    parser.add_argument("--user-id", type=int, default=1, help="임시 폴더를 만들 사용자 ID")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000], help="폴더당 문서 수")
+    parser.add_argument("--rounds", type=int, default=10, help="반복 횟수 (중앙값 사용)")
+    asyncio.run(main(parser.parse_args()))
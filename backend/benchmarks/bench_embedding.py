@@ -0,0 +1,286 @@
+"""
+Embedding Benchmark
+1) services.embedding_service 마이크로 배치 처리량: 배치 크기 / 대기 시간 / 동시 실행 수별 청크/초
+2) document_chunks 쓰기 처리량: COPY (FORMAT BINARY) vs 행마다 INSERT (executemany, 텍스트 벡터)
+3) 임베딩 캐시: 처음 수집 / 같은 프로세스에서 다시 (메모리 계층) / 새 프로세스에서 다시 (DB 계층)
+
+실행 (backend/ 에서, 2)는 .env 의 DB_* 사용):
+    python -m benchmarks.bench_embedding
+    python -m benchmarks.bench_embedding --backend remote --latency-ms 80 --per-item-ms 0.5 --fail-rate 0.05
+    python -m benchmarks.bench_embedding --skip-db --configs 1:0:1,16:10:2,64:20:4
+
+1) 배치
+- --docs개 문서가 동시에 --chunks개 청크를 --per-call개씩 embed_texts로 보냄 (수집 워커가 페이지 묶음마다 보내는 것과 같음)
+- --backend local: 실제 해시 임베더 (CPU 작업이라 배치 크기보다 코어 수가 처리량을 정함)
+  --backend remote: 호출 1번에 latency-ms + per-item-ms × 개수 만큼 기다리는 가짜 원격 모델
+  (--fail-rate 확률로 retryable 오류 → 재시도 경로도 같이 측정)
+- --configs 는 batch_size:wait_ms:concurrency 목록, 1:0:1 이 배치 없이 하나씩 보내는 기준선
+- 결과: 청크/초, 평균 배치 크기, 배치 수, 재시도 수, embed_texts 호출 p50 / p99 지연
+
+2) 쓰기
+- --user-id / --folder-id 아래에 벤치마크용 문서 1개를 만들고 --write-rows개 청크(--dim 차원)를 --write-batch행씩 저장
+- 라운드마다 커밋 후 지우고, 끝나면 문서도 삭제
+- 결과: 행/초, MB/초 (텍스트 + 벡터 바이트 기준)
+
+3) 캐시 (--backend 와 --docs / --chunks / --per-call 를 그대로 사용, --skip-db면 메모리 계층만)
+- 청크 중 --dup-rate 비율은 다른 문서와 같은 텍스트 (여러 학생이 같은 자료를 올린 경우)
+- cold: 빈 캐시, warm-memory: 같은 캐시로 한 번 더, warm-db: 메모리가 빈 새 캐시 (DB 계층만 남은 상태)
+- 결과: 청크/초, 백엔드로 보낸 청크 수, 계층별 적중률
+- 벤치마크가 만든 캐시 행(모델 id로 구분)은 끝나면 삭제
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+from repositories.base_repository import BaseRepository
+from repositories.chunk_repository import ChunkRepository
+from repositories.connection_pool import open_pool, close_pool, open_async_pool, close_async_pool
+from services.embedding_backends import EMBEDDING_DIM, EmbeddingBackend, EmbeddingError, LocalHashEmbedder, hash_embedding
+from services.embedding_cache import EmbeddingCache
+from services.embedding_service import EmbeddingBatcher
+
+_WORDS = (
+    "데이터베이스 트랜잭션 격리 수준 인덱스 정규화 조인 쿼리 최적화 운영체제 프로세스 스레드 스케줄링 "
+    "메모리 페이지 가상 네트워크 패킷 라우팅 알고리즘 정렬 탐색 그래프 동적 계획법 "
+    "database transaction index query process thread memory network packet graph sort search"
+).split()
+
+
+def _make_texts(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(_WORDS) for _ in range(rng.randint(80, 160))) for _ in range(count)]
+
+
+def _make_backend(args, model: str = "remote-sim") -> EmbeddingBackend:
+    if args.backend == "remote":
+        return SimulatedRemoteBackend(args.dim, args.latency_ms, args.per_item_ms, args.fail_rate, model)
+    return LocalHashEmbedder(args.dim)
+
+
+class SimulatedRemoteBackend(EmbeddingBackend):
+    """원격 임베딩 API 흉내 (지연만 있고 CPU는 거의 쓰지 않음)"""
+
+    name = "remote-sim"
+
+    def __init__(self, dim: int, latency_ms: float, per_item_ms: float, fail_rate: float, model: str = "remote-sim") -> None:
+        super().__init__(model, dim)
+        self.latency = latency_ms / 1000
+        self.per_item = per_item_ms / 1000
+        self.fail_rate = fail_rate
+        self.calls = 0
+        self._vector = [1.0 / dim ** 0.5] * dim
+
+    async def embed(self, texts: List[str]) -> List[list]:
+        self.calls += 1
+        await asyncio.sleep(self.latency + self.per_item * len(texts))
+        if random.random() < self.fail_rate:
+            raise EmbeddingError("simulated 503")
+        return [self._vector] * len(texts)
+
+
+# ==========================
+# 1) 마이크로 배치
+# ==========================
+async def _run_batcher(config: str, texts: List[str], args) -> dict:
+    batch_size, wait_ms, concurrency = (float(v) for v in config.split(":"))
+    batcher = EmbeddingBatcher(
+        _make_backend(args),
+        batch_size=int(batch_size),
+        max_wait_ms=wait_ms,
+        concurrency=int(concurrency),
+        max_pending=args.max_pending,
+        retry_base_sec=0.01
+    )
+    latencies: List[float] = []
+    per_doc = len(texts) // args.docs
+
+    async def document(doc: int) -> None:
+        mine = texts[doc * per_doc:(doc + 1) * per_doc]
+        for start in range(0, len(mine), args.per_call):
+            call_started = time.perf_counter()
+            vectors = await batcher.embed(mine[start:start + args.per_call])
+            latencies.append(time.perf_counter() - call_started)
+            assert len(vectors) == len(mine[start:start + args.per_call])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(document(doc) for doc in range(args.docs)))
+    elapsed = time.perf_counter() - started
+    stats = batcher.stats()
+    await batcher.stop()
+    latencies.sort()
+    return {
+        "config": config,
+        "chunks": per_doc * args.docs,
+        "elapsed": elapsed,
+        "batches": stats["batches"],
+        "avg_batch": stats["avg_batch_size"],
+        "retries": stats["retries"],
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+async def bench_batcher(args) -> None:
+    texts = _make_texts(args.chunks, seed=1)
+    print(
+        f"[batcher] backend={args.backend} dim={args.dim} docs={args.docs} chunks={args.chunks} per_call={args.per_call}"
+        + (f" latency={args.latency_ms}ms+{args.per_item_ms}ms/item fail_rate={args.fail_rate}" if args.backend == "remote" else "")
+    )
+    for config in args.configs.split(","):
+        r = await _run_batcher(config, texts, args)
+        print(
+            f"  size:wait:conc={r['config']:<10} {r['chunks'] / r['elapsed']:9.1f} chunks/s  "
+            f"batches={r['batches']:<5} avg_batch={r['avg_batch']:<6} retries={r['retries']:<3} "
+            f"call p50={r['p50'] * 1000:7.1f}ms p99={r['p99'] * 1000:7.1f}ms"
+        )
+
+
+# ==========================
+# 2) DB 쓰기
+# ==========================
+def _vector_literal(vector) -> str:
+    return "[" + ",".join(repr(v) for v in vector) + "]"
+
+
+def _insert_rows(doc_id: int, rows, vectors, conn) -> None:
+    """기준선: 행마다 INSERT (pipeline executemany, 벡터는 텍스트 리터럴)"""
+    with conn.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO document_chunks (doc_id, page_number, chunk_text, embedding) VALUES (%s, %s, %s, %s::vector)",
+            [(doc_id, page, text, _vector_literal(vector)) for (page, text), vector in zip(rows, vectors)]
+        )
+
+
+def _copy_rows(doc_id: int, rows, vectors, conn) -> None:
+    ChunkRepository.copy_many(doc_id, rows, vectors, conn=conn)
+
+
+def bench_writes(args) -> None:
+    texts = _make_texts(min(args.write_rows, 512), seed=2)
+    vectors = [hash_embedding(text, args.dim) for text in texts]
+    rows = [(i // 2 + 1, texts[i % len(texts)]) for i in range(args.write_rows)]
+    all_vectors = [vectors[i % len(vectors)] for i in range(args.write_rows)]
+    payload = sum(len(text.encode()) for _, text in rows) + args.write_rows * (4 * args.dim + 4)
+    print(f"[writes] rows={args.write_rows} batch={args.write_batch} dim={args.dim} payload={payload / 1e6:.1f} MB")
+
+    open_pool()
+    conn = BaseRepository.get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO documents (user_id, folder_id, filename, storage_path) VALUES (%s, %s, %s, %s) RETURNING doc_id",
+                (args.user_id, args.folder_id, "bench_embedding.pdf", "bench_embedding")
+            )
+            doc_id = cursor.fetchone()["doc_id"]
+        conn.commit()
+        try:
+            for mode, write in (("executemany", _insert_rows), ("copy", _copy_rows)):
+                timings = []
+                for _ in range(args.rounds):
+                    started = time.perf_counter()
+                    for start in range(0, len(rows), args.write_batch):
+                        write(doc_id, rows[start:start + args.write_batch], all_vectors[start:start + args.write_batch], conn)
+                        conn.commit()
+                    timings.append(time.perf_counter() - started)
+                    ChunkRepository.delete_by_doc_id(doc_id, conn=conn)
+                    conn.commit()
+                median = statistics.median(timings)
+                print(
+                    f"  {mode:>11}  median={median * 1000:8.1f}ms  {args.write_rows / median:9.1f} rows/s  "
+                    f"{payload / median / 1e6:7.2f} MB/s"
+                )
+        finally:
+            BaseRepository.execute_update("DELETE FROM documents WHERE doc_id = %s", (doc_id,), conn)
+            conn.commit()
+    finally:
+        conn.close()
+        close_pool()
+
+
+# ==========================
+# 3) 캐시
+# ==========================
+async def _run_cached(batcher: EmbeddingBatcher, texts: List[str], args) -> dict:
+    per_doc = len(texts) // args.docs
+    before = batcher.chunks
+
+    async def document(doc: int) -> None:
+        mine = texts[doc * per_doc:(doc + 1) * per_doc]
+        for start in range(0, len(mine), args.per_call):
+            await batcher.embed(mine[start:start + args.per_call])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(document(doc) for doc in range(args.docs)))
+    return {"elapsed": time.perf_counter() - started, "chunks": per_doc * args.docs, "embedded": batcher.chunks - before}
+
+
+async def bench_cache(args) -> None:
+    rng = random.Random(3)
+    shared = _make_texts(max(1, args.chunks // 10), seed=4)
+    unique = iter(_make_texts(args.chunks, seed=5))
+    texts = [rng.choice(shared) if rng.random() < args.dup_rate else next(unique) for _ in range(args.chunks)]
+    use_db = not args.skip_db
+    # 실행마다 다른 모델 id → 이전 실행이 남긴 캐시 행을 쓰지 않음
+    model = f"bench-{time.time_ns()}"
+    print(f"[cache] backend={args.backend} chunks={args.chunks} dup_rate={args.dup_rate} db={use_db} model={model}")
+
+    if use_db:
+        await open_async_pool()
+    try:
+        cache = EmbeddingCache(memory_entries=args.chunks, use_db=use_db)
+        batcher = EmbeddingBatcher(_make_backend(args, model), cache=cache)
+        runs = [("cold", batcher), ("warm-memory", batcher)]
+        if use_db:
+            runs.append(("warm-db", EmbeddingBatcher(_make_backend(args, model), cache=EmbeddingCache(use_db=True))))
+        for label, run_batcher in runs:
+            before = dict(run_batcher.cache.stats())
+            r = await _run_cached(run_batcher, texts, args)
+            after = run_batcher.cache.stats()
+            lookups = {tier: after[tier] - before[tier] for tier in ("memory_hits", "db_hits", "misses")}
+            total = sum(lookups.values()) or 1
+            print(
+                f"  {label:<12} {r['chunks'] / r['elapsed']:9.1f} chunks/s  embedded={r['embedded']:<6} "
+                f"memory_hit={lookups['memory_hits'] / total:5.3f} db_hit={lookups['db_hits'] / total:5.3f} "
+                f"miss={lookups['misses'] / total:5.3f}"
+            )
+        for run_batcher in {id(b): b for _, b in runs}.values():
+            await run_batcher.stop()
+    finally:
+        if use_db:
+            conn = BaseRepository.get_connection()
+            try:
+                BaseRepository.execute_update("DELETE FROM embedding_cache WHERE model LIKE %s", (f"{model}:%",), conn)
+                conn.commit()
+            finally:
+                conn.close()
+            await close_async_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 마이크로 배치 / 청크 저장 처리량 벤치마크")
+    parser.add_argument("--backend", choices=("local", "remote"), default="local")
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM)
+    parser.add_argument("--docs", type=int, default=8, help="동시에 수집하는 문서 수")
+    parser.add_argument("--chunks", type=int, default=2000, help="전체 청크 수")
+    parser.add_argument("--per-call", type=int, default=4, help="embed_texts 호출 1번의 청크 수")
+    parser.add_argument("--configs", default="1:0:1,16:10:2,64:20:4,128:50:4", help="batch_size:wait_ms:concurrency 목록")
+    parser.add_argument("--max-pending", type=int, default=1024)
+    parser.add_argument("--latency-ms", type=float, default=80, help="remote: 호출 1번 고정 지연")
+    parser.add_argument("--per-item-ms", type=float, default=0.5, help="remote: 청크 1개당 추가 지연")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="remote: 호출 실패 확률 (retryable)")
+    parser.add_argument("--dup-rate", type=float, default=0.3, help="캐시: 다른 문서와 겹치는 청크 비율")
+    parser.add_argument("--skip-db", action="store_true", help="쓰기 벤치마크와 캐시 DB 계층 생략")
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--folder-id", type=int, default=1)
+    parser.add_argument("--write-rows", type=int, default=2000)
+    parser.add_argument("--write-batch", type=int, default=200, help="트랜잭션 1개에 저장하는 행 수")
+    parser.add_argument("--rounds", type=int, default=3, help="쓰기 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    asyncio.run(bench_batcher(args))
+    if not args.skip_db:
+        bench_writes(args)
+    asyncio.run(bench_cache(args))
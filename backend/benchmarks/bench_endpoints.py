@@ -0,0 +1,351 @@
+"""
+Endpoint Benchmark Suite
+main.py의 실제 FastAPI 앱을 ASGI로 직접 호출해서 주요 엔드포인트의 처리량 / 지연 시간 측정
+
+실행 (backend/ 에서):
+    # Postgres(.env 의 DB_*, schema_int.sql 적용된 DB) + in-memory 둘 다
+    python -m benchmarks.bench_endpoints
+    # in-memory만 (DB 필요 없음), 동시 요청 50, 데이터셋 크기 조절
+    python -m benchmarks.bench_endpoints --target memory --concurrency 50 --folders 100 --docs-per-folder 200
+    # 일부 시나리오만, 이전 결과와 비교
+    python -m benchmarks.bench_endpoints --scenarios detail,list_documents --baseline benchmarks/results/<이전>.json
+
+대상 (--target)
+- postgres: 실제 DB. --user-id 사용자 아래에 bench-<run id> 폴더 / 문서를 만들고 끝나면 삭제
+            로그인은 --email / --password 계정 (DB에 있어야 함)
+            업로드한 blob 파일은 참조만 해제되므로 python -m scripts.gc_blobs 로 정리
+- memory:   benchmarks.in_memory_repositories 로 Repository만 교체 (라우터 / 서비스 / 직렬화 / 미들웨어는 그대로)
+            두 결과의 차이 = DB 왕복 비용, blob 파일은 끝나면 지워지는 임시 디렉터리에 저장
+
+시나리오: login, list_folders, list_documents, detail, rename, move, upload, delete
+- delete는 upload로 만든 문서를 지움 (모자라면 측정 전에 더 업로드)
+- 시나리오마다 --warmup 요청을 먼저 보내고 측정에서 제외
+- 동시성: --concurrency 개의 워커가 --requests 개의 요청을 나눠서 보냄 (같은 이벤트 루프, 네트워크 제외)
+- login 외 시나리오는 데이터셋 사용자의 access 토큰을 Authorization 헤더로 보냄 (토큰은 측정 전에 직접 발급)
+
+결과: 시나리오별 throughput(req/s), p50 / p95 / p99 / max(ms), 오류 수
+      --output (기본 benchmarks/results/endpoints-<시각>-<커밋>.json)에 JSON 저장, --baseline 파일이 있으면 변화율 출력
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import httpx
+
+# login 시나리오는 같은 계정으로 수백 번 로그인하므로 시도 횟수 제한을 끔 (환경변수로 켜면 그대로 사용)
+os.environ.setdefault("LOGIN_THROTTLE_ENABLED", "false")
+
+from main import app
+from app_logging import setup_logging
+from services import file_storage
+from services.token_service import TokenService
+from benchmarks.in_memory_repositories import InMemoryStore, install, uninstall
+from repositories.base_repository import BaseRepository
+from repositories.connection_pool import open_pool, close_pool, open_async_pool, close_async_pool
+
+API = "/api/v1"
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class BenchContext:
+    """시나리오가 공유하는 데이터셋 정보"""
+
+    def __init__(self, args, user_id: int, folder_ids: List[int], doc_ids: List[int]) -> None:
+        self.args = args
+        self.user_id = user_id
+        self.folder_ids = folder_ids
+        self.doc_ids = doc_ids
+        self.uploaded: List[int] = []
+
+    def folder(self, i: int) -> int:
+        return self.folder_ids[i % len(self.folder_ids)]
+
+    def doc(self, i: int) -> int:
+        return self.doc_ids[i % len(self.doc_ids)]
+
+
+# ==========================
+# 시나리오 (요청 1건)
+# ==========================
+async def _login(client: httpx.AsyncClient, ctx: BenchContext, i: int) -> httpx.Response:
+    return await client.post(f"{API}/auth/login", json={"email": ctx.args.email, "password": ctx.args.password})
+
+
+async def _list_folders(client: httpx.AsyncClient, ctx: BenchContext, i: int) -> httpx.Response:
+    return await client.get(f"{API}/folders/user/{ctx.user_id}")
+
+
+async def _list_documents(client: httpx.AsyncClient, ctx: BenchContext, i: int) -> httpx.Response:
+    return await client.get(f"{API}/documents/folder/{ctx.folder(i)}", params={"limit": ctx.args.page_size})
+
+
+async def _detail(client: httpx.AsyncClient, ctx: BenchContext, i: int) -> httpx.Response:
+    return await client.get(f"{API}/documents/{ctx.doc(i)}")
+
+
+async def _rename(client: httpx.AsyncClient, ctx: BenchContext, i: int) -> httpx.Response:
+    return await client.patch(f"{API}/documents/{ctx.doc(i)}/rename", json={"new_name": f"renamed-{i}"})
+
+
+async def _move(client: httpx.AsyncClient, ctx: BenchContext, i: int) -> httpx.Response:
+    return await client.patch(f"{API}/documents/{ctx.doc(i)}/move", json={"new_folder_id": ctx.folder(i + 1)})
+
+
+async def _upload(client: httpx.AsyncClient, ctx: BenchContext, i: int) -> httpx.Response:
+    data = b"%PDF-1.4\n" + os.urandom(ctx.args.size_kb * 1024)
+    r = await client.post(
+        f"{API}/documents/upload",
+        files={"file": (f"bench-upload-{i}.pdf", data, "application/pdf")},
+        data={"user_id": ctx.user_id, "folder_id": ctx.folder(i)}
+    )
+    if r.status_code == 201:
+        ctx.uploaded.append(r.json()["doc_id"])
+    return r
+
+
+async def _delete(client: httpx.AsyncClient, ctx: BenchContext, i: int) -> httpx.Response:
+    return await client.delete(f"{API}/documents/{ctx.uploaded.pop()}")
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "login": _login,
+    "list_folders": _list_folders,
+    "list_documents": _list_documents,
+    "detail": _detail,
+    "rename": _rename,
+    "move": _move,
+    "upload": _upload,
+    "delete": _delete,
+}
+
+
+async def _drive(client: httpx.AsyncClient, ctx: BenchContext, call: Callable, count: int, concurrency: int) -> dict:
+    """count개 요청을 concurrency개 워커로 보내고 결과 집계"""
+    latencies: List[float] = []
+    errors = 0
+    indexes = iter(range(count))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in indexes:
+            start = time.perf_counter()
+            r = await call(client, ctx, i)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if r.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    return {
+        "requests": count,
+        "errors": errors,
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(count / wall, 1),
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+    }
+
+
+async def _run_scenarios(ctx: BenchContext, args) -> Dict[str, dict]:
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    token = TokenService().issue(ctx.user_id, args.email).access_token
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for name in args.scenarios:
+            call = SCENARIOS[name]
+            if name == "delete":
+                missing = args.requests + args.warmup - len(ctx.uploaded)
+                if missing > 0:
+                    await _drive(client, ctx, _upload, missing, args.concurrency)
+            if args.warmup:
+                await _drive(client, ctx, call, args.warmup, args.concurrency)
+            results[name] = await _drive(client, ctx, call, args.requests, args.concurrency)
+            print(_format_row(name, results[name]))
+
+        # 측정에 쓰고 남은 업로드 문서 정리 (blob은 참조만 해제, 파일은 GC 몫)
+        while ctx.uploaded:
+            await _delete(client, ctx, 0)
+    return results
+
+
+# ==========================
+# 대상별 데이터셋 준비
+# ==========================
+SEED_FOLDERS_SQL = """
+    INSERT INTO folders (user_id, folder_name, created_at)
+    SELECT %s, %s || g, now() - interval '1 day' + g * interval '1 second'
+    FROM generate_series(1, %s) g
+    RETURNING folder_id
+"""
+
+SEED_DOCUMENTS_SQL = """
+    INSERT INTO documents (user_id, folder_id, filename, storage_path, summary_text, file_size, created_at)
+    SELECT f.user_id, f.folder_id, 'bench-' || f.folder_id || '-' || g || '.pdf',
+           'pdf_files/bench/missing.pdf', '', 0, f.created_at + g * interval '1 microsecond'
+    FROM folders f CROSS JOIN generate_series(1, %s) g
+    WHERE f.folder_id = ANY(%s)
+    RETURNING doc_id
+"""
+
+SEED_COUNTERS_SQL = "UPDATE folders SET document_count = %s, total_bytes = 0 WHERE folder_id = ANY(%s)"
+CLEANUP_DOCUMENTS_SQL = "DELETE FROM documents WHERE folder_id = ANY(%s) AND content_hash IS NULL"
+CLEANUP_FOLDERS_SQL = "DELETE FROM folders WHERE folder_id = ANY(%s)"
+
+
+async def _bench_postgres(args) -> Dict[str, dict]:
+    run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+    open_pool()
+    await open_async_pool()
+    folder_ids: List[int] = []
+    try:
+        conn = BaseRepository.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(SEED_FOLDERS_SQL, (args.user_id, f"bench-{run_id}-", args.folders))
+                folder_ids = [row["folder_id"] for row in cur.fetchall()]
+                cur.execute(SEED_DOCUMENTS_SQL, (args.docs_per_folder, folder_ids))
+                doc_ids = [row["doc_id"] for row in cur.fetchall()]
+                cur.execute(SEED_COUNTERS_SQL, (args.docs_per_folder, folder_ids))
+            conn.commit()
+        finally:
+            conn.close()
+
+        ctx = BenchContext(args, args.user_id, folder_ids, doc_ids)
+        return await _run_scenarios(ctx, args)
+    finally:
+        if folder_ids:
+            BaseRepository.execute_update(CLEANUP_DOCUMENTS_SQL, (folder_ids,))
+            BaseRepository.execute_update(CLEANUP_FOLDERS_SQL, (folder_ids,))
+        await close_async_pool()
+        close_pool()
+
+
+async def _bench_memory(args) -> Dict[str, dict]:
+    store = InMemoryStore()
+    user_id = store.add_user(args.email, args.password)
+    folder_ids, doc_ids = store.seed(user_id, args.folders, args.docs_per_folder)
+    install(app, store)
+    # GC가 없으므로 업로드 파일은 임시 디렉터리에 저장하고 끝나면 통째로 삭제
+    blob_root = file_storage.BLOB_ROOT
+    with tempfile.TemporaryDirectory(prefix="bench-blobs-") as tmp_root:
+        file_storage.BLOB_ROOT = tmp_root
+        try:
+            return await _run_scenarios(BenchContext(args, user_id, folder_ids, doc_ids), args)
+        finally:
+            file_storage.BLOB_ROOT = blob_root
+            uninstall(app)
+
+
+TARGETS = {"postgres": _bench_postgres, "memory": _bench_memory}
+
+
+# ==========================
+# 결과 저장 / 비교
+# ==========================
+def _format_row(name: str, result: dict) -> str:
+    return (
+        f"  {name:>14}  {result['throughput_rps']:9.1f} req/s  p50={result['p50_ms']:8.2f}ms  "
+        f"p95={result['p95_ms']:8.2f}ms  p99={result['p99_ms']:8.2f}ms  errors={result['errors']}"
+    )
+
+
+def _git_commit() -> dict:
+    def git(*command: str) -> str:
+        return subprocess.run(
+            ["git", *command], cwd=os.path.dirname(__file__), capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    try:
+        return {"commit": git("rev-parse", "--short", "HEAD") or None, "dirty": bool(git("status", "--porcelain"))}
+    except (OSError, subprocess.SubprocessError):
+        return {"commit": None, "dirty": None}
+
+
+def _compare(results: Dict[str, Dict[str, dict]], baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline_path} (commit {baseline['meta'].get('commit')})")
+    for target, scenarios in results.items():
+        for name, result in scenarios.items():
+            before = baseline["results"].get(target, {}).get(name)
+            if not before:
+                continue
+            p95 = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+            rps = (result["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] * 100
+            print(f"  {target:>8} {name:>14}  p95 {p95:+6.1f}%  throughput {rps:+6.1f}%")
+
+
+async def main(args) -> None:
+    setup_logging(level=args.log_level)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"unknown scenarios: {unknown} (choose from {list(SCENARIOS)})")
+
+    results = {}
+    for target in args.targets:
+        print(f"[{target}] folders={args.folders} docs/folder={args.docs_per_folder} "
+              f"concurrency={args.concurrency} requests={args.requests}")
+        results[target] = await TARGETS[target](args)
+
+    git = _git_commit()
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"endpoints-{datetime.now():%Y%m%d-%H%M%S}-{git['commit'] or 'nogit'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    report = {
+        "meta": {
+            **git,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "args": {key: value for key, value in vars(args).items() if key != "password"},
+        },
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nsaved {output}")
+
+    if args.baseline:
+        _compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="엔드포인트 벤치마크 (Postgres / in-memory Repository)")
+    parser.add_argument("--target", dest="targets", default="postgres,memory",
+                        type=lambda value: [t for t in value.split(",") if t], help="postgres, memory (쉼표로 여러 개)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        type=lambda value: [s for s in value.split(",") if s], help="실행할 시나리오 (쉼표로 구분)")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 요청 수")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 측정 요청 수")
+    parser.add_argument("--warmup", type=int, default=20, help="시나리오별 워밍업 요청 수 (측정 제외)")
+    parser.add_argument("--folders", type=int, default=20, help="만들 폴더 수")
+    parser.add_argument("--docs-per-folder", type=int, default=50, help="폴더당 문서 수")
+    parser.add_argument("--page-size", type=int, default=50, help="list_documents 페이지 크기")
+    parser.add_argument("--size-kb", type=int, default=64, help="업로드 파일 크기 (KB)")
+    parser.add_argument("--user-id", type=int, default=1, help="postgres: 데이터셋을 만들 사용자 ID")
+    parser.add_argument("--email", default="test1@naver.com", help="login 시나리오 이메일")
+    parser.add_argument("--password", default="0000", help="login 시나리오 비밀번호")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--log-level", default="WARNING", help="앱 로그 레벨 (기본 WARNING, 측정 중 출력 최소화)")
+    asyncio.run(main(parser.parse_args()))
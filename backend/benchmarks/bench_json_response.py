@@ -0,0 +1,111 @@
+"""
+JSON Response Benchmark
+폴더 목록 / 문서 목록 응답 직렬화 시간(p50 / p99)과 압축 비용 비교
+
+실행 (backend/ 에서, DB 필요 없음):
+    python -m benchmarks.bench_json_response
+    python -m benchmarks.bench_json_response --sizes 50 200 1000 --summary-chars 1500 --rounds 200
+
+- stdlib:  jsonable_encoder + json.dumps (response_model 없는 라우트의 FastAPI 기본 경로)
+- pydantic: TypeAdapter.dump_json (response_model 있는 라우트의 FastAPI 기본 경로)
+- fast:    api.responses.dumps (FastJSONRoute가 쓰는 orjson 경로)
+- gzip / br: fast 결과를 CompressionMiddleware 설정값으로 압축 (br은 brotli 설치 시)
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from api import compression
+from api.responses import dumps
+from dto.document_dto import DocumentDTO, DocumentListDTO
+from dto.folder_dto import FolderDTO, FolderListDTO
+
+_WORDS = ["요약", "학습", "데이터베이스", "인덱스", "트랜잭션", "summary", "index", "query", "PDF", "문서"]
+
+
+def _documents(count: int, summary_chars: int) -> DocumentListDTO:
+    rng = random.Random(count)
+    base = datetime(2026, 1, 1)
+    docs = []
+    for i in range(count):
+        summary = " ".join(rng.choice(_WORDS) for _ in range(summary_chars // 4))[:summary_chars]
+        docs.append(DocumentDTO(
+            doc_id=i + 1,
+            user_id=1,
+            folder_id=1,
+            filename=f"lecture_{i:05d}.pdf",
+            storage_path=f"pdf_files/blobs/ab/cd/{i:064x}",
+            summary_text=summary,
+            file_size=rng.randint(100_000, 20_000_000),
+            content_hash=f"{i:064x}",
+            created_at=base + timedelta(minutes=i)
+        ))
+    return DocumentListDTO(documents=docs, total=count)
+
+
+def _folders(count: int) -> FolderListDTO:
+    base = datetime(2026, 1, 1)
+    folders = [
+        FolderDTO(
+            folder_id=i + 1,
+            user_id=1,
+            folder_name=f"폴더 {i}",
+            created_at=base + timedelta(minutes=i),
+            document_count=i % 50,
+            total_bytes=i * 1_000_000
+        )
+        for i in range(count)
+    ]
+    return FolderListDTO(folders=folders, total=count)
+
+
+def _percentiles(func, rounds: int) -> tuple:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    return statistics.median(timings), p99
+
+
+def _run(label: str, payload, rounds: int) -> None:
+    adapter = TypeAdapter(type(payload))
+    body = dumps(payload)
+    assert body == adapter.dump_json(payload), "fast 경로 결과가 pydantic과 다름"
+
+    cases = [
+        ("stdlib", lambda: json.dumps(jsonable_encoder(payload), ensure_ascii=False).encode("utf-8")),
+        ("pydantic", lambda: adapter.dump_json(payload)),
+        ("fast", lambda: dumps(payload)),
+    ]
+    for encoding in compression.enabled_encodings():
+        cases.append((encoding, lambda encoding=encoding: compression._compress(encoding, body)))
+
+    print(f"{label}  body={len(body) / 1024:.1f}KB")
+    for name, func in cases:
+        p50, p99 = _percentiles(func, rounds)
+        size = f"  size={len(func()) / 1024:.1f}KB" if name in ("gzip", "br") else ""
+        print(f"    {name:>8}  p50={p50:8.3f}ms  p99={p99:8.3f}ms{size}")
+
+
+def main(args) -> None:
+    for size in args.sizes:
+        _run(f"documents={size}", _documents(size, args.summary_chars), args.rounds)
+    for size in args.sizes:
+        _run(f"folders={size}", _folders(size), args.rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSON 응답 직렬화 / 압축 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000], help="목록 길이")
+    parser.add_argument("--summary-chars", type=int, default=1500, help="문서 summary_text 길이")
+    parser.add_argument("--rounds", type=int, default=100, help="반복 횟수")
+    main(parser.parse_args())
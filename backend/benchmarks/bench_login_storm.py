@@ -0,0 +1,176 @@
+"""
+Login Storm Benchmark
+틀린 비밀번호 로그인 폭주(credential stuffing) 중에 문서 목록 조회 지연이 얼마나 늘어나는지 측정
+
+실행 (backend/ 에서):
+    python -m benchmarks.bench_login_storm
+    python -m benchmarks.bench_login_storm --target memory --storm-rps 500 --storm-ips 20
+    PASSWORD_VERIFY=db python -m benchmarks.bench_login_storm   # 예전 방식 (DB crypt(), pgcrypto 필요)
+
+단계
+- idle:          목록 조회만
+- storm:         목록 조회 + 로그인 폭주 (시도 횟수 제한 끔 → 해시 풀 대기열 상한 / 503만으로 버팀)
+- storm+limit:   목록 조회 + 로그인 폭주 (시도 횟수 제한 켬, 폭주는 --storm-ips 개 IP에서 옴)
+
+폭주는 있는 계정들에 틀린 비밀번호를 돌아가며 보냄 (없는 이메일은 해시 비교 없이 끝나므로)
+두 폭주 단계의 부하가 같도록 응답을 기다리지 않고 --storm-rps 속도로 보냄 (open loop)
+
+대상 (--target)
+- postgres: .env 의 DB, --folder-id 폴더 목록 조회 (폴더 / 문서가 있어야 함), 폭주 대상은 --email 계정
+- memory:   benchmarks.in_memory_repositories (DB 없이, 해시 비교 비용만), 폭주 대상 계정 --storm-accounts 개
+
+결과: 단계별 목록 조회 p50 / p95 / p99, 로그인 응답 코드 분포, 해시 대기열 최대 길이
+"""
+import argparse
+import asyncio
+import os
+import time
+from collections import Counter
+from typing import List
+
+import httpx
+
+from main import app
+from api.v1 import dependencies
+from app_logging import setup_logging
+from benchmarks.in_memory_repositories import InMemoryStore, install, uninstall
+from repositories.connection_pool import open_async_pool, close_async_pool
+from services import login_throttle
+from services.password_hasher import hasher_stats, start_password_hasher, shutdown_password_hasher
+
+API = "/api/v1"
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _list_documents(client: httpx.AsyncClient, args, folder_id: int) -> List[float]:
+    """목록 조회 --requests 번 (--concurrency 개 워커), 지연 시간(ms) 목록"""
+    latencies: List[float] = []
+    remaining = iter(range(args.requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            r = await client.get(f"{API}/documents/folder/{folder_id}", params={"limit": args.page_size})
+            latencies.append((time.perf_counter() - start) * 1000)
+            r.raise_for_status()
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return latencies
+
+
+async def _storm(client: httpx.AsyncClient, args, emails: List[str], stop: asyncio.Event, codes: Counter) -> None:
+    """stop이 설정될 때까지 계정을 돌아가며 틀린 비밀번호 로그인 (응답을 기다리지 않고 --storm-rps 속도로)"""
+    pending = set()
+
+    async def attempt(i: int) -> None:
+        r = await client.post(
+            f"{API}/auth/login",
+            json={"email": emails[i % len(emails)], "password": "wrong-password"},
+            headers={"X-Forwarded-For": f"10.0.{i % args.storm_ips // 256}.{i % args.storm_ips % 256}"}
+        )
+        codes[r.status_code] += 1
+
+    i = 0
+    next_send = time.perf_counter()
+    while not stop.is_set():
+        task = asyncio.create_task(attempt(i))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        i += 1
+        next_send += 1 / args.storm_rps
+        await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+    await asyncio.gather(*pending)
+
+
+async def _sample_queue(stop: asyncio.Event, peak: dict) -> None:
+    while not stop.is_set():
+        stats = hasher_stats()
+        peak["queued"] = max(peak["queued"], stats["queued"])
+        peak["running"] = max(peak["running"], stats["running"])
+        await asyncio.sleep(0.01)
+
+
+async def _phase(
+    client: httpx.AsyncClient, args, folder_id: int, emails: List[str], name: str, storm: bool, limit: bool
+) -> None:
+    login_throttle.LOGIN_THROTTLE_ENABLED = limit
+    login_throttle.login_throttle.reset()
+    stop = asyncio.Event()
+    codes: Counter = Counter()
+    peak = {"queued": 0, "running": 0}
+    background = [asyncio.create_task(_sample_queue(stop, peak))]
+    if storm:
+        background.append(asyncio.create_task(_storm(client, args, emails, stop, codes)))
+        await asyncio.sleep(args.storm_lead)
+
+    started = time.perf_counter()
+    latencies = await _list_documents(client, args, folder_id)
+    wall = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*background)
+
+    print(
+        f"  {name:>12}  list p50={_percentile(latencies, 50):8.2f}ms p95={_percentile(latencies, 95):8.2f}ms "
+        f"p99={_percentile(latencies, 99):8.2f}ms  {args.requests / wall:7.1f} req/s  "
+        f"logins={dict(sorted(codes.items()))}  hash peak queued={peak['queued']} running={peak['running']}"
+    )
+
+
+async def main(args) -> None:
+    setup_logging(level=args.log_level)
+    # 폭주는 X-Forwarded-For로 IP를 나눠서 보냄
+    dependencies.CLIENT_IP_HEADER = "x-forwarded-for"
+    start_password_hasher()
+
+    folder_id = args.folder_id
+    emails = [args.email]
+    if args.target == "memory":
+        store = InMemoryStore()
+        emails = [f"storm{i}@example.com" for i in range(args.storm_accounts)]
+        user_id = store.add_user(emails[0], "0000")
+        for email in emails[1:]:
+            store.add_user(email, "0000")
+        folder_ids, _ = store.seed(user_id, 1, args.page_size)
+        folder_id = folder_ids[0]
+        install(app, store)
+    else:
+        await open_async_pool()
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _list_documents(client, argparse.Namespace(**{**vars(args), "requests": args.warmup}), folder_id)
+            print(f"[{args.target}] {hasher_stats()['mode']} verify, hash workers={hasher_stats()['workers']} "
+                  f"storm {args.storm_rps:g} req/s ips={args.storm_ips}")
+            await _phase(client, args, folder_id, emails, "idle", storm=False, limit=False)
+            await _phase(client, args, folder_id, emails, "storm", storm=True, limit=False)
+            await _phase(client, args, folder_id, emails, "storm+limit", storm=True, limit=True)
+    finally:
+        if args.target == "memory":
+            uninstall(app)
+        else:
+            await close_async_pool()
+        shutdown_password_hasher()
+    print(f"  hash stats: {hasher_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로그인 폭주 중 목록 조회 지연 벤치마크")
+    parser.add_argument("--target", choices=("postgres", "memory"), default="postgres")
+    parser.add_argument("--folder-id", type=int, default=1, help="postgres: 목록을 조회할 폴더 ID")
+    parser.add_argument("--email", default=os.getenv("BENCH_EMAIL", "test1@naver.com"), help="postgres: 폭주 대상 계정")
+    parser.add_argument("--storm-accounts", type=int, default=20, help="memory: 폭주 대상 계정 수")
+    parser.add_argument("--requests", type=int, default=500, help="단계별 목록 조회 요청 수")
+    parser.add_argument("--warmup", type=int, default=50, help="워밍업 목록 조회 요청 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="목록 조회 동시 요청 수")
+    parser.add_argument("--page-size", type=int, default=50, help="목록 페이지 크기")
+    parser.add_argument("--storm-rps", type=float, default=200, help="초당 로그인 시도 수")
+    parser.add_argument("--storm-ips", type=int, default=1, help="로그인 폭주가 나오는 IP 수")
+    parser.add_argument("--storm-lead", type=float, default=0.5, help="목록 측정 전에 폭주를 먼저 보내는 시간 (초)")
+    parser.add_argument("--log-level", default="WARNING")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,90 @@
+"""
+Metrics Overhead Benchmark
+MetricsMiddleware가 요청 1건에 더하는 비용 측정
+
+실행 (backend/ 에서, DB 필요 없음):
+    python -m benchmarks.bench_metrics
+    python -m benchmarks.bench_metrics --requests 20000 --rounds 5
+    # 여러 워커(multiprocess, mmap 파일 기록) 모드 비용
+    PROMETHEUS_MULTIPROC_DIR=$(mktemp -d) python -m benchmarks.bench_metrics
+
+- 라우트 1개짜리 FastAPI 앱을 ASGI로 직접 호출 (네트워크 / httpx 비용 제외)
+- 미들웨어 없음 vs 있음의 요청당 시간 차이 = 계측 오버헤드
+- /metrics 렌더링 시간도 함께 출력
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+
+from api.metrics import MULTIPROCESS, MetricsMiddleware, render_metrics
+
+
+def _make_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"item_id": item_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def _call(app, path: str) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def _per_request_us(app, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        await _call(app, f"/items/{i % 100}")
+    return (time.perf_counter() - start) / count * 1e6
+
+
+async def main(args) -> None:
+    apps = {with_metrics: _make_app(with_metrics) for with_metrics in (False, True)}
+    timings = {False: [], True: []}
+    for app in apps.values():
+        await _per_request_us(app, 500)  # 워밍업
+    # 번갈아 실행해서 CPU 상태 차이가 한쪽에만 몰리지 않게 함
+    for _ in range(args.rounds):
+        for with_metrics, app in apps.items():
+            timings[with_metrics].append(await _per_request_us(app, args.requests))
+
+    results = {}
+    for with_metrics, values in timings.items():
+        results[with_metrics] = statistics.median(values)
+        print(f"metrics={'on ' if with_metrics else 'off'}  per request={results[with_metrics]:7.2f}us")
+
+    render = []
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        render_metrics()
+        render.append((time.perf_counter() - start) * 1000)
+
+    print(f"mode={'multiprocess' if MULTIPROCESS else 'single-process'}")
+    print(f"overhead per request: {results[True] - results[False]:+.2f}us")
+    print(f"/metrics render: {statistics.median(render):.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="요청 메트릭 미들웨어 오버헤드 벤치마크")
+    parser.add_argument("--requests", type=int, default=10000, help="라운드당 요청 수")
+    parser.add_argument("--rounds", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    asyncio.run(main(parser.parse_args()))
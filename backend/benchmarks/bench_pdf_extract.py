@@ -0,0 +1,125 @@
+"""
+PDF Extract Benchmark
+수집 워커의 페이지 추출 처리량 (페이지/초) 측정
+
+실행 (backend/ 에서, DB 필요 없음):
+    python -m benchmarks.bench_pdf_extract
+    python -m benchmarks.bench_pdf_extract --workers 1,2,4 --pages-per-task 4,8,16
+    python -m benchmarks.bench_pdf_extract --repeat 20      # 샘플 페이지를 20번 반복한 교재 크기 PDF
+
+- 입력: --pdf (기본: pdf_files/ 아래 첫 번째 PDF)
+  --repeat N 이면 샘플 페이지를 N번 이어 붙인 임시 PDF를 만들어서 측정 (수백 페이지 교재 흉내)
+- 추출은 앱과 같은 PageExtractor (spawn 프로세스 풀 + 페이지 범위 분할 + 순서대로 받기)
+- 작업자 수 × 범위 크기 × 라이브러리(pymupdf / pypdf, 설치된 것만) 조합마다
+  프로세스 시작을 뺀 추출 시간과 페이지/초, 처음 범위가 나올 때까지의 시간 출력
+"""
+import argparse
+import asyncio
+import glob
+import os
+import tempfile
+import time
+
+from services import pdf_extractor
+from services.ingestion_service import PageExtractor
+
+
+def _find_sample() -> str:
+    paths = sorted(glob.glob(os.path.join("pdf_files", "**", "*.pdf"), recursive=True))
+    if not paths:
+        raise SystemExit("pdf_files/ 아래에 PDF가 없습니다 (--pdf로 지정)")
+    return paths[0]
+
+
+def _build_repeated(path: str, repeat: int) -> str:
+    """샘플 PDF 페이지를 repeat번 이어 붙인 임시 PDF 경로"""
+    fd, out = tempfile.mkstemp(suffix=".pdf", prefix="bench_extract_")
+    os.close(fd)
+    if pdf_extractor.pymupdf is not None:
+        src = pdf_extractor.pymupdf.open(path)
+        dst = pdf_extractor.pymupdf.open()
+        for _ in range(repeat):
+            dst.insert_pdf(src)
+        dst.save(out)
+        dst.close()
+        src.close()
+    elif pdf_extractor.pypdf is not None:
+        reader = pdf_extractor.pypdf.PdfReader(path)
+        writer = pdf_extractor.pypdf.PdfWriter()
+        for _ in range(repeat):
+            for page in reader.pages:
+                writer.add_page(page)
+        with open(out, "wb") as f:
+            writer.write(f)
+    else:
+        raise SystemExit("pymupdf 또는 pypdf가 필요합니다")
+    return out
+
+
+def _backends(choice: str) -> list:
+    installed = [name for name, module in (("pymupdf", pdf_extractor.pymupdf), ("pypdf", pdf_extractor.pypdf)) if module]
+    return installed if choice == "all" else [b for b in installed if b == choice]
+
+
+async def _run(path: str, backend: str, workers: int, pages_per_task: int) -> dict:
+    # 작업자 프로세스는 spawn 시점의 환경변수로 라이브러리를 고름
+    os.environ["PDF_EXTRACT_BACKEND"] = backend
+    pdf_extractor.PDF_EXTRACT_BACKEND = backend
+    extractor = PageExtractor(workers, pages_per_task)
+    try:
+        # 프로세스 시작 + 문서 열기는 측정에서 뺌 (앱에서는 한 번만 일어남)
+        total = await extractor.page_count(path)
+        await asyncio.gather(*(extractor.page_count(path) for _ in range(workers * 2)))
+
+        started = time.perf_counter()
+        first_batch = None
+        pages = 0
+        chars = 0
+        async for batch in extractor.iter_pages(path, total):
+            if first_batch is None:
+                first_batch = time.perf_counter() - started
+            pages += len(batch)
+            chars += sum(len(text) for _, text in batch)
+        elapsed = time.perf_counter() - started
+    finally:
+        extractor.shutdown()
+    return {
+        "pages": pages, "chars": chars, "elapsed": elapsed,
+        "pages_per_sec": pages / elapsed, "first_ms": (first_batch or 0) * 1000,
+    }
+
+
+async def main(args) -> None:
+    path = args.pdf or _find_sample()
+    built = None
+    if args.repeat > 1:
+        built = path = _build_repeated(path, args.repeat)
+    backends = _backends(args.backend)
+    if not backends:
+        raise SystemExit(f"추출 라이브러리가 없습니다: {args.backend}")
+
+    try:
+        print(f"PDF: {path} (cpu={os.cpu_count()})")
+        for backend in backends:
+            for workers in (int(w) for w in args.workers.split(",")):
+                for pages_per_task in (int(p) for p in args.pages_per_task.split(",")):
+                    result = await _run(path, backend, workers, pages_per_task)
+                    print(
+                        f"  {backend:>7}  workers={workers:<2} pages/task={pages_per_task:<3} "
+                        f"pages={result['pages']:<5} chars={result['chars']:<9} "
+                        f"{result['elapsed'] * 1000:9.1f}ms  {result['pages_per_sec']:8.1f} pages/s  "
+                        f"first batch {result['first_ms']:7.1f}ms"
+                    )
+    finally:
+        if built:
+            os.remove(built)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PDF 페이지 추출 처리량 벤치마크")
+    parser.add_argument("--pdf", help="측정할 PDF (기본: pdf_files/ 아래 첫 번째 PDF)")
+    parser.add_argument("--repeat", type=int, default=1, help="샘플 페이지를 반복해서 만든 PDF로 측정")
+    parser.add_argument("--backend", choices=("all", "pymupdf", "pypdf"), default="all")
+    parser.add_argument("--workers", default="1,2", help="작업자 프로세스 수 (쉼표로 여러 개)")
+    parser.add_argument("--pages-per-task", default="8", help="작업 1개로 추출할 페이지 수 (쉼표로 여러 개)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,62 @@
+"""
+Query Stats Overhead Benchmark
+쿼리 계측(repositories.query_stats)을 켰을 때 / 껐을 때 쿼리 1회당 비용 비교
+
+실행 (backend/ 에서, .env 의 DB_* 사용):
+    python -m benchmarks.bench_query_stats
+    python -m benchmarks.bench_query_stats --queries 20000 --rounds 5
+
+- 같은 커넥션으로 SELECT 1 을 반복 (DB 왕복 자체가 가장 짧은 쿼리라 계측 비용이 가장 크게 보임)
+- observe()만 따로 호출한 순수 CPU 비용도 출력
+"""
+import argparse
+import statistics
+import time
+
+from repositories import query_stats
+from repositories.base_repository import BaseRepository
+
+SELECT_ONE_SQL = "SELECT 1 AS one"
+
+
+def _run_queries(conn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        BaseRepository.execute_query(SELECT_ONE_SQL, None, conn)
+    return time.perf_counter() - start
+
+
+def _run_observe(count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        query_stats.observe(SELECT_ONE_SQL, (1, "x"), time.perf_counter(), 1)
+    return time.perf_counter() - start
+
+
+def main(args) -> None:
+    # 느린 쿼리 로그가 측정에 섞이지 않게 끔
+    query_stats.SLOW_QUERY_MS = 0
+    conn = BaseRepository.get_connection()
+    try:
+        _run_queries(conn, 200)  # 워밍업
+        results = {}
+        for enabled in (False, True):
+            query_stats.QUERY_STATS_ENABLED = enabled
+            timings = [_run_queries(conn, args.queries) for _ in range(args.rounds)]
+            results[enabled] = statistics.median(timings) / args.queries * 1e6
+            observe_us = statistics.median(_run_observe(args.queries) for _ in range(args.rounds)) / args.queries * 1e6
+            print(
+                f"stats={'on ' if enabled else 'off'}  per query={results[enabled]:7.2f}us  "
+                f"observe()={observe_us:6.3f}us"
+            )
+        conn.rollback()
+    finally:
+        conn.close()
+    print(f"overhead per query: {results[True] - results[False]:+.2f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="쿼리 계측 오버헤드 벤치마크")
+    parser.add_argument("--queries", type=int, default=10000, help="라운드당 쿼리 수")
+    parser.add_argument("--rounds", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    main(parser.parse_args())
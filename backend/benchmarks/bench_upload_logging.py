@@ -0,0 +1,100 @@
+"""
+Upload Logging Benchmark
+POST /documents/upload 요청 지연 시간을 로깅 끔 / 큐 로깅 / 직접 출력 로깅으로 비교
+
+실행 (backend/ 에서, .env 의 DB_* 사용):
+    python -m benchmarks.bench_upload_logging --user-id 1 --folder-id 1
+    python -m benchmarks.bench_upload_logging --uploads 200 --size-kb 64 --log-file /tmp/bench.log
+
+- off:    LOG_LEVEL=WARNING (업로드 경로의 INFO / DEBUG 로그는 레벨 검사에서 바로 반환)
+- queue:  LOG_LEVEL=DEBUG, 큐에 넣고 백그라운드 스레드가 JSON 출력 (앱 기본 설정)
+- direct: LOG_LEVEL=DEBUG, 요청 처리 중에 바로 JSON 출력 (큐 없음, 비교용)
+- 앱을 프로세스 안에서 ASGI로 직접 호출 (네트워크 제외)
+- 모드를 라운드마다 번갈아 실행, 요청별 지연 시간의 p50 / p95 / p99 출력
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+from main import app
+from services.token_service import TokenService
+from app_logging import setup_logging, shutdown_logging
+from repositories.connection_pool import open_pool, close_pool, open_async_pool, close_async_pool
+
+API = "/api/v1/documents"
+
+MODES = {
+    "off": {"level": "WARNING", "use_queue": True},
+    "queue": {"level": "DEBUG", "use_queue": True},
+    "direct": {"level": "DEBUG", "use_queue": False},
+}
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _upload_round(client: httpx.AsyncClient, args) -> list:
+    """업로드 N번, 요청별 지연 시간(ms) 반환 후 만든 문서 삭제"""
+    timings, doc_ids = [], []
+    for i in range(args.uploads):
+        data = b"%PDF-1.4\n" + os.urandom(args.size_kb * 1024)
+        start = time.perf_counter()
+        r = await client.post(
+            f"{API}/upload",
+            files={"file": (f"bench_{i}.pdf", data, "application/pdf")},
+            data={"user_id": args.user_id, "folder_id": args.folder_id}
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        r.raise_for_status()
+        doc_ids.append(r.json()["doc_id"])
+    for doc_id in doc_ids:
+        await client.delete(f"{API}/{doc_id}")
+    return timings
+
+
+async def main(args) -> None:
+    open_pool()
+    await open_async_pool()
+    transport = httpx.ASGITransport(app=app)
+    timings = {mode: [] for mode in MODES}
+    try:
+        with open(args.log_file, "a") as log_stream:
+            # 라우트는 토큰이 필요하므로 --user-id 사용자의 access 토큰을 직접 발급해서 보냄
+            token = TokenService().issue(args.user_id, "bench@example.com").access_token
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}) as client:
+                # 워밍업 (풀 커넥션 생성)
+                setup_logging(level="WARNING", stream=log_stream)
+                await _upload_round(client, argparse.Namespace(**{**vars(args), "uploads": 5}))
+
+                for _ in range(args.rounds):
+                    for mode, options in MODES.items():
+                        setup_logging(fmt="json", stream=log_stream, **options)
+                        timings[mode].extend(await _upload_round(client, args))
+            shutdown_logging()
+    finally:
+        await close_async_pool()
+        close_pool()
+
+    print(f"uploads={args.uploads} x rounds={args.rounds}  size={args.size_kb}KB  log_file={args.log_file}")
+    for mode, values in timings.items():
+        print(
+            f"{mode:>6}  p50={_percentile(values, 50):7.2f}ms  p95={_percentile(values, 95):7.2f}ms  "
+            f"p99={_percentile(values, 99):7.2f}ms  mean={statistics.fmean(values):7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="업로드 지연 시간: 로깅 끔 vs 큐 로깅 vs 직접 출력")
+    parser.add_argument("--user-id", type=int, default=1, help="업로드할 사용자 ID")
+    parser.add_argument("--folder-id", type=int, default=1, help="업로드할 폴더 ID")
+    parser.add_argument("--uploads", type=int, default=100, help="라운드당 업로드 수")
+    parser.add_argument("--size-kb", type=int, default=64, help="파일 1개 크기 (KB)")
+    parser.add_argument("--rounds", type=int, default=3, help="반복 횟수 (모드를 번갈아 실행)")
+    parser.add_argument("--log-file", default=os.devnull, help="로그 출력 파일 (기본: 버림)")
+    asyncio.run(main(parser.parse_args()))
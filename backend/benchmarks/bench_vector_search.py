@@ -0,0 +1,270 @@
+"""
+Vector Search Benchmark
+GET /api/v1/search 검색 경로(services.search_service)의 recall@k / 지연 (청크 수별)
+
+실행 (backend/ 에서, .env 의 DB_* 사용):
+    python -m benchmarks.bench_vector_search
+    python -m benchmarks.bench_vector_search --sizes 100000 --queries 100 --ef-sweep 20,40,100,200
+    python -m benchmarks.bench_vector_search --sizes 1000000 --keep   # 다음 실행에서 데이터 / 인덱스 재사용
+    (큰 범위 exact 검색마다 느린 쿼리 로그가 남으므로 SLOW_QUERY_MS=0 으로 끄고 실행)
+
+데이터
+- 크기마다 별도 스키마 bench_vector_<청크 수>에 documents / document_ingestion / document_chunks를
+  public 테이블과 같은 컬럼으로 만들고, 접속 옵션 search_path로 그 스키마를 먼저 보게 해서
+  서비스 / Repository 코드는 그대로 사용 (public 데이터는 건드리지 않음)
+- 사용자: --large-users명이 각각 전체의 --large-share 비율 (SEARCH_EXACT_MAX_CHUNKS보다 크면 ann 경로),
+  나머지는 --user-chunks개씩 가진 작은 사용자 (exact 경로), 문서 1개 = --doc-chunks개 청크
+- 청크 텍스트는 사용자마다 고른 주제 단어 + 공통 단어, 임베딩은 로컬 해시 임베더 (EMBEDDING_DIM차원)
+- 청크는 ChunkRepository.copy_many(COPY BINARY)로 넣은 뒤 public과 같은 정의로 인덱스를 만들고
+  HNSW 생성 시간 / 크기를 출력 (--maintenance-work-mem, 그래프가 메모리에 들어가야 빠름)
+
+측정
+- 범위: small-user / large-user / document (큰 사용자의 문서 1개)
+- 질문마다 strategy=exact 결과를 정답으로 두고
+  exact / auto / ann(ef_search 하한을 --ef-sweep 값으로) 의 recall@k, 평균 ef_search, p50 / p99 지연
+- 지연은 요청 1개와 같은 단위 (Unit of Work 열기 + 범위 조회 + 검색), 질문 임베딩은 제외
+- 끝나면 스키마 삭제 (--keep이면 남김)
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from typing import List
+
+from repositories.base_repository import BaseRepository
+from repositories.chunk_repository import ChunkRepository
+from repositories.connection_pool import open_pool, close_pool, open_async_pool, close_async_pool
+from repositories.unit_of_work import AsyncUnitOfWork
+from services.embedding_backends import EMBEDDING_DIM, hash_embedding
+from services.search_service import AsyncSearchService, SEARCH_EXACT_MAX_CHUNKS
+
+_COMMON = [f"common{i}" for i in range(400)]
+
+
+def _topic_words(topic: int) -> List[str]:
+    return [f"t{topic}w{i}" for i in range(40)]
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# ==========================
+# 데이터
+# ==========================
+def _layout(size: int, args) -> List[dict]:
+    """사용자 목록 [{user_id, docs: [doc_id], topics, large}] (크기와 인자로 정해지는 결정적 배치)"""
+    rng = random.Random(size)
+    users = []
+    doc_id = 1
+    large_chunks = int(size * args.large_share)
+    remaining = size - large_chunks * args.large_users
+    plan = [large_chunks] * args.large_users + [args.user_chunks] * (remaining // args.user_chunks)
+    for user_id, chunks in enumerate(plan, start=1):
+        docs = list(range(doc_id, doc_id + chunks // args.doc_chunks))
+        doc_id += len(docs)
+        users.append({
+            "user_id": user_id,
+            "docs": docs,
+            "topics": rng.sample(range(args.topics), 8 if chunks > args.user_chunks else 3),
+            "large": chunks > args.user_chunks,
+        })
+    return users
+
+
+def _chunk_text(rng: random.Random, topics: List[int]) -> str:
+    words = _topic_words(rng.choice(topics))
+    return " ".join([rng.choice(words) for _ in range(60)] + [rng.choice(_COMMON) for _ in range(20)])
+
+
+def _schema_ready(schema: str, size: int, conn) -> bool:
+    rows = BaseRepository.execute_query(
+        "SELECT to_regclass(%s) IS NOT NULL AS ready", (f"{schema}.idx_chunks_embedding_hnsw",), conn
+    )
+    if not rows[0]["ready"]:
+        return False
+    rows = BaseRepository.execute_query(f"SELECT COUNT(*) AS count FROM {schema}.document_chunks", None, conn)
+    conn.commit()
+    return rows[0]["count"] == size
+
+
+def load(schema: str, size: int, users: List[dict], args) -> None:
+    conn = BaseRepository.get_connection()
+    try:
+        if args.keep and _schema_ready(schema, size, conn):
+            print(f"  reuse {schema}")
+            return
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+            cursor.execute(f"CREATE SCHEMA {schema}")
+            # 외래 키 / 기본값(public 시퀀스) 없이 컬럼만, chunk_id는 COPY가 채우도록 identity
+            cursor.execute(f"CREATE TABLE {schema}.documents (LIKE public.documents)")
+            cursor.execute(f"CREATE TABLE {schema}.document_ingestion (LIKE public.document_ingestion INCLUDING DEFAULTS)")
+            cursor.execute(f"CREATE TABLE {schema}.document_chunks (LIKE public.document_chunks)")
+            cursor.execute(f"ALTER TABLE {schema}.document_chunks ALTER COLUMN chunk_id ADD GENERATED BY DEFAULT AS IDENTITY")
+        conn.commit()
+
+        started = time.perf_counter()
+        rng = random.Random(size + 1)
+        with conn.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {schema}.documents (doc_id, user_id, folder_id, filename, storage_path, file_size) "
+                f"VALUES (%s, %s, NULL, %s, %s, 0)",
+                [(doc, user["user_id"], f"doc{doc}.pdf", f"bench/{doc}") for user in users for doc in user["docs"]]
+            )
+            cursor.executemany(
+                f"INSERT INTO {schema}.document_ingestion (doc_id, status, chunks) VALUES (%s, 'done', %s)",
+                [(doc, args.doc_chunks) for user in users for doc in user["docs"]]
+            )
+        conn.commit()
+        written = 0
+        for user in users:
+            for doc in user["docs"]:
+                rows = [(i // 2 + 1, _chunk_text(rng, user["topics"])) for i in range(args.doc_chunks)]
+                vectors = [hash_embedding(text, EMBEDDING_DIM) for _, text in rows]
+                written += ChunkRepository.copy_many(doc, rows, vectors, conn=conn)
+            conn.commit()
+        loaded = time.perf_counter() - started
+        print(f"  load      {written} chunks in {loaded:7.1f}s ({written / loaded:8.1f} chunks/s, embedding 포함)")
+
+        # public과 같은 인덱스 (HNSW 포함)를 데이터를 넣은 뒤 한 번에 생성
+        indexes = BaseRepository.execute_query(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = 'public' "
+            "AND tablename IN ('documents', 'document_ingestion', 'document_chunks')",
+            None, conn
+        )
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT set_config('maintenance_work_mem', %s, false)", (args.maintenance_work_mem,))
+            for index in indexes:
+                definition = index["indexdef"].replace(" ON public.", f" ON {schema}.")
+                started = time.perf_counter()
+                cursor.execute(definition)
+                conn.commit()
+                if "hnsw" in definition:
+                    cursor.execute("SELECT pg_relation_size(%s) AS size", (f"{schema}.{index['indexname']}",))
+                    print(
+                        f"  index     {index['indexname']} built in {time.perf_counter() - started:7.1f}s "
+                        f"size={cursor.fetchone()['size'] / 1e6:.0f} MB maintenance_work_mem={args.maintenance_work_mem}"
+                    )
+            cursor.execute(f"ANALYZE {schema}.documents")
+            cursor.execute(f"ANALYZE {schema}.document_ingestion")
+            cursor.execute(f"ANALYZE {schema}.document_chunks")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def drop(schema: str) -> None:
+    conn = BaseRepository.get_connection()
+    try:
+        BaseRepository.execute_update(f"DROP SCHEMA IF EXISTS {schema} CASCADE", None, conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# ==========================
+# 검색
+# ==========================
+async def _search(scope: dict, vector, k: int, strategy: str, ef_search=None):
+    started = time.perf_counter()
+    async with AsyncUnitOfWork("bench_search") as uow:
+        result = await AsyncSearchService(uow).search_by_vector(
+            scope["user_id"], vector, k=k, doc_id=scope.get("doc_id"), strategy=strategy, ef_search=ef_search
+        )
+    return result, time.perf_counter() - started
+
+
+async def bench_scope(label: str, scopes: List[dict], args) -> None:
+    rng = random.Random(len(scopes))
+    queries = []
+    for i in range(args.queries):
+        scope = scopes[i % len(scopes)]
+        words = _topic_words(rng.choice(scope["topics"]))
+        queries.append((scope, hash_embedding(" ".join(rng.choice(words) for _ in range(12)), EMBEDDING_DIM)))
+
+    # 정답 (exact, 캐시 예열 겸)
+    truth = []
+    for scope, vector in queries:
+        result, _ = await _search(scope, vector, args.k, "exact")
+        truth.append({hit.chunk_id for hit in result.hits})
+    scope_chunks = result.scope_chunks
+
+    modes = [("exact", "exact", None), ("auto", "auto", None)]
+    modes += [(f"ann ef>={ef}", "ann", ef) for ef in map(int, args.ef_sweep.split(","))]
+    print(f"  [{label}] scopes={len(scopes)} scope_chunks~{scope_chunks} queries={len(queries)} k={args.k}")
+    for name, strategy, ef_search in modes:
+        timings, recalls, efs, used = [], [], [], {}
+        for (scope, vector), expected in zip(queries, truth):
+            result, elapsed = await _search(scope, vector, args.k, strategy, ef_search)
+            timings.append(elapsed)
+            found = {hit.chunk_id for hit in result.hits}
+            recalls.append(len(found & expected) / len(expected) if expected else 1.0)
+            used[result.strategy] = used.get(result.strategy, 0) + 1
+            if result.ef_search:
+                efs.append(result.ef_search)
+        print(
+            f"    {name:<14} recall@{args.k}={sum(recalls) / len(recalls):6.4f}  "
+            f"p50={_percentile(timings, 0.5) * 1000:8.2f}ms p99={_percentile(timings, 0.99) * 1000:8.2f}ms  "
+            f"ef={round(sum(efs) / len(efs)) if efs else '-':<5} used={used}"
+        )
+
+
+async def bench_search(users: List[dict], args) -> None:
+    large = [user for user in users if user["large"]]
+    small = [user for user in users if not user["large"]]
+    documents = [
+        {"user_id": user["user_id"], "doc_id": doc, "topics": user["topics"]}
+        for user in large for doc in user["docs"][:50]
+    ]
+    await open_async_pool()
+    try:
+        if small:
+            await bench_scope("small-user", small, args)
+        if large:
+            await bench_scope("large-user", large, args)
+            await bench_scope("document", documents, args)
+    finally:
+        await close_async_pool()
+
+
+def run(size: int, args) -> None:
+    schema = f"bench_vector_{size}"
+    users = _layout(size, args)
+    print(
+        f"[size={size}] schema={schema} dim={EMBEDDING_DIM} users={len(users)} "
+        f"(large={sum(u['large'] for u in users)} × {int(size * args.large_share)} chunks) "
+        f"exact_max={SEARCH_EXACT_MAX_CHUNKS}"
+    )
+    # 이 크기의 스키마를 먼저 보도록 접속 옵션 지정 (풀을 열기 전에)
+    os.environ["PGOPTIONS"] = f"-c search_path={schema},public"
+    open_pool()
+    try:
+        load(schema, size, users, args)
+        asyncio.run(bench_search(users, args))
+        if not args.keep:
+            drop(schema)
+    finally:
+        close_pool()
+        os.environ.pop("PGOPTIONS", None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벡터 검색 recall@k / 지연 벤치마크")
+    parser.add_argument("--sizes", default="100000,1000000", help="전체 청크 수 목록")
+    parser.add_argument("--large-users", type=int, default=2)
+    parser.add_argument("--large-share", type=float, default=0.25, help="큰 사용자 1명의 청크 비율")
+    parser.add_argument("--user-chunks", type=int, default=500, help="작은 사용자 1명의 청크 수")
+    parser.add_argument("--doc-chunks", type=int, default=50, help="문서 1개의 청크 수")
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200, help="범위마다 질문 수")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--ef-sweep", default="20,40,100,200,400", help="ann 강제 시 ef_search 하한 목록")
+    parser.add_argument("--maintenance-work-mem", default="1GB", help="HNSW 생성 시 maintenance_work_mem")
+    parser.add_argument("--keep", action="store_true", help="스키마를 남기고, 있으면 다시 사용")
+    args = parser.parse_args()
+
+    for size in map(int, args.sizes.split(",")):
+        run(size, args)
@@ -0,0 +1,349 @@
+"""
+In-Memory Repositories
+벤치마크용 Folder / Documents / User / Blob / Ingestion Repository 대체 구현 (DB 없이 같은 서비스 / 라우터 경로 실행)
+
+- 메서드 이름 / 인자 / 반환 타입은 AsyncFolderRepository 등과 동일 (conn은 받기만 하고 무시)
+- 정렬 / 키셋 페이지 / 폴더 카운터 / blob 참조 수 규칙도 SQL과 동일하게 맞춤
+- install(app, store)로 FastAPI dependency_overrides에 등록하면
+  라우터 → 서비스 → (이 Repository) 경로로 실행되므로 DB 비용을 뺀 앱 자체 비용을 잴 수 있다
+- 이벤트 루프 한 스레드에서만 호출되므로 lock 없음
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Annotated, Dict, List, Optional, Tuple
+
+from fastapi import Depends, FastAPI
+
+from api.v1.auth import get_auth_service
+from api.v1.dependencies import get_unit_of_work
+from api.v1.documents import get_document_service
+from api.v1.folders import get_folder_service
+from dto.document_dto import DocumentDTO
+from dto.folder_dto import FolderDTO
+from dto.ingestion_dto import IngestionStatusDTO
+from dto.user_dto import UserDTO
+from repositories.base_repository import trusted_dto, trusted_dtos
+from repositories.unit_of_work import AsyncUnitOfWork
+from services.auth_service import AsyncAuthService
+from services.document_service import AsyncDocumentService
+from services.folder_service import AsyncFolderService
+from services.password_hasher import check_password, hash_password
+
+
+class InMemoryStore:
+    """테이블 대신 쓰는 dict 모음 (행은 SELECT 결과와 같은 키의 dict)"""
+
+    def __init__(self) -> None:
+        self.users: Dict[int, dict] = {}
+        self.folders: Dict[int, dict] = {}
+        self.documents: Dict[int, dict] = {}
+        self.blobs: Dict[str, dict] = {}
+        self.ingestion: Dict[int, dict] = {}
+        self.doc_ids_by_folder: Dict[Optional[int], set] = defaultdict(set)  # idx_documents_folder 역할
+        self._next_id = {"users": 1, "folders": 1, "documents": 1}
+
+    def next_id(self, table: str) -> int:
+        value = self._next_id[table]
+        self._next_id[table] = value + 1
+        return value
+
+    def add_user(self, email: str, password: str) -> int:
+        user_id = self.next_id("users")
+        self.users[user_id] = {
+            "user_id": user_id, "email": email, "password_hash": hash_password(password),
+            "created_at": datetime.now(),
+        }
+        return user_id
+
+    def seed(self, user_id: int, folders: int, docs_per_folder: int, file_size: int = 0) -> Tuple[List[int], List[int]]:
+        """폴더 / 문서 데이터셋 생성, (folder_ids, doc_ids) 반환"""
+        base = datetime.now() - timedelta(days=1)
+        folder_ids, doc_ids = [], []
+        for f in range(folders):
+            folder_id = self.next_id("folders")
+            self.folders[folder_id] = {
+                "folder_id": folder_id, "user_id": user_id, "folder_name": f"bench-folder-{f}",
+                "created_at": base + timedelta(seconds=f),
+                "document_count": docs_per_folder, "total_bytes": docs_per_folder * file_size,
+            }
+            folder_ids.append(folder_id)
+            for d in range(docs_per_folder):
+                doc_id = self.next_id("documents")
+                self.documents[doc_id] = {
+                    "doc_id": doc_id, "user_id": user_id, "folder_id": folder_id,
+                    "filename": f"bench-{f}-{d}.pdf", "storage_path": f"pdf_files/bench/{doc_id}.pdf",
+                    "summary_text": "", "file_size": file_size, "content_hash": None,
+                    "created_at": base + timedelta(seconds=f, microseconds=d),
+                }
+                self.doc_ids_by_folder[folder_id].add(doc_id)
+                doc_ids.append(doc_id)
+        return folder_ids, doc_ids
+
+
+def _newest_first(rows: List[dict], id_field: str) -> List[dict]:
+    return sorted(rows, key=lambda row: (row["created_at"], row[id_field]), reverse=True)
+
+
+def _after(rows: List[dict], after: Optional[tuple], id_field: str) -> List[dict]:
+    """키셋 조건 (created_at, id) < after"""
+    if after is None:
+        return rows
+    return [row for row in rows if (row["created_at"], row[id_field]) < tuple(after)]
+
+
+class InMemoryFolderRepository:
+    """AsyncFolderRepository 대체"""
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self.store = store
+
+    def _by_user(self, user_id: int) -> List[dict]:
+        return _newest_first([row for row in self.store.folders.values() if row["user_id"] == user_id], "folder_id")
+
+    async def find_all_by_user_id(self, user_id: int, conn=None) -> List[FolderDTO]:
+        return trusted_dtos(FolderDTO, [dict(row) for row in self._by_user(user_id)])
+
+    async def find_all_with_document_count_by_user_id(self, user_id: int, conn=None) -> Tuple[List[FolderDTO], int]:
+        rows = self._by_user(user_id)
+        return trusted_dtos(FolderDTO, [dict(row) for row in rows]), len(rows)
+
+    async def find_page_by_user_id(
+        self, user_id: int, limit: int, after: Optional[tuple] = None, conn=None
+    ) -> List[FolderDTO]:
+        rows = _after(self._by_user(user_id), after, "folder_id")[:limit]
+        return trusted_dtos(FolderDTO, [dict(row) for row in rows])
+
+    async def find_by_id(self, folder_id: int, conn=None) -> Optional[FolderDTO]:
+        row = self.store.folders.get(folder_id)
+        return trusted_dto(FolderDTO, dict(row)) if row else None
+
+    async def count_by_user_id(self, user_id: int, conn=None) -> int:
+        return sum(1 for row in self.store.folders.values() if row["user_id"] == user_id)
+
+    async def create_folder_by_user_id(self, user_id: int, folder_name: str, conn=None) -> FolderDTO:
+        folder_id = self.store.next_id("folders")
+        row = self.store.folders[folder_id] = {
+            "folder_id": folder_id, "user_id": user_id, "folder_name": folder_name,
+            "created_at": datetime.now(), "document_count": 0, "total_bytes": 0,
+        }
+        return trusted_dto(FolderDTO, dict(row))
+
+    async def rename_folder_by_id(self, folder_id: int, new_name: str, conn=None) -> Optional[FolderDTO]:
+        row = self.store.folders.get(folder_id)
+        if row is None:
+            return None
+        row["folder_name"] = new_name
+        return trusted_dto(FolderDTO, dict(row))
+
+    async def adjust_counters(self, folder_id: int, count_delta: int, bytes_delta: int, conn=None) -> bool:
+        row = self.store.folders.get(folder_id)
+        if row is None:
+            return False
+        row["document_count"] += count_delta
+        row["total_bytes"] += bytes_delta
+        return True
+
+    async def remove_folder_by_user_id(self, folder_id: int, conn=None) -> bool:
+        if self.store.folders.pop(folder_id, None) is None:
+            return False
+        # ON DELETE SET NULL
+        doc_ids = self.store.doc_ids_by_folder.pop(folder_id, set())
+        for doc_id in doc_ids:
+            self.store.documents[doc_id]["folder_id"] = None
+        self.store.doc_ids_by_folder[None] |= doc_ids
+        return True
+
+
+class InMemoryDocumentsRepository:
+    """AsyncDocumentsRepository 대체"""
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self.store = store
+
+    def _new_row(self, doc_data: dict) -> dict:
+        doc_id = self.store.next_id("documents")
+        row = self.store.documents[doc_id] = {
+            "doc_id": doc_id,
+            "user_id": doc_data["user_id"],
+            "folder_id": doc_data["folder_id"],
+            "filename": doc_data["filename"],
+            "storage_path": doc_data["storage_path"],
+            "summary_text": doc_data["summary_text"],
+            "file_size": doc_data.get("file_size", 0),
+            "content_hash": doc_data.get("content_hash"),
+            "created_at": datetime.now(),
+        }
+        self.store.doc_ids_by_folder[row["folder_id"]].add(doc_id)
+        return row
+
+    def _by_folder(self, folder_id: int) -> List[dict]:
+        documents = self.store.documents
+        return _newest_first([documents[doc_id] for doc_id in self.store.doc_ids_by_folder.get(folder_id, ())], "doc_id")
+
+    async def insert(self, doc_data: dict, conn=None) -> int:
+        return self._new_row(doc_data)["doc_id"]
+
+    async def insert_many(self, docs: List[dict], conn) -> List[DocumentDTO]:
+        return [trusted_dto(DocumentDTO, dict(self._new_row(doc_data))) for doc_data in docs]
+
+    async def find_by_doc_id(self, doc_id: int, conn=None) -> Optional[DocumentDTO]:
+        row = self.store.documents.get(doc_id)
+        return trusted_dto(DocumentDTO, dict(row)) if row else None
+
+    async def find_by_doc_id_for_update(self, doc_id: int, conn) -> Optional[DocumentDTO]:
+        return await self.find_by_doc_id(doc_id, conn)
+
+    async def find_all_by_folder_id(self, folder_id: int, conn=None) -> List[DocumentDTO]:
+        return trusted_dtos(DocumentDTO, [dict(row) for row in self._by_folder(folder_id)])
+
+    async def find_page_by_folder_id(
+        self, folder_id: int, limit: int, after: Optional[tuple] = None, conn=None
+    ) -> List[DocumentDTO]:
+        rows = _after(self._by_folder(folder_id), after, "doc_id")[:limit]
+        return trusted_dtos(DocumentDTO, [dict(row) for row in rows])
+
+    async def count_by_folder_id(self, folder_id: int, conn=None) -> int:
+        return len(self.store.doc_ids_by_folder.get(folder_id, ()))
+
+    async def delete_by_doc_id(self, doc_id: int, conn=None) -> Optional[DocumentDTO]:
+        row = self.store.documents.pop(doc_id, None)
+        if row is None:
+            return None
+        self.store.doc_ids_by_folder[row["folder_id"]].discard(doc_id)
+        return trusted_dto(DocumentDTO, dict(row))
+
+    async def update_filename(self, doc_id: int, new_filename: str, conn=None) -> bool:
+        if doc_id in self.store.documents:
+            self.store.documents[doc_id]["filename"] = new_filename
+        return True
+
+    async def update_folder(self, doc_id: int, new_folder_id: int, conn=None) -> Optional[Tuple[DocumentDTO, Optional[int]]]:
+        row = self.store.documents.get(doc_id)
+        if row is None:
+            return None
+        old_folder_id = row["folder_id"]
+        self.store.doc_ids_by_folder[old_folder_id].discard(doc_id)
+        self.store.doc_ids_by_folder[new_folder_id].add(doc_id)
+        row["folder_id"] = new_folder_id
+        return trusted_dto(DocumentDTO, dict(row)), old_folder_id
+
+
+class InMemoryUserRepository:
+    """AsyncUserRepository 대체 (해시 비교는 실제 로그인처럼 password_hasher 풀에서)"""
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self.store = store
+
+    async def find_by_email(self, email: str, conn=None) -> Optional[UserDTO]:
+        for row in self.store.users.values():
+            if row["email"] == email:
+                return UserDTO(**row)
+        return None
+
+    async def find_by_email_and_password(self, email: str, password: str, conn=None) -> Optional[UserDTO]:
+        user = await self.find_by_email(email)
+        return user if user and check_password(password, user.password_hash) else None
+
+
+class InMemoryBlobRepository:
+    """AsyncBlobRepository 대체 (참조 수가 0이 되어도 행은 남김, 삭제는 GC 몫)"""
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self.store = store
+
+    async def acquire(self, content_hash: str, file_size: int, conn=None) -> bool:
+        row = self.store.blobs.get(content_hash)
+        if row is None:
+            self.store.blobs[content_hash] = {"file_size": file_size, "ref_count": 1}
+            return True
+        row["ref_count"] += 1
+        return False
+
+    async def acquire_many(self, blobs: List[Tuple[str, int]], conn=None) -> Dict[str, bool]:
+        created = {}
+        for content_hash, file_size in blobs:
+            is_new = await self.acquire(content_hash, file_size)
+            created[content_hash] = created.get(content_hash, False) or is_new
+        return created
+
+    async def release(self, content_hash: str, conn=None) -> None:
+        row = self.store.blobs.get(content_hash)
+        if row is not None:
+            row["ref_count"] -= 1
+
+
+class InMemoryIngestionRepository:
+    """AsyncIngestionRepository 대체 (대기열에 넣기만 함, 추출 워커는 돌지 않음)"""
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self.store = store
+
+    async def enqueue(self, doc_id: int, conn=None) -> None:
+        now = datetime.now()
+        self.store.ingestion[doc_id] = {
+            "doc_id": doc_id, "status": "pending", "pages_total": None, "pages_done": 0, "progress": 0.0,
+            "chunks": 0, "attempts": 0, "error": None, "pages_per_sec": None,
+            "created_at": now, "started_at": None, "finished_at": None, "updated_at": now,
+        }
+
+    async def enqueue_many(self, doc_ids: List[int], conn=None) -> int:
+        added = [doc_id for doc_id in doc_ids if doc_id not in self.store.ingestion]
+        for doc_id in added:
+            await self.enqueue(doc_id)
+        return len(added)
+
+    async def find_by_doc_id(self, doc_id: int, conn=None) -> Optional[IngestionStatusDTO]:
+        row = self.store.ingestion.get(doc_id)
+        return trusted_dto(IngestionStatusDTO, dict(row)) if row else None
+
+
+class InMemoryUnitOfWork(AsyncUnitOfWork):
+    """커넥션 없이 after_commit / on_rollback 콜백만 처리하는 Unit of Work"""
+
+    async def __aenter__(self) -> "InMemoryUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._run_callbacks(self._after_commit if exc_type is None else self._on_rollback)
+
+
+def install(app: FastAPI, store: InMemoryStore) -> None:
+    """앱의 서비스 의존성을 in-memory Repository를 쓰는 서비스로 교체 (uninstall로 원복)"""
+    folders = InMemoryFolderRepository(store)
+    documents = InMemoryDocumentsRepository(store)
+    users = InMemoryUserRepository(store)
+    blobs = InMemoryBlobRepository(store)
+    ingestion = InMemoryIngestionRepository(store)
+
+    async def unit_of_work():
+        async with InMemoryUnitOfWork("in-memory") as uow:
+            yield uow
+
+    def folder_service(uow: Annotated[InMemoryUnitOfWork, Depends(unit_of_work, scope="function")]) -> AsyncFolderService:
+        service = AsyncFolderService(uow)
+        service.folder_repo, service.document_repo = folders, documents
+        return service
+
+    def document_service(uow: Annotated[InMemoryUnitOfWork, Depends(unit_of_work, scope="function")]) -> AsyncDocumentService:
+        service = AsyncDocumentService(uow)
+        service.folder_repo, service.document_repo, service.blob_repo = folders, documents, blobs
+        service.ingestion_repo = ingestion
+        return service
+
+    def auth_service() -> AsyncAuthService:
+        service = AsyncAuthService()
+        service.user_repo = users
+        return service
+
+    app.dependency_overrides.update({
+        get_unit_of_work: unit_of_work,
+        get_folder_service: folder_service,
+        get_document_service: document_service,
+        get_auth_service: auth_service,
+    })
+
+
+def uninstall(app: FastAPI) -> None:
+    for dependency in (get_unit_of_work, get_folder_service, get_document_service, get_auth_service):
+        app.dependency_overrides.pop(dependency, None)
+
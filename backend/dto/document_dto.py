@@ -11,6 +11,8 @@ class DocumentDTO(BaseModel):
     filename : str = Field(..., description="문서 이름", max_length=255)
     storage_path : str = Field(...,description="파일 저장 경로")
     summary_text : str = Field(..., description = "요약문")
+    file_size : int = Field(default=0, description="파일 크기 (bytes)")
+    content_hash : Optional[str] = Field(default=None, description="파일 SHA-256 (hex)")
     created_at: datetime = Field(..., description="생성 시각")
 
     class Config:
@@ -28,6 +30,24 @@ class DocumentCreateDTO(BaseModel):
 class DocumentListDTO(BaseModel):
     documents : list[DocumentDTO]
     total : int
+    next_cursor : Optional[str] = Field(default=None, description="다음 페이지 커서 (마지막 페이지면 null)")
+
+
+# 일괄 업로드 시 파일 1개의 결과
+class DocumentUploadResultDTO(BaseModel):
+    """일괄 업로드 파일별 결과 DTO"""
+    filename : str = Field(..., description="업로드한 파일명")
+    ok : bool = Field(..., description="성공 여부")
+    document : Optional[DocumentDTO] = Field(default=None, description="생성된 문서 (성공 시)")
+    error : Optional[str] = Field(default=None, description="실패 사유 (실패 시)")
+
+
+# 일괄 업로드 응답 DTO
+class DocumentBatchUploadDTO(BaseModel):
+    """일괄 업로드 응답 DTO (요청한 파일 순서대로 결과)"""
+    results : list[DocumentUploadResultDTO]
+    succeeded : int
+    failed : int
 
 
 # 문서 이름 변경 요청 DTO
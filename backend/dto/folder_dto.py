@@ -14,6 +14,7 @@ class FolderDTO(BaseModel):
     folder_name: str = Field(..., description="폴더 이름", max_length=100)
     created_at: datetime = Field(..., description="생성 시각")
     document_count: int = Field(default=0, description="폴더 내 문서 개수")     # updated_at에서 변경
+    total_bytes: int = Field(default=0, description="폴더 내 문서 총 크기 (bytes)")
 
     class Config:
         from_attributes = True  # ORM 모드 (dict 변환 지원)
@@ -27,7 +28,8 @@ class FolderCreateDTO(BaseModel):
 class FolderListDTO(BaseModel):
     """폴더 목록 응답 DTO"""
     folders: list[FolderDTO] = Field(default_factory=list, description="폴더 목록")
-    total: int = Field(..., description="전체 폴더 개수")
+    total: Optional[int] = Field(..., description="전체 폴더 개수 (include_total=false면 null)")
+    next_cursor: Optional[str] = Field(default=None, description="다음 페이지 커서 (마지막 페이지면 null)")
 
 class FolderRenameDTO(BaseModel):  # 변경할 파일 이름 검토
     new_name: str = Field(..., min_length=1, max_length=100, description="새 폴더 이름")
\ No newline at end of file
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class IngestionStatusDTO(BaseModel):
+    """문서 수집(텍스트 추출) 진행 상황 DTO"""
+    doc_id : int = Field(..., description="문서 ID")
+    status : str = Field(..., description="pending / running / done / failed")
+    pages_total : Optional[int] = Field(default=None, description="전체 페이지 수 (추출 시작 전이면 null)")
+    pages_done : int = Field(default=0, description="추출해서 저장한 페이지 수")
+    progress : float = Field(default=0.0, description="진행률 (0 ~ 1)")
+    chunks : int = Field(default=0, description="저장한 청크 수")
+    attempts : int = Field(default=0, description="시도 횟수")
+    error : Optional[str] = Field(default=None, description="실패 사유 (failed일 때)")
+    pages_per_sec : Optional[float] = Field(default=None, description="추출 속도 (페이지/초, 완료 시)")
+    created_at : datetime = Field(..., description="대기열에 들어간 시각")
+    started_at : Optional[datetime] = Field(default=None, description="추출 시작 시각")
+    finished_at : Optional[datetime] = Field(default=None, description="완료 / 실패 시각")
+    updated_at : datetime = Field(..., description="마지막 진행 갱신 시각")
+
+    class Config:
+        from_attributes = True
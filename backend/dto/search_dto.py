@@ -0,0 +1,23 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class SearchHitDTO(BaseModel):
+    """검색 결과 청크 1개"""
+    chunk_id : int = Field(..., description="청크 ID")
+    doc_id : int = Field(..., description="문서 ID")
+    folder_id : Optional[int] = Field(default=None, description="문서의 폴더 ID")
+    filename : str = Field(..., description="문서 이름")
+    page_number : Optional[int] = Field(default=None, description="청크가 시작하는 페이지")
+    chunk_text : str = Field(..., description="청크 텍스트")
+    score : float = Field(..., description="코사인 유사도 (1 - 코사인 거리, 클수록 가까움)")
+
+
+class SearchResultDTO(BaseModel):
+    """벡터 검색 응답 DTO (가까운 순서)"""
+    hits : list[SearchHitDTO]
+    k : int = Field(..., description="요청한 결과 수")
+    strategy : str = Field(..., description="exact (범위 안 전체 비교) / ann (HNSW 인덱스)")
+    ef_search : Optional[int] = Field(default=None, description="ann일 때 사용한 hnsw.ef_search")
+    scope_documents : int = Field(..., description="검색 범위 문서 수")
+    scope_chunks : int = Field(..., description="검색 범위 청크 수 (수집 기록 기준)")
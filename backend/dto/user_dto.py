@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -20,6 +21,27 @@ class LoginRequestDTO(BaseModel):
 
 
 class LoginResponseDTO(BaseModel):
-    """로그인 성공 시 응답 DTO"""
+    """로그인 / 토큰 갱신 성공 시 응답 DTO"""
     user_id: int = Field(..., description="사용자 ID")
     email: EmailStr = Field(..., description="사용자 이메일")
+    access_token: str = Field(..., description="API 호출용 access 토큰 (Authorization: Bearer)")
+    refresh_token: str = Field(..., description="access 토큰 갱신용 refresh 토큰 (1회용)")
+    token_type: str = Field(default="bearer", description="토큰 타입")
+    expires_in: int = Field(..., description="access 토큰 유효 시간 (초)")
+
+
+class RefreshRequestDTO(BaseModel):
+    """토큰 갱신 요청 DTO"""
+    refresh_token: str = Field(..., description="로그인 / 이전 갱신 때 받은 refresh 토큰")
+
+
+class LogoutRequestDTO(BaseModel):
+    """로그아웃 요청 DTO"""
+    refresh_token: Optional[str] = Field(default=None, description="함께 폐기할 refresh 토큰")
+    all_sessions: bool = Field(default=False, description="이 사용자의 모든 토큰 폐기 (모든 기기 로그아웃)")
+
+
+class AuthUserDTO(BaseModel):
+    """access 토큰에서 꺼낸 현재 사용자 (DB 조회 없음)"""
+    user_id: int = Field(..., description="사용자 ID")
+    email: str = Field(..., description="사용자 이메일")
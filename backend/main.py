@@ -3,12 +3,72 @@ FastAPI Main Application
 백엔드 애플리케이션 진입점
 """
 import os
-from fastapi import FastAPI
+from contextlib import AsyncExitStack, asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app_logging import setup_logging, logging_stats
+
+# 로깅 설정 (큐 + 백그라운드 스레드 출력, 라우터 / 서비스 모듈 import 전에)
+setup_logging()
+
 from api import router as api_router
+from api.compression import CompressionMiddleware, enabled_encodings
+from api.request_id import RequestIdMiddleware
+from api.profiling import ProfilingMiddleware, profiling_enabled
+from api.metrics import METRICS_ENABLED, METRICS_PATH, MetricsMiddleware, render_metrics, start_metrics, stop_metrics
+from repositories.connection_pool import (
+    open_pool, close_pool, open_async_pool, close_async_pool, pool_stats
+)
+from repositories.lookup_cache import cache_stats, start_invalidation_listener, stop_invalidation_listener
+from repositories.query_stats import query_stats
+from services.token_service import denylist
+from services.password_hasher import hasher_stats, start_password_hasher, shutdown_password_hasher
+from services.login_throttle import throttle_stats
+from services.ingestion_service import ingestion_stats, start_ingestion, stop_ingestion
+from services.embedding_service import embedding_stats, stop_embedding
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 수명 주기
+
+    시작:
+        1. DB 커넥션 풀 열기 (sync 호출자용 → async 라우터용)
+        2. 캐시 무효화 수신 시작
+        3. 메트릭 갱신 시작
+        4. 비밀번호 해시 작업자 시작
+        5. 텍스트 추출 워커 시작 (임베딩 배치는 첫 요청 때 시작)
+
+    종료 (시작의 역순):
+        1. 텍스트 추출 워커 / 임베딩 배치 정지
+        2. 메트릭 갱신 정지
+        3. 비밀번호 해시 작업자 종료
+        4. 캐시 무효화 수신 정지
+        5. DB 커넥션 풀 닫기
+
+    각 단계의 정리는 그 단계가 시작되면 바로 등록 → 시작 도중 실패해도 이미 시작한 단계만 역순으로 정리
+    """
+    async with AsyncExitStack() as stack:
+        open_pool()
+        stack.callback(close_pool)
+        await open_async_pool()
+        stack.push_async_callback(close_async_pool)
+        await start_invalidation_listener()
+        stack.push_async_callback(stop_invalidation_listener)
+        await start_metrics()
+        stack.push_async_callback(stop_metrics)
+        start_password_hasher()
+        stack.callback(shutdown_password_hasher)
+        stack.push_async_callback(stop_embedding)
+        await start_ingestion()
+        stack.push_async_callback(stop_ingestion)
+        yield
+
 
 # FastAPI 앱 생성
 app = FastAPI(
+    lifespan=lifespan,
     title="Study App API",
     description="학습 애플리케이션 백엔드 API",
     version="1.0.0",
@@ -26,6 +86,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (RESPONSE_COMPRESSION 이 비어 있거나 쓸 수 있는 인코딩이 없으면 등록하지 않음)
+if enabled_encodings():
+    app.add_middleware(CompressionMiddleware)
+
+# 요청 프로파일 (PROFILE_TOKEN / PROFILE_SAMPLE_RATE 를 설정했을 때만 등록, 요청 ID 안쪽)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+
+# 요청 ID + 접근 로그 (압축 / 핸들러에서 남긴 로그에도 같은 ID가 붙도록 그 바깥에 등록)
+app.add_middleware(RequestIdMiddleware)
+
+# 요청 메트릭 (가장 마지막에 등록 = 가장 바깥, 압축 후 응답 크기를 기록)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # 파일 저장할 uploaded_files 디렉터리 생성
 UPLOAD_DIR = "uploaded_files"
 if not os.path.exists(UPLOAD_DIR):
@@ -49,10 +124,27 @@ async def health_check():
     """상세 헬스 체크"""
     return {
         "status": "healthy",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "db_pool": pool_stats(),
+        "lookup_cache": cache_stats(),
+        "db_queries": query_stats(top=20),
+        "logging": logging_stats(),
+        "token_denylist": denylist.stats(),
+        "password_hash": hasher_stats(),
+        "login_throttle": throttle_stats(),
+        "ingestion": ingestion_stats(),
+        "embedding": embedding_stats()
     }
 
 
+if METRICS_ENABLED:
+    @app.get(METRICS_PATH, tags=["health"], include_in_schema=False)
+    def metrics():
+        """Prometheus 메트릭 (multiprocess 모드면 파일을 읽으므로 스레드풀에서 실행)"""
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,21 @@
+-- ==========================
+-- blob 지연 삭제 마이그레이션
+-- ==========================
+-- blobs.released_at 컬럼 추가
+-- 사용법: psql -h localhost -U mymoon -d postgres -f migrate_blob_gc.sql
+-- (migrate_blob_store.sql 이후에 실행)
+--
+-- 문서 삭제 / 업로드 rollback은 더 이상 blob 행과 파일을 지우지 않고 released_at만 기록한다.
+-- 참조가 없어진 지 --min-age-sec이 지난 blob은 python -m scripts.gc_blobs 가 삭제
+
+BEGIN;
+
+ALTER TABLE blobs ADD COLUMN IF NOT EXISTS released_at TIMESTAMP;
+
+-- 이미 참조가 없는 blob은 지금부터 유예 기간 시작
+UPDATE blobs
+SET released_at = now()
+WHERE ref_count <= 0
+  AND released_at IS NULL;
+
+COMMIT;
@@ -0,0 +1,33 @@
+-- ==========================
+-- 내용 주소 기반 blob 저장소 마이그레이션
+-- ==========================
+-- blobs 테이블 추가 + documents.content_hash → blobs FK
+-- 사용법: psql -h localhost -U mymoon -d postgres -f migrate_blob_store.sql
+-- (migrate_document_content_hash.sql 이후에 실행)
+--
+-- 기존 문서는 예전 경로(pdf_files/{user_id}/{folder_id}/{filename})의 파일을 그대로 쓰고
+-- content_hash를 NULL로 둔다. 이런 문서는 삭제할 때 자기 파일을 바로 지운다.
+-- 이후 어긋난 ref_count / 고아 파일은 python -m scripts.gc_blobs 로 정리
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash CHAR(64) PRIMARY KEY,
+    file_size BIGINT NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- blob 저장소 밖에 있는 기존 파일은 공유하면 안 되므로 예전 문서로 취급
+UPDATE documents
+SET content_hash = NULL
+WHERE content_hash IS NOT NULL
+  AND storage_path NOT LIKE 'pdf_files/blobs/%';
+
+ALTER TABLE documents
+    ADD CONSTRAINT documents_content_hash_fkey
+    FOREIGN KEY (content_hash) REFERENCES blobs(content_hash);
+
+COMMIT;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_content_hash ON documents(content_hash);
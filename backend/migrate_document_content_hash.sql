@@ -0,0 +1,8 @@
+-- ==========================
+-- 문서 내용 해시 마이그레이션
+-- ==========================
+-- documents.content_hash (업로드 시 계산한 SHA-256 hex) 컬럼 추가
+-- 사용법: psql -h localhost -U mymoon -d postgres -f migrate_document_content_hash.sql
+-- 기존 문서는 NULL로 남는다 (다시 업로드하거나 별도로 계산해서 채움)
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
@@ -0,0 +1,38 @@
+-- ==========================
+-- 문서 수집(텍스트 추출) 작업 테이블 마이그레이션
+-- ==========================
+-- document_ingestion 테이블 추가 + 기존 문서를 수집 대기열에 넣기
+-- 사용법: psql -h localhost -U mymoon -d postgres -f migrate_document_ingestion.sql
+-- 이후 수집 워커(앱 내장 또는 python -m scripts.ingest_worker)가 순서대로 처리
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS document_ingestion (
+    doc_id INTEGER PRIMARY KEY REFERENCES documents(doc_id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    pages_total INTEGER,
+    pages_done INTEGER NOT NULL DEFAULT 0,
+    chunks INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    pages_per_sec REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 이미 청크가 있는 문서는 건너뜀 (다시 추출하려면 python -m scripts.ingest_worker --doc-id N)
+INSERT INTO document_ingestion (doc_id, created_at)
+SELECT d.doc_id, d.created_at
+FROM documents d
+WHERE NOT EXISTS (SELECT 1 FROM document_chunks c WHERE c.doc_id = d.doc_id)
+ON CONFLICT (doc_id) DO NOTHING;
+
+CREATE INDEX IF NOT EXISTS idx_ingestion_queue
+    ON document_ingestion(created_at)
+    WHERE status IN ('pending', 'running');
+
+COMMIT;
+
+SELECT 'Document ingestion migrated!' as status;
@@ -0,0 +1,20 @@
+-- ==========================
+-- 임베딩 캐시 테이블 마이그레이션
+-- ==========================
+-- embedding_cache 테이블 추가 (비어 있는 상태로 시작, 수집 워커가 임베딩할 때마다 채워짐)
+-- 사용법: psql -h localhost -U mymoon -d postgres -f migrate_embedding_cache.sql
+-- 모델을 바꾼 뒤 예전 모델 캐시를 지우려면: DELETE FROM embedding_cache WHERE model = '<모델 이름:차원>';
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model VARCHAR(100) NOT NULL,
+    content_hash CHAR(64) NOT NULL,
+    embedding VECTOR NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (model, content_hash)
+);
+
+COMMIT;
+
+SELECT 'Embedding cache migrated!' as status;
@@ -0,0 +1,33 @@
+-- ==========================
+-- 폴더 문서 카운터 마이그레이션
+-- ==========================
+-- folders.document_count / total_bytes, documents.file_size 컬럼 추가 및 초기값 채우기
+-- 사용법: psql -h localhost -U mymoon -d postgres -f migrate_folder_counters.sql
+-- 이후 어긋난 값은 python -m scripts.reconcile_folder_counters 로 복구
+
+BEGIN;
+
+ALTER TABLE folders ADD COLUMN IF NOT EXISTS document_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE folders ADD COLUMN IF NOT EXISTS total_bytes BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS file_size BIGINT NOT NULL DEFAULT 0;
+
+-- 기존 문서 개수로 초기화 (file_size는 기존 문서에 대해 0, 필요 시 재계산)
+UPDATE folders f
+SET document_count = c.document_count,
+    total_bytes = c.total_bytes
+FROM (
+    SELECT folder_id, COUNT(*) AS document_count, COALESCE(SUM(file_size), 0) AS total_bytes
+    FROM documents
+    WHERE folder_id IS NOT NULL
+    GROUP BY folder_id
+) c
+WHERE f.folder_id = c.folder_id;
+
+COMMIT;
+
+-- 사용자별 폴더 목록 커버링 인덱스 (트랜잭션 밖에서 CONCURRENTLY)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_folders_user_created
+    ON folders(user_id, created_at DESC, folder_id DESC)
+    INCLUDE (folder_name, document_count, total_bytes);
+
+SELECT 'Folder counters migrated!' as status;
@@ -0,0 +1,31 @@
+-- ==========================
+-- 청크 벡터 검색 마이그레이션
+-- ==========================
+-- document_chunks.embedding을 VECTOR(3072) → VECTOR(1536)으로 바꾸고 HNSW 인덱스 추가
+-- (pgvector HNSW / IVFFlat 인덱스는 2000차원까지만 지원)
+-- 3072차원 벡터는 1536차원으로 바꿀 수 없으므로 기존 청크를 지우고 모든 문서를 수집 대기열에 다시 넣음
+-- → 수집 워커가 EMBEDDING_DIM=1536으로 다시 추출 / 임베딩 (임베딩 캐시는 모델:차원이 키라서 예전 벡터를 쓰지 않음)
+-- 사용법: psql -h localhost -U mymoon -d postgres -f migrate_vector_search.sql
+
+BEGIN;
+
+DELETE FROM document_chunks;
+
+ALTER TABLE document_chunks
+    ALTER COLUMN embedding TYPE VECTOR(1536) USING NULL;
+
+INSERT INTO document_ingestion (doc_id)
+SELECT doc_id FROM documents
+ON CONFLICT (doc_id) DO UPDATE
+SET status = 'pending', pages_total = NULL, pages_done = 0, chunks = 0, attempts = 0,
+    error = NULL, pages_per_sec = NULL, started_at = NULL, finished_at = NULL,
+    created_at = now(), updated_at = now();
+
+COMMIT;
+
+-- 청크를 비운 뒤라 바로 만들어짐, 이후 수집 워커가 청크를 다시 넣을 때마다 인덱스가 갱신됨
+CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+    ON document_chunks USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+SELECT 'Vector search migrated!' as status;
@@ -4,44 +4,113 @@ Base Repository
 """
 import psycopg
 from psycopg.rows import dict_row
-from typing import Optional, Any
-import os
-from dotenv import load_dotenv
+from typing import Optional, Any, List, Type, TypeVar
+import time
 import logging
-
-load_dotenv()   
+import weakref
+from .connection_pool import get_pool, get_async_pool, get_conninfo_kwargs
+from . import lookup_cache, query_stats
 
 logger = logging.getLogger(__name__)
 
+# UnitOfWork가 추적 중인 커넥션별 쿼리 왕복 횟수
+_round_trips: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+
+
+def track_round_trips(conn) -> None:
+    """이 커넥션에서 실행되는 쿼리 수를 세기 시작"""
+    _round_trips[conn] = 0
+
+
+def pop_round_trips(conn) -> int:
+    """세던 쿼리 수를 반환하고 추적 종료"""
+    return _round_trips.pop(conn, 0)
+
+
+def record_round_trip(conn) -> None:
+    """추적 중인 커넥션이면 쿼리 1회 기록 (custom cursor 경로에서도 호출)"""
+    if conn in _round_trips:
+        _round_trips[conn] += 1
+
+
+# ==========================
+# 검증 없는 DTO 생성 (DB에서 읽은 행 전용)
+# ==========================
+# 우리 스키마에서 읽은 행은 타입이 이미 DTO와 맞으므로 pydantic 검증을 건너뛰고
+# dict_row가 만든 행 dict를 그대로 모델의 __dict__로 사용 (복사 없음).
+# pydantic v2의 model_construct는 기본값 처리 때문에 오히려 DTO(**row)보다 느려서 직접 채운다.
+# 행의 키가 DTO 필드와 정확히 같지 않으면(스키마 변경 등) 일반 생성자로 검증한다.
+ModelT = TypeVar("ModelT")
+
+_model_fields: "weakref.WeakKeyDictionary[type, frozenset]" = weakref.WeakKeyDictionary()
+
+
+def _fields_of(model_cls) -> frozenset:
+    fields = _model_fields.get(model_cls)
+    if fields is None:
+        fields = _model_fields[model_cls] = frozenset(model_cls.model_fields)
+    return fields
+
+
+def trusted_dto(model_cls: Type[ModelT], row: Optional[dict]) -> Optional[ModelT]:
+    """DB 행 1개 → DTO (검증 생략, row dict의 소유권을 DTO가 가져감)"""
+    if row is None:
+        return None
+    return trusted_dtos(model_cls, [row])[0]
+
+
+def trusted_dtos(model_cls: Type[ModelT], rows: List[dict]) -> List[ModelT]:
+    """
+    DB 행 리스트 → DTO 리스트 (검증 생략)
+
+    같은 쿼리의 행은 컬럼이 모두 같으므로 첫 행의 키만 확인한다.
+    """
+    if not rows:
+        return []
+    fields = _fields_of(model_cls)
+    if rows[0].keys() != fields:
+        return [model_cls(**row) for row in rows]
+
+    new = model_cls.__new__
+    set_attr = object.__setattr__
+    result = []
+    for row in rows:
+        obj = new(model_cls)
+        set_attr(obj, '__dict__', row)
+        set_attr(obj, '__pydantic_fields_set__', set(fields))
+        set_attr(obj, '__pydantic_extra__', None)
+        set_attr(obj, '__pydantic_private__', None)
+        result.append(obj)
+    return result
+
+
 class BaseRepository:
     """기본 Repository 클래스"""
 
     @staticmethod
     def get_connection():
-        """DB 연결 생성"""
-        host = os.getenv("DB_HOST", "localhost")
-        port = os.getenv("DB_PORT", "5432")
-        database = os.getenv("DB_NAME", "studyapp")
-        user = os.getenv("DB_USER", "postgres")
-        password = os.getenv("DB_PASSWORD", "")
-
-        logger.info(
-            f"Trying DB connection host={host} port={port} db={database} user={user}"
+        """
+        DB 연결 획득
+
+        - 커넥션 풀이 열려 있으면 풀에서 빌려옴 (conn.close() 시 풀로 반납)
+        - 풀이 없으면 (스크립트, 풀 비활성화) 새로 연결
+        """
+        pool = get_pool()
+        if pool is not None:
+            return pool.getconn()
+
+        conninfo = get_conninfo_kwargs()
+        logger.debug(
+            f"Opening direct DB connection host={conninfo['host']} port={conninfo['port']} "
+            f"db={conninfo['dbname']} user={conninfo['user']}"
         )
 
         # psycopg3 (psycopg)
-        conn = psycopg.connect(
-            host=host,
-            port=port,
-            dbname=database,     # psycopg3는 dbname 파라미터 사용
-            user=user,
-            password=password,
+        return psycopg.connect(
+            **conninfo,
             row_factory=dict_row  # SELECT 결과를 dict처럼 다룰 수 있게
         )
 
-        logger.info("✅ DB connection SUCCESS")
-        return conn
-
     @staticmethod
     def execute_query(query: str, params: Optional[tuple] = None, conn=None) -> list[dict]:
         """
@@ -56,14 +125,28 @@ class BaseRepository:
             쿼리 결과 리스트
         """
         should_close = conn is None
+        acquire_sec = None
         if conn is None:
+            acquired = time.perf_counter()
             conn = BaseRepository.get_connection()
+            acquire_sec = time.perf_counter() - acquired
 
+        started = time.perf_counter()
         try:
             with conn.cursor() as cursor:
                 cursor.execute(query, params)
+                record_round_trip(conn)
                 result = cursor.fetchall()
-                return [dict(row) for row in result]
+            if query_stats.observe(query, params, started, len(result), acquire_sec):
+                query_stats.explain(conn, query, params)
+            if should_close:
+                # 풀 반납 전에 트랜잭션 종료 (INTRANS 상태로 반납하지 않도록)
+                conn.commit()
+            # dict_row가 행마다 새 dict를 만들므로 다시 복사하지 않음
+            return result
+        except Exception:
+            query_stats.observe(query, params, started, 0, acquire_sec, error=True)
+            raise
         finally:
             if should_close:
                 conn.close()
@@ -82,19 +165,152 @@ class BaseRepository:
             영향받은 행 수
         """
         should_close = conn is None
+        acquire_sec = None
         if conn is None:
+            acquired = time.perf_counter()
             conn = BaseRepository.get_connection()
+            acquire_sec = time.perf_counter() - acquired
 
+        started = time.perf_counter()
         try:
             with conn.cursor() as cursor:
                 cursor.execute(query, params)
+                record_round_trip(conn)
+                if query_stats.observe(query, params, started, cursor.rowcount, acquire_sec):
+                    query_stats.explain(conn, query, params)
                 if should_close:
                     conn.commit()
                 return cursor.rowcount
         except Exception as e:
+            query_stats.observe(query, params, started, 0, acquire_sec, error=True)
             if should_close:
                 conn.rollback()
             raise e
         finally:
             if should_close:
                 conn.close()
+
+    @staticmethod
+    def invalidate_cached(cache: "lookup_cache.LookupCache", key: Any, conn=None) -> None:
+        """
+        쓰기 후 단건 조회 캐시 무효화
+
+        - 이 프로세스: 바로 무효화 + 트랜잭션이 끝날 때 한 번 더 (lookup_cache.flush_invalidations)
+        - 공유 모드: 같은 트랜잭션에서 NOTIFY → commit 될 때 다른 워커로 전파
+        """
+        lookup_cache.invalidate(cache, key, conn)
+        params = lookup_cache.notify_params(cache, key)
+        if params is not None:
+            BaseRepository.execute_query(lookup_cache.NOTIFY_SQL, params, conn)
+
+
+class AsyncBaseRepository:
+    """
+    기본 Repository 클래스 (async 버전)
+
+    async 라우터에서 이벤트 루프를 막지 않도록 psycopg AsyncConnection 사용.
+    conn 인자 의미는 BaseRepository와 동일 (None이면 빌려서 쓰고 반납)
+    """
+
+    @staticmethod
+    async def get_connection():
+        """
+        async DB 연결 획득
+
+        - async 커넥션 풀이 열려 있으면 풀에서 빌려옴 (await conn.close() 시 반납)
+        - 풀이 없으면 새로 연결
+        """
+        pool = get_async_pool()
+        if pool is not None:
+            return await pool.getconn()
+
+        return await psycopg.AsyncConnection.connect(
+            **get_conninfo_kwargs(),
+            row_factory=dict_row
+        )
+
+    @staticmethod
+    async def execute_query(query: str, params: Optional[tuple] = None, conn=None) -> list[dict]:
+        """
+        SELECT 쿼리 실행
+
+        Args:
+            query: SQL 쿼리
+            params: 쿼리 파라미터
+            conn: 기존 연결 (트랜잭션용)
+
+        Returns:
+            쿼리 결과 리스트
+        """
+        should_close = conn is None
+        acquire_sec = None
+        if conn is None:
+            acquired = time.perf_counter()
+            conn = await AsyncBaseRepository.get_connection()
+            acquire_sec = time.perf_counter() - acquired
+
+        started = time.perf_counter()
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                record_round_trip(conn)
+                result = await cursor.fetchall()
+            if query_stats.observe(query, params, started, len(result), acquire_sec):
+                await query_stats.explain_async(conn, query, params)
+            if should_close:
+                # 풀 반납 전에 트랜잭션 종료 (INTRANS 상태로 반납하지 않도록)
+                await conn.commit()
+            return result
+        except Exception:
+            query_stats.observe(query, params, started, 0, acquire_sec, error=True)
+            raise
+        finally:
+            if should_close:
+                await conn.close()
+
+    @staticmethod
+    async def execute_update(query: str, params: Optional[tuple] = None, conn=None) -> int:
+        """
+        INSERT/UPDATE/DELETE 쿼리 실행
+
+        Args:
+            query: SQL 쿼리
+            params: 쿼리 파라미터
+            conn: 기존 연결 (트랜잭션용)
+
+        Returns:
+            영향받은 행 수
+        """
+        should_close = conn is None
+        acquire_sec = None
+        if conn is None:
+            acquired = time.perf_counter()
+            conn = await AsyncBaseRepository.get_connection()
+            acquire_sec = time.perf_counter() - acquired
+
+        started = time.perf_counter()
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                record_round_trip(conn)
+                if query_stats.observe(query, params, started, cursor.rowcount, acquire_sec):
+                    await query_stats.explain_async(conn, query, params)
+                if should_close:
+                    await conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            query_stats.observe(query, params, started, 0, acquire_sec, error=True)
+            if should_close:
+                await conn.rollback()
+            raise e
+        finally:
+            if should_close:
+                await conn.close()
+
+    @staticmethod
+    async def invalidate_cached(cache: "lookup_cache.LookupCache", key: Any, conn=None) -> None:
+        """쓰기 후 단건 조회 캐시 무효화 (BaseRepository.invalidate_cached와 동일)"""
+        lookup_cache.invalidate(cache, key, conn)
+        params = lookup_cache.notify_params(cache, key)
+        if params is not None:
+            await AsyncBaseRepository.execute_query(lookup_cache.NOTIFY_SQL, params, conn)
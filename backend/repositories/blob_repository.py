@@ -0,0 +1,236 @@
+"""
+Blob Repository
+내용 주소 기반 파일(blob)의 참조 카운트 관리
+
+- 문서 1개가 blob 1개를 참조 (documents.content_hash → blobs.content_hash)
+- 같은 내용을 여러 번 업로드하면 ref_count만 증가
+- 마지막 참조가 사라져도 요청 경로에서는 행 / 파일을 지우지 않고 released_at만 기록
+  (지우는 순간 같은 내용의 업로드가 끼어들면 commit 된 문서가 없는 파일을 가리킬 수 있음)
+- 행과 파일 삭제는 scripts/gc_blobs.py가 유예 기간이 지난 blob만 행을 잠근 채로 수행
+"""
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from .base_repository import BaseRepository, AsyncBaseRepository
+from . import query_stats
+
+
+# ==========================
+# SQL (sync / async Repository 공용)
+# ==========================
+# 새 blob이면 ref_count = 1로 INSERT, 이미 있으면 +1 (참조가 다시 생겼으므로 released_at 해제)
+# xmax = 0 이면 INSERT 된 행 (ON CONFLICT UPDATE면 xmax가 현재 트랜잭션 ID)
+ACQUIRE_SQL = """
+    INSERT INTO blobs (content_hash, file_size, ref_count)
+    VALUES (%s, %s, 1)
+    ON CONFLICT (content_hash) DO UPDATE
+    SET ref_count = blobs.ref_count + 1,
+        released_at = NULL
+    RETURNING (xmax = 0) AS created
+"""
+
+# 일괄 업로드용: 해시별 참조 수를 모아서 한 문장으로 upsert
+# (같은 문장에서 같은 행을 두 번 갱신할 수 없으므로 배치 안의 중복은 미리 합침)
+ACQUIRE_MANY_SQL = """
+    INSERT INTO blobs (content_hash, file_size, ref_count)
+    SELECT * FROM unnest(%s::char(64)[], %s::bigint[], %s::integer[])
+    ON CONFLICT (content_hash) DO UPDATE
+    SET ref_count = blobs.ref_count + EXCLUDED.ref_count,
+        released_at = NULL
+    RETURNING content_hash, (xmax = 0) AS created
+"""
+
+# 마지막 참조가 사라지면 released_at만 기록 (행 / 파일 삭제는 GC가 유예 기간 후에)
+RELEASE_SQL = """
+    UPDATE blobs
+    SET ref_count = ref_count - 1,
+        released_at = CASE WHEN ref_count <= 1 THEN now() ELSE released_at END
+    WHERE content_hash = %s
+"""
+
+# ==========================
+# 정리 스크립트용 (scripts/gc_blobs.py)
+# ==========================
+LOCK_BLOB_BATCH_SQL = """
+    SELECT content_hash
+    FROM blobs
+    WHERE content_hash > %s
+    ORDER BY content_hash
+    LIMIT %s
+    FOR UPDATE
+"""
+
+# 잠근 배치의 실제 참조 문서 수를 다시 세서 어긋난 blob만 수정
+# (새로 참조가 0이 된 blob은 지금부터 유예 기간 시작)
+RECONCILE_REF_COUNTS_SQL = """
+    WITH actual AS (
+        SELECT
+            b.content_hash,
+            COUNT(d.doc_id) AS ref_count
+        FROM blobs b
+        LEFT JOIN documents d ON d.content_hash = b.content_hash
+        WHERE b.content_hash = ANY(%s)
+        GROUP BY b.content_hash
+    )
+    UPDATE blobs b
+    SET ref_count = a.ref_count,
+        released_at = CASE WHEN a.ref_count = 0 THEN COALESCE(b.released_at, now()) END
+    FROM actual a
+    WHERE b.content_hash = a.content_hash
+      AND b.ref_count <> a.ref_count
+"""
+
+# 참조가 없어진 지 min_age_sec 이상 지난 blob만 삭제 (released_at이 없으면 created_at 기준)
+DELETE_UNREFERENCED_BATCH_SQL = """
+    DELETE FROM blobs
+    WHERE content_hash = ANY(%s)
+      AND ref_count <= 0
+      AND COALESCE(released_at, created_at) < now() - make_interval(secs => %s)
+    RETURNING content_hash
+"""
+
+# 고아 파일 후보를 ref_count = 0 행으로 선점 (이미 행이 있거나 다른 트랜잭션이 INSERT 중이면 제외)
+# 선점한 행은 파일을 지운 뒤 같은 트랜잭션에서 삭제 → 그동안 같은 해시의 acquire는 대기
+CLAIM_ORPHANS_SQL = """
+    INSERT INTO blobs (content_hash, file_size, ref_count)
+    SELECT unnest(%s::char(64)[]), 0, 0
+    ON CONFLICT (content_hash) DO NOTHING
+    RETURNING content_hash
+"""
+
+DELETE_CLAIMED_SQL = """
+    DELETE FROM blobs
+    WHERE content_hash = ANY(%s)
+      AND ref_count = 0
+"""
+
+
+query_stats.register_queries("blobs", globals())
+
+
+def _acquire_many_params(blobs: List[Tuple[str, int]]) -> tuple:
+    """acquire_many용 배열 파라미터 (해시별로 참조 수를 합침)"""
+    counts = Counter(content_hash for content_hash, _ in blobs)
+    sizes = dict(blobs)
+    hashes = list(counts)
+    return hashes, [sizes[h] for h in hashes], [counts[h] for h in hashes]
+
+
+class BlobRepository(BaseRepository):
+    """Blob Repository"""
+
+    @staticmethod
+    def acquire(content_hash: str, file_size: int, conn=None) -> bool:
+        """
+        blob 참조 1개 추가
+
+        Args:
+            content_hash: 파일 SHA-256 (hex)
+            file_size: 파일 크기 (bytes)
+            conn: DB 연결 (트랜잭션용)
+
+        Returns:
+            새 blob 행을 만들었으면 True (이미 있던 blob이면 False)
+        """
+        rows = BaseRepository.execute_query(ACQUIRE_SQL, (content_hash, file_size), conn)
+        return bool(rows and rows[0]["created"])
+
+    @staticmethod
+    def acquire_many(blobs: List[Tuple[str, int]], conn=None) -> Dict[str, bool]:
+        """
+        blob 참조 일괄 추가 (같은 해시가 여러 번 있으면 그만큼 ref_count 증가)
+
+        Args:
+            blobs: (content_hash, file_size) 리스트
+            conn: DB 연결 (트랜잭션용)
+
+        Returns:
+            {content_hash: 새 blob 행을 만들었으면 True}
+        """
+        if not blobs:
+            return {}
+        rows = BaseRepository.execute_query(ACQUIRE_MANY_SQL, _acquire_many_params(blobs), conn)
+        return {row["content_hash"]: row["created"] for row in rows}
+
+    @staticmethod
+    def release(content_hash: str, conn=None) -> None:
+        """
+        blob 참조 1개 제거 (마지막 참조여도 행 / 파일은 남김, 삭제는 scripts/gc_blobs.py)
+
+        Args:
+            content_hash: 파일 SHA-256 (hex)
+            conn: DB 연결 (트랜잭션용)
+        """
+        BaseRepository.execute_update(RELEASE_SQL, (content_hash,), conn)
+
+    @staticmethod
+    def reconcile_ref_counts(
+        after_hash: str,
+        batch_size: int,
+        min_age_sec: int,
+        conn
+    ) -> Tuple[Optional[str], int, List[str]]:
+        """
+        content_hash > after_hash 인 blob batch_size개의 ref_count를 실제 값으로 복구하고
+        참조가 없어진 지 min_age_sec이 지난 blob 행을 삭제
+
+        Args:
+            after_hash: 이전 배치의 마지막 해시 (처음이면 "")
+            batch_size: 배치 크기
+            min_age_sec: 참조가 없어진 뒤 삭제까지 기다리는 시간 (초)
+            conn: DB 연결 (배치 1개 = 트랜잭션 1개, 커밋은 호출자가)
+
+        Returns:
+            (이번 배치의 마지막 해시 또는 None(끝), 수정된 blob 수, 삭제된 blob 해시 리스트)
+            삭제된 blob은 commit 전까지 잠겨 있으므로 호출자는 commit 전에 파일을 지운다
+        """
+        rows = BaseRepository.execute_query(LOCK_BLOB_BATCH_SQL, (after_hash, batch_size), conn)
+        if not rows:
+            return None, 0, []
+
+        hashes = [row['content_hash'] for row in rows]
+        fixed = BaseRepository.execute_update(RECONCILE_REF_COUNTS_SQL, (hashes,), conn)
+        deleted = BaseRepository.execute_query(DELETE_UNREFERENCED_BATCH_SQL, (hashes, min_age_sec), conn)
+        return hashes[-1], fixed, [row['content_hash'] for row in deleted]
+
+    @staticmethod
+    def claim_orphans(hashes: List[str], conn) -> List[str]:
+        """
+        blobs 행이 없는 해시를 ref_count = 0 행으로 선점
+
+        Args:
+            hashes: 고아 파일 후보 해시 리스트
+            conn: DB 연결 (파일 삭제 + release_claimed까지 한 트랜잭션)
+
+        Returns:
+            선점한 해시 리스트 (파일을 지워도 되는 것)
+        """
+        rows = BaseRepository.execute_query(CLAIM_ORPHANS_SQL, (hashes,), conn)
+        return [row['content_hash'] for row in rows]
+
+    @staticmethod
+    def release_claimed(hashes: List[str], conn) -> int:
+        """claim_orphans로 선점한 행 삭제 (파일을 지운 뒤, commit 전에)"""
+        return BaseRepository.execute_update(DELETE_CLAIMED_SQL, (hashes,), conn)
+
+
+class AsyncBlobRepository(AsyncBaseRepository):
+    """Blob Repository (async 버전, SQL은 BlobRepository와 공용)"""
+
+    @staticmethod
+    async def acquire(content_hash: str, file_size: int, conn=None) -> bool:
+        """blob 참조 1개 추가, 새 blob 행을 만들었으면 True"""
+        rows = await AsyncBaseRepository.execute_query(ACQUIRE_SQL, (content_hash, file_size), conn)
+        return bool(rows and rows[0]["created"])
+
+    @staticmethod
+    async def acquire_many(blobs: List[Tuple[str, int]], conn=None) -> Dict[str, bool]:
+        """blob 참조 일괄 추가, {content_hash: 새 blob 행을 만들었으면 True}"""
+        if not blobs:
+            return {}
+        rows = await AsyncBaseRepository.execute_query(ACQUIRE_MANY_SQL, _acquire_many_params(blobs), conn)
+        return {row["content_hash"]: row["created"] for row in rows}
+
+    @staticmethod
+    async def release(content_hash: str, conn=None) -> None:
+        """blob 참조 1개 제거 (마지막 참조여도 행 / 파일은 남김, 삭제는 scripts/gc_blobs.py)"""
+        await AsyncBaseRepository.execute_update(RELEASE_SQL, (content_hash,), conn)
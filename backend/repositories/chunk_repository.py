@@ -0,0 +1,143 @@
+"""
+Chunk Repository
+문서 텍스트 청크 저장 (document_chunks 테이블)
+
+- 수집 워커가 추출한 페이지 묶음에서 나온 청크 + 임베딩을 copy_many로 저장 (한 묶음 = 한 트랜잭션)
+  행마다 INSERT하지 않고 COPY ... FROM STDIN (FORMAT BINARY) 한 번으로 보냄
+  - 벡터는 pgvector 바이너리 형식(차원 int16, 0 int16, float4 배열)으로 직접 만들어서 bytea처럼 보냄
+    (서버는 컬럼 타입(vector)의 바이너리 입력 함수로 읽으므로 pgvector 파이썬 패키지가 필요 없음)
+- page_number는 청크가 시작하는 페이지
+- 다시 수집할 때는 delete_by_doc_id로 이전 청크를 지우고 처음부터 저장
+"""
+import struct
+import time
+from typing import List, Optional, Sequence, Tuple
+from .base_repository import BaseRepository, AsyncBaseRepository, record_round_trip
+from . import query_stats
+
+
+# ==========================
+# SQL (sync / async Repository 공용)
+# ==========================
+COPY_SQL = """
+    COPY document_chunks (doc_id, page_number, chunk_text, embedding) FROM STDIN (FORMAT BINARY)
+"""
+
+DELETE_BY_DOC_ID_SQL = """
+    DELETE FROM document_chunks
+    WHERE doc_id = %s
+"""
+
+COUNT_BY_DOC_ID_SQL = """
+    SELECT COUNT(*) AS count
+    FROM document_chunks
+    WHERE doc_id = %s
+"""
+
+
+query_stats.register_queries("chunks", globals())
+
+# COPY BINARY 컬럼 타입 (embedding은 미리 만든 pgvector 바이너리를 그대로 보냄)
+_COPY_TYPES = ["int4", "int4", "text", "bytea"]
+
+
+def vector_binary(vector: Optional[Sequence[float]]) -> Optional[bytes]:
+    """pgvector vector 타입의 바이너리 표현 (None이면 NULL)"""
+    if vector is None:
+        return None
+    return struct.pack(f">HH{len(vector)}f", len(vector), 0, *vector)
+
+
+def vector_text(vector: Sequence[float]) -> str:
+    """pgvector 텍스트 표현 ('[1.0,2.0,...]', 쿼리 파라미터용)"""
+    return "[" + ",".join(map(repr, vector)) + "]"
+
+
+def vector_from_binary(data: bytes) -> Tuple[float, ...]:
+    """pgvector 바이너리 표현 → float 튜플 (vector_binary의 반대)"""
+    dim = struct.unpack_from(">H", data)[0]
+    return struct.unpack_from(f">{dim}f", data, 4)
+
+
+def _copy_rows(doc_id: int, chunks: List[Tuple[int, str]], embeddings: Optional[List[Sequence[float]]]):
+    if embeddings is None:
+        embeddings = [None] * len(chunks)
+    for (page, text), vector in zip(chunks, embeddings):
+        yield doc_id, page, text, vector_binary(vector)
+
+
+class ChunkRepository(BaseRepository):
+    """문서 청크 Repository"""
+
+    @staticmethod
+    def copy_many(
+        doc_id: int,
+        chunks: List[Tuple[int, str]],
+        embeddings: Optional[List[Sequence[float]]],
+        conn
+    ) -> int:
+        """
+        (시작 페이지 번호, 청크 텍스트) + 임베딩 일괄 저장 (COPY 1번)
+
+        Args:
+            embeddings: chunks와 같은 순서의 벡터 (None이면 embedding을 NULL로)
+            conn: DB 연결 (트랜잭션용, 커밋은 호출자가)
+
+        Returns:
+            저장한 행 수
+        """
+        if not chunks:
+            return 0
+        started = time.perf_counter()
+        with conn.cursor() as cursor:
+            with cursor.copy(COPY_SQL) as copy:
+                copy.set_types(_COPY_TYPES)
+                for row in _copy_rows(doc_id, chunks, embeddings):
+                    copy.write_row(row)
+            record_round_trip(conn)
+        query_stats.observe(COPY_SQL, None, started, len(chunks))
+        return len(chunks)
+
+    @staticmethod
+    def delete_by_doc_id(doc_id: int, conn=None) -> int:
+        """문서의 청크 전체 삭제, 삭제한 행 수 반환"""
+        return BaseRepository.execute_update(DELETE_BY_DOC_ID_SQL, (doc_id,), conn)
+
+    @staticmethod
+    def count_by_doc_id(doc_id: int, conn=None) -> int:
+        rows = BaseRepository.execute_query(COUNT_BY_DOC_ID_SQL, (doc_id,), conn)
+        return rows[0]["count"]
+
+
+class AsyncChunkRepository(AsyncBaseRepository):
+    """문서 청크 Repository (async 버전, SQL은 ChunkRepository와 공용)"""
+
+    @staticmethod
+    async def copy_many(
+        doc_id: int,
+        chunks: List[Tuple[int, str]],
+        embeddings: Optional[List[Sequence[float]]],
+        conn
+    ) -> int:
+        """(시작 페이지 번호, 청크 텍스트) + 임베딩 일괄 저장 (COPY 1번), 저장한 행 수 반환"""
+        if not chunks:
+            return 0
+        started = time.perf_counter()
+        async with conn.cursor() as cursor:
+            async with cursor.copy(COPY_SQL) as copy:
+                copy.set_types(_COPY_TYPES)
+                for row in _copy_rows(doc_id, chunks, embeddings):
+                    await copy.write_row(row)
+            record_round_trip(conn)
+        query_stats.observe(COPY_SQL, None, started, len(chunks))
+        return len(chunks)
+
+    @staticmethod
+    async def delete_by_doc_id(doc_id: int, conn=None) -> int:
+        """문서의 청크 전체 삭제, 삭제한 행 수 반환"""
+        return await AsyncBaseRepository.execute_update(DELETE_BY_DOC_ID_SQL, (doc_id,), conn)
+
+    @staticmethod
+    async def count_by_doc_id(doc_id: int, conn=None) -> int:
+        rows = await AsyncBaseRepository.execute_query(COUNT_BY_DOC_ID_SQL, (doc_id,), conn)
+        return rows[0]["count"]
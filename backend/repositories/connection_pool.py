@@ -0,0 +1,187 @@
+"""
+Connection Pool
+프로세스 전역 DB 커넥션 풀 관리 (psycopg_pool)
+
+- main.py의 lifespan에서 open_pool() / close_pool() 호출
+- 풀이 열려 있으면 BaseRepository.get_connection()이 풀에서 커넥션을 빌려옴
+- close_returns=True 이므로 기존 코드의 conn.close()는 풀 반납으로 동작
+- async 라우터용 AsyncConnectionPool도 같은 설정으로 함께 관리
+"""
+import os
+import time
+import logging
+import weakref
+from typing import Optional
+
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool, AsyncConnectionPool
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ConnectionPool] = None
+_async_pool: Optional[AsyncConnectionPool] = None
+
+# 커넥션 생성 시각 (연결 수명 통계용)
+_connection_born_at: "weakref.WeakKeyDictionary[psycopg.Connection, float]" = weakref.WeakKeyDictionary()
+
+
+def get_conninfo_kwargs() -> dict:
+    """DB 접속 정보 (DB_HOST, DB_PORT, ... 환경 변수)"""
+    return {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": os.getenv("DB_PORT", "5432"),
+        "dbname": os.getenv("DB_NAME", "studyapp"),
+        "user": os.getenv("DB_USER", "postgres"),
+        "password": os.getenv("DB_PASSWORD", ""),
+    }
+
+
+def is_pool_enabled() -> bool:
+    """DB_POOL_ENABLED=false 이면 풀 없이 요청마다 직접 연결"""
+    return os.getenv("DB_POOL_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def _pool_settings() -> dict:
+    """풀 크기/타임아웃 설정 (환경 변수)"""
+    return {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "600")),
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+    }
+
+
+def _configure_connection(conn: psycopg.Connection) -> None:
+    """풀이 새 물리 커넥션을 만들 때마다 호출"""
+    _connection_born_at[conn] = time.monotonic()
+    logger.debug("New pooled DB connection created")
+
+
+async def _configure_async_connection(conn: psycopg.AsyncConnection) -> None:
+    """async 풀이 새 물리 커넥션을 만들 때마다 호출"""
+    _connection_born_at[conn] = time.monotonic()
+    logger.debug("New pooled async DB connection created")
+
+
+def open_pool() -> Optional[ConnectionPool]:
+    """커넥션 풀 생성 (앱 시작 시 1회)"""
+    global _pool
+    if _pool is not None or not is_pool_enabled():
+        return _pool
+
+    settings = _pool_settings()
+    conninfo = get_conninfo_kwargs()
+    logger.info(
+        f"Opening DB pool host={conninfo['host']} port={conninfo['port']} "
+        f"db={conninfo['dbname']} min={settings['min_size']} max={settings['max_size']}"
+    )
+
+    _pool = ConnectionPool(
+        kwargs={**conninfo, "row_factory": dict_row},
+        configure=_configure_connection,
+        close_returns=True,  # conn.close() → 풀 반납
+        open=False,
+        name="studyapp",
+        **settings,
+    )
+    # DB가 아직 안 떠 있어도 앱은 기동되도록 wait 하지 않음
+    _pool.open(wait=False)
+    return _pool
+
+
+def close_pool() -> None:
+    """커넥션 풀 종료 (앱 종료 시 1회)"""
+    global _pool
+    if _pool is None:
+        return
+    logger.info("Closing DB pool")
+    _pool.close()
+    _pool = None
+
+
+def get_pool() -> Optional[ConnectionPool]:
+    """열린 풀 반환 (없으면 None)"""
+    return _pool
+
+
+async def open_async_pool() -> Optional[AsyncConnectionPool]:
+    """async 커넥션 풀 생성 (앱 시작 시 1회, 이벤트 루프 안에서 호출)"""
+    global _async_pool
+    if _async_pool is not None or not is_pool_enabled():
+        return _async_pool
+
+    _async_pool = AsyncConnectionPool(
+        kwargs={**get_conninfo_kwargs(), "row_factory": dict_row},
+        configure=_configure_async_connection,
+        close_returns=True,  # await conn.close() → 풀 반납
+        open=False,
+        name="studyapp-async",
+        **_pool_settings(),
+    )
+    await _async_pool.open(wait=False)
+    return _async_pool
+
+
+async def close_async_pool() -> None:
+    """async 커넥션 풀 종료 (앱 종료 시 1회)"""
+    global _async_pool
+    if _async_pool is None:
+        return
+    logger.info("Closing async DB pool")
+    await _async_pool.close()
+    _async_pool = None
+
+
+def get_async_pool() -> Optional[AsyncConnectionPool]:
+    """열린 async 풀 반환 (없으면 None)"""
+    return _async_pool
+
+
+def _stats_of(pool, ages: list) -> dict:
+    """psycopg_pool 통계를 /health 응답 형태로 변환"""
+    stats = pool.get_stats()
+    requests_num = stats.get("requests_num", 0)
+
+    return {
+        "enabled": True,
+        "pool_min": stats.get("pool_min"),
+        "pool_max": stats.get("pool_max"),
+        "pool_size": stats.get("pool_size", 0),
+        "available": stats.get("pool_available", 0),
+        "checked_out": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests_total": requests_num,
+        "requests_queued": stats.get("requests_queued", 0),
+        "requests_errors": stats.get("requests_errors", 0),
+        "wait_ms_total": stats.get("requests_wait_ms", 0),
+        "wait_ms_avg": round(stats.get("requests_wait_ms", 0) / requests_num, 2) if requests_num else 0.0,
+        "connections_created": stats.get("connections_num", 0),
+        "connections_errors": stats.get("connections_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+        "connection_age_max_s": round(max(ages), 1) if ages else 0.0,
+        "connection_age_avg_s": round(sum(ages) / len(ages), 1) if ages else 0.0,
+    }
+
+
+def pool_stats() -> dict:
+    """
+    풀 상태 통계 (/health 용)
+
+    Returns:
+        checked_out, available, waiting, wait 시간, 커넥션 수명 등
+        (async 풀이 열려 있으면 "async" 키에 같은 형태로 포함)
+    """
+    now = time.monotonic()
+    sync_ages, async_ages = [], []
+    for conn, born in list(_connection_born_at.items()):
+        (async_ages if isinstance(conn, psycopg.AsyncConnection) else sync_ages).append(now - born)
+
+    result = _stats_of(_pool, sync_ages) if _pool is not None else {"enabled": False}
+    if _async_pool is not None:
+        result["async"] = _stats_of(_async_pool, async_ages)
+    return result
@@ -1,8 +1,161 @@
-from typing import Optional, List
-from .base_repository import BaseRepository
+import time
+from datetime import datetime
+from typing import Optional, List, Tuple
+from .base_repository import BaseRepository, AsyncBaseRepository, record_round_trip, trusted_dto, trusted_dtos
+from .lookup_cache import document_cache, cached_get, cached_set, fill_token, invalidate
+from . import query_stats
 from dto.document_dto import *
 
 
+# ==========================
+# SQL (sync / async Repository 공용)
+# ==========================
+INSERT_SQL = """
+    INSERT INTO documents (user_id, folder_id, filename, storage_path, summary_text, file_size, content_hash)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    RETURNING doc_id
+"""
+
+# 일괄 업로드용: 삽입한 행 전체를 돌려받아 다시 SELECT 하지 않음
+INSERT_RETURNING_ROW_SQL = """
+    INSERT INTO documents (user_id, folder_id, filename, storage_path, summary_text, file_size, content_hash)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    RETURNING doc_id, user_id, folder_id, filename, storage_path, summary_text, file_size, content_hash, created_at
+"""
+
+FIND_BY_DOC_ID_SQL = """
+    SELECT
+        doc_id,
+        user_id,
+        folder_id,
+        filename,
+        storage_path,
+        summary_text,
+        file_size,
+        content_hash,
+        created_at
+    FROM documents
+    WHERE doc_id = %s
+"""
+
+# 읽은 값으로 행을 고치는 경로(이름 변경)용: 캐시를 거치지 않고 행을 잠가 최신 값을 읽는다
+FIND_BY_DOC_ID_FOR_UPDATE_SQL = FIND_BY_DOC_ID_SQL.rstrip() + "\n    FOR UPDATE\n"
+
+FIND_ALL_BY_FOLDER_ID_SQL = """
+    SELECT
+        doc_id,
+        user_id,
+        folder_id,
+        filename,
+        storage_path,
+        summary_text,
+        file_size,
+        content_hash,
+        created_at
+    FROM documents
+    WHERE folder_id = %s
+    ORDER BY created_at DESC, doc_id DESC
+"""
+
+# 키셋 페이지네이션: (created_at, doc_id) 내림차순, idx_documents_folder_created 사용
+_PAGE_COLUMNS = """
+    SELECT
+        doc_id,
+        user_id,
+        folder_id,
+        filename,
+        storage_path,
+        summary_text,
+        file_size,
+        content_hash,
+        created_at
+    FROM documents
+"""
+
+FIND_FIRST_PAGE_BY_FOLDER_ID_SQL = _PAGE_COLUMNS + """
+    WHERE folder_id = %s
+    ORDER BY created_at DESC, doc_id DESC
+    LIMIT %s
+"""
+
+FIND_NEXT_PAGE_BY_FOLDER_ID_SQL = _PAGE_COLUMNS + """
+    WHERE folder_id = %s
+      AND (created_at, doc_id) < (%s, %s)
+    ORDER BY created_at DESC, doc_id DESC
+    LIMIT %s
+"""
+
+COUNT_BY_FOLDER_ID_SQL = """
+    SELECT COUNT(*) as count
+    FROM documents
+    WHERE folder_id = %s
+"""
+
+# 지운 행을 돌려받아 폴더 카운터 / blob 참조 해제를 이 값으로 계산
+# (행이 없으면 다른 요청이 이미 지운 것 → 카운터를 다시 줄이지 않음)
+DELETE_BY_DOC_ID_SQL = """
+    DELETE FROM documents
+    WHERE doc_id = %s
+    RETURNING doc_id, user_id, folder_id, filename, storage_path, summary_text, file_size, content_hash, created_at
+"""
+
+# 이름 변경 / 폴더 이동은 메타데이터만 바꾼다 (storage_path는 내용 해시 기반이라 그대로)
+UPDATE_FILENAME_SQL = """
+    UPDATE documents
+    SET filename = %s
+    WHERE doc_id = %s
+"""
+
+# 이동 전 folder_id는 같은 문장에서 행을 잠그고(FOR UPDATE) 읽는다
+# (미리 조회한 값(캐시일 수 있음)으로 카운터를 옮기면 동시 이동 시 카운터가 어긋남)
+UPDATE_FOLDER_SQL = """
+    WITH old AS (
+        SELECT doc_id, folder_id
+        FROM documents
+        WHERE doc_id = %s
+        FOR UPDATE
+    )
+    UPDATE documents d
+    SET folder_id = %s
+    FROM old
+    WHERE d.doc_id = old.doc_id
+    RETURNING d.doc_id, d.user_id, d.folder_id, d.filename, d.storage_path, d.summary_text, d.file_size,
+              d.content_hash, d.created_at, old.folder_id AS old_folder_id
+"""
+
+
+query_stats.register_queries("documents", globals())
+
+
+def _page_query(folder_id: int, limit: int, after: Optional[Tuple[datetime, int]]) -> Tuple[str, tuple]:
+    """첫 페이지 / 다음 페이지 SQL과 파라미터 선택"""
+    if after is None:
+        return FIND_FIRST_PAGE_BY_FOLDER_ID_SQL, (folder_id, limit)
+    return FIND_NEXT_PAGE_BY_FOLDER_ID_SQL, (folder_id, after[0], after[1], limit)
+
+
+def _insert_params(doc_data: dict) -> tuple:
+    """insert용 파라미터 튜플"""
+    return (
+        doc_data["user_id"],
+        doc_data["folder_id"],
+        doc_data["filename"],
+        doc_data["storage_path"],
+        doc_data["summary_text"],
+        doc_data.get("file_size", 0),
+        doc_data.get("content_hash")
+    )
+
+
+def _moved(rows: List[dict]) -> Optional[Tuple[DocumentDTO, Optional[int]]]:
+    """UPDATE_FOLDER_SQL 결과 → (변경된 문서 DTO, 이동 전 폴더 ID)"""
+    if not rows:
+        return None
+    row = rows[0]
+    old_folder_id = row.pop("old_folder_id")
+    return trusted_dto(DocumentDTO, row), old_folder_id
+
+
 class DocumentsRepository(BaseRepository):
     """문서 Repository"""
 
@@ -12,36 +165,35 @@ class DocumentsRepository(BaseRepository):
         문서 메타데이터 삽입
 
         Args:
-            doc_data: 문서 데이터 (user_id, folder_id, filename, storage_path, summary_text)
+            doc_data: 문서 데이터 (user_id, folder_id, filename, storage_path, summary_text, file_size, content_hash)
             conn: DB 연결 (트랜잭션용)
 
         Returns:
             생성된 문서 ID
         """
-        query = """
-            INSERT INTO documents (user_id, folder_id, filename, storage_path, summary_text)
-            VALUES (%s, %s, %s, %s, %s)
-            RETURNING doc_id
-        """
-
         should_close = conn is None
+        acquire_sec = None
         if conn is None:
+            acquired = time.perf_counter()
             conn = BaseRepository.get_connection()
+            acquire_sec = time.perf_counter() - acquired
 
+        params = _insert_params(doc_data)
+        started = time.perf_counter()
         try:
             with conn.cursor() as cursor:
-                cursor.execute(query, (
-                    doc_data["user_id"],
-                    doc_data["folder_id"],
-                    doc_data["filename"],
-                    doc_data["storage_path"],
-                    doc_data["summary_text"]
-                ))
+                cursor.execute(INSERT_SQL, params)
+                record_round_trip(conn)
                 result = cursor.fetchone()
+                query_stats.observe(INSERT_SQL, params, started, cursor.rowcount, acquire_sec)
                 if should_close:
                     conn.commit()  # 커밋!
+                elif result:
+                    # commit 전 새 문서가 같은 트랜잭션의 조회로 캐시에 들어가지 않게 표시
+                    invalidate(document_cache, result['doc_id'], conn)
                 return result['doc_id'] if result else None
         except Exception as e:
+            query_stats.observe(INSERT_SQL, params, started, 0, acquire_sec, error=True)
             if should_close:
                 conn.rollback()
             raise e
@@ -49,6 +201,30 @@ class DocumentsRepository(BaseRepository):
             if should_close:
                 conn.close()
 
+    @staticmethod
+    def insert_many(docs: List[dict], conn) -> List[DocumentDTO]:
+        """
+        문서 메타데이터 일괄 삽입 (executemany + RETURNING)
+
+        psycopg가 pipeline 모드로 INSERT를 한 번에 보내므로 문서 수와 상관없이 왕복 1회.
+
+        Args:
+            docs: 문서 데이터 리스트 (insert와 같은 형식)
+            conn: DB 연결 (트랜잭션용, 커밋은 호출자가)
+
+        Returns:
+            삽입된 문서 DTO 리스트 (docs 순서와 같음)
+        """
+        if not docs:
+            return []
+        started = time.perf_counter()
+        with conn.cursor() as cursor:
+            cursor.executemany(INSERT_RETURNING_ROW_SQL, [_insert_params(d) for d in docs], returning=True)
+            record_round_trip(conn)
+            inserted = [trusted_dto(DocumentDTO, cursor.fetchone()) for _ in cursor.results()]
+        query_stats.observe(INSERT_RETURNING_ROW_SQL, None, started, len(inserted))
+        return inserted
+
     @staticmethod
     def find_by_doc_id(doc_id: int, conn=None) -> Optional[DocumentDTO]:
         """
@@ -59,22 +235,30 @@ class DocumentsRepository(BaseRepository):
             conn: DB 연결 (트랜잭션용)
 
         Returns:
-            문서 DTO 또는 None
+            문서 DTO 또는 None (캐시에서 나온 DTO는 공유 객체이므로 수정하지 말 것)
         """
-        query = """
-            SELECT
-                doc_id,
-                user_id,
-                folder_id,
-                filename,
-                storage_path,
-                summary_text,
-                created_at
-            FROM documents
-            WHERE doc_id = %s
+        doc = cached_get(document_cache, doc_id, conn)
+        if doc is None:
+            token = fill_token(document_cache)
+            rows = BaseRepository.execute_query(FIND_BY_DOC_ID_SQL, (doc_id,), conn)
+            doc = trusted_dto(DocumentDTO, rows[0]) if rows else None
+            cached_set(document_cache, doc_id, doc, token, conn)
+        return doc
+
+    @staticmethod
+    def find_by_doc_id_for_update(doc_id: int, conn) -> Optional[DocumentDTO]:
         """
-        rows = BaseRepository.execute_query(query, (doc_id,), conn)
-        return DocumentDTO(**rows[0]) if rows else None
+        문서 ID로 단건 조회 (캐시를 거치지 않고 트랜잭션이 끝날 때까지 행 잠금)
+
+        Args:
+            doc_id: 문서 ID
+            conn: DB 연결 (트랜잭션용, 필수)
+
+        Returns:
+            문서 DTO 또는 None
+        """
+        rows = BaseRepository.execute_query(FIND_BY_DOC_ID_FOR_UPDATE_SQL, (doc_id,), conn)
+        return trusted_dto(DocumentDTO, rows[0]) if rows else None
 
     @staticmethod
     def find_all_by_folder_id(folder_id: int, conn=None) -> List[DocumentDTO]:
@@ -88,21 +272,28 @@ class DocumentsRepository(BaseRepository):
         Returns:
             문서 DTO 리스트
         """
-        query = """
-            SELECT
-                doc_id,
-                user_id,
-                folder_id,
-                filename,
-                storage_path,
-                summary_text,
-                created_at
-            FROM documents
-            WHERE folder_id = %s
-            ORDER BY created_at DESC
+        rows = BaseRepository.execute_query(FIND_ALL_BY_FOLDER_ID_SQL, (folder_id,), conn)
+        return trusted_dtos(DocumentDTO, rows)
+
+    @staticmethod
+    def find_page_by_folder_id(
+        folder_id: int, limit: int, after: Optional[Tuple[datetime, int]] = None, conn=None
+    ) -> List[DocumentDTO]:
+        """
+        폴더 내 문서 한 페이지 조회 (키셋 페이지네이션)
+
+        Args:
+            folder_id: 폴더 ID
+            limit: 최대 조회 개수
+            after: 이전 페이지 마지막 문서의 (created_at, doc_id), 첫 페이지면 None
+            conn: DB 연결 (트랜잭션용)
+
+        Returns:
+            문서 DTO 리스트 (created_at, doc_id 내림차순)
         """
-        rows = BaseRepository.execute_query(query, (folder_id,), conn)
-        return [DocumentDTO(**row) for row in rows]
+        query, params = _page_query(folder_id, limit, after)
+        rows = BaseRepository.execute_query(query, params, conn)
+        return trusted_dtos(DocumentDTO, rows)
 
     @staticmethod
     def count_by_folder_id(folder_id: int, conn=None) -> int:
@@ -116,16 +307,11 @@ class DocumentsRepository(BaseRepository):
         Returns:
             문서 개수
         """
-        query = """
-            SELECT COUNT(*) as count
-            FROM documents
-            WHERE folder_id = %s
-        """
-        rows = BaseRepository.execute_query(query, (folder_id,), conn)
+        rows = BaseRepository.execute_query(COUNT_BY_FOLDER_ID_SQL, (folder_id,), conn)
         return rows[0]['count'] if rows else 0
 
     @staticmethod
-    def delete_by_doc_id(doc_id: int, conn=None) -> bool:
+    def delete_by_doc_id(doc_id: int, conn=None) -> Optional[DocumentDTO]:
         """
         문서 삭제
 
@@ -134,56 +320,151 @@ class DocumentsRepository(BaseRepository):
             conn: DB 연결 (트랜잭션용)
 
         Returns:
-            삭제 성공 여부
+            삭제된 문서 DTO (이미 없으면 None)
         """
-        query = """
-            DELETE FROM documents
-            WHERE doc_id = %s
-        """
-        BaseRepository.execute_update(query, (doc_id,), conn)
-        return True
+        rows = BaseRepository.execute_query(DELETE_BY_DOC_ID_SQL, (doc_id,), conn)
+        BaseRepository.invalidate_cached(document_cache, doc_id, conn)
+        return trusted_dto(DocumentDTO, rows[0]) if rows else None
 
     @staticmethod
-    def update_filename_and_path(doc_id: int, new_filename: str, new_storage_path: str, conn=None) -> bool:
+    def update_filename(doc_id: int, new_filename: str, conn=None) -> bool:
         """
-        문서 파일명 및 저장 경로 업데이트
+        문서 파일명 업데이트 (파일 시스템 작업 없음)
 
         Args:
             doc_id: 문서 ID
             new_filename: 새 파일명
-            new_storage_path: 새 저장 경로
             conn: DB 연결 (트랜잭션용)
 
         Returns:
             업데이트 성공 여부
         """
-        query = """
-            UPDATE documents
-            SET filename = %s, storage_path = %s
-            WHERE doc_id = %s
-        """
-        BaseRepository.execute_update(query, (new_filename, new_storage_path, doc_id), conn)
+        BaseRepository.execute_update(UPDATE_FILENAME_SQL, (new_filename, doc_id), conn)
+        BaseRepository.invalidate_cached(document_cache, doc_id, conn)
         return True
 
     @staticmethod
-    def update_folder(doc_id: int, new_folder_id: int, new_filename: str, new_storage_path: str, conn=None) -> bool:
+    def update_folder(doc_id: int, new_folder_id: int, conn=None) -> Optional[Tuple[DocumentDTO, Optional[int]]]:
         """
-        문서 폴더 변경 (폴더 ID, 파일명, 저장 경로 업데이트)
+        문서 폴더 변경 (파일 시스템 작업 없음)
 
         Args:
             doc_id: 문서 ID
             new_folder_id: 새 폴더 ID
-            new_filename: 새 파일명
-            new_storage_path: 새 저장 경로
             conn: DB 연결 (트랜잭션용)
 
         Returns:
-            업데이트 성공 여부
-        """
-        query = """
-            UPDATE documents
-            SET folder_id = %s, filename = %s, storage_path = %s
-            WHERE doc_id = %s
+            (변경된 문서 DTO, 이동 전 폴더 ID), 문서가 없으면 None
         """
-        BaseRepository.execute_update(query, (new_folder_id, new_filename, new_storage_path, doc_id), conn)
+        rows = BaseRepository.execute_query(UPDATE_FOLDER_SQL, (doc_id, new_folder_id), conn)
+        BaseRepository.invalidate_cached(document_cache, doc_id, conn)
+        return _moved(rows)
+
+
+class AsyncDocumentsRepository(AsyncBaseRepository):
+    """문서 Repository (async 버전, SQL은 DocumentsRepository와 공용)"""
+
+    @staticmethod
+    async def insert(doc_data: dict, conn=None) -> int:
+        """문서 메타데이터 삽입 후 생성된 문서 ID 반환"""
+        should_close = conn is None
+        acquire_sec = None
+        if conn is None:
+            acquired = time.perf_counter()
+            conn = await AsyncBaseRepository.get_connection()
+            acquire_sec = time.perf_counter() - acquired
+
+        params = _insert_params(doc_data)
+        started = time.perf_counter()
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute(INSERT_SQL, params)
+                record_round_trip(conn)
+                result = await cursor.fetchone()
+                query_stats.observe(INSERT_SQL, params, started, cursor.rowcount, acquire_sec)
+                if should_close:
+                    await conn.commit()
+                elif result:
+                    # commit 전 새 문서가 같은 트랜잭션의 조회로 캐시에 들어가지 않게 표시
+                    invalidate(document_cache, result['doc_id'], conn)
+                return result['doc_id'] if result else None
+        except Exception as e:
+            query_stats.observe(INSERT_SQL, params, started, 0, acquire_sec, error=True)
+            if should_close:
+                await conn.rollback()
+            raise e
+        finally:
+            if should_close:
+                await conn.close()
+
+    @staticmethod
+    async def insert_many(docs: List[dict], conn) -> List[DocumentDTO]:
+        """문서 메타데이터 일괄 삽입 (executemany + RETURNING, docs 순서대로 반환)"""
+        if not docs:
+            return []
+        started = time.perf_counter()
+        async with conn.cursor() as cursor:
+            await cursor.executemany(INSERT_RETURNING_ROW_SQL, [_insert_params(d) for d in docs], returning=True)
+            record_round_trip(conn)
+            inserted = [trusted_dto(DocumentDTO, await cursor.fetchone()) async for _ in cursor.results()]
+        query_stats.observe(INSERT_RETURNING_ROW_SQL, None, started, len(inserted))
+        return inserted
+
+    @staticmethod
+    async def find_by_doc_id(doc_id: int, conn=None) -> Optional[DocumentDTO]:
+        """문서 ID로 단건 조회 (read-through 캐시)"""
+        doc = cached_get(document_cache, doc_id, conn)
+        if doc is None:
+            token = fill_token(document_cache)
+            rows = await AsyncBaseRepository.execute_query(FIND_BY_DOC_ID_SQL, (doc_id,), conn)
+            doc = trusted_dto(DocumentDTO, rows[0]) if rows else None
+            cached_set(document_cache, doc_id, doc, token, conn)
+        return doc
+
+    @staticmethod
+    async def find_by_doc_id_for_update(doc_id: int, conn) -> Optional[DocumentDTO]:
+        """문서 ID로 단건 조회 (캐시를 거치지 않고 트랜잭션이 끝날 때까지 행 잠금)"""
+        rows = await AsyncBaseRepository.execute_query(FIND_BY_DOC_ID_FOR_UPDATE_SQL, (doc_id,), conn)
+        return trusted_dto(DocumentDTO, rows[0]) if rows else None
+
+    @staticmethod
+    async def find_all_by_folder_id(folder_id: int, conn=None) -> List[DocumentDTO]:
+        """폴더 내 모든 문서 조회"""
+        rows = await AsyncBaseRepository.execute_query(FIND_ALL_BY_FOLDER_ID_SQL, (folder_id,), conn)
+        return trusted_dtos(DocumentDTO, rows)
+
+    @staticmethod
+    async def find_page_by_folder_id(
+        folder_id: int, limit: int, after: Optional[Tuple[datetime, int]] = None, conn=None
+    ) -> List[DocumentDTO]:
+        """폴더 내 문서 한 페이지 조회 (키셋 페이지네이션)"""
+        query, params = _page_query(folder_id, limit, after)
+        rows = await AsyncBaseRepository.execute_query(query, params, conn)
+        return trusted_dtos(DocumentDTO, rows)
+
+    @staticmethod
+    async def count_by_folder_id(folder_id: int, conn=None) -> int:
+        """폴더 내 문서 개수 조회"""
+        rows = await AsyncBaseRepository.execute_query(COUNT_BY_FOLDER_ID_SQL, (folder_id,), conn)
+        return rows[0]['count'] if rows else 0
+
+    @staticmethod
+    async def delete_by_doc_id(doc_id: int, conn=None) -> Optional[DocumentDTO]:
+        """문서 삭제, 삭제된 문서 DTO 반환 (이미 없으면 None)"""
+        rows = await AsyncBaseRepository.execute_query(DELETE_BY_DOC_ID_SQL, (doc_id,), conn)
+        await AsyncBaseRepository.invalidate_cached(document_cache, doc_id, conn)
+        return trusted_dto(DocumentDTO, rows[0]) if rows else None
+
+    @staticmethod
+    async def update_filename(doc_id: int, new_filename: str, conn=None) -> bool:
+        """문서 파일명 업데이트 (파일 시스템 작업 없음)"""
+        await AsyncBaseRepository.execute_update(UPDATE_FILENAME_SQL, (new_filename, doc_id), conn)
+        await AsyncBaseRepository.invalidate_cached(document_cache, doc_id, conn)
         return True
+
+    @staticmethod
+    async def update_folder(doc_id: int, new_folder_id: int, conn=None) -> Optional[Tuple[DocumentDTO, Optional[int]]]:
+        """문서 폴더 변경 (파일 시스템 작업 없음), (변경된 문서 DTO, 이동 전 폴더 ID) 반환 (문서가 없으면 None)"""
+        rows = await AsyncBaseRepository.execute_query(UPDATE_FOLDER_SQL, (doc_id, new_folder_id), conn)
+        await AsyncBaseRepository.invalidate_cached(document_cache, doc_id, conn)
+        return _moved(rows)
@@ -0,0 +1,98 @@
+"""
+Embedding Cache Repository
+청크 임베딩 영구 캐시 (embedding_cache 테이블)
+
+- 키: (모델 id, 정규화한 청크 텍스트의 SHA-256)
+  모델 id에 차원까지 넣어서 모델 / 차원이 바뀌면 예전 벡터를 쓰지 않음
+- 벡터는 pgvector 바이너리 형식으로 읽고 씀 (find_many는 binary 결과, put_many는 COPY BINARY)
+- put_many: ON CONFLICT가 필요해서 COPY로 임시 테이블에 넣은 뒤 INSERT ... SELECT 한 번
+  임시 테이블은 커넥션마다 한 번 만들고 commit 때 비워짐 (ON COMMIT DELETE ROWS, 배치마다 만들고 지우지 않음)
+- async 전용 (임베딩 서비스에서만 사용)
+"""
+import time
+from typing import Dict, List, Sequence, Tuple
+from .base_repository import AsyncBaseRepository, record_round_trip
+from .chunk_repository import vector_binary
+from . import query_stats
+
+
+# ==========================
+# SQL
+# ==========================
+FIND_MANY_SQL = """
+    SELECT content_hash, embedding
+    FROM embedding_cache
+    WHERE model = %s
+      AND content_hash = ANY(%s::char(64)[])
+"""
+
+CREATE_STAGE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS embedding_cache_stage (
+        content_hash TEXT NOT NULL,
+        embedding VECTOR NOT NULL
+    ) ON COMMIT DELETE ROWS
+"""
+
+COPY_STAGE_SQL = """
+    COPY embedding_cache_stage (content_hash, embedding) FROM STDIN (FORMAT BINARY)
+"""
+
+# 다른 워커가 같은 텍스트를 먼저 저장했으면 그대로 둠 (같은 모델이면 같은 벡터)
+MERGE_STAGE_SQL = """
+    INSERT INTO embedding_cache (model, content_hash, embedding)
+    SELECT %s, content_hash, embedding
+    FROM embedding_cache_stage
+    ON CONFLICT (model, content_hash) DO NOTHING
+"""
+
+
+query_stats.register_queries("embedding_cache", globals())
+
+
+class AsyncEmbeddingCacheRepository(AsyncBaseRepository):
+    """임베딩 캐시 Repository (async)"""
+
+    @staticmethod
+    async def find_many(model: str, content_hashes: List[str], conn) -> Dict[str, bytes]:
+        """
+        저장된 임베딩 조회
+
+        Returns:
+            {content_hash: pgvector 바이너리} (없는 해시는 빠짐)
+        """
+        if not content_hashes:
+            return {}
+        started = time.perf_counter()
+        async with conn.cursor() as cursor:
+            # vector 타입은 파이썬 쪽 로더가 없어서 binary로 받으면 bytes 그대로 옴
+            await cursor.execute(FIND_MANY_SQL, (model, content_hashes), binary=True)
+            record_round_trip(conn)
+            rows = await cursor.fetchall()
+        query_stats.observe(FIND_MANY_SQL, None, started, len(rows))
+        return {row["content_hash"]: row["embedding"] for row in rows}
+
+    @staticmethod
+    async def put_many(model: str, entries: List[Tuple[str, Sequence[float]]], conn) -> int:
+        """
+        (content_hash, 벡터) 일괄 저장 (이미 있는 키는 건너뜀)
+
+        Args:
+            conn: DB 연결 (트랜잭션용, 커밋은 호출자가)
+
+        Returns:
+            새로 저장한 행 수
+        """
+        if not entries:
+            return 0
+        started = time.perf_counter()
+        async with conn.cursor() as cursor:
+            await cursor.execute(CREATE_STAGE_SQL)
+            async with cursor.copy(COPY_STAGE_SQL) as copy:
+                copy.set_types(["text", "bytea"])
+                for content_hash, vector in entries:
+                    await copy.write_row((content_hash, vector_binary(vector)))
+            await cursor.execute(MERGE_STAGE_SQL, (model,))
+            record_round_trip(conn)
+            inserted = cursor.rowcount
+        query_stats.observe(MERGE_STAGE_SQL, None, started, inserted)
+        return inserted
@@ -2,11 +2,163 @@
 Folder Repository
 폴더 관련 데이터베이스 접근 로직 (Raw SQL)
 """
-from typing import Optional, List
-from .base_repository import BaseRepository
+import time
+from datetime import datetime
+from typing import Optional, List, Tuple
+from .base_repository import BaseRepository, AsyncBaseRepository, record_round_trip, trusted_dto, trusted_dtos
+from .lookup_cache import folder_cache, document_cache, cached_get, cached_set, fill_token, ALL_KEYS
+from . import query_stats
 from dto.folder_dto import FolderDTO
 
 
+# ==========================
+# SQL (sync / async Repository 공용)
+# ==========================
+FIND_ALL_BY_USER_ID_SQL = """
+    SELECT
+        folder_id,
+        user_id,
+        folder_name,
+        created_at
+    FROM folders
+    WHERE user_id = %s
+    ORDER BY created_at DESC
+"""
+
+# 폴더 목록 + 전체 폴더 수를 한 번의 왕복으로 조회
+# document_count / total_bytes는 업로드·삭제·이동 시 증분 갱신되는 컬럼이므로
+# 문서 테이블을 보지 않음 (idx_folders_user_created 커버링 인덱스로 index-only scan)
+FIND_ALL_WITH_DOCUMENT_COUNT_BY_USER_ID_SQL = """
+    SELECT
+        folder_id,
+        user_id,
+        folder_name,
+        created_at,
+        document_count,
+        total_bytes,
+        COUNT(*) OVER () AS total
+    FROM folders
+    WHERE user_id = %s
+    ORDER BY created_at DESC, folder_id DESC
+"""
+
+# 키셋 페이지네이션: (created_at, folder_id) 내림차순, idx_folders_user_created 사용
+_PAGE_COLUMNS = """
+    SELECT
+        folder_id,
+        user_id,
+        folder_name,
+        created_at,
+        document_count,
+        total_bytes
+    FROM folders
+"""
+
+FIND_FIRST_PAGE_BY_USER_ID_SQL = _PAGE_COLUMNS + """
+    WHERE user_id = %s
+    ORDER BY created_at DESC, folder_id DESC
+    LIMIT %s
+"""
+
+FIND_NEXT_PAGE_BY_USER_ID_SQL = _PAGE_COLUMNS + """
+    WHERE user_id = %s
+      AND (created_at, folder_id) < (%s, %s)
+    ORDER BY created_at DESC, folder_id DESC
+    LIMIT %s
+"""
+
+FIND_BY_ID_SQL = """
+    SELECT
+        folder_id,
+        user_id,
+        folder_name,
+        created_at,
+        document_count,
+        total_bytes
+    FROM folders
+    WHERE folder_id = %s
+"""
+
+COUNT_BY_USER_ID_SQL = """
+    SELECT COUNT(*) as count
+    FROM folders
+    WHERE user_id = %s
+"""
+
+CREATE_FOLDER_SQL = """
+    INSERT INTO folders (user_id, folder_name)
+    VALUES (%s, %s)
+    RETURNING folder_id, user_id, folder_name, created_at, document_count, total_bytes
+"""
+
+RENAME_FOLDER_SQL = """
+    UPDATE folders
+    SET folder_name = %s
+    WHERE folder_id = %s
+    RETURNING folder_id, user_id, folder_name, created_at, document_count, total_bytes
+"""
+
+DELETE_FOLDER_SQL = """
+    DELETE FROM folders
+    WHERE folder_id = %s
+"""
+
+ADJUST_COUNTERS_SQL = """
+    UPDATE folders
+    SET document_count = document_count + %s,
+        total_bytes = total_bytes + %s
+    WHERE folder_id = %s
+"""
+
+# 재계산 대상 폴더 배치를 잠금 (동시 업로드의 카운터 증분과 겹치지 않도록)
+LOCK_FOLDER_BATCH_SQL = """
+    SELECT folder_id
+    FROM folders
+    WHERE folder_id > %s
+    ORDER BY folder_id
+    LIMIT %s
+    FOR UPDATE
+"""
+
+# 잠근 배치의 실제 문서 개수/크기를 다시 세서 어긋난 폴더만 수정
+RECONCILE_COUNTERS_SQL = """
+    WITH actual AS (
+        SELECT
+            f.folder_id,
+            COUNT(d.doc_id) AS document_count,
+            COALESCE(SUM(d.file_size), 0) AS total_bytes
+        FROM folders f
+        LEFT JOIN documents d ON d.folder_id = f.folder_id
+        WHERE f.folder_id = ANY(%s)
+        GROUP BY f.folder_id
+    )
+    UPDATE folders f
+    SET document_count = a.document_count,
+        total_bytes = a.total_bytes
+    FROM actual a
+    WHERE f.folder_id = a.folder_id
+      AND (f.document_count <> a.document_count OR f.total_bytes <> a.total_bytes)
+"""
+
+
+query_stats.register_queries("folders", globals())
+
+
+def _page_query(user_id: int, limit: int, after: Optional[Tuple[datetime, int]]) -> Tuple[str, tuple]:
+    """첫 페이지 / 다음 페이지 SQL과 파라미터 선택"""
+    if after is None:
+        return FIND_FIRST_PAGE_BY_USER_ID_SQL, (user_id, limit)
+    return FIND_NEXT_PAGE_BY_USER_ID_SQL, (user_id, after[0], after[1], limit)
+
+
+def _folders_with_total(rows: list[dict]) -> Tuple[List[FolderDTO], int]:
+    """집계 쿼리 결과 → (FolderDTO 리스트, 전체 개수)"""
+    total = rows[0].pop('total') if rows else 0
+    for row in rows[1:]:
+        row.pop('total')
+    return trusted_dtos(FolderDTO, rows), total
+
+
 class FolderRepository(BaseRepository):
     """폴더 Repository"""
 
@@ -22,19 +174,43 @@ class FolderRepository(BaseRepository):
         Returns:
             폴더 DTO 리스트
         """
-        query = """
-            SELECT
-                folder_id,
-                user_id,
-                folder_name,
-                created_at
-            FROM folders
-            WHERE user_id = %s
-            ORDER BY created_at DESC
+        rows = BaseRepository.execute_query(FIND_ALL_BY_USER_ID_SQL, (user_id,), conn)
+        return trusted_dtos(FolderDTO, rows)
+
+    @staticmethod
+    def find_all_with_document_count_by_user_id(user_id: int, conn=None) -> Tuple[List[FolderDTO], int]:
+        """
+        특정 사용자의 모든 폴더 + 폴더별 문서 개수 + 전체 폴더 수 조회 (쿼리 1회)
+
+        Args:
+            user_id: 사용자 ID
+            conn: DB 연결 (트랜잭션용)
+
+        Returns:
+            (document_count가 채워진 폴더 DTO 리스트, 전체 폴더 개수)
+        """
+        rows = BaseRepository.execute_query(FIND_ALL_WITH_DOCUMENT_COUNT_BY_USER_ID_SQL, (user_id,), conn)
+        return _folders_with_total(rows)
+
+    @staticmethod
+    def find_page_by_user_id(
+        user_id: int, limit: int, after: Optional[Tuple[datetime, int]] = None, conn=None
+    ) -> List[FolderDTO]:
         """
+        사용자 폴더 한 페이지 조회 (키셋 페이지네이션)
+
+        Args:
+            user_id: 사용자 ID
+            limit: 최대 조회 개수
+            after: 이전 페이지 마지막 폴더의 (created_at, folder_id), 첫 페이지면 None
+            conn: DB 연결 (트랜잭션용)
 
-        rows = BaseRepository.execute_query(query, (user_id,), conn)
-        return [FolderDTO(**row) for row in rows]
+        Returns:
+            폴더 DTO 리스트 (created_at, folder_id 내림차순)
+        """
+        query, params = _page_query(user_id, limit, after)
+        rows = BaseRepository.execute_query(query, params, conn)
+        return trusted_dtos(FolderDTO, rows)
 
     @staticmethod
     def find_by_id(folder_id: int, conn=None) -> Optional[FolderDTO]:
@@ -46,20 +222,15 @@ class FolderRepository(BaseRepository):
             conn: DB 연결 (트랜잭션용)
 
         Returns:
-            폴더 DTO 또는 None
+            폴더 DTO 또는 None (캐시에서 나온 DTO는 공유 객체이므로 수정하지 말 것)
         """
-        query = """
-            SELECT
-                folder_id,
-                user_id,
-                folder_name,
-                created_at
-            FROM folders
-            WHERE folder_id = %s
-        """
-
-        rows = BaseRepository.execute_query(query, (folder_id,), conn)
-        return FolderDTO(**rows[0]) if rows else None
+        folder = cached_get(folder_cache, folder_id, conn)
+        if folder is None:
+            token = fill_token(folder_cache)
+            rows = BaseRepository.execute_query(FIND_BY_ID_SQL, (folder_id,), conn)
+            folder = trusted_dto(FolderDTO, rows[0]) if rows else None
+            cached_set(folder_cache, folder_id, folder, token, conn)
+        return folder
 
     @staticmethod
     def count_by_user_id(user_id: int, conn=None) -> int:
@@ -73,13 +244,7 @@ class FolderRepository(BaseRepository):
         Returns:
             폴더 개수
         """
-        query = """
-            SELECT COUNT(*) as count
-            FROM folders
-            WHERE user_id = %s
-        """
-
-        rows = BaseRepository.execute_query(query, (user_id,), conn)
+        rows = BaseRepository.execute_query(COUNT_BY_USER_ID_SQL, (user_id,), conn)
         return rows[0]['count'] if rows else 0
 
     @staticmethod
@@ -87,56 +252,172 @@ class FolderRepository(BaseRepository):
         """
         폴더 생성 (Raw SQL, 파라미터 바인딩)
         """
-        query = """
-            INSERT INTO folders (user_id, folder_name)
-            VALUES (%s, %s)
-            RETURNING folder_id, user_id, folder_name, created_at, document_count
-        """
+        rows = BaseRepository.execute_query(CREATE_FOLDER_SQL, (user_id, folder_name), conn)
+        return trusted_dto(FolderDTO, rows[0])
 
-        rows = BaseRepository.execute_query(query, (user_id, folder_name), conn)
-        return FolderDTO(**rows[0])
-    
     @staticmethod
     def rename_folder_by_id(folder_id: int, new_name: str, conn=None) -> FolderDTO:
-        query = """
-            UPDATE folders
-            SET folder_name = %s
-            WHERE folder_id = %s
-            RETURNING folder_id, user_id, folder_name, created_at, document_count
+        rows = BaseRepository.execute_query(RENAME_FOLDER_SQL, (new_name, folder_id), conn)
+        BaseRepository.invalidate_cached(folder_cache, folder_id, conn)
+        return trusted_dto(FolderDTO, rows[0]) if rows else None
+
+    @staticmethod
+    def adjust_counters(folder_id: int, count_delta: int, bytes_delta: int, conn=None) -> bool:
         """
-        rows = BaseRepository.execute_query(query, (new_name, folder_id), conn)
-        return FolderDTO(**rows[0]) if rows else None
+        폴더의 document_count / total_bytes 증분 갱신
+
+        Args:
+            folder_id: 폴더 ID
+            count_delta: 문서 개수 변화량 (업로드 +1, 삭제 -1)
+            bytes_delta: 총 크기 변화량 (bytes)
+            conn: DB 연결 (문서 INSERT/DELETE와 같은 트랜잭션이어야 함)
+
+        Returns:
+            갱신된 폴더가 있으면 True
+        """
+        updated = BaseRepository.execute_update(ADJUST_COUNTERS_SQL, (count_delta, bytes_delta, folder_id), conn)
+        BaseRepository.invalidate_cached(folder_cache, folder_id, conn)
+        return updated > 0
+
+    @staticmethod
+    def reconcile_counters(after_folder_id: int, batch_size: int, conn) -> Tuple[Optional[int], int]:
+        """
+        folder_id > after_folder_id 인 폴더 batch_size개의 카운터를 실제 값으로 복구
+
+        Args:
+            after_folder_id: 이전 배치의 마지막 폴더 ID (처음이면 0)
+            batch_size: 배치 크기
+            conn: DB 연결 (배치 1개 = 트랜잭션 1개, 커밋은 호출자가)
+
+        Returns:
+            (이번 배치의 마지막 폴더 ID 또는 None(끝), 수정된 폴더 수)
+        """
+        rows = BaseRepository.execute_query(LOCK_FOLDER_BATCH_SQL, (after_folder_id, batch_size), conn)
+        if not rows:
+            return None, 0
+
+        folder_ids = [row['folder_id'] for row in rows]
+        fixed = BaseRepository.execute_update(RECONCILE_COUNTERS_SQL, (folder_ids,), conn)
+        if fixed:
+            BaseRepository.invalidate_cached(folder_cache, ALL_KEYS, conn)
+        return folder_ids[-1], fixed
 
     @staticmethod
     def remove_folder_by_user_id(folder_id: int, conn=None) -> bool:
         """
         폴더 삭제
         - 삭제된 행이 1개 이상이면 True, 아니면 False 반환
-        - conn은 psycopg2 connection (FolderService에서 넘겨줌)
+        - conn은 psycopg connection (FolderService에서 넘겨줌)
         """
+        acquire_sec = None
         if conn is None:
             # 보통은 Service에서 conn을 넘겨주니까 여기 안 타지만,
             # 안전하게 방어 코드 한 번 넣어둠.
-            from .base_repository import BaseRepository  # 순환 import 피하려면 상단에서 해도 OK
+            acquired = time.perf_counter()
             conn = BaseRepository.get_connection()
+            acquire_sec = time.perf_counter() - acquired
             close_conn = True
         else:
             close_conn = False
 
+        started = time.perf_counter()
         try:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    DELETE FROM folders
-                    WHERE folder_id = %s
-                    """,
-                    (folder_id,),
-                )
+                cur.execute(DELETE_FOLDER_SQL, (folder_id,))
+                record_round_trip(conn)
                 deleted_rows = cur.rowcount  # 영향받은 행 수
+            query_stats.observe(DELETE_FOLDER_SQL, (folder_id,), started, deleted_rows, acquire_sec)
+
+            # 폴더 캐시 + 문서 캐시 (ON DELETE SET NULL로 문서의 folder_id가 바뀜)
+            if deleted_rows and not close_conn:
+                BaseRepository.invalidate_cached(folder_cache, folder_id, conn)
+                BaseRepository.invalidate_cached(document_cache, ALL_KEYS, conn)
 
             # Service에서 commit/rollback 관리하므로 여기서는 커밋 안 함
             return deleted_rows > 0
+        except Exception:
+            query_stats.observe(DELETE_FOLDER_SQL, (folder_id,), started, 0, acquire_sec, error=True)
+            raise
         finally:
             # 만약 여기서 새로 만든 conn이면 정리
             if close_conn:
                 conn.close()
+
+
+class AsyncFolderRepository(AsyncBaseRepository):
+    """폴더 Repository (async 버전, SQL은 FolderRepository와 공용)"""
+
+    @staticmethod
+    async def find_all_by_user_id(user_id: int, conn=None) -> List[FolderDTO]:
+        """특정 사용자의 모든 폴더 조회"""
+        rows = await AsyncBaseRepository.execute_query(FIND_ALL_BY_USER_ID_SQL, (user_id,), conn)
+        return trusted_dtos(FolderDTO, rows)
+
+    @staticmethod
+    async def find_all_with_document_count_by_user_id(user_id: int, conn=None) -> Tuple[List[FolderDTO], int]:
+        """특정 사용자의 모든 폴더 + 폴더별 문서 개수 + 전체 폴더 수 조회 (쿼리 1회)"""
+        rows = await AsyncBaseRepository.execute_query(
+            FIND_ALL_WITH_DOCUMENT_COUNT_BY_USER_ID_SQL, (user_id,), conn
+        )
+        return _folders_with_total(rows)
+
+    @staticmethod
+    async def find_page_by_user_id(
+        user_id: int, limit: int, after: Optional[Tuple[datetime, int]] = None, conn=None
+    ) -> List[FolderDTO]:
+        """사용자 폴더 한 페이지 조회 (키셋 페이지네이션)"""
+        query, params = _page_query(user_id, limit, after)
+        rows = await AsyncBaseRepository.execute_query(query, params, conn)
+        return trusted_dtos(FolderDTO, rows)
+
+    @staticmethod
+    async def find_by_id(folder_id: int, conn=None) -> Optional[FolderDTO]:
+        """폴더 ID로 조회 (read-through 캐시)"""
+        folder = cached_get(folder_cache, folder_id, conn)
+        if folder is None:
+            token = fill_token(folder_cache)
+            rows = await AsyncBaseRepository.execute_query(FIND_BY_ID_SQL, (folder_id,), conn)
+            folder = trusted_dto(FolderDTO, rows[0]) if rows else None
+            cached_set(folder_cache, folder_id, folder, token, conn)
+        return folder
+
+    @staticmethod
+    async def count_by_user_id(user_id: int, conn=None) -> int:
+        """사용자의 폴더 개수 조회"""
+        rows = await AsyncBaseRepository.execute_query(COUNT_BY_USER_ID_SQL, (user_id,), conn)
+        return rows[0]['count'] if rows else 0
+
+    @staticmethod
+    async def create_folder_by_user_id(user_id: int, folder_name: str, conn=None) -> FolderDTO:
+        """폴더 생성 (commit은 호출자가 관리)"""
+        rows = await AsyncBaseRepository.execute_query(CREATE_FOLDER_SQL, (user_id, folder_name), conn)
+        return trusted_dto(FolderDTO, rows[0])
+
+    @staticmethod
+    async def rename_folder_by_id(folder_id: int, new_name: str, conn=None) -> Optional[FolderDTO]:
+        """폴더 이름 변경 (commit은 호출자가 관리)"""
+        rows = await AsyncBaseRepository.execute_query(RENAME_FOLDER_SQL, (new_name, folder_id), conn)
+        await AsyncBaseRepository.invalidate_cached(folder_cache, folder_id, conn)
+        return trusted_dto(FolderDTO, rows[0]) if rows else None
+
+    @staticmethod
+    async def adjust_counters(folder_id: int, count_delta: int, bytes_delta: int, conn=None) -> bool:
+        """폴더의 document_count / total_bytes 증분 갱신 (문서 변경과 같은 트랜잭션에서)"""
+        updated = await AsyncBaseRepository.execute_update(
+            ADJUST_COUNTERS_SQL, (count_delta, bytes_delta, folder_id), conn
+        )
+        await AsyncBaseRepository.invalidate_cached(folder_cache, folder_id, conn)
+        return updated > 0
+
+    @staticmethod
+    async def remove_folder_by_user_id(folder_id: int, conn=None) -> bool:
+        """
+        폴더 삭제
+        - conn이 없으면 자체 커밋, 있으면 호출자가 commit/rollback 관리
+        """
+        deleted_rows = await AsyncBaseRepository.execute_update(DELETE_FOLDER_SQL, (folder_id,), conn)
+        if deleted_rows:
+            # 폴더 캐시 + 문서 캐시 (ON DELETE SET NULL로 문서의 folder_id가 바뀜)
+            await AsyncBaseRepository.invalidate_cached(folder_cache, folder_id, conn)
+            await AsyncBaseRepository.invalidate_cached(document_cache, ALL_KEYS, conn)
+        return deleted_rows > 0
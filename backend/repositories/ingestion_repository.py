@@ -0,0 +1,214 @@
+"""
+Ingestion Repository
+문서 수집(텍스트 추출) 작업 대기열 (document_ingestion 테이블)
+
+- 업로드 트랜잭션에서 enqueue → commit 되어야 워커에게 보임 (업로드가 rollback 되면 작업도 없음)
+- 워커는 claim_next로 한 건씩 가져감 (FOR UPDATE SKIP LOCKED → 여러 워커 프로세스가 같은 작업을 잡지 않음)
+- running 상태로 stale_sec 넘게 갱신이 없으면 워커가 죽은 것으로 보고 다른 워커가 다시 가져감
+"""
+from typing import List, Optional
+from .base_repository import BaseRepository, AsyncBaseRepository, trusted_dto
+from . import query_stats
+from dto.ingestion_dto import IngestionStatusDTO
+
+
+# ==========================
+# SQL (sync / async Repository 공용)
+# ==========================
+# 이미 있는 문서를 다시 넣으면 처음부터 다시 수집
+ENQUEUE_SQL = """
+    INSERT INTO document_ingestion (doc_id)
+    VALUES (%s)
+    ON CONFLICT (doc_id) DO UPDATE
+    SET status = 'pending', pages_total = NULL, pages_done = 0, chunks = 0, attempts = 0,
+        error = NULL, pages_per_sec = NULL, started_at = NULL, finished_at = NULL,
+        created_at = now(), updated_at = now()
+"""
+
+ENQUEUE_MANY_SQL = """
+    INSERT INTO document_ingestion (doc_id)
+    SELECT unnest(%s::integer[])
+    ON CONFLICT (doc_id) DO NOTHING
+"""
+
+# 오래된 pending부터, 또는 워커가 죽어서 멈춘 running (시도 횟수 제한 안에서)
+CLAIM_NEXT_SQL = """
+    UPDATE document_ingestion
+    SET status = 'running', attempts = attempts + 1, pages_done = 0, chunks = 0, error = NULL,
+        started_at = now(), finished_at = NULL, updated_at = now()
+    WHERE doc_id = (
+        SELECT doc_id
+        FROM document_ingestion
+        WHERE status IN ('pending', 'running')
+          AND (status = 'pending' OR updated_at < now() - make_interval(secs => %s))
+          AND attempts < %s
+        ORDER BY created_at
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING doc_id, attempts
+"""
+
+# 시도 횟수를 다 쓰고 멈춘 작업은 실패로 정리
+FAIL_EXHAUSTED_SQL = """
+    UPDATE document_ingestion
+    SET status = 'failed', error = COALESCE(error, '수집 시도 횟수 초과'), finished_at = now(), updated_at = now()
+    WHERE status IN ('pending', 'running')
+      AND (status = 'pending' OR updated_at < now() - make_interval(secs => %s))
+      AND attempts >= %s
+"""
+
+START_SQL = """
+    UPDATE document_ingestion
+    SET pages_total = %s, updated_at = now()
+    WHERE doc_id = %s
+"""
+
+PROGRESS_SQL = """
+    UPDATE document_ingestion
+    SET pages_done = %s, chunks = %s, updated_at = now()
+    WHERE doc_id = %s
+"""
+
+FINISH_SQL = """
+    UPDATE document_ingestion
+    SET status = 'done', pages_done = %s, chunks = %s, pages_per_sec = %s, finished_at = now(), updated_at = now()
+    WHERE doc_id = %s
+"""
+
+FAIL_SQL = """
+    UPDATE document_ingestion
+    SET status = 'failed', error = %s, finished_at = now(), updated_at = now()
+    WHERE doc_id = %s
+"""
+
+# 일시적인 오류 (DB 연결 등) → 다시 대기열로 (시도 횟수는 유지)
+RETRY_SQL = """
+    UPDATE document_ingestion
+    SET status = 'pending', error = %s, updated_at = now()
+    WHERE doc_id = %s
+"""
+
+# 워커 종료 시 하던 작업을 돌려놓음 (시도 횟수도 되돌림)
+REQUEUE_SQL = """
+    UPDATE document_ingestion
+    SET status = 'pending', attempts = GREATEST(attempts - 1, 0), updated_at = now()
+    WHERE doc_id = ANY(%s)
+      AND status = 'running'
+"""
+
+FIND_BY_DOC_ID_SQL = """
+    SELECT
+        doc_id,
+        status,
+        pages_total,
+        pages_done,
+        CASE WHEN pages_total > 0 THEN pages_done::float / pages_total ELSE 0 END AS progress,
+        chunks,
+        attempts,
+        error,
+        pages_per_sec,
+        created_at,
+        started_at,
+        finished_at,
+        updated_at
+    FROM document_ingestion
+    WHERE doc_id = %s
+"""
+
+COUNT_BY_STATUS_SQL = """
+    SELECT status, COUNT(*) AS count
+    FROM document_ingestion
+    GROUP BY status
+"""
+
+
+query_stats.register_queries("ingestion", globals())
+
+
+class IngestionRepository(BaseRepository):
+    """문서 수집 작업 Repository"""
+
+    @staticmethod
+    def enqueue(doc_id: int, conn=None) -> None:
+        """수집 대기열에 추가 (이미 있으면 처음부터 다시)"""
+        BaseRepository.execute_update(ENQUEUE_SQL, (doc_id,), conn)
+
+    @staticmethod
+    def enqueue_many(doc_ids: List[int], conn=None) -> int:
+        """여러 문서를 한 문장으로 추가 (이미 있는 문서는 그대로), 추가된 수 반환"""
+        if not doc_ids:
+            return 0
+        return BaseRepository.execute_update(ENQUEUE_MANY_SQL, (doc_ids,), conn)
+
+    @staticmethod
+    def find_by_doc_id(doc_id: int, conn=None) -> Optional[IngestionStatusDTO]:
+        """문서의 수집 상태 (작업이 없으면 None)"""
+        rows = BaseRepository.execute_query(FIND_BY_DOC_ID_SQL, (doc_id,), conn)
+        return trusted_dto(IngestionStatusDTO, rows[0]) if rows else None
+
+
+class AsyncIngestionRepository(AsyncBaseRepository):
+    """문서 수집 작업 Repository (async 버전, SQL은 IngestionRepository와 공용)"""
+
+    @staticmethod
+    async def enqueue(doc_id: int, conn=None) -> None:
+        """수집 대기열에 추가 (이미 있으면 처음부터 다시)"""
+        await AsyncBaseRepository.execute_update(ENQUEUE_SQL, (doc_id,), conn)
+
+    @staticmethod
+    async def enqueue_many(doc_ids: List[int], conn=None) -> int:
+        """여러 문서를 한 문장으로 추가 (이미 있는 문서는 그대로), 추가된 수 반환"""
+        if not doc_ids:
+            return 0
+        return await AsyncBaseRepository.execute_update(ENQUEUE_MANY_SQL, (doc_ids,), conn)
+
+    @staticmethod
+    async def claim_next(stale_sec: float, max_attempts: int, conn=None) -> Optional[dict]:
+        """다음 작업 1건을 running으로 바꾸고 {doc_id, attempts} 반환 (없으면 None)"""
+        rows = await AsyncBaseRepository.execute_query(CLAIM_NEXT_SQL, (stale_sec, max_attempts), conn)
+        return rows[0] if rows else None
+
+    @staticmethod
+    async def fail_exhausted(stale_sec: float, max_attempts: int, conn=None) -> int:
+        """시도 횟수를 다 쓴 작업을 failed로 정리, 정리한 수 반환"""
+        return await AsyncBaseRepository.execute_update(FAIL_EXHAUSTED_SQL, (stale_sec, max_attempts), conn)
+
+    @staticmethod
+    async def start(doc_id: int, pages_total: int, conn=None) -> None:
+        await AsyncBaseRepository.execute_update(START_SQL, (pages_total, doc_id), conn)
+
+    @staticmethod
+    async def progress(doc_id: int, pages_done: int, chunks: int, conn=None) -> None:
+        await AsyncBaseRepository.execute_update(PROGRESS_SQL, (pages_done, chunks, doc_id), conn)
+
+    @staticmethod
+    async def finish(doc_id: int, pages_done: int, chunks: int, pages_per_sec: float, conn=None) -> None:
+        await AsyncBaseRepository.execute_update(FINISH_SQL, (pages_done, chunks, pages_per_sec, doc_id), conn)
+
+    @staticmethod
+    async def fail(doc_id: int, error: str, conn=None) -> None:
+        await AsyncBaseRepository.execute_update(FAIL_SQL, (error[:1000], doc_id), conn)
+
+    @staticmethod
+    async def retry(doc_id: int, error: str, conn=None) -> None:
+        await AsyncBaseRepository.execute_update(RETRY_SQL, (error[:1000], doc_id), conn)
+
+    @staticmethod
+    async def requeue(doc_ids: List[int], conn=None) -> int:
+        """running 작업을 pending으로 되돌림 (워커 종료 시)"""
+        if not doc_ids:
+            return 0
+        return await AsyncBaseRepository.execute_update(REQUEUE_SQL, (doc_ids,), conn)
+
+    @staticmethod
+    async def find_by_doc_id(doc_id: int, conn=None) -> Optional[IngestionStatusDTO]:
+        """문서의 수집 상태 (작업이 없으면 None)"""
+        rows = await AsyncBaseRepository.execute_query(FIND_BY_DOC_ID_SQL, (doc_id,), conn)
+        return trusted_dto(IngestionStatusDTO, rows[0]) if rows else None
+
+    @staticmethod
+    async def count_by_status(conn=None) -> dict:
+        """상태별 작업 수"""
+        rows = await AsyncBaseRepository.execute_query(COUNT_BY_STATUS_SQL, None, conn)
+        return {row["status"]: row["count"] for row in rows}
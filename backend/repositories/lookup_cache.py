@@ -0,0 +1,276 @@
+"""
+Lookup Cache
+폴더 / 문서 단건 조회(find_by_id, find_by_doc_id)용 read-through 캐시
+
+- 프로세스 안 LRU + TTL, 최대 항목 수로 메모리 제한
+- 쓰기(Repository의 rename / remove / adjust_counters / delete / update_*)가 명시적으로 무효화
+- 트랜잭션 안에서 쓴 키는 그 커넥션에서 "dirty"로 기억해 두고
+  · 같은 트랜잭션에서는 캐시를 읽지도 채우지도 않음 (commit 전 값이 캐시에 들어가지 않게)
+  · 트랜잭션이 끝나면(flush_invalidations) 한 번 더 무효화 (그 사이 다른 요청이 옛 값을 채웠을 수 있음)
+- LOOKUP_CACHE_SHARED=true 이면 PostgreSQL LISTEN/NOTIFY로 다른 워커에도 무효화를 전파
+  (NOTIFY는 commit 될 때만 전달되므로 rollback 된 쓰기는 전파되지 않음)
+- 채우기 전에 버전 토큰(fill_token)을 받고, DB를 읽는 사이 그 키가 무효화됐으면 저장하지 않음
+  (다른 워커의 commit + NOTIFY보다 먼저 읽은 옛 행이 무효화 뒤에 캐시에 다시 들어가지 않게)
+- LOOKUP_CACHE_ENABLED=false 로 배포별로 끌 수 있음
+
+캐시된 DTO는 여러 요청이 공유하므로 수정하지 말고 model_copy로 복사해서 쓴다.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from weakref import WeakKeyDictionary
+
+import psycopg
+
+from .connection_pool import get_conninfo_kwargs
+from . import query_stats
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+LOOKUP_CACHE_ENABLED = _env_flag("LOOKUP_CACHE_ENABLED", "true")
+LOOKUP_CACHE_TTL_SEC = float(os.getenv("LOOKUP_CACHE_TTL_SEC", "30"))
+LOOKUP_CACHE_MAX_ENTRIES = int(os.getenv("LOOKUP_CACHE_MAX_ENTRIES", "10000"))
+
+# 여러 uvicorn 워커 사이 무효화 전파 (PostgreSQL LISTEN/NOTIFY)
+LOOKUP_CACHE_SHARED = _env_flag("LOOKUP_CACHE_SHARED", "false")
+INVALIDATION_CHANNEL = "lookup_cache_invalidate"
+NOTIFY_SQL = "SELECT pg_notify(%s, %s) AS notified"
+query_stats.register_queries("lookup_cache", globals())
+
+# 키 자리에 쓰면 캐시 전체 삭제
+ALL_KEYS = "*"
+
+
+class LookupCache:
+    """LRU + TTL 캐시 (스레드 안전, sync Repository는 스레드풀에서 호출됨)"""
+
+    def __init__(self, name: str, max_entries: int, ttl_sec: float, enabled: bool = True):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 무효화할 때마다 증가하는 버전 + 키별 마지막 무효화 버전 (최대 max_entries개)
+        # 기록에서 밀려난 키 / 전체 무효화는 _floor로 기억 (그보다 오래된 토큰의 채우기는 모두 거절)
+        self._version = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_fills = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def fill_token(self) -> int:
+        """DB를 읽기 직전의 버전 (set에 넘기면 그 뒤에 무효화된 키는 저장하지 않음)"""
+        with self._lock:
+            return self._version
+
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> None:
+        """캐시 저장 (None은 저장하지 않음 → 새로 생긴 행이 바로 보이도록)"""
+        if not self.enabled or value is None:
+            return
+        with self._lock:
+            if token is not None and (token < self._floor or self._invalidated.get(key, -1) > token):
+                # 읽는 사이 무효화됨 → 옛 값일 수 있음
+                self.stale_fills += 1
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_sec, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """키 하나 삭제 (ALL_KEYS면 전체 삭제)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.invalidations += 1
+            self._version += 1
+            if key == ALL_KEYS:
+                self._entries.clear()
+                self._invalidated.clear()
+                self._floor = self._version
+            else:
+                self._entries.pop(key, None)
+                self._invalidated[key] = self._version
+                self._invalidated.move_to_end(key)
+                if len(self._invalidated) > self.max_entries:
+                    _, oldest = self._invalidated.popitem(last=False)
+                    self._floor = max(self._floor, oldest)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl_sec,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stale_fills": self.stale_fills,
+        }
+
+
+folder_cache = LookupCache("folder", LOOKUP_CACHE_MAX_ENTRIES, LOOKUP_CACHE_TTL_SEC, LOOKUP_CACHE_ENABLED)
+document_cache = LookupCache("document", LOOKUP_CACHE_MAX_ENTRIES, LOOKUP_CACHE_TTL_SEC, LOOKUP_CACHE_ENABLED)
+
+_caches: Dict[str, LookupCache] = {cache.name: cache for cache in (folder_cache, document_cache)}
+
+
+# ==========================
+# 트랜잭션 단위 무효화 (커넥션별 dirty 키)
+# ==========================
+_dirty: "WeakKeyDictionary[Any, set]" = WeakKeyDictionary()
+_dirty_lock = threading.Lock()
+
+
+def _is_dirty(conn, cache: LookupCache, key: Hashable) -> bool:
+    if conn is None:
+        return False
+    with _dirty_lock:
+        keys = _dirty.get(conn)
+    return bool(keys) and ((cache.name, key) in keys or (cache.name, ALL_KEYS) in keys)
+
+
+def cached_get(cache: LookupCache, key: Hashable, conn=None) -> Optional[Any]:
+    """캐시 조회 (이 커넥션의 트랜잭션에서 이미 바꾼 키면 캐시를 건너뜀)"""
+    if _is_dirty(conn, cache, key):
+        return None
+    return cache.get(key)
+
+
+def fill_token(cache: LookupCache) -> int:
+    """캐시를 채울 DB 조회 직전에 호출, 결과는 cached_set에 넘김"""
+    return cache.fill_token()
+
+
+def cached_set(cache: LookupCache, key: Hashable, value: Any, token: int, conn=None) -> None:
+    """
+    캐시 저장
+
+    - 이 커넥션의 트랜잭션에서 바꾼 키면 commit 전 값이므로 저장하지 않음
+    - token(fill_token) 이후에 무효화된 키면 읽은 값이 옛 값일 수 있으므로 저장하지 않음
+    """
+    if not _is_dirty(conn, cache, key):
+        cache.set(key, value, token)
+
+
+def invalidate(cache: LookupCache, key: Hashable, conn=None) -> None:
+    """
+    키 무효화
+
+    conn이 주어지면(트랜잭션 안) 트랜잭션이 끝날 때 flush_invalidations에서 한 번 더 무효화한다.
+    """
+    cache.invalidate(key)
+    if conn is not None and cache.enabled:
+        with _dirty_lock:
+            _dirty.setdefault(conn, set()).add((cache.name, key))
+
+
+def flush_invalidations(conn) -> None:
+    """트랜잭션이 끝난 뒤(commit / rollback 모두) 호출: 이 커넥션이 바꾼 키를 다시 무효화"""
+    with _dirty_lock:
+        keys = _dirty.pop(conn, None)
+    for name, key in keys or ():
+        _caches[name].invalidate(key)
+
+
+def notify_params(cache: LookupCache, key: Hashable) -> Optional[tuple]:
+    """공유 모드면 NOTIFY_SQL 파라미터, 아니면 None"""
+    if not (LOOKUP_CACHE_SHARED and cache.enabled):
+        return None
+    return INVALIDATION_CHANNEL, f"{cache.name}:{key}"
+
+
+def cache_stats() -> dict:
+    """캐시별 hit/miss 통계 (/health 용)"""
+    stats = {name: cache.stats() for name, cache in _caches.items()}
+    stats["shared"] = LOOKUP_CACHE_SHARED
+    return stats
+
+
+# ==========================
+# 워커 간 무효화 수신 (LISTEN)
+# ==========================
+_listener_task: Optional[asyncio.Task] = None
+
+
+def _apply_notification(payload: str) -> None:
+    """'folder:12' / 'document:*' 형식의 메시지 적용"""
+    name, _, key = payload.partition(":")
+    cache = _caches.get(name)
+    if cache is None:
+        return
+    cache.invalidate(key if key == ALL_KEYS else int(key))
+
+
+async def _listen_forever(conninfo: dict) -> None:
+    backoff = 1.0
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(**conninfo, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {INVALIDATION_CHANNEL}")
+                # 연결이 끊겨 있던 동안 놓친 메시지가 있을 수 있으므로 전부 비움
+                for cache in _caches.values():
+                    cache.invalidate(ALL_KEYS)
+                logger.info(f"Lookup cache listener connected channel={INVALIDATION_CHANNEL}")
+                backoff = 1.0
+                async for notify in conn.notifies():
+                    _apply_notification(notify.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"Lookup cache listener disconnected, retrying in {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+
+async def start_invalidation_listener() -> None:
+    """공유 모드일 때 LISTEN 태스크 시작 (앱 시작 시 1번)"""
+    global _listener_task
+    if not (LOOKUP_CACHE_SHARED and LOOKUP_CACHE_ENABLED) or _listener_task is not None:
+        return
+    _listener_task = asyncio.create_task(_listen_forever(get_conninfo_kwargs()))
+
+
+async def stop_invalidation_listener() -> None:
+    """LISTEN 태스크 종료 (앱 종료 시)"""
+    global _listener_task
+    if _listener_task is None:
+        return
+    _listener_task.cancel()
+    try:
+        await _listener_task
+    except asyncio.CancelledError:
+        pass
+    _listener_task = None
@@ -0,0 +1,259 @@
+"""
+Query Stats
+쿼리별 실행 시간 / 행 수 / 커넥션 획득 시간 집계 + 느린 쿼리 로그
+
+- Repository 모듈의 *_SQL 상수를 register_queries로 등록하면 그 이름으로 집계
+  (등록되지 않은 쿼리는 "select:documents" 같은 동사:테이블 이름)
+- 쿼리 이름별 히스토그램 (HISTOGRAM_BUCKETS_MS, 누적 아님)
+- SLOW_QUERY_MS 이상 걸린 쿼리는 WARNING 로그: 이름, 시간, 행 수, 호출한 서비스 메서드, 파라미터(값 가림)
+- SLOW_QUERY_EXPLAIN=true 이면 느린 쿼리를 EXPLAIN (ANALYZE, BUFFERS)로 다시 실행해서 실행 계획도 로그
+  (같은 트랜잭션의 savepoint 안에서 실행 후 rollback → 쓰기 쿼리도 데이터가 바뀌지 않음)
+- QUERY_STATS_ENABLED=false 면 observe가 바로 반환 (쿼리당 함수 호출 1번)
+
+sync Repository는 스레드풀에서 호출되므로 집계는 lock으로 보호한다.
+"""
+import os
+import re
+import sys
+import time
+import logging
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from psycopg.rows import tuple_row
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+QUERY_STATS_ENABLED = _env_flag("QUERY_STATS_ENABLED", "true")
+
+# 0 이하면 느린 쿼리 로그 끔
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN = _env_flag("SLOW_QUERY_EXPLAIN", "false")
+
+# 히스토그램 구간 상한 (ms), 마지막 구간은 그보다 큰 값 전부
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS) "
+
+# 등록되지 않은 쿼리 이름 캐시 상한 (동적으로 만든 SQL이 끝없이 쌓이지 않게)
+_MAX_DERIVED_NAMES = 1000
+
+_QUERY_VERB_RE = re.compile(r"^\s*(\w+)")
+_QUERY_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+(\w+)", re.IGNORECASE)
+
+
+class _QueryStat:
+    """쿼리 이름 1개의 집계"""
+
+    __slots__ = (
+        "count", "errors", "rows", "total_sec", "max_sec", "buckets",
+        "acquire_count", "acquire_total_sec", "acquire_max_sec", "slow"
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_sec = 0.0
+        self.max_sec = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.acquire_count = 0
+        self.acquire_total_sec = 0.0
+        self.acquire_max_sec = 0.0
+        self.slow = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "slow": self.slow,
+            "rows": self.rows,
+            "total_ms": round(self.total_sec * 1000, 3),
+            "avg_ms": round(self.total_sec * 1000 / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_sec * 1000, 3),
+            "buckets_ms": dict(zip([*map(str, HISTOGRAM_BUCKETS_MS), "inf"], self.buckets)),
+            "acquire": {
+                "count": self.acquire_count,
+                "avg_ms": round(self.acquire_total_sec * 1000 / self.acquire_count, 3) if self.acquire_count else None,
+                "max_ms": round(self.acquire_max_sec * 1000, 3),
+            },
+        }
+
+
+_stats: Dict[str, _QueryStat] = {}
+_stats_lock = threading.Lock()
+
+# SQL 문자열 → 이름
+_names: Dict[str, str] = {}
+
+
+def register_queries(prefix: str, namespace: dict) -> None:
+    """
+    모듈의 *_SQL 상수를 쿼리 이름으로 등록 (Repository 모듈 끝에서 1번 호출)
+
+    예) register_queries("documents", globals()) → "documents.FIND_BY_DOC_ID_SQL"
+    """
+    for key, value in namespace.items():
+        if key.endswith("_SQL") and isinstance(value, str):
+            _names.setdefault(value, f"{prefix}.{key}")
+
+
+def query_name(query: str) -> str:
+    """SQL 문자열의 집계 이름"""
+    name = _names.get(query)
+    if name is None:
+        verb = _QUERY_VERB_RE.match(query)
+        table = _QUERY_TABLE_RE.search(query)
+        name = f"{verb.group(1).lower() if verb else 'sql'}:{table.group(1).lower() if table else '?'}"
+        if len(_names) < _MAX_DERIVED_NAMES:
+            _names[query] = name
+    return name
+
+
+def observe(
+    query: str,
+    params: Any,
+    started: float,
+    rows: int,
+    acquire_sec: Optional[float] = None,
+    error: bool = False
+) -> bool:
+    """
+    쿼리 1회 기록
+
+    Args:
+        query: 실행한 SQL
+        params: 쿼리 파라미터 (느린 쿼리 로그에 가려서 출력)
+        started: 실행 시작 시각 (time.perf_counter)
+        rows: 반환 / 영향받은 행 수
+        acquire_sec: 이 쿼리를 위해 커넥션을 새로 빌렸으면 그 대기 시간 (초)
+        error: 실행 중 예외가 났는지
+
+    Returns:
+        EXPLAIN을 찍어야 하면 True (호출한 쪽이 같은 커넥션으로 explain / explain_async 호출)
+    """
+    if not QUERY_STATS_ENABLED:
+        return False
+
+    elapsed = time.perf_counter() - started
+    elapsed_ms = elapsed * 1000
+    name = query_name(query)
+    slow = 0 < SLOW_QUERY_MS <= elapsed_ms
+
+    with _stats_lock:
+        stat = _stats.get(name)
+        if stat is None:
+            stat = _stats[name] = _QueryStat()
+        stat.count += 1
+        stat.rows += rows if rows > 0 else 0
+        stat.total_sec += elapsed
+        if elapsed > stat.max_sec:
+            stat.max_sec = elapsed
+        stat.buckets[_bucket_index(elapsed_ms)] += 1
+        if error:
+            stat.errors += 1
+        if slow:
+            stat.slow += 1
+        if acquire_sec is not None:
+            stat.acquire_count += 1
+            stat.acquire_total_sec += acquire_sec
+            if acquire_sec > stat.acquire_max_sec:
+                stat.acquire_max_sec = acquire_sec
+
+    if not slow:
+        return False
+
+    logger.warning(
+        f"Slow query name={name} ms={elapsed_ms:.1f} rows={rows} error={error} "
+        f"acquire_ms={acquire_sec * 1000 if acquire_sec is not None else 0:.1f} "
+        f"caller={_caller()} params={redact_params(params)}"
+    )
+    return SLOW_QUERY_EXPLAIN and not error
+
+
+def _bucket_index(elapsed_ms: float) -> int:
+    for i, upper in enumerate(HISTOGRAM_BUCKETS_MS):
+        if elapsed_ms <= upper:
+            return i
+    return len(HISTOGRAM_BUCKETS_MS)
+
+
+def _caller() -> Optional[str]:
+    """Repository 밖에서 이 쿼리를 부른 첫 함수 (보통 서비스 메서드)"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith("repositories"):
+            # co_qualname은 3.11+ (3.10에서는 클래스 이름 없이 함수 이름만)
+            return f"{module}.{getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)}"
+        frame = frame.f_back
+    return None
+
+
+def redact_params(params: Any) -> Any:
+    """로그용 파라미터: 숫자 / bool / None / 날짜만 그대로, 문자열 등은 타입과 길이만"""
+    if params is None:
+        return None
+    if isinstance(params, (tuple, list)):
+        return tuple(_redact(value) for value in params)
+    if isinstance(params, dict):
+        return {key: _redact(value) for key, value in params.items()}
+    return _redact(params)
+
+
+def _redact(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, date, datetime)):
+        return value
+    if isinstance(value, (str, bytes, bytearray, list, tuple)):
+        return f"<{type(value).__name__} len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def _log_plan(query: str, plan_rows: list) -> None:
+    plan = "\n".join(row[0] for row in plan_rows)
+    logger.warning(f"Slow query plan name={query_name(query)}\n{plan}")
+
+
+def explain(conn, query: str, params: Any) -> None:
+    """느린 쿼리를 savepoint 안에서 EXPLAIN ANALYZE 후 rollback (sync)"""
+    try:
+        with conn.transaction(force_rollback=True):
+            with conn.cursor(row_factory=tuple_row) as cursor:
+                cursor.execute(EXPLAIN_PREFIX + query, params)
+                plan_rows = cursor.fetchall()
+        _log_plan(query, plan_rows)
+    except Exception:
+        logger.exception(f"EXPLAIN failed name={query_name(query)}")
+
+
+async def explain_async(conn, query: str, params: Any) -> None:
+    """느린 쿼리를 savepoint 안에서 EXPLAIN ANALYZE 후 rollback (async)"""
+    try:
+        async with conn.transaction(force_rollback=True):
+            async with conn.cursor(row_factory=tuple_row) as cursor:
+                await cursor.execute(EXPLAIN_PREFIX + query, params)
+                plan_rows = await cursor.fetchall()
+        _log_plan(query, plan_rows)
+    except Exception:
+        logger.exception(f"EXPLAIN failed name={query_name(query)}")
+
+
+def query_stats(top: Optional[int] = None) -> dict:
+    """쿼리 이름별 집계 (총 실행 시간이 긴 순서, top개만)"""
+    with _stats_lock:
+        items = sorted(_stats.items(), key=lambda item: item[1].total_sec, reverse=True)
+        if top is not None:
+            items = items[:top]
+        return {name: stat.as_dict() for name, stat in items}
+
+
+def reset_query_stats() -> None:
+    """집계 초기화 (벤치마크용)"""
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,107 @@
+"""
+Search Repository
+청크 벡터 검색 (document_chunks.embedding, 코사인 거리)
+
+- 검색 범위는 항상 사용자의 문서 ID 목록 (find_scope) → 다른 사용자의 청크는 조건에서 빠짐
+- search_exact: cosine_distance() 함수로 정렬 → HNSW 인덱스를 타지 않고
+  idx_chunks_doc_id로 범위 안의 청크만 읽어서 정확한 top-k (범위가 작을 때)
+- search_ann: <=> 연산자로 정렬 → idx_chunks_embedding_hnsw 그래프를 따라가며 문서 ID 조건으로 거름
+  hnsw.ef_search(트랜잭션 안에서만 유지)만큼 후보를 보고 그중 범위 안 청크만 남으므로
+  범위가 전체에서 차지하는 비율이 작으면 ef_search를 그만큼 키워야 k개가 나옴 (services.search_service)
+  psycopg가 같은 쿼리를 여러 번 실행하면 prepared statement로 바꾸는데, 작은 범위로 여러 번 실행된 뒤의
+  generic plan은 문서 ID 배열 크기를 모르고 idx_chunks_doc_id + 정렬을 골라 큰 범위에서도 전체를 읽음
+  → ann 트랜잭션에서는 plan_cache_mode=force_custom_plan으로 매번 배열 크기를 보고 계획
+"""
+from typing import List, Optional, Sequence
+from .base_repository import AsyncBaseRepository
+from .chunk_repository import vector_text
+from . import query_stats
+
+
+# ==========================
+# SQL
+# ==========================
+# 검색 범위 문서 (사용자 → 폴더 → 문서 순으로 좁힘) + 문서별 청크 수 (수집 작업 기록)
+FIND_SCOPE_SQL = """
+    SELECT
+        d.doc_id,
+        d.folder_id,
+        d.filename,
+        COALESCE(i.chunks, 0) AS chunks
+    FROM documents d
+    LEFT JOIN document_ingestion i ON i.doc_id = d.doc_id
+    WHERE d.user_id = %s
+      AND (%s::integer IS NULL OR d.folder_id = %s)
+      AND (%s::integer IS NULL OR d.doc_id = %s)
+"""
+
+# 전체 청크 수 추정 (통계 값, 테이블을 세지 않음)
+ESTIMATE_CHUNKS_SQL = """
+    SELECT GREATEST(reltuples, 0)::bigint AS estimate
+    FROM pg_class
+    WHERE oid = 'document_chunks'::regclass
+"""
+
+SEARCH_EXACT_SQL = """
+    SELECT chunk_id, doc_id, page_number, chunk_text, cosine_distance(embedding, %s::vector) AS distance
+    FROM document_chunks
+    WHERE doc_id = ANY(%s::integer[])
+      AND embedding IS NOT NULL
+    ORDER BY distance
+    LIMIT %s
+"""
+
+SEARCH_ANN_SQL = """
+    SELECT chunk_id, doc_id, page_number, chunk_text, embedding <=> %s::vector AS distance
+    FROM document_chunks
+    WHERE doc_id = ANY(%s::integer[])
+    ORDER BY distance
+    LIMIT %s
+"""
+
+# 트랜잭션 안에서만 유지 (커넥션이 풀로 돌아가도 다음 요청에 남지 않음)
+SET_ANN_SETTINGS_SQL = """
+    SELECT
+        set_config('hnsw.ef_search', %s, true) AS ef_search,
+        set_config('plan_cache_mode', 'force_custom_plan', true) AS plan_cache_mode
+"""
+
+
+query_stats.register_queries("search", globals())
+
+
+class AsyncSearchRepository(AsyncBaseRepository):
+    """청크 벡터 검색 Repository (async)"""
+
+    @staticmethod
+    async def find_scope(
+        user_id: int,
+        folder_id: Optional[int] = None,
+        doc_id: Optional[int] = None,
+        conn=None
+    ) -> List[dict]:
+        """사용자의 검색 범위 문서 [{doc_id, folder_id, filename, chunks}]"""
+        return await AsyncBaseRepository.execute_query(
+            FIND_SCOPE_SQL, (user_id, folder_id, folder_id, doc_id, doc_id), conn
+        )
+
+    @staticmethod
+    async def estimate_chunks(conn=None) -> int:
+        rows = await AsyncBaseRepository.execute_query(ESTIMATE_CHUNKS_SQL, None, conn)
+        return rows[0]["estimate"] if rows else 0
+
+    @staticmethod
+    async def search_exact(vector: Sequence[float], doc_ids: List[int], k: int, conn=None) -> List[dict]:
+        """범위 안 청크 전체와 거리 계산 (정확한 top-k)"""
+        return await AsyncBaseRepository.execute_query(SEARCH_EXACT_SQL, (vector_text(vector), doc_ids, k), conn)
+
+    @staticmethod
+    async def search_ann(vector: Sequence[float], doc_ids: List[int], k: int, ef_search: int, conn) -> List[dict]:
+        """
+        HNSW 근사 검색 (후보 ef_search개 중 범위 안 청크만, k개보다 적게 나올 수 있음)
+
+        Args:
+            conn: DB 연결 (set_config가 트랜잭션 단위라서 필수)
+        """
+        await AsyncBaseRepository.execute_query(SET_ANN_SETTINGS_SQL, (str(ef_search),), conn)
+        return await AsyncBaseRepository.execute_query(SEARCH_ANN_SQL, (vector_text(vector), doc_ids, k), conn)
@@ -0,0 +1,74 @@
+"""
+Unit of Work
+요청 1건 = 커넥션 1개 = 트랜잭션 1개
+
+- 요청 동안 모든 Repository 호출이 같은 커넥션(uow.conn)을 사용
+- 끝날 때 한 번만 commit (예외 시 rollback)
+- 파일 시스템 작업은 after_commit / on_rollback 콜백으로 DB 결과와 맞춤
+- 요청별 쿼리 왕복(round-trip) 횟수를 로그로 남김
+- 트랜잭션이 끝나면 이 요청이 바꾼 폴더/문서의 조회 캐시를 다시 무효화
+"""
+import time
+import logging
+from typing import Callable
+
+from starlette.concurrency import run_in_threadpool
+
+from .base_repository import AsyncBaseRepository, track_round_trips, pop_round_trips
+from .lookup_cache import flush_invalidations
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUnitOfWork:
+    """async 라우터용 Unit of Work (FastAPI 의존성으로 요청마다 생성)"""
+
+    def __init__(self, name: str = "request"):
+        self.name = name
+        self.conn = None
+        self.round_trips = 0
+        self._after_commit: list[tuple[Callable, tuple]] = []
+        self._on_rollback: list[tuple[Callable, tuple]] = []
+
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        self._started_at = time.perf_counter()
+        self.conn = await AsyncBaseRepository.get_connection()
+        track_round_trips(self.conn)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        committed = False
+        try:
+            if exc_type is None:
+                await self.conn.commit()
+                committed = True
+            else:
+                await self.conn.rollback()
+        finally:
+            # commit 자체가 실패해도 커넥션 반납 + 캐시 무효화 + 파일 되돌리기는 수행
+            self.round_trips = pop_round_trips(self.conn)
+            flush_invalidations(self.conn)
+            await self.conn.close()
+            logger.info(
+                f"UoW[{self.name}] {'commit' if committed else 'rollback'} "
+                f"round_trips={self.round_trips} "
+                f"elapsed_ms={(time.perf_counter() - self._started_at) * 1000:.1f}"
+            )
+            await self._run_callbacks(self._after_commit if committed else self._on_rollback)
+
+    def after_commit(self, func: Callable, *args) -> None:
+        """commit 성공 후 실행할 작업 등록 (예: DB에서 지운 문서의 파일 삭제)"""
+        self._after_commit.append((func, args))
+
+    def on_rollback(self, func: Callable, *args) -> None:
+        """rollback 시 되돌릴 작업 등록 (예: 방금 저장한 파일 삭제)"""
+        self._on_rollback.append((func, args))
+
+    @staticmethod
+    async def _run_callbacks(callbacks: list) -> None:
+        """등록된 파일 시스템 작업을 스레드풀에서 실행 (역순, 실패는 로그만)"""
+        for func, args in reversed(callbacks):
+            try:
+                await run_in_threadpool(func, *args)
+            except Exception:
+                logger.exception(f"UoW callback failed: {getattr(func, '__name__', func)}")
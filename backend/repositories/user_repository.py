@@ -3,10 +3,42 @@ User Repository
 사용자 관련 DB 접근 로직
 """
 from typing import Optional
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, AsyncBaseRepository
+from . import query_stats
 from dto.user_dto import UserDTO
 
 
+# ==========================
+# SQL (sync / async Repository 공용)
+# ==========================
+FIND_BY_EMAIL_SQL = """
+    SELECT
+        user_id,
+        email,
+        password_hash,
+        created_at
+    FROM users
+    WHERE email = %s
+    LIMIT 1
+"""
+
+# password는 '평문'이고, DB에서 pgcrypto의 crypt() 함수로 해시 비교를 한다.
+FIND_BY_EMAIL_AND_PASSWORD_SQL = """
+    SELECT
+        user_id,
+        email,
+        password_hash,
+        created_at
+    FROM users
+    WHERE email = %s
+      AND password_hash = crypt(%s, password_hash)
+    LIMIT 1
+"""
+
+
+query_stats.register_queries("users", globals())
+
+
 class UserRepository(BaseRepository):
     """사용자 Repository"""
 
@@ -15,17 +47,7 @@ class UserRepository(BaseRepository):
         """
         이메일로 사용자 한 명 조회
         """
-        query = """
-            SELECT
-                user_id,
-                email,
-                password_hash,
-                created_at
-            FROM users
-            WHERE email = %s
-            LIMIT 1
-        """
-        rows = BaseRepository.execute_query(query, (email,), conn)
+        rows = BaseRepository.execute_query(FIND_BY_EMAIL_SQL, (email,), conn)
         return UserDTO(**rows[0]) if rows else None
 
     @staticmethod
@@ -36,16 +58,21 @@ class UserRepository(BaseRepository):
         여기서 password는 '평문'이고,
         DB에서 pgcrypto의 crypt() 함수로 해시 비교를 한다.
         """
-        query = """
-            SELECT
-                user_id,
-                email,
-                password_hash,
-                created_at
-            FROM users
-            WHERE email = %s
-              AND password_hash = crypt(%s, password_hash)
-            LIMIT 1
-        """
-        rows = BaseRepository.execute_query(query, (email, password), conn)
+        rows = BaseRepository.execute_query(FIND_BY_EMAIL_AND_PASSWORD_SQL, (email, password), conn)
+        return UserDTO(**rows[0]) if rows else None
+
+
+class AsyncUserRepository(AsyncBaseRepository):
+    """사용자 Repository (async 버전, SQL은 UserRepository와 공용)"""
+
+    @staticmethod
+    async def find_by_email(email: str, conn=None) -> Optional[UserDTO]:
+        """이메일로 사용자 한 명 조회"""
+        rows = await AsyncBaseRepository.execute_query(FIND_BY_EMAIL_SQL, (email,), conn)
+        return UserDTO(**rows[0]) if rows else None
+
+    @staticmethod
+    async def find_by_email_and_password(email: str, password: str, conn=None) -> Optional[UserDTO]:
+        """이메일 + 비밀번호로 사용자 인증 (crypt() 비교는 DB에서)"""
+        rows = await AsyncBaseRepository.execute_query(FIND_BY_EMAIL_AND_PASSWORD_SQL, (email, password), conn)
         return UserDTO(**rows[0]) if rows else None
@@ -25,6 +25,21 @@ CREATE TABLE IF NOT EXISTS folders (
     folder_id SERIAL PRIMARY KEY,
     user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
     folder_name VARCHAR(255) NOT NULL,
+    document_count INTEGER NOT NULL DEFAULT 0,  -- 문서 업로드/삭제/이동 시 증분 갱신
+    total_bytes BIGINT NOT NULL DEFAULT 0,      -- 폴더 내 문서 총 크기
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ==========================
+-- 파일 blob 테이블 (내용 주소 기반 저장소)
+-- ==========================
+-- 같은 내용의 PDF는 파일 1개만 저장하고 문서들이 content_hash로 참조
+-- 파일 경로: pdf_files/blobs/{hash[0:2]}/{hash[2:4]}/{hash}
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash CHAR(64) PRIMARY KEY,       -- SHA-256 (hex)
+    file_size BIGINT NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,    -- 참조하는 문서 수 (0이 되어도 바로 지우지 않음)
+    released_at TIMESTAMP,                   -- ref_count가 0이 된 시각 (scripts/gc_blobs.py가 유예 기간 후 행과 파일 삭제)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -38,6 +53,8 @@ CREATE TABLE IF NOT EXISTS documents (
     filename VARCHAR(255) NOT NULL,
     storage_path TEXT NOT NULL,
     summary_text TEXT,
+    file_size BIGINT NOT NULL DEFAULT 0,
+    content_hash CHAR(64) REFERENCES blobs(content_hash),  -- 업로드 시 계산한 SHA-256 (hex), NULL이면 blob 도입 전 문서
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -49,10 +66,43 @@ CREATE TABLE IF NOT EXISTS document_chunks (
     doc_id INTEGER NOT NULL REFERENCES documents(doc_id) ON DELETE CASCADE,
     chunk_text TEXT NOT NULL,
     page_number INTEGER,
-    embedding VECTOR(3072),  -- text-embedding-3-large 기준
+    embedding VECTOR(1536),  -- text-embedding-3-large (dimensions=1536), HNSW 인덱스 한도(2000차원) 안
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- ==========================
+-- 임베딩 캐시 테이블
+-- ==========================
+-- 같은 청크 텍스트(정규화 후 SHA-256)는 모델마다 한 번만 임베딩
+-- 모델 id에 차원이 들어 있어서 모델마다 차원이 달라도 되도록 embedding 차원은 고정하지 않음
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model VARCHAR(100) NOT NULL,      -- 모델 이름:차원 (예: text-embedding-3-large:1536)
+    content_hash CHAR(64) NOT NULL,   -- 정규화한 청크 텍스트의 SHA-256 (hex)
+    embedding VECTOR NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (model, content_hash)
+);
+
+-- ==========================
+-- 문서 수집(텍스트 추출) 작업 테이블
+-- ==========================
+-- 업로드 트랜잭션에서 pending으로 추가 → 수집 워커가 가져가서 페이지별로 추출 → document_chunks
+-- 진행 상황(pages_done / pages_total)은 추출한 페이지 묶음을 저장할 때마다 갱신
+CREATE TABLE IF NOT EXISTS document_ingestion (
+    doc_id INTEGER PRIMARY KEY REFERENCES documents(doc_id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- pending / running / done / failed
+    pages_total INTEGER,
+    pages_done INTEGER NOT NULL DEFAULT 0,
+    chunks INTEGER NOT NULL DEFAULT 0,              -- 저장한 document_chunks 행 수
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    pages_per_sec REAL,                             -- 마지막 추출 속도
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP  -- running 상태에서 오래 갱신이 없으면 워커가 죽은 것으로 보고 다시 가져감
+);
+
 -- ==========================
 -- 퀴즈 테이블
 -- ==========================
@@ -69,15 +119,40 @@ CREATE TABLE IF NOT EXISTS quizzes (
 -- 문서별 청크 조회
 CREATE INDEX IF NOT EXISTS idx_chunks_doc_id ON document_chunks(doc_id);
 
+-- 청크 벡터 검색 (GET /api/v1/search, 코사인 거리)
+-- HNSW: 학습 단계가 없어서 빈 테이블에서 만들어 두고 청크가 들어올 때마다 갱신됨 (IVFFlat은 데이터가 쌓인 뒤 lists를 정해서 다시 만들어야 함)
+-- m / ef_construction은 만들 때 고정, 검색 시 정확도 / 속도는 hnsw.ef_search (SEARCH_EF_SEARCH)로 조절
+CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+    ON document_chunks USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
 -- 폴더별 문서 조회
 CREATE INDEX IF NOT EXISTS idx_documents_folder_id ON documents(folder_id);
 
+-- 폴더별 문서 목록 키셋 페이지네이션 (created_at, doc_id 내림차순)
+CREATE INDEX IF NOT EXISTS idx_documents_folder_created
+    ON documents(folder_id, created_at DESC, doc_id DESC);
+
+-- blob 참조 문서 조회 (blobs 삭제 시 FK 검사)
+CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON documents(content_hash);
+
 -- 사용자별 문서 조회
 CREATE INDEX IF NOT EXISTS idx_documents_user_id ON documents(user_id);
 
 -- 사용자별 폴더 조회
 CREATE INDEX IF NOT EXISTS idx_folders_user_id ON folders(user_id);
 
+-- 사용자별 폴더 목록 + 키셋 페이지네이션 (created_at, folder_id 내림차순)
+-- 카운터 컬럼까지 포함한 커버링 인덱스 → index-only scan
+CREATE INDEX IF NOT EXISTS idx_folders_user_created
+    ON folders(user_id, created_at DESC, folder_id DESC)
+    INCLUDE (folder_name, document_count, total_bytes);
+
+-- 수집 워커가 가져갈 작업 (pending / running만 들어가는 작은 부분 인덱스)
+CREATE INDEX IF NOT EXISTS idx_ingestion_queue
+    ON document_ingestion(created_at)
+    WHERE status IN ('pending', 'running');
+
 -- 문서별 퀴즈 조회
 CREATE INDEX IF NOT EXISTS idx_quizzes_doc_id ON quizzes(doc_id);
 
@@ -0,0 +1 @@
+# 운영 스크립트 (python -m scripts.<name> 로 backend/ 에서 실행)
@@ -0,0 +1,148 @@
+"""
+Blob GC
+blobs.ref_count 복구 + 참조 없는 blob / 고아 파일 삭제
+
+실행 (backend/ 에서, .env 의 DB_* 사용):
+    python -m scripts.gc_blobs
+    python -m scripts.gc_blobs --batch-size 200 --min-age-sec 3600 --dry-run
+
+요청 경로(문서 삭제, 업로드 rollback)는 blob 파일을 지우지 않으므로 삭제는 여기서만 한다.
+
+1) content_hash 순서로 batch_size 개씩 잠그고 실제 참조 문서 수를 다시 세서 ref_count 복구,
+   참조가 없어진 지 min_age_sec이 지난 blob 행을 삭제하고 행을 잠근 채로(commit 전에) 파일 삭제
+   - 같은 내용의 업로드는 잠금이 풀릴 때까지 acquire에서 기다렸다가 새 행을 만들고,
+     파일이 없으면 다시 저장한다 (services.file_storage.restore_blob_if_missing)
+2) BLOB_ROOT 아래 파일 중 blobs 행이 없는 것(업로드 rollback, 중단된 임시 파일 등)을 삭제
+   - 진행 중인 업로드의 파일을 지우지 않도록 min_age_sec 보다 오래된 파일만 대상
+   - 후보 해시를 ref_count = 0 행으로 선점한 뒤에 지워서 동시에 같은 내용을 올리는 업로드와 엇갈리지 않음
+"""
+import argparse
+import os
+import re
+import time
+
+from repositories.base_repository import BaseRepository
+from repositories.blob_repository import BlobRepository
+from services.file_storage import BLOB_ROOT, blob_path
+
+
+# blob 파일 이름 (SHA-256 hex), 이 형식이 아닌 파일은 건드리지 않음
+BLOB_NAME = re.compile(r"[0-9a-f]{64}")
+
+
+def _remove_blob_files(hashes: list) -> None:
+    """blob 파일 삭제 (이미 없으면 무시)"""
+    for content_hash in hashes:
+        path = blob_path(content_hash)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def reconcile_ref_counts(batch_size: int, min_age_sec: int, dry_run: bool = False) -> int:
+    """
+    전체 blob ref_count 복구 + 참조가 없어진 지 min_age_sec이 지난 blob 삭제
+
+    Returns:
+        삭제된 blob 수
+    """
+    after_hash = ""
+    total_fixed = 0
+    total_deleted = 0
+
+    while True:
+        conn = BaseRepository.get_connection()
+        try:
+            last_hash, fixed, deleted = BlobRepository.reconcile_ref_counts(
+                after_hash, batch_size, min_age_sec, conn=conn
+            )
+            if dry_run:
+                conn.rollback()
+            else:
+                # 삭제한 행을 잠근 채로 파일 삭제 (commit이 실패해도 업로드가 파일을 다시 저장함)
+                _remove_blob_files(deleted)
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        if last_hash is None:
+            break
+
+        total_fixed += fixed
+        total_deleted += len(deleted)
+        after_hash = last_hash
+        print(f"[gc_blobs] last_hash={last_hash[:12]} fixed={fixed} deleted={len(deleted)}")
+
+    print(f"[gc_blobs] ref_count 복구 완료: fixed={total_fixed} deleted={total_deleted}")
+    return total_deleted
+
+
+def remove_orphan_files(batch_size: int, min_age_sec: int, dry_run: bool = False) -> int:
+    """
+    blobs 행이 없는 파일 삭제
+
+    Returns:
+        삭제된 파일 수
+    """
+    cutoff = time.time() - min_age_sec
+    removed = 0
+
+    def flush(candidates: dict) -> int:
+        conn = BaseRepository.get_connection()
+        try:
+            claimed = BlobRepository.claim_orphans(list(candidates), conn=conn)
+            for name in claimed:
+                print(f"[gc_blobs] orphan: {candidates[name]}")
+            if dry_run:
+                conn.rollback()
+            else:
+                _remove_blob_files(claimed)
+                BlobRepository.release_claimed(claimed, conn=conn)
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return len(claimed)
+
+    candidates = {}
+    for dirpath, _, filenames in os.walk(BLOB_ROOT):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.getmtime(path) > cutoff:
+                continue
+            # 중단된 업로드의 임시 파일
+            if name.endswith(".part"):
+                print(f"[gc_blobs] stale temp: {path}")
+                if not dry_run:
+                    os.remove(path)
+                removed += 1
+                continue
+            if not BLOB_NAME.fullmatch(name) or path != blob_path(name):
+                continue
+            candidates[name] = path
+            if len(candidates) >= batch_size:
+                removed += flush(candidates)
+                candidates = {}
+
+    if candidates:
+        removed += flush(candidates)
+
+    print(f"[gc_blobs] 고아 파일 정리 완료: removed={removed}")
+    return removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="blobs.ref_count 복구 및 고아 파일 삭제")
+    parser.add_argument("--batch-size", type=int, default=500, help="트랜잭션 1개에서 처리할 blob 수")
+    parser.add_argument(
+        "--min-age-sec", type=int, default=3600,
+        help="참조가 없어진 지 이 시간이 지난 blob / 이보다 오래된 고아 파일만 삭제"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 대상만 출력")
+    args = parser.parse_args()
+    reconcile_ref_counts(args.batch_size, args.min_age_sec, args.dry_run)
+    remove_orphan_files(args.batch_size, args.min_age_sec, args.dry_run)
@@ -0,0 +1,60 @@
+"""
+Ingestion Worker
+PDF 텍스트 추출 워커를 앱 서버와 따로 실행 (앱은 INGEST_ENABLED=false)
+
+실행 (backend/ 에서, .env 의 DB_* 사용):
+    python -m scripts.ingest_worker                 # 계속 대기열 처리 (Ctrl+C로 종료, 하던 문서는 pending으로 되돌림)
+    python -m scripts.ingest_worker --once          # 대기열이 빌 때까지만 처리
+    python -m scripts.ingest_worker --doc-id 12     # 문서 12를 처음부터 다시 추출 (대기열에 넣고 --once)
+
+- 여러 개를 띄워도 FOR UPDATE SKIP LOCKED로 문서를 나눠 가짐
+- 다른 프로세스에서 업로드한 문서는 깨우는 신호를 받지 못하므로 INGEST_POLL_SEC 주기로 확인
+"""
+import argparse
+import asyncio
+
+from app_logging import setup_logging
+from repositories.connection_pool import open_async_pool, close_async_pool
+from repositories.ingestion_repository import AsyncIngestionRepository
+from services.embedding_service import stop_embedding
+from services.ingestion_service import (
+    IngestionWorker, PageExtractor, INGEST_CONCURRENCY, INGEST_EXTRACT_WORKERS, INGEST_PAGES_PER_TASK
+)
+
+
+async def main(args) -> None:
+    setup_logging(level=args.log_level)
+    await open_async_pool()
+    worker = IngestionWorker(PageExtractor(args.workers, args.pages_per_task), args.concurrency)
+    try:
+        if args.doc_id:
+            for doc_id in args.doc_id:
+                await AsyncIngestionRepository.enqueue(doc_id)
+        if args.once or args.doc_id:
+            processed = await worker.run_until_empty()
+            print(f"[ingest] 완료: documents={processed} stats={worker.stats()}")
+            worker.extractor.shutdown()
+            return
+
+        worker.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await worker.stop()
+    finally:
+        await stop_embedding()
+        await close_async_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PDF 텍스트 추출 워커")
+    parser.add_argument("--once", action="store_true", help="대기열이 빌 때까지만 처리하고 종료")
+    parser.add_argument("--doc-id", type=int, action="append", help="이 문서를 처음부터 다시 추출 (여러 번 지정 가능)")
+    parser.add_argument("--workers", type=int, default=INGEST_EXTRACT_WORKERS, help="추출 프로세스 수")
+    parser.add_argument("--pages-per-task", type=int, default=INGEST_PAGES_PER_TASK, help="작업 1개로 추출할 페이지 수")
+    parser.add_argument("--concurrency", type=int, default=INGEST_CONCURRENCY, help="동시에 처리할 문서 수")
+    parser.add_argument("--log-level", default="INFO")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
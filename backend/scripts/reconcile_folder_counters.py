@@ -0,0 +1,63 @@
+"""
+Folder Counter Reconcile
+folders.document_count / total_bytes 가 실제 문서와 어긋난 경우 배치 단위로 복구
+
+실행 (backend/ 에서, .env 의 DB_* 사용):
+    python -m scripts.reconcile_folder_counters
+    python -m scripts.reconcile_folder_counters --batch-size 200 --sleep-ms 50
+
+- folder_id 순서로 batch_size 개씩 잠그고 다시 세서, 어긋난 폴더만 UPDATE
+- 배치 1개 = 트랜잭션 1개 (업로드/삭제와 오래 경합하지 않도록 짧게 끊음)
+"""
+import argparse
+import time
+
+from repositories.base_repository import BaseRepository
+from repositories.folder_repository import FolderRepository
+from repositories.lookup_cache import flush_invalidations
+
+
+def reconcile(batch_size: int, sleep_ms: int = 0) -> int:
+    """
+    전체 폴더 카운터 복구
+
+    Returns:
+        수정된 폴더 수
+    """
+    after_folder_id = 0
+    total_fixed = 0
+    batches = 0
+
+    while True:
+        conn = BaseRepository.get_connection()
+        try:
+            last_folder_id, fixed = FolderRepository.reconcile_counters(after_folder_id, batch_size, conn=conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            flush_invalidations(conn)
+            conn.close()
+
+        if last_folder_id is None:
+            break
+
+        batches += 1
+        total_fixed += fixed
+        after_folder_id = last_folder_id
+        print(f"[reconcile] batch={batches} last_folder_id={last_folder_id} fixed={fixed}")
+
+        if sleep_ms:
+            time.sleep(sleep_ms / 1000)
+
+    print(f"[reconcile] 완료: batches={batches} fixed={total_fixed}")
+    return total_fixed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="folders.document_count / total_bytes 복구")
+    parser.add_argument("--batch-size", type=int, default=500, help="트랜잭션 1개에서 처리할 폴더 수")
+    parser.add_argument("--sleep-ms", type=int, default=0, help="배치 사이 대기 시간 (DB 부하 조절)")
+    args = parser.parse_args()
+    reconcile(args.batch_size, args.sleep_ms)
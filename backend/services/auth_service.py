@@ -1,8 +1,15 @@
 """
 Auth Service
 로그인 관련 비즈니스 로직
+
+- 시도 횟수 제한(login_throttle)을 먼저 확인해서 거절할 요청은 해시 비교 전에 끊음
+- DB에서는 이메일로 해시만 읽고, 비교는 앱 서버 프로세스 풀(password_hasher)에서
+  (PASSWORD_VERIFY=db 이거나 풀에서 비교할 수 없는 해시 형식이면 DB crypt()로 비교)
 """
-from repositories.user_repository import UserRepository
+from typing import Optional
+from repositories.user_repository import UserRepository, AsyncUserRepository
+from services.login_throttle import login_throttle
+from services.password_hasher import app_verify_enabled, password_hasher
 from dto.user_dto import UserDTO
 
 
@@ -12,7 +19,7 @@ class AuthService:
     def __init__(self):
         self.user_repo = UserRepository()
 
-    def login(self, email: str, password: str) -> UserDTO:
+    def login(self, email: str, password: str, client_ip: Optional[str] = None) -> UserDTO:
         """
         이메일 + 비밀번호로 로그인
 
@@ -20,12 +27,60 @@ class AuthService:
             UserDTO (성공 시)
 
         Raises:
+            LoginThrottledError: 시도 횟수 초과
+            PasswordHashBusyError: 해시 비교 대기열이 가득 찬 경우
             ValueError: 이메일 또는 비밀번호가 틀린 경우
         """
-        user = self.user_repo.find_by_email_and_password(email, password)
+        login_throttle.check(email, client_ip)
+
+        if not app_verify_enabled():
+            user = self.user_repo.find_by_email_and_password(email, password)
+        else:
+            user = self.user_repo.find_by_email(email)
+            if user:
+                matched = password_hasher.verify_blocking(password, user.password_hash)
+                if matched is None:
+                    user = self.user_repo.find_by_email_and_password(email, password)
+                elif not matched:
+                    user = None
 
         if not user:
             # 이메일이 없거나 비번이 틀린 경우 모두 여기로
             raise ValueError("이메일 또는 비밀번호가 올바르지 않습니다.")
 
         return user
+
+
+class AsyncAuthService:
+    """인증 서비스 (async 버전)"""
+
+    def __init__(self):
+        self.user_repo = AsyncUserRepository()
+
+    async def login(self, email: str, password: str, client_ip: Optional[str] = None) -> UserDTO:
+        """
+        이메일 + 비밀번호로 로그인
+        해시 비교를 기다리는 동안 DB 커넥션을 잡고 있지 않음
+
+        Raises:
+            LoginThrottledError: 시도 횟수 초과
+            PasswordHashBusyError: 해시 비교 대기열이 가득 찬 경우
+            ValueError: 이메일 또는 비밀번호가 틀린 경우
+        """
+        login_throttle.check(email, client_ip)
+
+        if not app_verify_enabled():
+            user = await self.user_repo.find_by_email_and_password(email, password)
+        else:
+            user = await self.user_repo.find_by_email(email)
+            if user:
+                matched = await password_hasher.verify(password, user.password_hash)
+                if matched is None:
+                    user = await self.user_repo.find_by_email_and_password(email, password)
+                elif not matched:
+                    user = None
+
+        if not user:
+            raise ValueError("이메일 또는 비밀번호가 올바르지 않습니다.")
+
+        return user
@@ -0,0 +1,214 @@
+"""
+Chunker
+추출한 페이지 텍스트를 RAG용 청크로 나누는 스트리밍 분할기
+
+- 페이지를 하나씩 받아서(feed) 다 찬 청크부터 바로 내보냄 (generator)
+  → 들고 있는 텍스트는 만들고 있는 청크 1개 + 다음 청크로 넘길 겹침 부분뿐, 문서 전체를 모으지 않음
+- 청크 크기는 토큰 수 기준 (CHUNK_MAX_TOKENS), 이전 청크 끝 CHUNK_OVERLAP_TOKENS 토큰 정도를 다음 청크 앞에 반복
+- 자르는 단위: 줄 → 문장 → (그래도 크면) 어절 → 글자
+  강의 자료는 한 줄이 한 항목인 경우가 많아서 줄을 먼저 단위로 씀
+- 페이지 출처: 청크가 시작하는 페이지(page_number)와 끝나는 페이지(page_end)
+- 토큰 수
+  - 기본(estimate): 한글 음절 1개 = 1토큰, 영문 / 숫자는 4글자당 1토큰, 그 밖의 기호 1개 = 1토큰
+    (한국어 / 영어가 섞인 강의 자료에서 실제 BPE 토큰 수보다 조금 많게 세서 예산을 넘지 않는 쪽)
+  - CHUNK_TOKENIZER=tiktoken 이면 tiktoken (선택 의존성, CHUNK_TIKTOKEN_ENCODING)
+"""
+import os
+import re
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # 선택 의존성
+    tiktoken = None
+
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "500"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "50"))
+CHUNK_TOKENIZER = os.getenv("CHUNK_TOKENIZER", "estimate").lower()
+CHUNK_TIKTOKEN_ENCODING = os.getenv("CHUNK_TIKTOKEN_ENCODING", "cl100k_base")
+
+# 영문 / 숫자 덩어리는 4글자당 1토큰, 그 밖의 공백이 아닌 글자(한글 음절, 한자, 기호)는 1글자당 1토큰
+_ASCII_WORDS = re.compile(r"[A-Za-z]+|[0-9]+")
+_OTHER_CHARS = re.compile(r"[^\sA-Za-z0-9]")
+
+# 문장 끝 (. ! ? 。 뒤 공백), "다." "요." 같은 한국어 문장 끝도 마침표로 잡힘
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+_WORDS = re.compile(r"\S+\s*")
+
+
+class Chunk(NamedTuple):
+    """청크 1개 (overlap_chars: 앞 청크와 겹치는 text 앞부분 글자 수)"""
+    index: int
+    page_number: int
+    page_end: int
+    text: str
+    tokens: int
+    overlap_chars: int
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사 (모듈 docstring 참고)"""
+    return _OTHER_CHARS.subn("", text)[1] + sum((len(word) + 3) // 4 for word in _ASCII_WORDS.findall(text))
+
+
+def token_counter() -> Callable[[str], int]:
+    """설정된 토큰 계산 함수 (tiktoken을 쓸 수 없으면 근사)"""
+    if CHUNK_TOKENIZER == "tiktoken" and tiktoken is not None:
+        encoding = tiktoken.get_encoding(CHUNK_TIKTOKEN_ENCODING)
+        return lambda text: len(encoding.encode_ordinary(text))
+    return estimate_tokens
+
+
+class _Unit(NamedTuple):
+    """청크를 만드는 최소 단위 (sep: 앞 단위와 이을 때 넣는 구분자)"""
+    page: int
+    sep: str
+    text: str
+    tokens: int
+
+
+class Chunker:
+    """
+    페이지를 받아서 청크를 내보내는 분할기 (문서 1개당 1개)
+
+        chunker = Chunker()
+        for page_number, text in pages:
+            for chunk in chunker.feed(page_number, text):
+                ...
+        for chunk in chunker.flush():
+            ...
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = CHUNK_MAX_TOKENS,
+        overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+        count_tokens: Optional[Callable[[str], int]] = None
+    ) -> None:
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be positive")
+        self.max_tokens = max_tokens
+        # 겹침이 청크 절반을 넘으면 청크마다 새 내용이 너무 적어짐
+        self.overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+        self.count_tokens = count_tokens or token_counter()
+        self._units: List[_Unit] = []
+        self._tokens = 0
+        self._overlap_units = 0  # _units 앞쪽 중 앞 청크에서 넘어온 단위 수
+        self._index = 0
+
+    # ---------- 입력 ----------
+    def feed(self, page_number: int, text: str) -> Iterator[Chunk]:
+        """페이지 1개를 받아서 다 찬 청크들을 내보냄"""
+        for unit in self._units_of(page_number, text):
+            if self._tokens + unit.tokens > self.max_tokens:
+                if len(self._units) > self._overlap_units:
+                    yield self._emit()
+                # 넘겨받은 겹침과 새 단위가 예산을 넘으면 겹침을 앞에서부터 줄임
+                while self._units and self._tokens + unit.tokens > self.max_tokens:
+                    self._tokens -= self._units.pop(0).tokens
+                    self._overlap_units -= 1
+            self._units.append(unit)
+            self._tokens += unit.tokens
+
+    def flush(self) -> Iterator[Chunk]:
+        """남은 텍스트로 마지막 청크 (겹침만 남았으면 내보내지 않음)"""
+        if len(self._units) > self._overlap_units:
+            yield self._emit(keep_overlap=False)
+        self._units, self._tokens, self._overlap_units = [], 0, 0
+
+    # ---------- 단위 나누기 ----------
+    def _units_of(self, page_number: int, text: str) -> Iterator[_Unit]:
+        sep = "\n"  # 페이지 경계도 줄바꿈으로 이음
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            tokens = self.count_tokens(line)
+            if tokens <= self.max_tokens:
+                yield _Unit(page_number, sep, line, tokens)
+            else:
+                for i, piece in enumerate(self._split_long(line)):
+                    yield _Unit(page_number, sep if i == 0 else " ", piece, self.count_tokens(piece))
+            sep = "\n"
+
+    def _split_long(self, line: str) -> Iterator[str]:
+        """max_tokens보다 긴 줄: 문장 → 어절 → 글자 순으로 예산 안에 들어가게 자름"""
+        for sentence in _SENTENCE_END.split(line):
+            if self.count_tokens(sentence) <= self.max_tokens:
+                yield sentence
+                continue
+            piece, piece_tokens = "", 0
+            for word in _WORDS.findall(sentence):
+                word_tokens = self.count_tokens(word)
+                if word_tokens > self.max_tokens:
+                    if piece:
+                        yield piece.strip()
+                    piece, piece_tokens = "", 0
+                    yield from self._split_chars(word.strip())
+                elif piece_tokens + word_tokens > self.max_tokens:
+                    yield piece.strip()
+                    piece, piece_tokens = word, word_tokens
+                else:
+                    piece += word
+                    piece_tokens += word_tokens
+            if piece.strip():
+                yield piece.strip()
+
+    def _split_chars(self, word: str) -> Iterator[str]:
+        """공백 없이 긴 덩어리 (URL, 띄어쓰기 없는 한글 등)는 글자 수로 자르고 예산을 넘으면 줄임"""
+        start = 0
+        while start < len(word):
+            size = self.max_tokens
+            while size > 1 and self.count_tokens(word[start:start + size]) > self.max_tokens:
+                size = max(1, size * 9 // 10)
+            yield word[start:start + size]
+            start += size
+
+    # ---------- 청크 만들기 ----------
+    def _emit(self, keep_overlap: bool = True) -> Chunk:
+        """모은 단위로 청크 1개 (구분자는 공백 / 줄바꿈이라 토큰으로 세지 않음)"""
+        units = self._units
+        text_parts = [units[0].text]
+        overlap_chars = len(units[0].text) if self._overlap_units else 0
+        for position, unit in enumerate(units[1:], start=1):
+            text_parts.append(unit.sep)
+            text_parts.append(unit.text)
+            if position < self._overlap_units:
+                overlap_chars += len(unit.sep) + len(unit.text)
+        if 0 < self._overlap_units < len(units):
+            overlap_chars += len(units[self._overlap_units].sep)
+        chunk = Chunk(
+            index=self._index,
+            page_number=units[0].page,
+            page_end=units[-1].page,
+            text="".join(text_parts),
+            tokens=self._tokens,
+            overlap_chars=overlap_chars,
+        )
+        self._index += 1
+
+        # 끝에서부터 겹침 예산 안에 들어가는 단위만 다음 청크로 넘김
+        kept: List[_Unit] = []
+        kept_tokens = 0
+        if keep_overlap and self.overlap_tokens:
+            for unit in reversed(units):
+                if kept_tokens + unit.tokens > self.overlap_tokens or len(kept) + 1 >= len(units):
+                    break
+                kept.append(unit)
+                kept_tokens += unit.tokens
+        kept.reverse()
+        self._units, self._tokens, self._overlap_units = kept, kept_tokens, len(kept)
+        return chunk
+
+
+def chunk_pages(
+    pages: Iterable[Tuple[int, str]],
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+    count_tokens: Optional[Callable[[str], int]] = None
+) -> Iterator[Chunk]:
+    """(페이지 번호, 텍스트)를 차례로 읽으면서 청크를 내보내는 generator"""
+    chunker = Chunker(max_tokens, overlap_tokens, count_tokens)
+    for page_number, text in pages:
+        yield from chunker.feed(page_number, text)
+    yield from chunker.flush()
@@ -1,8 +1,26 @@
-import os, shutil
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 from repositories.documents_repository import *
 from repositories.folder_repository import * 
-from dto.document_dto import DocumentCreateDTO, DocumentDTO
+from repositories.blob_repository import BlobRepository, AsyncBlobRepository
+from repositories.ingestion_repository import IngestionRepository, AsyncIngestionRepository
+from dto.document_dto import DocumentCreateDTO, DocumentDTO, DocumentUploadResultDTO, DocumentBatchUploadDTO
+from dto.ingestion_dto import IngestionStatusDTO
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from repositories.unit_of_work import AsyncUnitOfWork
+from repositories.lookup_cache import flush_invalidations
+from services.pagination import decode_cursor, split_page, DEFAULT_PAGE_SIZE
+from services.file_storage import (
+    save_blob, restore_blob_if_missing, StoredFile, TooManyFilesError,
+    UPLOAD_BATCH_CONCURRENCY, UPLOAD_BATCH_MAX_FILES
+)
+from services.ingestion_service import wake_ingestion
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -10,6 +28,8 @@ class DocumentService:
     def __init__(self):
         self.folder_repo = FolderRepository()
         self.document_repo = DocumentsRepository()
+        self.blob_repo = BlobRepository()
+        self.ingestion_repo = IngestionRepository()
 
     #문서 업로드 구현
     def upload_file(
@@ -18,17 +38,21 @@ class DocumentService:
             create_dto : DocumentCreateDTO,
             custom_filename: str = None
     ) -> DocumentDTO :
-        print(f"[문서 업로드 서비스] 요청 받음")
-        print(f"  - 원본 파일명: {file.filename}")
-        print(f"  - 사용자 지정 파일명: {custom_filename}")
-        print(f"  - 파일 타입: {file.content_type}")
-        print(f"  - 사용자 ID: {create_dto.user_id}")
-        print(f"  - 폴더 ID: {create_dto.folder_id}")
+        logger.debug(
+            "Document upload started",
+            extra={
+                "upload_filename": file.filename,
+                "custom_filename": custom_filename,
+                "content_type": file.content_type,
+                "user_id": create_dto.user_id,
+                "folder_id": create_dto.folder_id,
+            }
+        )
 
-        #1. 폴더 존재 확인
+        #1. 폴더 존재 확인 (업로드하는 사용자의 폴더여야 함)
         folder = self.folder_repo.find_by_id(create_dto.folder_id)
-        if not folder:
-            print(f"[에러] 폴더를 찾을 수 없음: {create_dto.folder_id}")
+        if not folder or folder.user_id != create_dto.user_id:
+            logger.warning("Document upload folder not found", extra={"folder_id": create_dto.folder_id})
             raise ValueError(f"Folder with id {create_dto.folder_id} not found")
 
         #2. 파일명 처리
@@ -42,57 +66,154 @@ class DocumentService:
             # 원본 파일명 그대로 사용
             safe_filename = file.filename
 
-        #3. 저장 경로 생성
-        storage_path = f"pdf_files/{create_dto.user_id}/{create_dto.folder_id}/{safe_filename}"
-
-        #4. 파일 저장
-        self._save_file(file, storage_path)
+        #3. 파일 저장 (내용 해시 경로, 같은 내용이 이미 있으면 기존 blob 재사용)
+        stored = self._save_file(file)
 
-        #5. DB삽입 데이터 준비
+        #4. DB삽입 데이터 준비
         doc_data = {
         "user_id": create_dto.user_id,
         "folder_id": create_dto.folder_id,
         "filename": safe_filename,
-        "storage_path": storage_path,
-        "summary_text": ""  # 초기값 (나중에 AI 요약 기능 추가 가능)
+        "storage_path": stored.storage_path,
+        "summary_text": "",  # 초기값 (나중에 AI 요약 기능 추가 가능)
+        "file_size": stored.size,
+        "content_hash": stored.sha256
         }
 
-        #6. Repository 호출
-        doc_id = self.document_repo.insert(doc_data)
-        print(f"[문서 업로드 서비스] DB에 삽입된 문서 ID: {doc_id}")
-
+        #5. Repository 호출 (blob 참조 + 문서 INSERT + 폴더 카운터 증분 + 텍스트 추출 대기열을 한 트랜잭션으로)
+        #   rollback 돼도 파일은 지우지 않음 (같은 내용을 동시에 올린 다른 요청이 쓸 수 있음, 고아 파일은 GC가 정리)
+        conn = self.document_repo.get_connection()
+        try:
+            self.blob_repo.acquire(stored.sha256, stored.size, conn=conn)
+            restore_blob_if_missing(file.file, stored)
+            doc_id = self.document_repo.insert(doc_data, conn=conn)
+            if doc_id:
+                self.folder_repo.adjust_counters(create_dto.folder_id, 1, stored.size, conn=conn)
+                self.ingestion_repo.enqueue(doc_id, conn=conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            flush_invalidations(conn)
+            conn.close()
         if not doc_id:
-            print(f"[에러] 문서 삽입 실패 - doc_id가 None입니다")
+            logger.error("Document insert returned no id", extra={"folder_id": create_dto.folder_id})
             raise ValueError("문서 삽입에 실패했습니다")
+        wake_ingestion()
 
-        #7. 생성된 문서 반환
+        #6. 생성된 문서 반환
         result = self.document_repo.find_by_doc_id(doc_id)
-        print(f"[문서 업로드 서비스] 조회된 문서: {result}")
-
         if not result:
-            print(f"[에러] 문서 조회 실패 - doc_id {doc_id}로 문서를 찾을 수 없습니다")
+            logger.error("Uploaded document not found", extra={"doc_id": doc_id})
             raise ValueError(f"문서 ID {doc_id}를 찾을 수 없습니다")
 
+        logger.info(
+            "Document uploaded",
+            extra={
+                "doc_id": doc_id,
+                "user_id": create_dto.user_id,
+                "folder_id": create_dto.folder_id,
+                "file_size": stored.size,
+                "deduplicated": not stored.created,
+            }
+        )
+
         return result
 
 
+    #문서 일괄 업로드
+    def upload_files(self, files: List[UploadFile], create_dto: DocumentCreateDTO) -> DocumentBatchUploadDTO:
+        """
+        여러 파일 일괄 업로드
+
+        - 폴더 확인 1번
+        - 파일 저장은 UPLOAD_BATCH_CONCURRENCY개씩 스레드에서 동시에
+        - blob 참조 / 문서 INSERT / 폴더 카운터는 한 트랜잭션에서 각각 1문장
+
+        Returns:
+            파일별 결과 (저장에 실패한 파일만 실패로 표시, DB 오류는 전체 실패)
+
+        Raises:
+            ValueError: 폴더가 없거나 다른 사용자의 폴더인 경우
+            TooManyFilesError: 파일 수가 UPLOAD_BATCH_MAX_FILES 초과
+        """
+        _check_batch_size(files)
+        folder = self.folder_repo.find_by_id(create_dto.folder_id)
+        if not folder or folder.user_id != create_dto.user_id:
+            raise ValueError(f"Folder with id {create_dto.folder_id} not found")
+
+        with ThreadPoolExecutor(max_workers=UPLOAD_BATCH_CONCURRENCY) as executor:
+            saved = list(executor.map(_save_file_or_error, files))
+
+        stored = [s for s in saved if isinstance(s, StoredFile)]
+        conn = self.document_repo.get_connection()
+        try:
+            self.blob_repo.acquire_many([(s.sha256, s.size) for s in stored], conn=conn)
+            _restore_missing_blobs(files, saved)
+            documents = self.document_repo.insert_many(
+                [_doc_data(create_dto, file.filename, s) for file, s in zip(files, saved) if isinstance(s, StoredFile)],
+                conn=conn
+            )
+            if documents:
+                self.folder_repo.adjust_counters(
+                    create_dto.folder_id, len(documents), sum(s.size for s in stored), conn=conn
+                )
+                self.ingestion_repo.enqueue_many([d.doc_id for d in documents], conn=conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            flush_invalidations(conn)
+            conn.close()
+        if documents:
+            wake_ingestion()
+
+        return _batch_result(files, saved, documents)
+
     #문서 조회
-    def get_documents_by_folder(self, folder_id: int) -> DocumentListDTO:
+    def get_documents_by_folder(
+            self,
+            folder_id: int,
+            limit: Optional[int] = None,
+            cursor: Optional[str] = None
+    ) -> DocumentListDTO:
+        """
+        폴더 내 문서 목록 조회
+
+        Args:
+            folder_id: 폴더 ID
+            limit: 페이지 크기 (None이면 전체 조회)
+            cursor: 이전 응답의 next_cursor
+
+        Raises:
+            ValueError: 폴더가 없는 경우
+            InvalidCursorError: cursor 형식이 잘못된 경우
+        """
         #1. 폴더 존재 확인
+        after = decode_cursor(cursor)
         folder = self.folder_repo.find_by_id(folder_id)
         if not folder:
             raise ValueError(f"Folder with id {folder_id} not found")
 
-        #2. 문서 목록 조회
-        documents = self.document_repo.find_all_by_folder_id(folder_id)
+        #2. 문서 목록 조회 (limit이 있으면 키셋 페이지, limit + 1개로 다음 페이지 유무 확인)
+        next_cursor = None
+        if limit is None and after is None:
+            documents = self.document_repo.find_all_by_folder_id(folder_id)
+        else:
+            limit = limit or DEFAULT_PAGE_SIZE
+            rows = self.document_repo.find_page_by_folder_id(folder_id, limit + 1, after)
+            documents, next_cursor = split_page(rows, limit, "doc_id")
 
-        #3. 총 개수 조회
-        total = self.document_repo.count_by_folder_id(folder_id)
+        #3. 총 개수 (폴더에 증분 갱신되는 document_count 사용)
+        total = folder.document_count
 
         #4. DocumentListDTO 반환
         return DocumentListDTO(
             documents=documents,
-            total=total
+            total=total,
+            next_cursor=next_cursor
         )
 
     #문서 상세 조회
@@ -106,33 +227,67 @@ class DocumentService:
 
         #3. 반환
         return doc
-    
-    #문서 삭제
-    def delete_document(self, doc_id: int) -> bool:
-        #1. 문서 조회
-        doc = self.document_repo.find_by_doc_id(doc_id)
-
-        #2. 문서 존재 확인
-        if not doc:
-            raise ValueError(f"Document with id {doc_id} not found")
 
-        #3. 파일 경로 저장 (DB 삭제 전에 저장)
-        file_path = doc.storage_path
+    #문서 텍스트 추출 진행 상황 조회
+    def get_ingestion_status(self, doc_id: int) -> IngestionStatusDTO:
+        status = self.ingestion_repo.find_by_doc_id(doc_id)
+        if not status:
+            raise ValueError(f"Ingestion for document {doc_id} not found")
+        return status
 
-        #4. DB에서 삭제
-        self.document_repo.delete_by_doc_id(doc_id)
+    #문서 파일 조회 (다운로드용)
+    def get_document_file(self, doc_id: int) -> Tuple[DocumentDTO, os.stat_result]:
+        """
+        문서와 저장된 파일의 stat 정보 조회
 
-        #5. 물리적 파일 삭제 (DB 삭제 후)
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        Returns:
+            (문서 DTO, 파일 stat) - stat은 Content-Length / Last-Modified에 사용
 
-        #6. 성공 반환
+        Raises:
+            ValueError: 문서 또는 물리적 파일이 없는 경우
+        """
+        doc = self.get_document_detail(doc_id)
+        try:
+            stat_result = os.stat(doc.storage_path)
+        except FileNotFoundError:
+            raise ValueError(f"File for document {doc_id} not found")
+        return doc, stat_result
+    
+    #문서 삭제
+    def delete_document(self, doc_id: int) -> bool:
+        #1. DB에서 삭제 (폴더 카운터 감소 + blob 참조 해제를 한 트랜잭션으로)
+        #   카운터 / blob은 DELETE ... RETURNING으로 돌려받은 행 기준
+        #   (미리 조회한 행(캐시일 수 있음)을 쓰면 동시에 지운 요청과 두 번 줄어듦)
+        conn = self.document_repo.get_connection()
+        try:
+            doc = self.document_repo.delete_by_doc_id(doc_id, conn=conn)
+
+            #2. 문서 존재 확인 (다른 요청이 먼저 지운 경우 포함)
+            if not doc:
+                raise ValueError(f"Document with id {doc_id} not found")
+
+            if doc.folder_id is not None:
+                self.folder_repo.adjust_counters(doc.folder_id, -1, -doc.file_size, conn=conn)
+            remove_file = self._release_blob(doc, conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            flush_invalidations(conn)
+            conn.close()
+
+        #3. 예전 문서(content_hash 없음)면 물리적 파일 삭제 (DB 삭제 후)
+        if remove_file:
+            _remove_file_if_exists(doc.storage_path)
+
+        #4. 성공 반환
         return True
 
     #문서 이름 변경
     def rename_document(self, doc_id: int, new_name: str) -> DocumentDTO:
         """
-        문서 이름 변경 (파일명 + 물리적 파일)
+        문서 이름 변경 (DB의 파일명만 변경, 물리적 파일은 그대로)
 
         Args:
             doc_id: 문서 ID
@@ -144,37 +299,36 @@ class DocumentService:
         Raises:
             ValueError: 문서가 존재하지 않을 경우
         """
-        #1. 문서 조회
-        doc = self.document_repo.find_by_doc_id(doc_id)
-
-        #2. 문서 존재 확인
-        if not doc:
-            raise ValueError(f"Document with id {doc_id} not found")
-
-        #3. 기존 파일 확장자 추출
-        _, ext = os.path.splitext(doc.filename)
-
-        #4. 새 파일명 생성 (새이름.확장자)
-        new_filename = f"{new_name}{ext}"
-
-        #5. 새 저장 경로 생성
-        new_storage_path = f"pdf_files/{doc.user_id}/{doc.folder_id}/{new_filename}"
-
-        #6. 물리적 파일명 변경
-        old_path = doc.storage_path
-        if os.path.exists(old_path):
-            os.rename(old_path, new_storage_path)
-
-        #7. DB 업데이트
-        self.document_repo.update_filename_and_path(doc_id, new_filename, new_storage_path)
-
-        #8. 변경된 문서 반환
-        return self.document_repo.find_by_doc_id(doc_id)
+        #1. 문서 조회 + 존재 확인 (행을 잠그고 캐시를 거치지 않음 → 동시 이름 변경 / 이동 중에도 최신 값 기준)
+        conn = self.document_repo.get_connection()
+        try:
+            doc = self.document_repo.find_by_doc_id_for_update(doc_id, conn=conn)
+            if not doc:
+                raise ValueError(f"Document with id {doc_id} not found")
+
+            #2. 기존 파일 확장자 추출
+            _, ext = os.path.splitext(doc.filename)
+
+            #3. 새 파일명 생성 (새이름.확장자)
+            new_filename = f"{new_name}{ext}"
+
+            #4. DB 업데이트 (storage_path는 내용 해시 기반이라 바뀌지 않음)
+            self.document_repo.update_filename(doc_id, new_filename, conn=conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            flush_invalidations(conn)
+            conn.close()
+
+        #5. 변경된 문서 반환
+        return doc.model_copy(update={"filename": new_filename})
 
     #문서 폴더 변경 (이동)
     def move_document(self, doc_id: int, new_folder_id: int) -> DocumentDTO:
         """
-        문서 폴더 변경 (폴더 이동 + 파일 이동)
+        문서 폴더 변경 (DB의 폴더 ID만 변경, 물리적 파일은 그대로)
 
         Args:
             doc_id: 문서 ID
@@ -186,35 +340,31 @@ class DocumentService:
         Raises:
             ValueError: 문서 또는 폴더가 존재하지 않을 경우
         """
-        #1. 문서 조회
-        doc = self.document_repo.find_by_doc_id(doc_id)
-        if not doc:
-            raise ValueError(f"Document with id {doc_id} not found")
-
-        #2. 새 폴더 존재 확인
+        #1. 새 폴더 존재 확인
         new_folder = self.folder_repo.find_by_id(new_folder_id)
         if not new_folder:
             raise ValueError(f"Folder with id {new_folder_id} not found")
 
-        #3. 기존 파일명 그대로 사용 (폴더명 접두사 없음)
-        new_filename = doc.filename
-
-        #5. 새 저장 경로 생성
-        new_storage_path = f"pdf_files/{doc.user_id}/{new_folder_id}/{new_filename}"
-
-        #6. 새 디렉터리 생성
-        os.makedirs(os.path.dirname(new_storage_path), exist_ok=True)
-
-        #7. 물리적 파일 이동
-        old_path = doc.storage_path
-        if os.path.exists(old_path):
-            shutil.move(old_path, new_storage_path)
-
-        #8. DB 업데이트 (folder_id, filename, storage_path)
-        self.document_repo.update_folder(doc_id, new_folder_id, new_filename, new_storage_path)
-
-        #9. 변경된 문서 반환
-        return self.document_repo.find_by_doc_id(doc_id)
+        #2. DB 업데이트 (folder_id) + 두 폴더의 카운터 이동
+        #   이동 전 folder_id는 UPDATE가 행을 잠그고 돌려준 값 기준 (동시 이동에도 카운터 유지)
+        conn = self.document_repo.get_connection()
+        try:
+            moved = self.document_repo.update_folder(doc_id, new_folder_id, conn=conn)
+            if not moved:
+                raise ValueError(f"Document with id {doc_id} not found")
+            doc, old_folder_id = moved
+            for folder_id, count_delta, bytes_delta in _move_counter_deltas(doc, old_folder_id, new_folder_id):
+                self.folder_repo.adjust_counters(folder_id, count_delta, bytes_delta, conn=conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            flush_invalidations(conn)
+            conn.close()
+
+        #3. 변경된 문서 반환
+        return doc
 
 
 
@@ -236,21 +386,370 @@ class DocumentService:
         # 폴더명_파일명.확장자 형식으로 결합
         return f"{folder_name}_{name}{ext}"
 
-    def _save_file(self, file: UploadFile, storage_path: str):
+    def _release_blob(self, doc: DocumentDTO, conn) -> bool:
+        """
+        삭제되는 문서의 blob 참조 해제
+
+        Returns:
+            commit 후 물리적 파일을 지워야 하면 True
+            (content_hash가 없는 예전 문서만 파일을 혼자 쓰므로 True,
+             blob 파일은 마지막 참조여도 남겨두고 scripts/gc_blobs.py가 유예 기간 후 삭제)
         """
-        물리적 파일 저장
+        if doc.content_hash is None:
+            return True
+        self.blob_repo.release(doc.content_hash, conn=conn)
+        return False
+
+    @staticmethod
+    def _save_file(file: UploadFile) -> StoredFile:
+        """
+        물리적 파일 저장 (청크 단위 스트리밍 + 해시/크기 계산, 내용 해시 경로에 저장)
 
         Args:
             file: 업로드된 파일 객체
-            storage_path: 저장할 경로 (예: pdf_files/1/2/수학_simpledocument.pdf)
+
+        Returns:
+            StoredFile(size, sha256, storage_path, created)
+
+        Raises:
+            FileTooLargeError: UPLOAD_MAX_BYTES 초과
         """
-        # 디렉터리 생성 (부모 디렉터리가 없으면 자동 생성)
-        os.makedirs(os.path.dirname(storage_path), exist_ok=True)
+        return save_blob(file.file)
 
-        # 파일 저장
-        with open(storage_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+
+class AsyncDocumentService:
+    """
+    문서 서비스 (async 버전)
+
+    async 라우터에서 사용. DB I/O는 AsyncRepository로 await 하고,
+    파일 시스템 작업은 스레드풀로 넘겨 이벤트 루프를 막지 않는다.
+    비즈니스 규칙은 DocumentService와 동일.
+
+    id로 문서 / 폴더를 지정하는 메서드는 owner_id(토큰의 사용자)를 받아서, 다른 사용자의 것이면
+    없는 것과 같이 ValueError를 낸다 (AsyncSearchService._find_scope와 같은 규칙, None이면 확인 생략).
+
+    uow가 주어지면 모든 Repository 호출이 uow의 커넥션 하나를 공유하고,
+    commit/rollback은 uow가 요청 끝에 한 번만 한다. 파일 삭제는 commit 후에 실행한다(after_commit).
+    blob 파일은 rollback 돼도 되돌리지 않는다 (고아 파일은 scripts/gc_blobs.py가 정리).
+    """
+
+    def __init__(self, uow: Optional[AsyncUnitOfWork] = None):
+        self.uow = uow
+        self.conn = uow.conn if uow else None
+        self.folder_repo = AsyncFolderRepository()
+        self.document_repo = AsyncDocumentsRepository()
+        self.blob_repo = AsyncBlobRepository()
+        self.ingestion_repo = AsyncIngestionRepository()
+
+    async def _after_commit(self, func, *args) -> None:
+        """uow commit 후 실행 (uow가 없으면 바로 실행)"""
+        if self.uow:
+            self.uow.after_commit(func, *args)
+        else:
+            await run_in_threadpool(func, *args)
+
+    #문서 업로드 구현
+    async def upload_file(
+            self,
+            file: UploadFile,
+            create_dto: DocumentCreateDTO,
+            custom_filename: str = None
+    ) -> DocumentDTO:
+        logger.debug(
+            "Document upload started",
+            extra={
+                "upload_filename": file.filename,
+                "custom_filename": custom_filename,
+                "content_type": file.content_type,
+                "user_id": create_dto.user_id,
+                "folder_id": create_dto.folder_id,
+            }
+        )
+
+        #1. 폴더 존재 확인 (업로드하는 사용자의 폴더여야 함)
+        folder = await self.folder_repo.find_by_id(create_dto.folder_id, conn=self.conn)
+        if not folder or folder.user_id != create_dto.user_id:
+            logger.warning("Document upload folder not found", extra={"folder_id": create_dto.folder_id})
+            raise ValueError(f"Folder with id {create_dto.folder_id} not found")
+
+        #2. 파일명 처리
+        if custom_filename and custom_filename.strip():
+            _, ext = os.path.splitext(file.filename)
+            safe_filename = f"{custom_filename.strip()}{ext}"
+        else:
+            safe_filename = file.filename
+
+        #3. 파일 저장 (스레드풀에서 청크 단위 복사, 같은 내용이 이미 있으면 기존 blob 재사용)
+        stored = await run_in_threadpool(DocumentService._save_file, file)
+
+        #4. blob 참조 추가 후 그 사이 GC가 파일을 지웠으면 다시 저장
+        #   (rollback 돼도 파일은 지우지 않음, 고아 파일은 GC가 정리)
+        await self.blob_repo.acquire(stored.sha256, stored.size, conn=self.conn)
+        await run_in_threadpool(restore_blob_if_missing, file.file, stored)
+
+        #5. DB삽입 데이터 준비
+        doc_data = {
+            "user_id": create_dto.user_id,
+            "folder_id": create_dto.folder_id,
+            "filename": safe_filename,
+            "storage_path": stored.storage_path,
+            "summary_text": "",  # 초기값 (나중에 AI 요약 기능 추가 가능)
+            "file_size": stored.size,
+            "content_hash": stored.sha256
+        }
+
+        #6. Repository 호출 (폴더 카운터 증분은 같은 uow 트랜잭션)
+        doc_id = await self.document_repo.insert(doc_data, conn=self.conn)
+        if not doc_id:
+            logger.error("Document insert returned no id", extra={"folder_id": create_dto.folder_id})
+            raise ValueError("문서 삽입에 실패했습니다")
+
+        await self.folder_repo.adjust_counters(create_dto.folder_id, 1, stored.size, conn=self.conn)
+
+        #7. 텍스트 추출 대기열에 추가 (같은 트랜잭션, commit 후 수집 워커를 깨움)
+        await self.ingestion_repo.enqueue(doc_id, conn=self.conn)
+        await self._after_commit(wake_ingestion)
+
+        #8. 생성된 문서 반환
+        result = await self.document_repo.find_by_doc_id(doc_id, conn=self.conn)
+        if not result:
+            logger.error("Uploaded document not found", extra={"doc_id": doc_id})
+            raise ValueError(f"문서 ID {doc_id}를 찾을 수 없습니다")
+
+        logger.info(
+            "Document uploaded",
+            extra={
+                "doc_id": doc_id,
+                "user_id": create_dto.user_id,
+                "folder_id": create_dto.folder_id,
+                "file_size": stored.size,
+                "deduplicated": not stored.created,
+            }
+        )
+
+        return result
+
+    #문서 일괄 업로드
+    async def upload_files(self, files: List[UploadFile], create_dto: DocumentCreateDTO) -> DocumentBatchUploadDTO:
+        """여러 파일 일괄 업로드, 규칙은 DocumentService.upload_files와 동일 (파일 저장은 세마포어로 동시 실행 수 제한)"""
+        if self.uow is None:
+            # 일괄 INSERT는 트랜잭션 하나가 필요하므로 uow 없이 호출되면 직접 만든다
+            async with AsyncUnitOfWork("upload_files") as uow:
+                return await AsyncDocumentService(uow).upload_files(files, create_dto)
+
+        #1. 파일 수 / 폴더 확인 (1번만, 업로드하는 사용자의 폴더여야 함)
+        _check_batch_size(files)
+        folder = await self.folder_repo.find_by_id(create_dto.folder_id, conn=self.conn)
+        if not folder or folder.user_id != create_dto.user_id:
+            raise ValueError(f"Folder with id {create_dto.folder_id} not found")
+
+        #2. 파일 저장 (스레드풀, 최대 UPLOAD_BATCH_CONCURRENCY개 동시)
+        semaphore = asyncio.Semaphore(UPLOAD_BATCH_CONCURRENCY)
+
+        async def save(file: UploadFile):
+            async with semaphore:
+                return await run_in_threadpool(_save_file_or_error, file)
+
+        saved = await asyncio.gather(*(save(file) for file in files))
+        stored = [s for s in saved if isinstance(s, StoredFile)]
+
+        #3. blob 참조 일괄 추가 후 그 사이 GC가 지운 파일은 다시 저장 (rollback 돼도 파일은 지우지 않음)
+        await self.blob_repo.acquire_many([(s.sha256, s.size) for s in stored], conn=self.conn)
+        await run_in_threadpool(_restore_missing_blobs, files, saved)
+
+        #4. 문서 일괄 INSERT (RETURNING으로 행 전체를 받아서 다시 조회하지 않음)
+        documents = await self.document_repo.insert_many(
+            [_doc_data(create_dto, file.filename, s) for file, s in zip(files, saved) if isinstance(s, StoredFile)],
+            conn=self.conn
+        )
+
+        #5. 폴더 카운터 한 번에 증분 + 텍스트 추출 대기열에 추가
+        if documents:
+            await self.folder_repo.adjust_counters(
+                create_dto.folder_id, len(documents), sum(s.size for s in stored), conn=self.conn
+            )
+            await self.ingestion_repo.enqueue_many([d.doc_id for d in documents], conn=self.conn)
+            await self._after_commit(wake_ingestion)
+
+        return _batch_result(files, saved, documents)
+
+    #문서 조회
+    async def get_documents_by_folder(
+            self,
+            folder_id: int,
+            limit: Optional[int] = None,
+            cursor: Optional[str] = None,
+            owner_id: Optional[int] = None
+    ) -> DocumentListDTO:
+        """폴더 내 문서 목록 조회 (limit/cursor가 있으면 키셋 페이지)"""
+        after = decode_cursor(cursor)
+        folder = await self._find_owned_folder(folder_id, owner_id)
+
+        next_cursor = None
+        if limit is None and after is None:
+            documents = await self.document_repo.find_all_by_folder_id(folder_id, conn=self.conn)
+        else:
+            limit = limit or DEFAULT_PAGE_SIZE
+            rows = await self.document_repo.find_page_by_folder_id(folder_id, limit + 1, after, conn=self.conn)
+            documents, next_cursor = split_page(rows, limit, "doc_id")
+
+        return DocumentListDTO(
+            documents=documents,
+            total=folder.document_count,
+            next_cursor=next_cursor
+        )
+
+    #문서 상세 조회
+    async def get_document_detail(self, doc_id: int, owner_id: Optional[int] = None) -> DocumentDTO:
+        return await self._find_owned(doc_id, owner_id)
+
+    #문서 텍스트 추출 진행 상황 조회
+    async def get_ingestion_status(self, doc_id: int, owner_id: Optional[int] = None) -> IngestionStatusDTO:
+        """추출 작업이 없으면 (마이그레이션 전 문서 등) ValueError"""
+        if owner_id is not None:
+            await self._find_owned(doc_id, owner_id)
+        status = await self.ingestion_repo.find_by_doc_id(doc_id, conn=self.conn)
+        if not status:
+            raise ValueError(f"Ingestion for document {doc_id} not found")
+        return status
+
+    #문서 파일 조회 (다운로드용)
+    async def get_document_file(self, doc_id: int, owner_id: Optional[int] = None) -> Tuple[DocumentDTO, os.stat_result]:
+        """문서와 저장된 파일의 stat 정보 조회 (stat은 스레드풀에서)"""
+        doc = await self._find_owned(doc_id, owner_id)
+        try:
+            stat_result = await run_in_threadpool(os.stat, doc.storage_path)
+        except FileNotFoundError:
+            raise ValueError(f"File for document {doc_id} not found")
+        return doc, stat_result
+
+    #문서 삭제
+    async def delete_document(self, doc_id: int, owner_id: Optional[int] = None) -> bool:
+        """문서 삭제, 규칙은 DocumentService.delete_document와 동일 (카운터 / blob은 삭제된 행 기준)"""
+        if owner_id is not None:
+            await self._find_owned(doc_id, owner_id)
+        doc = await self.document_repo.delete_by_doc_id(doc_id, conn=self.conn)
+        if not doc:
+            raise ValueError(f"Document with id {doc_id} not found")
+
+        if doc.folder_id is not None:
+            await self.folder_repo.adjust_counters(doc.folder_id, -1, -doc.file_size, conn=self.conn)
+        # blob 파일은 GC가 지우고, 예전 문서(content_hash 없음)의 파일만 commit 후 삭제
+        if doc.content_hash is None:
+            await self._after_commit(_remove_file_if_exists, doc.storage_path)
+        else:
+            await self.blob_repo.release(doc.content_hash, conn=self.conn)
+
+        return True
+
+    #문서 이름 변경
+    async def rename_document(self, doc_id: int, new_name: str, owner_id: Optional[int] = None) -> DocumentDTO:
+        """문서 이름 변경 (DB의 파일명만 변경), 규칙은 DocumentService.rename_document와 동일"""
+        doc = await self.document_repo.find_by_doc_id_for_update(doc_id, conn=self.conn)
+        if not doc or (owner_id is not None and doc.user_id != owner_id):
+            raise ValueError(f"Document with id {doc_id} not found")
+
+        _, ext = os.path.splitext(doc.filename)
+        new_filename = f"{new_name}{ext}"
+        await self.document_repo.update_filename(doc_id, new_filename, conn=self.conn)
+
+        return doc.model_copy(update={"filename": new_filename})
+
+    #문서 폴더 변경 (이동)
+    async def move_document(self, doc_id: int, new_folder_id: int, owner_id: Optional[int] = None) -> DocumentDTO:
+        """문서 폴더 변경 (DB의 폴더 ID만 변경), 규칙은 DocumentService.move_document와 동일"""
+        if owner_id is not None:
+            await self._find_owned(doc_id, owner_id)
+        await self._find_owned_folder(new_folder_id, owner_id)
+
+        moved = await self.document_repo.update_folder(doc_id, new_folder_id, conn=self.conn)
+        if not moved:
+            raise ValueError(f"Document with id {doc_id} not found")
+        doc, old_folder_id = moved
+        for folder_id, count_delta, bytes_delta in _move_counter_deltas(doc, old_folder_id, new_folder_id):
+            await self.folder_repo.adjust_counters(folder_id, count_delta, bytes_delta, conn=self.conn)
+
+        return doc
+
+    async def _find_owned(self, doc_id: int, owner_id: Optional[int]) -> DocumentDTO:
+        """문서 조회, 없거나 owner_id가 아닌 사용자의 문서면 ValueError (user_id는 바뀌지 않으므로 캐시 조회로 충분)"""
+        doc = await self.document_repo.find_by_doc_id(doc_id, conn=self.conn)
+        if not doc or (owner_id is not None and doc.user_id != owner_id):
+            raise ValueError(f"Document with id {doc_id} not found")
+        return doc
+
+    async def _find_owned_folder(self, folder_id: int, owner_id: Optional[int]) -> FolderDTO:
+        """폴더 조회, 없거나 owner_id가 아닌 사용자의 폴더면 ValueError"""
+        folder = await self.folder_repo.find_by_id(folder_id, conn=self.conn)
+        if not folder or (owner_id is not None and folder.user_id != owner_id):
+            raise ValueError(f"Folder with id {folder_id} not found")
+        return folder
+
+
+def _move_counter_deltas(
+    doc: DocumentDTO, old_folder_id: Optional[int], new_folder_id: int
+) -> List[Tuple[int, int, int]]:
+    """
+    이동할 때 두 폴더에 적용할 카운터 증분 (folder_id, 개수, 크기)
+
+    folder_id 오름차순으로 돌려줌 → 반대 방향 동시 이동(A→B, B→A)도 폴더 행을 같은 순서로 잠가 교착 상태가 생기지 않음
+    """
+    if old_folder_id == new_folder_id:
+        return []
+    deltas = [(new_folder_id, 1, doc.file_size)]
+    if old_folder_id is not None:
+        deltas.append((old_folder_id, -1, -doc.file_size))
+    return sorted(deltas)
+
+
+def _check_batch_size(files: List[UploadFile]) -> None:
+    """일괄 업로드 파일 수 확인"""
+    if len(files) > UPLOAD_BATCH_MAX_FILES:
+        raise TooManyFilesError(f"한 번에 최대 {UPLOAD_BATCH_MAX_FILES}개 파일까지 업로드할 수 있습니다.")
+
+
+def _save_file_or_error(file: UploadFile):
+    """파일 저장, 실패하면 예외를 던지지 않고 돌려줌 (파일별 결과로 보고)"""
+    try:
+        return DocumentService._save_file(file)
+    except Exception as e:
+        return e
+
+
+def _doc_data(create_dto: DocumentCreateDTO, filename: str, stored: StoredFile) -> dict:
+    """INSERT용 문서 데이터"""
+    return {
+        "user_id": create_dto.user_id,
+        "folder_id": create_dto.folder_id,
+        "filename": filename,
+        "storage_path": stored.storage_path,
+        "summary_text": "",
+        "file_size": stored.size,
+        "content_hash": stored.sha256
+    }
+
+
+def _restore_missing_blobs(files: List[UploadFile], saved: list) -> None:
+    """일괄 업로드에서 blob 참조를 추가한 뒤 없어진 파일 다시 저장 (restore_blob_if_missing)"""
+    for file, s in zip(files, saved):
+        if isinstance(s, StoredFile):
+            restore_blob_if_missing(file.file, s)
+
+
+def _batch_result(files: List[UploadFile], saved: list, documents: List[DocumentDTO]) -> DocumentBatchUploadDTO:
+    """파일 순서대로 결과 조립 (documents는 저장에 성공한 파일 순서와 같음)"""
+    inserted = iter(documents)
+    results = []
+    for file, s in zip(files, saved):
+        if isinstance(s, StoredFile):
+            results.append(DocumentUploadResultDTO(filename=file.filename, ok=True, document=next(inserted)))
+        else:
+            results.append(DocumentUploadResultDTO(filename=file.filename, ok=False, error=str(s)))
+    succeeded = sum(1 for r in results if r.ok)
+    return DocumentBatchUploadDTO(results=results, succeeded=succeeded, failed=len(results) - succeeded)
 
 
-     
-    
\ No newline at end of file
+def _remove_file_if_exists(path: str) -> None:
+    """물리적 파일 삭제 (없으면 무시)"""
+    if os.path.exists(path):
+        os.remove(path)
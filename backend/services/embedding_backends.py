@@ -0,0 +1,202 @@
+"""
+Embedding Backends
+청크 텍스트 → 벡터 변환 구현 (EMBEDDING_BACKEND로 선택)
+
+- local:  결정적 해시 임베딩 (외부 호출 없음, 테스트 / 오프라인 / 벤치마크용)
+          영문 / 숫자 단어와 한글 음절 bigram을 해시해서 EMBEDDING_DIM 차원에 더하고 L2 정규화
+          → 같은 텍스트는 항상 같은 벡터, 단어가 많이 겹치는 텍스트끼리 코사인 유사도가 높음
+- openai: OpenAI 호환 /v1/embeddings (httpx 선택 의존성, OPENAI_API_KEY / OPENAI_BASE_URL)
+          모델 EMBEDDING_MODEL (기본 text-embedding-3-large), 차원이 모델 기본값과 다르면 dimensions로 줄여서 요청
+- 새 백엔드는 EmbeddingBackend를 상속해서 embed()를 구현하고 register_backend()로 등록
+
+EMBEDDING_DIM은 document_chunks.embedding 컬럼 차원과 같아야 함
+(기본 1536: pgvector HNSW / IVFFlat 인덱스는 2000차원까지라서 text-embedding-3-large도 1536으로 줄여서 받음)
+"""
+import os
+import math
+import hashlib
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import httpx
+except ImportError:  # 선택 의존성
+    httpx = None
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "local").lower()
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1536"))
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-large")
+EMBEDDING_TIMEOUT_SEC = float(os.getenv("EMBEDDING_TIMEOUT_SEC", "30"))
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+
+Vector = List[float]
+
+
+class EmbeddingError(ValueError):
+    """임베딩 요청 실패 (retryable이면 배치를 다시 시도)"""
+
+    def __init__(self, message: str, retryable: bool = True) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class EmbeddingBackend:
+    """임베딩 백엔드 기본 클래스 (texts 순서대로 벡터를 돌려줌)"""
+
+    name = "base"
+
+    def __init__(self, model: str, dim: int) -> None:
+        self.model = model
+        self.dim = dim
+
+    async def embed(self, texts: List[str]) -> List[Vector]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """연결 등 정리 (필요한 백엔드만)"""
+
+
+# ==========================
+# local: 결정적 해시 임베딩
+# ==========================
+@lru_cache(maxsize=65536)
+def _bucket(feature: str, dim: int) -> tuple:
+    """특징 문자열 → (차원 위치, 부호)"""
+    value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+    return value % dim, 1.0 if value >> 63 else -1.0
+
+
+def _features(text: str):
+    """영문 / 숫자 단어는 그대로, 한글은 음절 bigram (한 글자 단어는 그 글자)"""
+    word = []
+    hangul = []
+    for ch in text.lower():
+        if "가" <= ch <= "힣":
+            if word:
+                yield "".join(word)
+                word = []
+            hangul.append(ch)
+        elif ch.isascii() and ch.isalnum():
+            if hangul:
+                yield from _bigrams(hangul)
+                hangul = []
+            word.append(ch)
+        else:
+            if word:
+                yield "".join(word)
+                word = []
+            if hangul:
+                yield from _bigrams(hangul)
+                hangul = []
+    if word:
+        yield "".join(word)
+    if hangul:
+        yield from _bigrams(hangul)
+
+
+def _bigrams(chars: list):
+    if len(chars) == 1:
+        yield chars[0]
+        return
+    for i in range(len(chars) - 1):
+        yield chars[i] + chars[i + 1]
+
+
+def hash_embedding(text: str, dim: int) -> Vector:
+    """텍스트 1개의 결정적 해시 임베딩 (L2 정규화, 특징이 없으면 영벡터)"""
+    sparse: Dict[int, float] = {}
+    for feature in _features(text):
+        index, sign = _bucket(feature, dim)
+        sparse[index] = sparse.get(index, 0.0) + sign
+    norm = math.sqrt(sum(v * v for v in sparse.values()))
+    vector = [0.0] * dim
+    if norm:
+        for index, value in sparse.items():
+            vector[index] = value / norm
+    return vector
+
+
+class LocalHashEmbedder(EmbeddingBackend):
+    """외부 호출 없는 결정적 임베딩 (CPU 작업이라 스레드풀에서 실행)"""
+
+    name = "local"
+
+    def __init__(self, dim: int = EMBEDDING_DIM) -> None:
+        super().__init__("local-hash-v1", dim)
+
+    def embed_blocking(self, texts: List[str]) -> List[Vector]:
+        return [hash_embedding(text, self.dim) for text in texts]
+
+    async def embed(self, texts: List[str]) -> List[Vector]:
+        return await run_in_threadpool(self.embed_blocking, texts)
+
+
+# ==========================
+# openai: 원격 임베딩 API
+# ==========================
+# text-embedding-3-* 기본 차원 (다르면 dimensions 파라미터로 줄여서 받음)
+_NATIVE_DIMS = {"text-embedding-3-large": 3072, "text-embedding-3-small": 1536, "text-embedding-ada-002": 1536}
+
+
+class OpenAIEmbedder(EmbeddingBackend):
+    """OpenAI 호환 /embeddings API (429 / 5xx / 연결 오류는 retryable)"""
+
+    name = "openai"
+
+    def __init__(self, model: str = EMBEDDING_MODEL, dim: int = EMBEDDING_DIM) -> None:
+        if httpx is None:
+            raise RuntimeError("httpx is required for EMBEDDING_BACKEND=openai")
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY is required for EMBEDDING_BACKEND=openai")
+        super().__init__(model, dim)
+        self._client = httpx.AsyncClient(
+            base_url=OPENAI_BASE_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=EMBEDDING_TIMEOUT_SEC
+        )
+
+    async def embed(self, texts: List[str]) -> List[Vector]:
+        body = {"model": self.model, "input": texts, "encoding_format": "float"}
+        if _NATIVE_DIMS.get(self.model) != self.dim:
+            body["dimensions"] = self.dim
+        try:
+            response = await self._client.post("/embeddings", json=body)
+        except httpx.TransportError as e:
+            raise EmbeddingError(f"embedding request failed: {e}")
+        if response.status_code == 429 or response.status_code >= 500:
+            raise EmbeddingError(f"embedding API {response.status_code}: {response.text[:200]}")
+        if response.status_code >= 400:
+            raise EmbeddingError(f"embedding API {response.status_code}: {response.text[:200]}", retryable=False)
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+_backends: Dict[str, Callable[[], EmbeddingBackend]] = {
+    "local": LocalHashEmbedder,
+    "openai": OpenAIEmbedder,
+}
+
+
+def register_backend(name: str, factory: Callable[[], EmbeddingBackend]) -> None:
+    """EMBEDDING_BACKEND=name 으로 고를 수 있는 백엔드 추가"""
+    _backends[name] = factory
+
+
+def create_backend(name: Optional[str] = None) -> EmbeddingBackend:
+    """
+    이름으로 백엔드 생성
+
+    Raises:
+        ValueError: 등록되지 않은 이름
+    """
+    name = (name or EMBEDDING_BACKEND).lower()
+    factory = _backends.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown embedding backend: {name} (available: {', '.join(sorted(_backends))})")
+    return factory()
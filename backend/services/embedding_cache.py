@@ -0,0 +1,146 @@
+"""
+Embedding Cache
+임베딩 백엔드 앞에 두는 2단 캐시 (프로세스 안 LRU → embedding_cache 테이블)
+
+- 키: (모델 id, 정규화한 청크 텍스트의 SHA-256)
+  정규화 = 유니코드 NFKC + 연속 공백을 공백 1개로 + 앞뒤 공백 제거
+  → PDF마다 다른 줄바꿈 / 공백 차이는 같은 키, 글자가 하나라도 다르면 다른 키
+- 같은 슬라이드 / 교재를 여러 학생이 올리면 청크가 같으므로 두 번째부터는 백엔드를 부르지 않음
+  (같은 PDF를 다시 올리면 모든 청크가 캐시에 있어서 임베딩을 전혀 하지 않음)
+- 메모리 계층: LookupCache (LRU, EMBED_CACHE_MEMORY_ENTRIES개, 값은 pgvector 바이너리라 차원 × 4바이트)
+- DB 계층: repositories.embedding_cache_repository (EMBED_CACHE_DB=false면 메모리만)
+  DB 조회 / 저장 실패는 로그만 남기고 캐시가 없는 것처럼 진행 (임베딩은 계속됨)
+- 계층별 적중률은 stats() (/health의 embedding.cache)와 embedding_cache_lookups_total{tier}
+"""
+import os
+import re
+import math
+import hashlib
+import logging
+import unicodedata
+from typing import Dict, List, Sequence, Tuple
+
+from prometheus_client import Counter
+
+from repositories.unit_of_work import AsyncUnitOfWork
+from repositories.lookup_cache import LookupCache
+from repositories.chunk_repository import vector_binary, vector_from_binary
+from repositories.embedding_cache_repository import AsyncEmbeddingCacheRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+EMBED_CACHE_ENABLED = _env_flag("EMBED_CACHE_ENABLED", "true")
+EMBED_CACHE_MEMORY_ENTRIES = int(os.getenv("EMBED_CACHE_MEMORY_ENTRIES", "4096"))
+EMBED_CACHE_DB = _env_flag("EMBED_CACHE_DB", "true")
+
+EMBED_CACHE_LOOKUPS = Counter(
+    "embedding_cache_lookups_total", "임베딩 캐시 조회 수",
+    ["tier"]  # memory / db / miss
+)
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 정규화 (모듈 docstring 참고)"""
+    return _SPACES.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def content_key(text: str) -> str:
+    """정규화한 텍스트의 SHA-256 (hex)"""
+    return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """메모리 LRU + DB 2단 임베딩 캐시"""
+
+    def __init__(
+        self,
+        memory_entries: int = EMBED_CACHE_MEMORY_ENTRIES,
+        use_db: bool = EMBED_CACHE_DB,
+        enabled: bool = EMBED_CACHE_ENABLED
+    ) -> None:
+        self.enabled = enabled
+        self.use_db = use_db
+        # 임베딩은 바뀌지 않으므로 TTL 없음 (LRU로만 밀려남)
+        self.memory = LookupCache("embedding", max(1, memory_entries), math.inf, enabled)
+        self.db_hits = 0
+        self.misses = 0
+        self.db_errors = 0
+        self.stored = 0
+
+    async def get_many(self, model: str, keys: List[str]) -> Dict[str, Tuple[float, ...]]:
+        """캐시에 있는 키의 벡터 {key: vector} (메모리에 없는 키만 DB에서 한 번에 조회)"""
+        if not self.enabled or not keys:
+            return {}
+        found: Dict[str, Tuple[float, ...]] = {}
+        remaining: List[str] = []
+        for key in dict.fromkeys(keys):
+            data = self.memory.get((model, key))
+            if data is None:
+                remaining.append(key)
+            else:
+                found[key] = vector_from_binary(data)
+        EMBED_CACHE_LOOKUPS.labels("memory").inc(len(found))
+
+        if remaining and self.use_db:
+            try:
+                async with AsyncUnitOfWork("embedding_cache_lookup") as uow:
+                    rows = await AsyncEmbeddingCacheRepository.find_many(model, remaining, conn=uow.conn)
+            except Exception as e:
+                self.db_errors += 1
+                logger.warning(f"Embedding cache lookup failed: {e}")
+                rows = {}
+            for key, data in rows.items():
+                self.memory.set((model, key), data)
+                found[key] = vector_from_binary(data)
+            self.db_hits += len(rows)
+            EMBED_CACHE_LOOKUPS.labels("db").inc(len(rows))
+            remaining = [key for key in remaining if key not in rows]
+
+        self.misses += len(remaining)
+        EMBED_CACHE_LOOKUPS.labels("miss").inc(len(remaining))
+        return found
+
+    def remember(self, model: str, entries: List[Tuple[str, Sequence[float]]]) -> None:
+        """새로 만든 임베딩을 메모리 계층에 저장"""
+        if not self.enabled:
+            return
+        for key, vector in entries:
+            self.memory.set((model, key), vector_binary(vector))
+
+    async def persist(self, model: str, entries: List[Tuple[str, Sequence[float]]]) -> None:
+        """새로 만든 임베딩을 DB 계층에 저장 (실패는 로그만)"""
+        if not self.enabled or not self.use_db or not entries:
+            return
+        try:
+            async with AsyncUnitOfWork("embedding_cache_store") as uow:
+                self.stored += await AsyncEmbeddingCacheRepository.put_many(model, entries, conn=uow.conn)
+        except Exception as e:
+            self.db_errors += 1
+            logger.warning(f"Embedding cache store failed size={len(entries)}: {e}")
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        memory_hits = memory["hits"]
+        lookups = memory_hits + self.db_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "db": self.use_db,
+            "memory_size": memory["size"],
+            "memory_max_entries": memory["max_entries"],
+            "memory_evictions": memory["evictions"],
+            "memory_hits": memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "memory_hit_rate": round(memory_hits / lookups, 3) if lookups else None,
+            "db_hit_rate": round(self.db_hits / lookups, 3) if lookups else None,
+            "hit_rate": round((memory_hits + self.db_hits) / lookups, 3) if lookups else None,
+            "db_stored": self.stored,
+            "db_errors": self.db_errors,
+        }
@@ -0,0 +1,293 @@
+"""
+Embedding Service
+여러 문서의 청크를 모아서 마이크로 배치로 임베딩
+
+- embed_texts(texts)는 텍스트마다 대기열에 넣고 자기 벡터가 나올 때까지 기다림
+  → 동시에 수집 중인 문서들의 청크가 한 배치로 묶여서 백엔드 호출 수가 줄어듦
+- 배치는 EMBED_BATCH_SIZE개가 모이거나 첫 항목이 들어온 뒤 EMBED_BATCH_WAIT_MS가 지나면 보냄
+- 동시에 보내는 배치는 EMBED_CONCURRENCY개까지
+  모두 바쁘면 대기열을 더 꺼내지 않고, 대기열(EMBED_MAX_PENDING개)이 차면 넣는 쪽이 기다림 (backpressure)
+- 실패한 배치는 EMBED_MAX_RETRIES번까지 지수 백오프로 다시 시도 (retryable=False 오류는 바로 실패)
+  끝내 실패하면 그 배치의 텍스트를 기다리던 호출자 모두에게 예외 전달
+- 백엔드 앞에 services.embedding_cache (메모리 LRU → DB): 캐시에 있는 텍스트는 대기열에 넣지 않음
+  같은 텍스트가 이미 다른 호출 때문에 임베딩 중이면 그 결과를 같이 기다림 (같은 청크를 두 번 보내지 않음)
+- 백엔드는 services.embedding_backends (EMBEDDING_BACKEND, 기본 local)
+- 처리량(청크/초, 배치 크기, 재시도, 대기열 길이)은 embedding_stats()로 확인 (/health)
+"""
+import os
+import time
+import random
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from services.embedding_backends import EmbeddingBackend, EmbeddingError, Vector, create_backend
+from services.embedding_cache import EmbeddingCache, content_key
+
+logger = logging.getLogger(__name__)
+
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS", "20"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+EMBED_MAX_PENDING = int(os.getenv("EMBED_MAX_PENDING", "1024"))
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "3"))
+EMBED_RETRY_BASE_SEC = float(os.getenv("EMBED_RETRY_BASE_SEC", "0.5"))
+
+EMBED_CHUNKS = Counter(
+    "embedding_chunks_total", "임베딩한 청크 수",
+    ["result"]  # ok / failed
+)
+EMBED_RETRIES = Counter("embedding_retries_total", "임베딩 배치 재시도 수")
+EMBED_BATCH_SIZES = Histogram(
+    "embedding_batch_size", "임베딩 배치 1개의 청크 수",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+EMBED_BATCH_SECONDS = Histogram(
+    "embedding_batch_seconds", "임베딩 배치 1개 처리 시간 (재시도 포함)",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+_Item = Tuple[str, str, asyncio.Future]  # (캐시 키, 텍스트, 결과)
+
+
+def _fail_stopped(items: List[_Item]) -> None:
+    """서비스 종료로 임베딩하지 못한 항목의 future를 실패로 (기다리는 호출자가 멈추지 않도록)"""
+    for _, _, future in items:
+        if not future.done():
+            future.set_exception(EmbeddingError("embedding service stopped"))
+
+
+class EmbeddingBatcher:
+    """캐시 + 크기 / 시간 제한 마이크로 배치 + 동시 실행 제한 + 재시도"""
+
+    def __init__(
+        self,
+        backend: Optional[EmbeddingBackend] = None,
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_wait_ms: float = EMBED_BATCH_WAIT_MS,
+        concurrency: int = EMBED_CONCURRENCY,
+        max_pending: int = EMBED_MAX_PENDING,
+        max_retries: int = EMBED_MAX_RETRIES,
+        retry_base_sec: float = EMBED_RETRY_BASE_SEC,
+        cache: Optional[EmbeddingCache] = None
+    ) -> None:
+        self._backend = backend
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.concurrency = max(1, concurrency)
+        self.max_pending = max(self.batch_size, max_pending)
+        self.max_retries = max(0, max_retries)
+        self.retry_base = max(0.0, retry_base_sec)
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.requested = 0
+        self.joined = 0
+        self.chunks = 0
+        self.failed = 0
+        self.batches = 0
+        self.retries = 0
+        self.seconds = 0.0  # 배치 처리 시간 합 (동시 실행은 겹쳐서 셈)
+        self._first_at: Optional[float] = None
+        self._last_at: Optional[float] = None
+
+    @property
+    def backend(self) -> EmbeddingBackend:
+        if self._backend is None:
+            self._backend = create_backend()
+        return self._backend
+
+    @property
+    def model_id(self) -> str:
+        """캐시 키에 쓰는 모델 id (모델 이름 + 차원)"""
+        return f"{self.backend.model}:{self.backend.dim}"
+
+    def _ensure_started(self) -> None:
+        if self._collector is None or self._collector.done():
+            self._queue = asyncio.Queue(self.max_pending)
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._collector = asyncio.create_task(self._collect())
+
+    async def embed(self, texts: List[str]) -> List[Vector]:
+        """
+        texts 순서대로 벡터 (다른 호출자의 텍스트와 같은 배치로 묶일 수 있음)
+
+        Raises:
+            EmbeddingError: 재시도 후에도 배치가 실패한 경우
+        """
+        if not texts:
+            return []
+        self.requested += len(texts)
+        keys = [content_key(text) for text in texts]
+        results: Dict[str, object] = {}
+        if self.cache is not None:
+            results.update(await self.cache.get_many(self.model_id, keys))
+
+        waiting: Dict[str, asyncio.Future] = {}
+        for key, text in zip(keys, texts):
+            if key in results or key in waiting:
+                continue
+            future = self._inflight.get(key)
+            if future is not None:
+                self.joined += 1
+            else:
+                self._ensure_started()
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+                future.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+                await self._queue.put((key, text, future))
+            waiting[key] = future
+        if waiting:
+            # 같은 future를 다른 호출자도 기다리므로 이 호출이 취소돼도 future는 취소하지 않음
+            vectors = await asyncio.gather(*(asyncio.shield(future) for future in waiting.values()))
+            results.update(zip(waiting, vectors))
+        return [results[key] for key in keys]
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        # 대기열에서 꺼냈지만 아직 배치 태스크로 넘기지 않은 항목 (stop()으로 취소되면 실패로 돌려줌)
+        batch: List[_Item] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                # 동시 실행 수가 차 있으면 여기서 기다림 → 그동안 대기열이 차면 넣는 쪽이 기다림
+                await self._slots.acquire()
+                task = asyncio.create_task(self._run_batch(batch))
+                batch = []
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+        except asyncio.CancelledError:
+            _fail_stopped(batch)
+            raise
+
+    async def _run_batch(self, batch: List[_Item]) -> None:
+        started = time.perf_counter()
+        texts = [text for _, text, _ in batch]
+        try:
+            vectors = await self._embed_with_retry(texts)
+        except Exception as e:
+            self.failed += len(batch)
+            EMBED_CHUNKS.labels("failed").inc(len(batch))
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+            elapsed = time.perf_counter() - started
+            self.batches += 1
+            self.seconds += elapsed
+            EMBED_BATCH_SIZES.observe(len(batch))
+            EMBED_BATCH_SECONDS.observe(elapsed)
+
+        now = time.perf_counter()
+        if self._first_at is None:
+            self._first_at = started
+        self._last_at = now
+        self.chunks += len(batch)
+        EMBED_CHUNKS.labels("ok").inc(len(batch))
+        entries = [(key, vector) for (key, _, _), vector in zip(batch, vectors)]
+        if self.cache is not None:
+            # future를 풀기 전에 메모리 계층에 넣어야 그 사이 들어온 같은 텍스트가 다시 임베딩되지 않음
+            self.cache.remember(self.model_id, entries)
+        for (_, _, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+        if self.cache is not None:
+            await self.cache.persist(self.model_id, entries)
+
+    async def _embed_with_retry(self, texts: List[str]) -> List[Vector]:
+        attempt = 0
+        while True:
+            try:
+                vectors = await self.backend.embed(texts)
+                if len(vectors) != len(texts):
+                    raise EmbeddingError(f"backend returned {len(vectors)} vectors for {len(texts)} texts")
+                return vectors
+            except Exception as e:
+                if attempt >= self.max_retries or not getattr(e, "retryable", True):
+                    logger.error(f"Embedding batch failed size={len(texts)} attempts={attempt + 1}: {e}")
+                    raise
+                attempt += 1
+                self.retries += 1
+                EMBED_RETRIES.inc()
+                delay = self.retry_base * 2 ** (attempt - 1) * (0.5 + random.random())
+                logger.warning(f"Embedding batch retry {attempt}/{self.max_retries} in {delay:.2f}s: {e}")
+                await asyncio.sleep(delay)
+
+    async def stop(self) -> None:
+        """수집 태스크 종료 + 진행 중 배치 완료 대기 + 백엔드 정리"""
+        if self._collector is not None:
+            self._collector.cancel()
+            await asyncio.gather(self._collector, return_exceptions=True)
+            self._collector = None
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._queue is not None:
+            # 배치로 묶이지 못한 항목은 실패로 돌려줌
+            items = []
+            while not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            _fail_stopped(items)
+        if self._backend is not None:
+            await self._backend.close()
+            self._backend = None
+
+    def stats(self) -> dict:
+        active = (self._last_at - self._first_at) if self._first_at is not None and self._last_at else 0.0
+        backend = self._backend
+        return {
+            "backend": backend.name if backend else None,
+            "model": backend.model if backend else None,
+            "dim": backend.dim if backend else None,
+            "batch_size": self.batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "concurrency": self.concurrency,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight_batches": len(self._batches),
+            "requested": self.requested,  # embed_texts로 들어온 텍스트 수 (캐시 적중 포함)
+            "joined": self.joined,        # 이미 임베딩 중인 같은 텍스트를 기다린 수
+            "chunks": self.chunks,        # 백엔드로 임베딩한 텍스트 수
+            "failed": self.failed,
+            "batches": self.batches,
+            "retries": self.retries,
+            "avg_batch_size": round(self.chunks / self.batches, 1) if self.batches else 0.0,
+            "avg_batch_ms": round(self.seconds * 1000 / self.batches, 2) if self.batches else 0.0,
+            # 첫 배치 시작부터 마지막 배치 끝까지 (쉬는 시간 포함)
+            "chunks_per_sec": round(self.chunks / active, 1) if active > 0 else None,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+embedding_batcher = EmbeddingBatcher(cache=EmbeddingCache())
+
+
+def embedding_stats() -> dict:
+    return embedding_batcher.stats()
+
+
+async def embed_texts(texts: List[str]) -> List[Vector]:
+    """청크 텍스트들의 임베딩 (캐시에 없는 것만 마이크로 배치로 묶어서 처리)"""
+    return await embedding_batcher.embed(texts)
+
+
+async def stop_embedding() -> None:
+    """앱 / 워커 종료 시 호출"""
+    await embedding_batcher.stop()
@@ -0,0 +1,156 @@
+"""
+File Storage
+업로드 파일을 디스크에 저장하는 로직 (내용 주소 기반 blob 저장소)
+
+- 고정 크기 청크로 임시 파일에 복사 (메모리 사용량 일정)
+- 복사하면서 SHA-256 해시와 바이트 수를 함께 계산 (파일을 다시 읽지 않음)
+- 최대 크기를 넘으면 즉시 중단하고 임시 파일 삭제
+- 파일 위치는 내용 해시로 결정: {BLOB_ROOT}/ab/cd/abcd...
+  같은 내용이 이미 있으면 임시 파일만 지우고 기존 파일을 그대로 사용 (중복 저장 없음)
+- 새 파일은 같은 디렉터리 트리 안에서 os.replace로 원자적 rename (반쯤 쓴 파일이 보이지 않음)
+
+몇 개의 문서가 blob을 참조하는지는 DB(blobs.ref_count)가 관리한다.
+blob 파일은 요청 경로에서 지우지 않고 scripts/gc_blobs.py만 지운다. 저장할 때 있던 파일이
+DB에 참조를 추가하기 전에 GC로 지워질 수 있으므로, 참조를 추가한 뒤 restore_blob_if_missing으로 확인한다.
+블로킹 I/O이므로 async 코드에서는 run_in_threadpool로 호출한다.
+업로드 처리량은 Prometheus 카운터로 기록한다 (/metrics, rate()로 bytes/s 계산).
+"""
+import os
+import time
+import hashlib
+import tempfile
+from typing import BinaryIO, NamedTuple, Optional
+
+from prometheus_client import Counter, Histogram
+
+# 한 번에 읽고 쓰는 크기
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# 업로드 최대 크기 (기본 100MB)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(100 * 1024 * 1024)))
+
+# 일괄 업로드: 동시에 디스크에 쓰는 파일 수 / 한 번에 받을 수 있는 최대 파일 수
+UPLOAD_BATCH_CONCURRENCY = int(os.getenv("UPLOAD_BATCH_CONCURRENCY", "4"))
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("UPLOAD_BATCH_MAX_FILES", "100"))
+
+# blob 저장 위치 (임시 파일도 이 아래에 만들어서 rename이 같은 파일시스템 안에서 끝나도록 함)
+BLOB_ROOT = os.getenv("BLOB_ROOT", "pdf_files/blobs")
+
+UPLOAD_BYTES = Counter("upload_bytes_total", "저장한 업로드 바이트 수")
+UPLOAD_FILES = Counter(
+    "upload_files_total", "처리한 업로드 파일 수",
+    ["result"]  # created / deduplicated / too_large
+)
+UPLOAD_SECONDS = Histogram(
+    "upload_write_seconds", "업로드 파일 1개를 해시 계산하며 디스크에 쓰는 시간",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+
+class FileTooLargeError(ValueError):
+    """업로드 최대 크기 초과 (라우터에서 413으로 변환)"""
+
+
+class TooManyFilesError(ValueError):
+    """일괄 업로드 파일 수 초과 (라우터에서 400으로 변환)"""
+
+
+class StoredFile(NamedTuple):
+    """저장된 파일 정보"""
+    size: int
+    sha256: str
+    storage_path: str
+    created: bool  # 이번 호출에서 새 파일을 만들었는지 (False면 기존 blob 재사용)
+
+
+def blob_path(sha256: str) -> str:
+    """해시로 blob 경로 생성 (앞 4글자로 2단계 디렉터리를 나눠 한 디렉터리에 파일이 몰리지 않게 함)"""
+    return os.path.join(BLOB_ROOT, sha256[:2], sha256[2:4], sha256)
+
+
+def save_blob(
+    src: BinaryIO,
+    max_bytes: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> StoredFile:
+    """
+    업로드 스트림을 blob 저장소에 저장
+
+    Args:
+        src: 읽을 파일 객체 (UploadFile.file)
+        max_bytes: 최대 크기 (None이면 UPLOAD_MAX_BYTES)
+        chunk_size: 청크 크기 (None이면 UPLOAD_CHUNK_SIZE)
+
+    Returns:
+        StoredFile(size, sha256, storage_path, created)
+
+    Raises:
+        FileTooLargeError: 최대 크기를 넘은 경우 (저장되지 않음)
+    """
+    max_bytes = UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    chunk_size = chunk_size or UPLOAD_CHUNK_SIZE
+
+    os.makedirs(BLOB_ROOT, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    started = time.perf_counter()
+
+    fd, tmp_path = tempfile.mkstemp(dir=BLOB_ROOT, prefix=".upload-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    UPLOAD_FILES.labels("too_large").inc()
+                    raise FileTooLargeError(
+                        f"파일 크기가 최대 허용 크기({max_bytes} bytes)를 초과했습니다."
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        storage_path = blob_path(sha256)
+
+        # 같은 내용이 이미 있으면 새로 쓴 임시 파일은 버림
+        created = not os.path.exists(storage_path)
+        if created:
+            os.makedirs(os.path.dirname(storage_path), exist_ok=True)
+            os.replace(tmp_path, storage_path)
+        else:
+            os.remove(tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    UPLOAD_SECONDS.observe(time.perf_counter() - started)
+    UPLOAD_BYTES.inc(size)
+    UPLOAD_FILES.labels("created" if created else "deduplicated").inc()
+    return StoredFile(size=size, sha256=sha256, storage_path=storage_path, created=created)
+
+
+def restore_blob_if_missing(src: BinaryIO, stored: StoredFile) -> bool:
+    """
+    blob 참조를 추가한(acquire) 뒤 파일이 없으면 업로드 스트림에서 다시 저장
+
+    save_blob과 acquire 사이에 GC가 참조 없는 blob을 지웠을 수 있다.
+    acquire가 행을 잠근 뒤에는 GC가 같은 blob을 지우지 못하므로 여기서 한 번만 확인하면 된다.
+
+    Args:
+        src: save_blob에 넘겼던 파일 객체 (처음부터 다시 읽음)
+        stored: save_blob 결과
+
+    Returns:
+        파일을 다시 저장했으면 True
+    """
+    if os.path.exists(stored.storage_path):
+        return False
+    src.seek(0)
+    restored = save_blob(src)
+    if restored.sha256 != stored.sha256:
+        raise ValueError("업로드 스트림 내용이 바뀌어 blob을 다시 저장할 수 없습니다.")
+    return True
@@ -2,11 +2,14 @@
 Folder Service
 폴더 관련 비즈니스 로직
 """
-from typing import List
-from repositories.folder_repository import FolderRepository
-from repositories.documents_repository import DocumentsRepository
+from typing import List, Optional
+from repositories.folder_repository import FolderRepository, AsyncFolderRepository
+from repositories.documents_repository import DocumentsRepository, AsyncDocumentsRepository
 from dto.folder_dto import FolderDTO, FolderListDTO
-import psycopg2
+from repositories.unit_of_work import AsyncUnitOfWork
+from repositories.lookup_cache import flush_invalidations
+from services.pagination import decode_cursor, split_page, DEFAULT_PAGE_SIZE
+import psycopg
 
 class FolderService:
     """폴더 서비스"""
@@ -15,40 +18,47 @@ class FolderService:
         self.folder_repo = FolderRepository()
         self.document_repo = DocumentsRepository()
 
-    def get_folders_by_user(self, user_id: int) -> FolderListDTO:
+    def get_folders_by_user(
+        self,
+        user_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> FolderListDTO:
         """
         사용자의 폴더 목록 조회
 
         Args:
             user_id: 사용자 ID
+            limit: 페이지 크기 (None이면 전체 조회)
+            cursor: 이전 응답의 next_cursor
+            include_total: 페이지 조회 시 전체 개수도 셀지 여부
 
         Returns:
-            FolderListDTO (폴더 목록 + 총 개수)
-        """
-        # 폴더 목록 조회
-        folders = self.folder_repo.find_all_by_user_id(user_id)
-
-        # 각 폴더의 문서 개수 조회 및 추가
-        folders_with_count = []
-        for folder in folders:
-            # 폴더 내 문서 개수 조회
-            doc_count = self.document_repo.count_by_folder_id(folder.folder_id)
-
-            # FolderDTO를 dict로 변환
-            folder_dict = folder.model_dump()
-
-            # document_count 필드 추가
-            folder_dict['document_count'] = doc_count
+            FolderListDTO (폴더 목록 + 총 개수 + 다음 페이지 커서)
 
-            # dict를 다시 FolderDTO로 변환
-            folders_with_count.append(FolderDTO(**folder_dict))
-
-        # 총 개수 조회
-        total = self.folder_repo.count_by_user_id(user_id)
+        Raises:
+            InvalidCursorError: cursor 형식이 잘못된 경우
+        """
+        after = decode_cursor(cursor)
+        if limit is None and after is None:
+            # 폴더 목록 + 폴더별 문서 개수 + 총 개수를 쿼리 1회로 조회
+            folders, total = self.folder_repo.find_all_with_document_count_by_user_id(user_id)
+            return FolderListDTO(
+                folders=folders,
+                total=total
+            )
+
+        # 키셋 페이지 (limit + 1개로 다음 페이지 유무 확인)
+        limit = limit or DEFAULT_PAGE_SIZE
+        rows = self.folder_repo.find_page_by_user_id(user_id, limit + 1, after)
+        folders, next_cursor = split_page(rows, limit, "folder_id")
+        total = self.folder_repo.count_by_user_id(user_id) if include_total else None
 
         return FolderListDTO(
-            folders=folders_with_count,
-            total=total
+            folders=folders,
+            total=total,
+            next_cursor=next_cursor
         )
 
     def get_folder_by_id(self, folder_id: int) -> FolderDTO:
@@ -77,7 +87,7 @@ class FolderService:
             folder = self.folder_repo.create_folder_by_user_id(user_id, folder_name, conn=conn)
             conn.commit()
             return folder
-        except psycopg2.errors.UniqueViolation as e:
+        except psycopg.errors.UniqueViolation as e:
             conn.rollback()
             # 상위(라우터)에서 409로 변환
             raise ValueError("동일한 이름의 폴더가 이미 존재합니다.")
@@ -85,6 +95,7 @@ class FolderService:
             conn.rollback()
             raise
         finally:
+            flush_invalidations(conn)
             conn.close()
 
     def rename_folder(self, folder_id: int, new_name: str) -> FolderDTO:
@@ -95,13 +106,14 @@ class FolderService:
                 raise ValueError("입력하신 폴더가 존재하지 않습니다.")
             conn.commit()
             return folder
-        except psycopg2.errors.UniqueViolation:
+        except psycopg.errors.UniqueViolation:
             conn.rollback()
             raise ValueError("동일한 이름의 폴더가 이미 존재합니다.")
         except Exception:
             conn.rollback()
             raise
         finally:
+            flush_invalidations(conn)
             conn.close()
 
     def remove_folder(self, folder_id: int) -> None:
@@ -116,4 +128,81 @@ class FolderService:
             conn.rollback()
             raise
         finally:
-            conn.close()
\ No newline at end of file
+            flush_invalidations(conn)
+            conn.close()
+
+
+class AsyncFolderService:
+    """
+    폴더 서비스 (async 버전, 규칙은 FolderService와 동일)
+
+    uow가 주어지면 uow의 커넥션 하나로 실행하고 commit/rollback은 uow가 한다.
+    uow가 없으면 Repository 호출마다 자체 커넥션으로 커밋한다.
+    folder_id로 지정하는 메서드는 owner_id(토큰의 사용자)가 주어지면 다른 사용자의 폴더를 없는 것과 같이 취급한다.
+    """
+
+    def __init__(self, uow: Optional[AsyncUnitOfWork] = None):
+        self.conn = uow.conn if uow else None
+        self.folder_repo = AsyncFolderRepository()
+        self.document_repo = AsyncDocumentsRepository()
+
+    async def get_folders_by_user(
+        self,
+        user_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> FolderListDTO:
+        """사용자의 폴더 목록 조회 (limit/cursor가 있으면 키셋 페이지)"""
+        after = decode_cursor(cursor)
+        if limit is None and after is None:
+            folders, total = await self.folder_repo.find_all_with_document_count_by_user_id(user_id, conn=self.conn)
+            return FolderListDTO(
+                folders=folders,
+                total=total
+            )
+
+        limit = limit or DEFAULT_PAGE_SIZE
+        rows = await self.folder_repo.find_page_by_user_id(user_id, limit + 1, after, conn=self.conn)
+        folders, next_cursor = split_page(rows, limit, "folder_id")
+        total = await self.folder_repo.count_by_user_id(user_id, conn=self.conn) if include_total else None
+
+        return FolderListDTO(
+            folders=folders,
+            total=total,
+            next_cursor=next_cursor
+        )
+
+    async def get_folder_by_id(self, folder_id: int, owner_id: Optional[int] = None) -> FolderDTO:
+        """폴더 ID로 단건 조회 (없거나 owner_id가 아닌 사용자의 폴더면 ValueError)"""
+        folder = await self.folder_repo.find_by_id(folder_id, conn=self.conn)
+
+        if not folder or (owner_id is not None and folder.user_id != owner_id):
+            raise ValueError(f"Folder with id {folder_id} not found")
+
+        return folder
+
+    async def create_folder(self, user_id: int, folder_name: str) -> FolderDTO:
+        try:
+            return await self.folder_repo.create_folder_by_user_id(user_id, folder_name, conn=self.conn)
+        except psycopg.errors.UniqueViolation:
+            # 상위(라우터)에서 409로 변환, rollback은 uow가 처리
+            raise ValueError("동일한 이름의 폴더가 이미 존재합니다.")
+
+    async def rename_folder(self, folder_id: int, new_name: str, owner_id: Optional[int] = None) -> FolderDTO:
+        if owner_id is not None:
+            await self.get_folder_by_id(folder_id, owner_id)
+        try:
+            folder = await self.folder_repo.rename_folder_by_id(folder_id, new_name, conn=self.conn)
+        except psycopg.errors.UniqueViolation:
+            raise ValueError("동일한 이름의 폴더가 이미 존재합니다.")
+        if not folder:
+            raise ValueError("입력하신 폴더가 존재하지 않습니다.")
+        return folder
+
+    async def remove_folder(self, folder_id: int, owner_id: Optional[int] = None) -> None:
+        if owner_id is not None:
+            await self.get_folder_by_id(folder_id, owner_id)
+        ok = await self.folder_repo.remove_folder_by_user_id(folder_id, conn=self.conn)
+        if not ok:
+            raise ValueError("입력하신 폴더가 존재하지 않습니다.")
@@ -0,0 +1,372 @@
+"""
+Ingestion Service
+업로드된 PDF의 텍스트를 요청 밖에서 추출해서 document_chunks에 저장
+
+- 업로드 트랜잭션이 document_ingestion에 pending 작업을 넣고, commit 후 wake_ingestion()으로 워커를 깨움
+  (업로드 응답은 추출을 기다리지 않음)
+- 추출은 별도 프로세스 풀 (PDF 파싱은 CPU 작업이라 이벤트 루프 / 해시 풀과 나눠 씀)
+  - 한 문서를 INGEST_PAGES_PER_TASK 페이지 범위로 나눠서 여러 작업자가 동시에 추출
+  - 동시에 추출 중인 범위는 작업자 수 × 2개까지 → 수백 페이지 교재도 메모리에는 범위 몇 개만
+  - 범위는 순서대로 받아서 저장 (페이지 순서 = 저장 순서)
+- 받은 페이지는 순서대로 services.chunker에 넣어서 토큰 예산 / 겹침에 맞춘 청크로 나눔
+- 다 찬 청크는 services.embedding_service로 임베딩 (다른 문서의 청크와 같은 배치로 묶일 수 있음)
+- 범위 1개 = 트랜잭션 1개 (청크 + 임베딩 COPY + 진행 상황 갱신), 진행률은 GET /documents/{doc_id}/ingestion
+- 문서를 동시에 INGEST_CONCURRENCY개까지 처리 (여러 워커 프로세스여도 FOR UPDATE SKIP LOCKED로 나눠 가짐)
+- 실패 처리
+  - PDF를 열 수 없음 / 파일 없음 → failed (다시 해도 같음)
+  - 그 밖의 오류 → pending으로 되돌려서 다시 시도, INGEST_MAX_ATTEMPTS번 넘으면 failed
+  - 추출 중 문서가 삭제됨 → 작업도 CASCADE로 사라지므로 그냥 멈춤
+  - 워커가 죽어서 running으로 남은 작업은 INGEST_STALE_SEC 뒤에 다른 워커가 가져감
+- INGEST_ENABLED=false 면 앱 안에서 워커를 띄우지 않음 (python -m scripts.ingest_worker 로 따로 실행)
+
+작업자 프로세스는 spawn으로 띄우므로 추출 함수는 services.pdf_extractor (가벼운 모듈)에 둔다
+"""
+import os
+import time
+import asyncio
+import logging
+import itertools
+import multiprocessing
+from collections import deque
+from contextlib import aclosing
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, List, Optional, Set, Tuple
+
+import psycopg
+from prometheus_client import Counter, Histogram
+
+from repositories.unit_of_work import AsyncUnitOfWork
+from repositories.documents_repository import AsyncDocumentsRepository
+from repositories.ingestion_repository import AsyncIngestionRepository
+from repositories.chunk_repository import AsyncChunkRepository
+from services import pdf_extractor
+from services.pdf_extractor import PdfExtractError
+from services.chunker import Chunker
+from services.embedding_service import embed_texts
+
+logger = logging.getLogger(__name__)
+
+INGEST_ENABLED = os.getenv("INGEST_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# 추출 프로세스 수 (기본 CPU 절반, 나머지는 요청 처리 / 비밀번호 해시용)
+INGEST_EXTRACT_WORKERS = int(os.getenv("INGEST_EXTRACT_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# 작업 1개(= 저장 트랜잭션 1개)로 추출할 페이지 수
+INGEST_PAGES_PER_TASK = int(os.getenv("INGEST_PAGES_PER_TASK", "8"))
+
+# 동시에 처리할 문서 수
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "2"))
+
+# 깨우는 신호가 없을 때 대기열을 다시 확인하는 주기 (다른 워커 프로세스가 넣은 작업, 재시도)
+INGEST_POLL_SEC = float(os.getenv("INGEST_POLL_SEC", "5"))
+
+# running 상태로 이 시간 넘게 진행 갱신이 없으면 다른 워커가 다시 가져감
+INGEST_STALE_SEC = float(os.getenv("INGEST_STALE_SEC", "300"))
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
+
+INGEST_PAGES = Counter("ingest_pages_total", "추출해서 저장한 PDF 페이지 수")
+INGEST_DOCUMENTS = Counter(
+    "ingest_documents_total", "수집을 끝낸 문서 수",
+    ["result"]  # done / failed / retry
+)
+CHUNK_WRITE_ROWS = Counter("chunk_write_rows_total", "COPY로 저장한 청크 행 수")
+CHUNK_WRITE_BYTES = Counter("chunk_write_bytes_total", "COPY로 저장한 청크 데이터 크기 (근사)")
+INGEST_SECONDS = Histogram(
+    "ingest_document_seconds", "문서 1개 추출 + 저장 시간",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+
+
+# ==========================
+# 페이지 추출 (프로세스 풀)
+# ==========================
+class PageExtractor:
+    """페이지 범위 단위로 추출 작업을 나눠 주는 프로세스 풀"""
+
+    def __init__(self, workers: int = INGEST_EXTRACT_WORKERS, pages_per_task: int = INGEST_PAGES_PER_TASK) -> None:
+        self.workers = max(1, workers)
+        self.pages_per_task = max(1, pages_per_task)
+        self.max_in_flight = self.workers * 2
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            logger.info(f"Starting PDF extract pool workers={self.workers} pages_per_task={self.pages_per_task}")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def page_count(self, path: str) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), pdf_extractor.page_count, path)
+
+    async def iter_pages(self, path: str, total: int) -> AsyncIterator[List[Tuple[int, str]]]:
+        """
+        페이지 범위별 [(페이지 번호, 텍스트)]를 순서대로 yield
+
+        max_in_flight개 범위를 미리 추출시켜 두고, 하나를 받을 때마다 다음 범위를 넣음
+        (호출한 쪽이 저장하는 동안에도 작업자는 계속 추출)
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        ranges = ((start, min(start + self.pages_per_task, total + 1))
+                  for start in range(1, total + 1, self.pages_per_task))
+        pending: deque = deque(
+            loop.run_in_executor(executor, pdf_extractor.extract_pages, path, start, end)
+            for start, end in itertools.islice(ranges, self.max_in_flight)
+        )
+        try:
+            while pending:
+                batch = await pending.popleft()
+                next_range = next(ranges, None)
+                if next_range is not None:
+                    pending.append(loop.run_in_executor(executor, pdf_extractor.extract_pages, path, *next_range))
+                yield batch
+        finally:
+            # 중간에 멈추면 (실패, 종료) 아직 시작 안 한 범위는 버림
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# ==========================
+# 수집 워커
+# ==========================
+class IngestionWorker:
+    """대기열에서 문서를 가져가서 추출 → 저장 (이벤트 루프 1개에서 INGEST_CONCURRENCY개 태스크)"""
+
+    def __init__(self, extractor: Optional[PageExtractor] = None, concurrency: int = INGEST_CONCURRENCY) -> None:
+        self.extractor = extractor or PageExtractor()
+        self.concurrency = max(1, concurrency)
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._active: Set[int] = set()
+        self._stopping = False
+        self.documents_done = 0
+        self.documents_failed = 0
+        self.documents_retried = 0
+        self.pages = 0
+        self.seconds = 0.0
+        self.last_pages_per_sec: Optional[float] = None
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+
+    # ---------- 대기열 ----------
+    async def claim_next(self) -> Optional[dict]:
+        return await AsyncIngestionRepository.claim_next(INGEST_STALE_SEC, INGEST_MAX_ATTEMPTS)
+
+    async def run_until_empty(self) -> int:
+        """대기열이 빌 때까지 처리 (스크립트용), 처리한 문서 수 반환"""
+        processed = 0
+        while not self._stopping:
+            job = await self.claim_next()
+            if job is None:
+                break
+            await self.process(job["doc_id"], job["attempts"])
+            processed += 1
+        await AsyncIngestionRepository.fail_exhausted(INGEST_STALE_SEC, INGEST_MAX_ATTEMPTS)
+        return processed
+
+    async def _run_forever(self) -> None:
+        while not self._stopping:
+            # 확인 전에 신호를 지워야 확인하는 사이에 들어온 작업의 신호를 놓치지 않음
+            self._wake.clear()
+            try:
+                job = await self.claim_next()
+            except Exception:
+                logger.exception("Ingestion claim failed")
+                job = None
+            if job is not None:
+                await self.process(job["doc_id"], job["attempts"])
+                continue
+            try:
+                await AsyncIngestionRepository.fail_exhausted(INGEST_STALE_SEC, INGEST_MAX_ATTEMPTS)
+            except Exception:
+                logger.exception("Ingestion cleanup failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), INGEST_POLL_SEC)
+            except asyncio.TimeoutError:
+                pass
+
+    # ---------- 문서 1개 ----------
+    async def process(self, doc_id: int, attempts: int = 1) -> None:
+        """문서 1개 추출 → 저장 (claim_next로 running이 된 작업)"""
+        self._active.add(doc_id)
+        started = time.perf_counter()
+        try:
+            doc = await AsyncDocumentsRepository.find_by_doc_id(doc_id)
+            if doc is None:
+                return  # 그 사이 삭제됨 (작업 행도 CASCADE로 삭제)
+
+            total = await self.extractor.page_count(doc.storage_path)
+            async with AsyncUnitOfWork("ingestion_start") as uow:
+                await AsyncChunkRepository.delete_by_doc_id(doc_id, conn=uow.conn)
+                await AsyncIngestionRepository.start(doc_id, total, conn=uow.conn)
+
+            pages_done = 0
+            chunks = 0
+            chunker = Chunker()
+            async with aclosing(self.extractor.iter_pages(doc.storage_path, total)) as batches:
+                async for batch in batches:
+                    # 페이지 경계를 넘는 청크는 다음 범위에서 이어서 만듦 (다 찬 청크만 저장)
+                    rows = [(chunk.page_number, chunk.text)
+                            for number, text in batch for chunk in chunker.feed(number, text)]
+                    # 임베딩은 트랜잭션 밖에서 기다림 (원격 백엔드 지연 동안 커넥션을 잡고 있지 않음)
+                    vectors = await embed_texts([text for _, text in rows])
+                    async with AsyncUnitOfWork("ingestion_pages") as uow:
+                        chunks += await self._write_chunks(doc_id, rows, vectors, uow.conn)
+                        pages_done += len(batch)
+                        await AsyncIngestionRepository.progress(doc_id, pages_done, chunks, conn=uow.conn)
+                    INGEST_PAGES.inc(len(batch))
+
+            elapsed = time.perf_counter() - started
+            pages_per_sec = pages_done / elapsed if elapsed > 0 else 0.0
+            rows = [(chunk.page_number, chunk.text) for chunk in chunker.flush()]
+            vectors = await embed_texts([text for _, text in rows])
+            async with AsyncUnitOfWork("ingestion_finish") as uow:
+                chunks += await self._write_chunks(doc_id, rows, vectors, uow.conn)
+                await AsyncIngestionRepository.finish(doc_id, pages_done, chunks, round(pages_per_sec, 2), conn=uow.conn)
+            INGEST_DOCUMENTS.labels("done").inc()
+            INGEST_SECONDS.observe(elapsed)
+            self.documents_done += 1
+            self.pages += pages_done
+            self.seconds += elapsed
+            self.last_pages_per_sec = pages_per_sec
+            logger.info(
+                "Document ingested",
+                extra={"doc_id": doc_id, "pages": pages_done, "chunks": chunks,
+                       "elapsed_ms": round(elapsed * 1000, 1), "pages_per_sec": round(pages_per_sec, 1)}
+            )
+        except asyncio.CancelledError:
+            raise  # 종료 중 → stop()이 pending으로 되돌림
+        except psycopg.errors.ForeignKeyViolation:
+            logger.info("Document deleted during ingestion", extra={"doc_id": doc_id})
+        except (PdfExtractError, FileNotFoundError) as e:
+            await self._fail(doc_id, str(e))
+        except Exception as e:
+            logger.exception("Document ingestion failed", extra={"doc_id": doc_id, "attempts": attempts})
+            if attempts >= INGEST_MAX_ATTEMPTS:
+                await self._fail(doc_id, f"{type(e).__name__}: {e}")
+            else:
+                await self._retry(doc_id, f"{type(e).__name__}: {e}")
+        finally:
+            self._active.discard(doc_id)
+
+    async def _write_chunks(self, doc_id: int, rows: List[Tuple[int, str]], vectors: List[list], conn) -> int:
+        """청크 + 임베딩 COPY (DB 쓰기 처리량 기록)"""
+        if not rows:
+            return 0
+        started = time.perf_counter()
+        written = await AsyncChunkRepository.copy_many(doc_id, rows, vectors, conn=conn)
+        elapsed = time.perf_counter() - started
+        # COPY BINARY 행 크기 근사: 텍스트 + 벡터(4바이트 × 차원 + 헤더) + 정수 컬럼
+        size = sum(len(text.encode()) for _, text in rows) + sum(4 * len(v) + 4 for v in vectors) + 16 * written
+        self.rows_written += written
+        self.bytes_written += size
+        self.write_seconds += elapsed
+        CHUNK_WRITE_ROWS.inc(written)
+        CHUNK_WRITE_BYTES.inc(size)
+        return written
+
+    async def _fail(self, doc_id: int, error: str) -> None:
+        logger.warning("Document ingestion failed", extra={"doc_id": doc_id, "error": error})
+        self.documents_failed += 1
+        INGEST_DOCUMENTS.labels("failed").inc()
+        try:
+            await AsyncIngestionRepository.fail(doc_id, error)
+        except Exception:
+            logger.exception("Failed to record ingestion failure", extra={"doc_id": doc_id})
+
+    async def _retry(self, doc_id: int, error: str) -> None:
+        self.documents_retried += 1
+        INGEST_DOCUMENTS.labels("retry").inc()
+        try:
+            await AsyncIngestionRepository.retry(doc_id, error)
+        except Exception:
+            logger.exception("Failed to requeue ingestion", extra={"doc_id": doc_id})
+
+    # ---------- 시작 / 종료 ----------
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._run_forever()) for _ in range(self.concurrency)]
+        logger.info(f"Ingestion worker started concurrency={self.concurrency}")
+
+    def wake(self) -> None:
+        """새 작업이 들어왔음을 알림 (다른 스레드에서 호출해도 됨)"""
+        if self._loop is None or self._wake is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def stop(self) -> None:
+        """태스크 종료 + 하던 문서는 pending으로 되돌림 + 추출 프로세스 정리"""
+        self._stopping = True
+        active = list(self._active)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if active:
+            try:
+                await AsyncIngestionRepository.requeue(active)
+            except Exception:
+                logger.exception("Failed to requeue active ingestion jobs", extra={"doc_ids": active})
+        await asyncio.get_running_loop().run_in_executor(None, self.extractor.shutdown)
+        self._loop = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": INGEST_ENABLED,
+            "backend": pdf_extractor.extract_backend(),
+            "running": bool(self._tasks),
+            "extract_workers": self.extractor.workers,
+            "pages_per_task": self.extractor.pages_per_task,
+            "concurrency": self.concurrency,
+            "active_doc_ids": sorted(self._active),
+            "documents_done": self.documents_done,
+            "documents_failed": self.documents_failed,
+            "documents_retried": self.documents_retried,
+            "pages": self.pages,
+            "avg_pages_per_sec": round(self.pages / self.seconds, 1) if self.seconds else None,
+            "last_pages_per_sec": round(self.last_pages_per_sec, 1) if self.last_pages_per_sec is not None else None,
+            # COPY 시간만 (임베딩 대기 제외)
+            "chunks_written": self.rows_written,
+            "write_rows_per_sec": round(self.rows_written / self.write_seconds, 1) if self.write_seconds else None,
+            "write_mb_per_sec": round(self.bytes_written / self.write_seconds / 1e6, 2) if self.write_seconds else None,
+        }
+
+
+ingestion_worker = IngestionWorker()
+
+
+def ingestion_stats() -> dict:
+    return ingestion_worker.stats()
+
+
+def wake_ingestion() -> None:
+    """업로드 commit 후 호출: 워커가 대기 중이면 바로 대기열 확인 (워커가 없으면 아무것도 안 함)"""
+    ingestion_worker.wake()
+
+
+async def start_ingestion() -> None:
+    """앱 시작 시 호출: INGEST_ENABLED 이고 추출 라이브러리가 있을 때만 워커 시작"""
+    if not INGEST_ENABLED:
+        return
+    if pdf_extractor.extract_backend() is None:
+        logger.warning("Neither pymupdf nor pypdf is installed, PDF ingestion worker not started")
+        return
+    ingestion_worker.start()
+
+
+async def stop_ingestion() -> None:
+    """앱 종료 시 호출"""
+    if ingestion_worker.stats()["running"]:
+        await ingestion_worker.stop()
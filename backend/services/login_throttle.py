@@ -0,0 +1,129 @@
+"""
+Login Throttle
+이메일별 / 클라이언트 IP별 토큰 버킷으로 로그인 시도 횟수 제한
+
+- 로그인 시도마다 두 버킷에서 토큰 1개씩 사용, 어느 쪽이든 비어 있으면 해시 비교 전에 거절
+  (LoginThrottledError → 라우터에서 429 + Retry-After)
+- 버킷은 BURST개까지 모이고 분당 PER_MIN개씩 다시 참
+  - 이메일: 한 계정을 노리는 비밀번호 대입 (기본 10개, 분당 10개)
+  - IP: 한 곳에서 여러 계정을 도는 credential stuffing (기본 30개, 분당 60개)
+- 키는 LOGIN_THROTTLE_MAX_KEYS개까지 LRU로 보관 (오래 안 쓴 버킷은 가득 찬 상태와 같으므로 버려도 됨)
+- 상태는 프로세스 메모리 (워커가 여러 개면 워커마다 따로 센다)
+- LOGIN_THROTTLE_ENABLED=false 면 제한하지 않음
+"""
+import os
+import math
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+LOGIN_THROTTLE_ENABLED = os.getenv("LOGIN_THROTTLE_ENABLED", "true").lower() in ("1", "true", "yes")
+LOGIN_EMAIL_BURST = float(os.getenv("LOGIN_EMAIL_BURST", "10"))
+LOGIN_EMAIL_PER_MIN = float(os.getenv("LOGIN_EMAIL_PER_MIN", "10"))
+LOGIN_IP_BURST = float(os.getenv("LOGIN_IP_BURST", "30"))
+LOGIN_IP_PER_MIN = float(os.getenv("LOGIN_IP_PER_MIN", "60"))
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+
+
+class LoginThrottledError(ValueError):
+    """로그인 시도 횟수 초과 (라우터에서 429로 변환)"""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBuckets:
+    """키별 토큰 버킷 (키 → [남은 토큰, 마지막 갱신 시각])"""
+
+    def __init__(self, burst: float, per_min: float, max_keys: int) -> None:
+        self.burst = burst
+        self.rate = per_min / 60.0
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self.throttled = 0
+
+    def refill(self, key: str, now: float) -> list:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        return bucket
+
+    def wait_seconds(self, bucket: list) -> float:
+        """토큰 1개가 찰 때까지 남은 시간 (지금 쓸 수 있으면 0)"""
+        if bucket[0] >= 1:
+            return 0.0
+        return (1 - bucket[0]) / self.rate if self.rate > 0 else 3600.0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class LoginThrottle:
+    """이메일 + IP 로그인 시도 제한"""
+
+    def __init__(self) -> None:
+        self.by_email = TokenBuckets(LOGIN_EMAIL_BURST, LOGIN_EMAIL_PER_MIN, LOGIN_THROTTLE_MAX_KEYS)
+        self.by_ip = TokenBuckets(LOGIN_IP_BURST, LOGIN_IP_PER_MIN, LOGIN_THROTTLE_MAX_KEYS)
+        self._lock = threading.Lock()
+
+    def check(self, email: str, client_ip: Optional[str]) -> None:
+        """
+        시도 1번 기록 (두 버킷 모두 토큰이 있을 때만 사용)
+
+        Raises:
+            LoginThrottledError: 어느 한쪽 버킷이라도 비어 있는 경우
+        """
+        if not LOGIN_THROTTLE_ENABLED:
+            return
+        now = time.monotonic()
+        with self._lock:
+            email_bucket = self.by_email.refill(email.strip().lower(), now)
+            ip_bucket = self.by_ip.refill(client_ip, now) if client_ip else None
+
+            wait = 0.0
+            if ip_bucket is not None and self.by_ip.wait_seconds(ip_bucket) > 0:
+                self.by_ip.throttled += 1
+                wait = self.by_ip.wait_seconds(ip_bucket)
+            elif self.by_email.wait_seconds(email_bucket) > 0:
+                self.by_email.throttled += 1
+                wait = self.by_email.wait_seconds(email_bucket)
+            if wait > 0:
+                raise LoginThrottledError(
+                    "로그인 시도가 너무 많습니다. 잠시 후 다시 시도해 주세요.",
+                    retry_after=max(1, math.ceil(wait))
+                )
+
+            email_bucket[0] -= 1
+            if ip_bucket is not None:
+                ip_bucket[0] -= 1
+
+    def reset(self) -> None:
+        """모든 버킷 / 카운터 초기화 (벤치마크, 잘못 막힌 사용자 수동 해제)"""
+        with self._lock:
+            self.by_email = TokenBuckets(LOGIN_EMAIL_BURST, LOGIN_EMAIL_PER_MIN, LOGIN_THROTTLE_MAX_KEYS)
+            self.by_ip = TokenBuckets(LOGIN_IP_BURST, LOGIN_IP_PER_MIN, LOGIN_THROTTLE_MAX_KEYS)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": LOGIN_THROTTLE_ENABLED,
+                "email_keys": len(self.by_email),
+                "ip_keys": len(self.by_ip),
+                "throttled_email": self.by_email.throttled,
+                "throttled_ip": self.by_ip.throttled,
+            }
+
+
+login_throttle = LoginThrottle()
+
+
+def throttle_stats() -> dict:
+    return login_throttle.stats()
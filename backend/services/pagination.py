@@ -0,0 +1,59 @@
+"""
+Keyset Pagination
+(created_at, id) 기준 커서 페이지네이션 공통 로직
+
+커서는 클라이언트에게 불투명한 문자열 (base64url)이고,
+마지막으로 받은 행의 created_at, id를 담는다.
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+# cursor만 주고 limit을 생략했을 때의 페이지 크기
+DEFAULT_PAGE_SIZE = 50
+
+# 한 페이지 최대 크기 (라우터 Query 검증에 사용)
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(ValueError):
+    """잘못된 커서 (라우터에서 400으로 변환)"""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """마지막 행의 (created_at, id) → 커서 문자열"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    커서 문자열 → (created_at, id)
+
+    Raises:
+        InvalidCursorError: 형식이 맞지 않는 경우
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError("잘못된 cursor 값입니다.") from e
+
+
+def split_page(rows: list, limit: int, id_field: str) -> Tuple[list, Optional[str]]:
+    """
+    limit + 1개 조회한 결과를 (이번 페이지, next_cursor)로 분리
+
+    Args:
+        rows: limit + 1개까지 조회한 DTO 리스트
+        limit: 페이지 크기
+        id_field: 커서에 넣을 ID 필드명 (doc_id, folder_id)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last.created_at, getattr(last, id_field))
@@ -0,0 +1,231 @@
+"""
+Password Hasher
+로그인 비밀번호 해시 비교를 앱 서버의 별도 프로세스 풀에서 실행
+
+- 예전에는 로그인마다 DB가 crypt(%s, password_hash)를 계산했다 (bcrypt 계열, 수십 ms CPU)
+  → 로그인 폭주(credential stuffing) 시 폴더 / 문서 조회와 같은 DB CPU를 나눠 씀
+- 이제 DB에서는 해시만 읽고 비교는 여기서 한다
+  - 해시 계산은 GIL을 쥔 채로 도는 경우가 있어 (표준 라이브러리 crypt) 스레드가 아닌 프로세스 풀 사용
+  - 작업자 수 PASSWORD_HASH_WORKERS (기본 CPU 절반), 대기열 PASSWORD_HASH_MAX_QUEUE
+    대기열이 차면 해시를 계산하지 않고 바로 PasswordHashBusyError (라우터에서 503)
+- 비교 라이브러리: bcrypt 패키지 (선택 의존성) → 없으면 표준 라이브러리 crypt (libxcrypt, pgcrypto 해시 호환)
+  이 프로세스에서 비교할 수 없는 해시 형식이면 None을 돌려주고, 호출하는 쪽이 DB crypt()로 비교
+- PASSWORD_VERIFY=db 면 예전처럼 DB에서 비교 (풀을 만들지 않음)
+- 대기 / 실행 중 개수와 누적 결과는 hasher_stats()로 확인 (/health, /metrics 게이지)
+
+작업자 프로세스는 spawn으로 띄우므로 이 모듈은 가볍게 유지 (DB / 메트릭 모듈을 import하지 않음)
+spawn은 실행한 스크립트(__main__)를 다시 import하므로 스크립트는 if __name__ == "__main__" 가드 필요
+앱 시작 시 start_password_hasher()로 작업자를 미리 띄워서 첫 로그인이 프로세스 시작을 기다리지 않게 함
+"""
+import os
+import hmac
+import time
+import asyncio
+import logging
+import warnings
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+try:
+    import bcrypt
+except ImportError:  # 선택 의존성
+    bcrypt = None
+
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import crypt as _crypt  # Python 3.13에서 제거됨
+except ImportError:
+    _crypt = None
+
+logger = logging.getLogger(__name__)
+
+# app: 앱 서버 프로세스 풀에서 비교, db: DB의 crypt()로 비교 (예전 방식)
+PASSWORD_VERIFY = os.getenv("PASSWORD_VERIFY", "app").lower()
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# 작업자가 모두 바쁠 때 기다릴 수 있는 비교 수 (넘으면 503, 로그인 폭주가 메모리 / 지연으로 번지지 않게)
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+# hash_password()로 새 해시를 만들 때 bcrypt cost (pgcrypto gen_salt('bf')의 기본값은 6)
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "10"))
+
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+class PasswordHashBusyError(ValueError):
+    """해시 비교 대기열이 가득 참 (라우터에서 503으로 변환)"""
+
+
+# ==========================
+# 작업자 프로세스에서 실행
+# ==========================
+def check_password(password: str, password_hash: str) -> Optional[bool]:
+    """
+    평문 비밀번호와 저장된 해시 비교
+
+    Returns:
+        True / False, 이 프로세스에서 지원하지 않는 해시 형식이면 None
+    """
+    if bcrypt is not None and password_hash.startswith(BCRYPT_PREFIXES):
+        try:
+            return bcrypt.checkpw(password.encode(), password_hash.encode())
+        except ValueError:
+            return None
+    if _crypt is not None:
+        try:
+            computed = _crypt.crypt(password, password_hash)
+        except OSError:
+            computed = None
+        if computed is None or computed.startswith("*"):  # libxcrypt가 모르는 형식
+            return None
+        return hmac.compare_digest(computed, password_hash)
+    return None
+
+
+def hash_password(password: str, rounds: int = PASSWORD_HASH_ROUNDS) -> str:
+    """새 bcrypt 해시 생성 (pgcrypto crypt()와 check_password() 모두 비교 가능)"""
+    if bcrypt is not None:
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+    if _crypt is not None:
+        return _crypt.crypt(password, _crypt.mksalt(_crypt.METHOD_BLOWFISH, rounds=2 ** rounds))
+    raise RuntimeError("bcrypt or crypt is required to hash passwords")
+
+
+def _warm_up() -> None:
+    """작업자 프로세스를 미리 띄우기 위한 빈 작업"""
+
+
+# ==========================
+# 풀 (앱 프로세스)
+# ==========================
+class PasswordHasher:
+    """크기가 정해진 프로세스 풀 + 대기열 상한"""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE) -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._matched = 0
+        self._mismatched = 0
+        self._unsupported = 0
+        self._rejected = 0
+        self._seconds_total = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    logger.info(f"Starting password hash pool workers={self.workers} max_queue={self.max_queue}")
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHashBusyError("로그인 요청이 많습니다. 잠시 후 다시 시도해 주세요.")
+            self._in_flight += 1
+
+    def _release(self, result: Optional[bool], started: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._seconds_total += time.perf_counter() - started
+            if result is None:
+                self._unsupported += 1
+            elif result:
+                self._matched += 1
+            else:
+                self._mismatched += 1
+
+    async def verify(self, password: str, password_hash: str) -> Optional[bool]:
+        """
+        풀에서 해시 비교 (이벤트 루프는 결과를 기다리기만 함)
+
+        Raises:
+            PasswordHashBusyError: 대기열이 가득 찬 경우
+        """
+        self._acquire()
+        started = time.perf_counter()
+        result = None
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), check_password, password, password_hash)
+            return result
+        finally:
+            self._release(result, started)
+
+    def verify_blocking(self, password: str, password_hash: str) -> Optional[bool]:
+        """verify()의 sync 버전 (호출한 스레드가 결과를 기다림)"""
+        self._acquire()
+        started = time.perf_counter()
+        result = None
+        try:
+            result = self._get_executor().submit(check_password, password, password_hash).result()
+            return result
+        finally:
+            self._release(result, started)
+
+    def start(self) -> None:
+        """작업자 수만큼 빈 작업을 넣어서 프로세스를 미리 시작 (결과는 기다리지 않음)"""
+        executor = self._get_executor()
+        for _ in range(self.workers):
+            executor.submit(_warm_up)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = self._in_flight
+            checks = self._matched + self._mismatched + self._unsupported
+            return {
+                "mode": PASSWORD_VERIFY,
+                "backend": "bcrypt" if bcrypt is not None else ("crypt" if _crypt is not None else None),
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": min(in_flight, self.workers),
+                "queued": max(0, in_flight - self.workers),
+                "matched": self._matched,
+                "mismatched": self._mismatched,
+                "unsupported": self._unsupported,
+                "rejected": self._rejected,
+                # 대기열에서 기다린 시간 포함
+                "avg_ms": round(self._seconds_total * 1000 / checks, 2) if checks else 0.0,
+            }
+
+
+def app_verify_enabled() -> bool:
+    """앱 서버에서 비교할지 여부 (PASSWORD_VERIFY=app 이고 비교 라이브러리가 있을 때)"""
+    return PASSWORD_VERIFY == "app" and (bcrypt is not None or _crypt is not None)
+
+
+if PASSWORD_VERIFY == "app" and not app_verify_enabled():
+    logger.warning("Neither bcrypt nor crypt is available, verifying passwords in the DB")
+
+password_hasher = PasswordHasher()
+
+
+def hasher_stats() -> dict:
+    return password_hasher.stats()
+
+
+def start_password_hasher() -> None:
+    """앱 시작 시 호출: 앱 서버에서 비교할 때만 작업자 프로세스 시작"""
+    if app_verify_enabled():
+        password_hasher.start()
+
+
+def shutdown_password_hasher() -> None:
+    """앱 종료 시 호출: 작업자 프로세스 정리"""
+    password_hasher.shutdown()
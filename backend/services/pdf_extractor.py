@@ -0,0 +1,118 @@
+"""
+PDF Extractor
+PDF 페이지 텍스트 추출 (수집 워커의 프로세스 풀에서 실행되는 함수들)
+
+- 라이브러리: PyMuPDF (빠름, 선택 의존성) → 없으면 pypdf (순수 파이썬, 느림)
+  PDF_EXTRACT_BACKEND=pymupdf|pypdf 로 고정 가능
+- 페이지 범위 단위로 추출 (extract_pages(path, start, end)) → 한 문서의 페이지를 여러 프로세스가 나눠서 처리
+- 작업자 프로세스마다 마지막으로 연 문서 1개를 열어 둔 채로 재사용 (범위마다 xref를 다시 읽지 않음)
+  페이지 객체는 범위가 끝나면 버리므로 문서 전체 텍스트를 메모리에 들고 있지 않음
+- 저장 경로는 내용 해시 기반(확장자 없음)이라 형식을 PDF로 지정해서 연다
+
+작업자 프로세스는 spawn으로 띄우므로 이 모듈은 가볍게 유지 (DB / 메트릭 모듈을 import하지 않음)
+"""
+import os
+import re
+from typing import List, Optional, Tuple
+
+try:
+    import pymupdf
+except ImportError:  # 선택 의존성
+    pymupdf = None
+
+try:
+    import pypdf
+except ImportError:  # 선택 의존성
+    pypdf = None
+
+PDF_EXTRACT_BACKEND = os.getenv("PDF_EXTRACT_BACKEND", "auto").lower()
+
+# 줄 끝 공백 / 3줄 이상 빈 줄 정리 (임베딩 / 청크 크기에 의미 없는 문자)
+_TRAILING_SPACE = re.compile(r"[ \t\u00a0]+\n")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+class PdfExtractError(ValueError):
+    """PDF를 열 수 없거나 추출 라이브러리가 없음 (수집 상태에 failed로 기록)"""
+
+
+def extract_backend() -> Optional[str]:
+    """사용할 추출 라이브러리 이름 (없으면 None)"""
+    if PDF_EXTRACT_BACKEND == "pymupdf" or (PDF_EXTRACT_BACKEND == "auto" and pymupdf is not None):
+        return "pymupdf" if pymupdf is not None else None
+    if PDF_EXTRACT_BACKEND in ("pypdf", "auto"):
+        return "pypdf" if pypdf is not None else None
+    return None
+
+
+def clean_text(text: str) -> str:
+    """추출한 페이지 텍스트 정리 (TEXT 컬럼에 넣을 수 없는 NUL 제거, 공백 정리)"""
+    text = text.replace("\x00", "").replace("\r\n", "\n").replace("\r", "\n")
+    text = _TRAILING_SPACE.sub("\n", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+# ==========================
+# 작업자 프로세스에서 실행
+# ==========================
+# (경로, 열린 문서) - 같은 문서의 다음 범위는 다시 열지 않음
+_opened: Tuple[Optional[str], object] = (None, None)
+
+
+def _open(path: str):
+    global _opened
+    if _opened[0] == path:
+        return _opened[1]
+    _close_opened()
+
+    backend = extract_backend()
+    if backend is None:
+        raise PdfExtractError("PDF 추출 라이브러리(pymupdf 또는 pypdf)가 설치되어 있지 않습니다.")
+    try:
+        if backend == "pymupdf":
+            doc = pymupdf.open(path, filetype="pdf")
+        else:
+            doc = pypdf.PdfReader(path)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        raise PdfExtractError(f"PDF를 열 수 없습니다: {e}")
+    _opened = (path, doc)
+    return doc
+
+
+def _close_opened() -> None:
+    global _opened
+    doc = _opened[1]
+    _opened = (None, None)
+    close = getattr(doc, "close", None)
+    if close is not None:
+        close()
+
+
+def page_count(path: str) -> int:
+    """전체 페이지 수"""
+    doc = _open(path)
+    return doc.page_count if extract_backend() == "pymupdf" else len(doc.pages)
+
+
+def extract_pages(path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    """
+    [start, end) 페이지의 텍스트 (페이지 번호는 1부터)
+
+    한 페이지에서 오류가 나면 그 페이지만 빈 텍스트로 두고 계속 진행
+    (깨진 페이지 하나 때문에 교재 전체가 실패하지 않도록)
+    """
+    doc = _open(path)
+    pymupdf_backend = extract_backend() == "pymupdf"
+    pages = []
+    for number in range(start, end):
+        try:
+            if pymupdf_backend:
+                text = doc.load_page(number - 1).get_text("text")
+            else:
+                text = doc.pages[number - 1].extract_text() or ""
+        except Exception:
+            text = ""
+        pages.append((number, clean_text(text)))
+    return pages
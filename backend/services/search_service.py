@@ -0,0 +1,183 @@
+"""
+Search Service
+사용자 / 폴더 / 문서 범위 안에서 질문과 가까운 청크 top-k 검색
+
+- 질문은 청크와 같은 임베딩 백엔드로 벡터화 (services.embedding_service, 캐시 / 배치 공용)
+- 범위는 항상 user_id로 시작 (폴더 / 문서를 지정하면 그 사용자 것인지 먼저 확인)
+- 검색 방법 (strategy=auto)
+  - 범위 청크 수 ≤ SEARCH_EXACT_MAX_CHUNKS: exact
+    범위 문서의 청크만 인덱스(doc_id)로 읽어서 모두 비교 → 정확, 다른 사용자 청크는 읽지 않음
+  - 그보다 크면: ann (HNSW)
+    그래프에서 후보 ef_search개를 보고 범위 밖 청크는 버리므로
+    ef_search ≥ k / (범위 청크 비율) × SEARCH_ANN_OVERSAMPLE 이 되게 올림
+    그 값이 SEARCH_MAX_EF_SEARCH를 넘거나 결과가 k개보다 적으면 exact로 다시 검색
+- 정확도 / 속도 조절: SEARCH_EF_SEARCH (요청의 ef_search로 올릴 수 있음, 클수록 정확하고 느림),
+  SEARCH_EXACT_MAX_CHUNKS (클수록 exact를 더 많이 씀)
+- strategy=exact / ann 으로 강제할 수 있음 (ann 강제 시 exact로 다시 검색하지 않음, 벤치마크용)
+"""
+import os
+import math
+import time
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from repositories.unit_of_work import AsyncUnitOfWork
+from repositories.documents_repository import AsyncDocumentsRepository
+from repositories.folder_repository import AsyncFolderRepository
+from repositories.search_repository import AsyncSearchRepository
+from services.embedding_service import embed_texts
+from dto.search_dto import SearchHitDTO, SearchResultDTO
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DEFAULT_K = int(os.getenv("SEARCH_DEFAULT_K", "5"))
+SEARCH_MAX_K = int(os.getenv("SEARCH_MAX_K", "50"))
+SEARCH_EXACT_MAX_CHUNKS = int(os.getenv("SEARCH_EXACT_MAX_CHUNKS", "20000"))
+SEARCH_EF_SEARCH = int(os.getenv("SEARCH_EF_SEARCH", "100"))
+SEARCH_MAX_EF_SEARCH = int(os.getenv("SEARCH_MAX_EF_SEARCH", "1000"))  # pgvector hnsw.ef_search 상한
+SEARCH_ANN_OVERSAMPLE = float(os.getenv("SEARCH_ANN_OVERSAMPLE", "2.0"))
+
+SEARCH_SECONDS = Histogram(
+    "search_seconds", "벡터 검색 DB 시간 (질문 임베딩 제외)",
+    ["strategy"],  # exact / ann
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+SEARCH_FALLBACKS = Counter("search_ann_fallbacks_total", "ann 결과가 k개보다 적어서 exact로 다시 검색한 수")
+
+
+def plan_search(
+    scope_chunks: int,
+    total_chunks: int,
+    k: int,
+    strategy: str = "auto",
+    ef_search: Optional[int] = None
+) -> Tuple[str, Optional[int]]:
+    """(exact / ann, ann일 때 ef_search) 결정 (모듈 docstring 참고)"""
+    if strategy == "exact" or (strategy == "auto" and scope_chunks <= SEARCH_EXACT_MAX_CHUNKS):
+        return "exact", None
+    ratio = scope_chunks / max(total_chunks, scope_chunks, 1)
+    needed = math.ceil(k / ratio * SEARCH_ANN_OVERSAMPLE) if ratio > 0 else SEARCH_MAX_EF_SEARCH + 1
+    ef = max(ef_search or SEARCH_EF_SEARCH, k, needed)
+    if ef > SEARCH_MAX_EF_SEARCH:
+        if strategy == "auto":
+            return "exact", None
+        ef = SEARCH_MAX_EF_SEARCH
+    return "ann", ef
+
+
+class AsyncSearchService:
+    """청크 벡터 검색 서비스 (async)"""
+
+    def __init__(self, uow: Optional[AsyncUnitOfWork] = None):
+        self.uow = uow
+        self.conn = uow.conn if uow else None
+        self.document_repo = AsyncDocumentsRepository()
+        self.folder_repo = AsyncFolderRepository()
+        self.search_repo = AsyncSearchRepository()
+
+    async def search(
+        self,
+        user_id: int,
+        query: str,
+        k: int = SEARCH_DEFAULT_K,
+        folder_id: Optional[int] = None,
+        doc_id: Optional[int] = None,
+        strategy: str = "auto",
+        ef_search: Optional[int] = None
+    ) -> SearchResultDTO:
+        """
+        질문과 가까운 청크 top-k
+
+        Raises:
+            ValueError: 폴더 / 문서가 없거나 다른 사용자의 것
+            EmbeddingError: 질문 임베딩 실패
+        """
+        scope = await self._find_scope(user_id, folder_id, doc_id)
+        if not sum(doc["chunks"] for doc in scope):
+            # 청크가 없으면 질문을 임베딩하지 않음
+            return self._result([], scope, k, "exact", None)
+        vector = (await embed_texts([query]))[0]
+        return await self._search_scope(vector, scope, k, strategy, ef_search)
+
+    async def search_by_vector(
+        self,
+        user_id: int,
+        vector: Sequence[float],
+        k: int = SEARCH_DEFAULT_K,
+        folder_id: Optional[int] = None,
+        doc_id: Optional[int] = None,
+        strategy: str = "auto",
+        ef_search: Optional[int] = None
+    ) -> SearchResultDTO:
+        """이미 임베딩한 벡터로 검색 (search와 같은 범위 규칙)"""
+        scope = await self._find_scope(user_id, folder_id, doc_id)
+        return await self._search_scope(vector, scope, k, strategy, ef_search)
+
+    async def _find_scope(self, user_id: int, folder_id: Optional[int], doc_id: Optional[int]) -> List[dict]:
+        """범위 문서 목록 (지정한 폴더 / 문서가 다른 사용자 것이면 없는 것과 같이 ValueError)"""
+        if doc_id is not None:
+            doc = await self.document_repo.find_by_doc_id(doc_id, conn=self.conn)
+            if not doc or doc.user_id != user_id:
+                raise ValueError(f"Document with id {doc_id} not found")
+        if folder_id is not None:
+            folder = await self.folder_repo.find_by_id(folder_id, conn=self.conn)
+            if not folder or folder.user_id != user_id:
+                raise ValueError(f"Folder with id {folder_id} not found")
+        return await self.search_repo.find_scope(user_id, folder_id, doc_id, conn=self.conn)
+
+    async def _search_scope(
+        self,
+        vector: Sequence[float],
+        scope: List[dict],
+        k: int,
+        strategy: str,
+        ef_search: Optional[int]
+    ) -> SearchResultDTO:
+        scope_chunks = sum(doc["chunks"] for doc in scope)
+        if not scope_chunks:
+            return self._result([], scope, k, "exact", None)
+        doc_ids = [doc["doc_id"] for doc in scope]
+        total = 0
+        if strategy == "ann" or (strategy == "auto" and scope_chunks > SEARCH_EXACT_MAX_CHUNKS):
+            total = await self.search_repo.estimate_chunks(conn=self.conn)
+        used, ef = plan_search(scope_chunks, total, k, strategy, ef_search)
+
+        started = time.perf_counter()
+        if used == "ann":
+            rows = await self.search_repo.search_ann(vector, doc_ids, k, ef, conn=self.conn)
+            SEARCH_SECONDS.labels("ann").observe(time.perf_counter() - started)
+            if len(rows) < min(k, scope_chunks) and strategy == "auto":
+                # 후보 중 범위 안 청크가 모자람 (범위 비율 추정이 틀렸거나 아직 임베딩 안 된 청크)
+                SEARCH_FALLBACKS.inc()
+                used, ef = "exact", None
+                started = time.perf_counter()
+        if used == "exact":
+            rows = await self.search_repo.search_exact(vector, doc_ids, k, conn=self.conn)
+            SEARCH_SECONDS.labels("exact").observe(time.perf_counter() - started)
+        return self._result(rows, scope, k, used, ef)
+
+    @staticmethod
+    def _result(rows: List[dict], scope: List[dict], k: int, strategy: str, ef: Optional[int]) -> SearchResultDTO:
+        docs = {doc["doc_id"]: doc for doc in scope}
+        hits = [
+            SearchHitDTO(
+                chunk_id=row["chunk_id"],
+                doc_id=row["doc_id"],
+                folder_id=docs[row["doc_id"]]["folder_id"],
+                filename=docs[row["doc_id"]]["filename"],
+                page_number=row["page_number"],
+                chunk_text=row["chunk_text"],
+                score=1.0 - row["distance"]
+            )
+            for row in rows
+        ]
+        return SearchResultDTO(
+            hits=hits,
+            k=k,
+            strategy=strategy,
+            ef_search=ef,
+            scope_documents=len(scope),
+            scope_chunks=sum(doc["chunks"] for doc in scope)
+        )
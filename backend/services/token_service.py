@@ -0,0 +1,244 @@
+"""
+Token Service
+로그인 후 발급하는 서명 토큰 (access / refresh) 발급 / 검증 / 폐기
+
+- 형식: JWT (HS256, header에 kid), 표준 라이브러리 hmac으로 서명 / 검증 → 요청마다 DB 조회 없음
+- 키: AUTH_TOKEN_KEYS="kid1:secret1,kid2:secret2" (첫 번째 키로 서명, 나머지는 검증만 → 키 교체 시 무중단)
+      AUTH_TOKEN_SECRET 하나만 줘도 됨 (kid "default")
+      둘 다 없으면 프로세스마다 임의 키 생성 (재시작 / 다른 워커에서는 토큰이 무효, 개발용)
+      키와 header 세그먼트는 import 시 한 번 만들어 두고 재사용
+- 토큰 없는 요청은 401 (AUTH_REQUIRED=false면 토큰 없이도 통과, 개발용)
+- access 토큰: ACCESS_TOKEN_TTL_SEC (기본 15분), refresh 토큰: REFRESH_TOKEN_TTL_SEC (기본 14일)
+- refresh는 회전 방식: 한 번 쓴 refresh 토큰은 폐기 목록에 넣고 새 쌍을 발급
+- 폐기(로그아웃)는 프로세스 메모리의 denylist
+  - jti → 만료 시각 (만료된 항목은 자동으로 정리, 토큰이 살아 있는 동안만 보관)
+  - 사용자별 "이 시각 이전 발급분 전부 폐기" (모든 기기 로그아웃)
+    iat는 마이크로초 단위 소수라서 폐기 직후 같은 초에 다시 로그인한 토큰은 살아 있음
+  워커가 여러 개면 폐기는 요청을 받은 워커에만 적용되므로, access TTL을 짧게 유지할 것
+"""
+import os
+import time
+import hmac
+import base64
+import hashlib
+import logging
+import secrets
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import orjson
+
+from dto.user_dto import LoginResponseDTO
+
+logger = logging.getLogger(__name__)
+
+AUTH_TOKEN_KEYS = os.getenv("AUTH_TOKEN_KEYS", "")
+AUTH_TOKEN_SECRET = os.getenv("AUTH_TOKEN_SECRET", "")
+ACCESS_TOKEN_TTL_SEC = int(os.getenv("ACCESS_TOKEN_TTL_SEC", "900"))
+REFRESH_TOKEN_TTL_SEC = int(os.getenv("REFRESH_TOKEN_TTL_SEC", str(14 * 24 * 3600)))
+
+# 기본은 토큰 없는 요청을 401로 거절
+# false면 토큰이 있을 때만 검증 (토큰을 보내지 않는 예전 클라이언트용, 소유자 확인이 생략되므로 개발 환경에서만)
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "true").lower() in ("1", "true", "yes")
+
+# denylist 항목이 이보다 많아지면 경고 (만료 전 항목은 지우지 않음)
+TOKEN_DENYLIST_WARN_SIZE = int(os.getenv("TOKEN_DENYLIST_WARN_SIZE", "100000"))
+
+TOKEN_ISSUER = "study-app"
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+class InvalidTokenError(ValueError):
+    """서명 / 형식이 잘못됐거나 만료 / 폐기된 토큰 (라우터에서 401로 변환)"""
+
+
+class TokenClaims(NamedTuple):
+    """검증된 토큰 내용"""
+    user_id: int
+    email: str
+    token_type: str
+    jti: str
+    issued_at: float  # 마이크로초 단위 (사용자별 폐기 기준 시각과 비교)
+    expires_at: int
+
+
+# ==========================
+# 키 (import 시 1번 파싱)
+# ==========================
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _load_keys() -> Dict[str, bytes]:
+    keys = {}
+    for item in AUTH_TOKEN_KEYS.split(","):
+        kid, _, secret = item.strip().partition(":")
+        if kid and secret:
+            keys[kid] = secret.encode()
+    if not keys and AUTH_TOKEN_SECRET:
+        keys["default"] = AUTH_TOKEN_SECRET.encode()
+    if not keys:
+        logger.warning("AUTH_TOKEN_KEYS / AUTH_TOKEN_SECRET not set, using a random per-process token key")
+        keys["ephemeral"] = secrets.token_bytes(32)
+    return keys
+
+
+_keys = _load_keys()
+_signing_kid = next(iter(_keys))
+
+# header 세그먼트(base64) → kid (검증할 때 header JSON을 매번 파싱하지 않음)
+_header_segments: Dict[str, str] = {
+    _b64encode(orjson.dumps({"alg": "HS256", "typ": "JWT", "kid": kid})): kid for kid in _keys
+}
+_signing_header = next(segment for segment, kid in _header_segments.items() if kid == _signing_kid)
+
+
+def _sign(key: bytes, signing_input: str) -> bytes:
+    return hmac.new(key, signing_input.encode("ascii"), hashlib.sha256).digest()
+
+
+# ==========================
+# 폐기 목록
+# ==========================
+class TokenDenylist:
+    """폐기된 토큰 목록 (jti → 만료 시각 + 사용자별 폐기 기준 시각)"""
+
+    def __init__(self) -> None:
+        self._jtis: Dict[str, int] = {}
+        self._user_cutoffs: Dict[int, Tuple[float, float]] = {}  # user_id → (이 시각 이전 발급분 폐기, 보관 만료)
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+
+    def revoke(self, jti: str, expires_at: int) -> None:
+        with self._lock:
+            self._jtis[jti] = expires_at
+            self._prune_locked()
+
+    def revoke_user(self, user_id: int) -> None:
+        """지금까지 발급된 이 사용자의 토큰 전부 폐기"""
+        now = time.time()
+        with self._lock:
+            self._user_cutoffs[user_id] = (now, now + REFRESH_TOKEN_TTL_SEC)
+            self._prune_locked()
+
+    def is_revoked(self, claims: TokenClaims) -> bool:
+        if claims.jti in self._jtis:
+            return True
+        cutoff = self._user_cutoffs.get(claims.user_id)
+        return cutoff is not None and claims.issued_at < cutoff[0]
+
+    def _prune_locked(self) -> None:
+        """만료된 항목 정리 (최대 초당 1번)"""
+        now = time.time()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + 1.0
+        self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+        self._user_cutoffs = {uid: cutoff for uid, cutoff in self._user_cutoffs.items() if cutoff[1] > now}
+        if len(self._jtis) > TOKEN_DENYLIST_WARN_SIZE:
+            logger.warning(f"Token denylist is large size={len(self._jtis)}")
+
+    def stats(self) -> dict:
+        return {"revoked_tokens": len(self._jtis), "revoked_users": len(self._user_cutoffs)}
+
+
+denylist = TokenDenylist()
+
+
+# ==========================
+# 발급 / 검증
+# ==========================
+class TokenService:
+    """토큰 발급 / 검증 / 폐기 (상태는 모듈 전역 키 / denylist, 인스턴스는 가벼움)"""
+
+    @staticmethod
+    def _encode(user_id: int, email: str, token_type: str, ttl_sec: int, now: float) -> str:
+        payload = {
+            "iss": TOKEN_ISSUER,
+            "sub": str(user_id),
+            "email": email,
+            "typ": token_type,
+            "jti": _b64encode(secrets.token_bytes(12)),
+            "iat": round(now, 6),
+            "exp": int(now) + ttl_sec,
+        }
+        signing_input = f"{_signing_header}.{_b64encode(orjson.dumps(payload))}"
+        return f"{signing_input}.{_b64encode(_sign(_keys[_signing_kid], signing_input))}"
+
+    def issue(self, user_id: int, email: str) -> LoginResponseDTO:
+        """access + refresh 토큰 쌍 발급"""
+        now = time.time()
+        return LoginResponseDTO(
+            user_id=user_id,
+            email=email,
+            access_token=self._encode(user_id, email, ACCESS, ACCESS_TOKEN_TTL_SEC, now),
+            refresh_token=self._encode(user_id, email, REFRESH, REFRESH_TOKEN_TTL_SEC, now),
+            expires_in=ACCESS_TOKEN_TTL_SEC,
+        )
+
+    def verify(self, token: str, token_type: str = ACCESS) -> TokenClaims:
+        """
+        서명 / 만료 / 종류 / 폐기 여부 확인
+
+        Raises:
+            InvalidTokenError: 하나라도 맞지 않는 경우
+        """
+        # 정상 토큰은 base64url + "." 뿐 (ASCII가 아니면 서명 계산 / 비교 전에 거절)
+        if not token.isascii():
+            raise InvalidTokenError("토큰 형식이 올바르지 않습니다.")
+        try:
+            header, payload_segment, signature = token.split(".")
+        except ValueError:
+            raise InvalidTokenError("토큰 형식이 올바르지 않습니다.")
+
+        kid = _header_segments.get(header)
+        if kid is None:
+            raise InvalidTokenError("알 수 없는 토큰 키입니다.")
+        expected = _b64encode(_sign(_keys[kid], f"{header}.{payload_segment}"))
+        if not hmac.compare_digest(expected.encode("ascii"), signature.encode("ascii")):
+            raise InvalidTokenError("토큰 서명이 올바르지 않습니다.")
+
+        try:
+            payload = orjson.loads(_b64decode(payload_segment))
+            claims = TokenClaims(
+                user_id=int(payload["sub"]),
+                email=payload["email"],
+                token_type=payload["typ"],
+                jti=payload["jti"],
+                issued_at=float(payload["iat"]),
+                expires_at=int(payload["exp"]),
+            )
+        except (ValueError, KeyError, TypeError):
+            raise InvalidTokenError("토큰 내용이 올바르지 않습니다.")
+
+        if payload.get("iss") != TOKEN_ISSUER or claims.token_type != token_type:
+            raise InvalidTokenError("토큰 종류가 올바르지 않습니다.")
+        if claims.expires_at <= time.time():
+            raise InvalidTokenError("토큰이 만료되었습니다.")
+        if denylist.is_revoked(claims):
+            raise InvalidTokenError("폐기된 토큰입니다.")
+        return claims
+
+    def refresh(self, refresh_token: str) -> LoginResponseDTO:
+        """refresh 토큰으로 새 토큰 쌍 발급 (쓴 refresh 토큰은 폐기)"""
+        claims = self.verify(refresh_token, REFRESH)
+        denylist.revoke(claims.jti, claims.expires_at)
+        return self.issue(claims.user_id, claims.email)
+
+    def revoke(self, access_claims: TokenClaims, refresh_token: Optional[str] = None, all_sessions: bool = False) -> None:
+        """로그아웃: 현재 access 토큰 (+ 같은 사용자의 refresh 토큰, 또는 사용자의 모든 토큰) 폐기"""
+        denylist.revoke(access_claims.jti, access_claims.expires_at)
+        if all_sessions:
+            denylist.revoke_user(access_claims.user_id)
+        elif refresh_token:
+            try:
+                refresh_claims = self.verify(refresh_token, REFRESH)
+            except InvalidTokenError:
+                return  # 이미 만료 / 폐기된 refresh 토큰
+            if refresh_claims.user_id == access_claims.user_id:
+                denylist.revoke(refresh_claims.jti, refresh_claims.expires_at)
@@ -0,0 +1,165 @@
+"""
+services.chunker 속성 테스트
+
+임의로 만든 한글 / 영문 / 숫자 / 기호가 섞인 페이지를 임의의 max_tokens / overlap으로 나눠서
+모든 청크가 규칙을 지키는지 확인 (hypothesis 없이 seed 고정 난수, 실패 메시지에 seed 포함)
+
+실행 (backend/ 에서):
+    python -m pytest -q tests/test_chunker.py
+"""
+import random
+import re
+from typing import List, Tuple
+
+import pytest
+
+from services.chunker import Chunker, chunk_pages, estimate_tokens
+
+_SPACES = re.compile(r"\s+")
+_PUNCTUATION = ".,!?;:()[]-/%·。"
+
+CASES = 300
+
+
+# ==========================
+# 입력 만들기
+# ==========================
+def _hangul(rng: random.Random, length: int) -> str:
+    return "".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(length))
+
+
+def _ascii(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(length))
+
+
+def _word(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.4:
+        return _hangul(rng, rng.randint(1, 6))
+    if kind < 0.7:
+        return _ascii(rng, rng.randint(1, 12))
+    if kind < 0.8:
+        return str(rng.randrange(10 ** rng.randint(1, 8)))
+    if kind < 0.9:
+        # 한글과 영문 / 숫자가 붙은 어절 (예: "API를", "3장")
+        return _ascii(rng, rng.randint(1, 5)) + _hangul(rng, rng.randint(1, 3))
+    return "".join(rng.choice(_PUNCTUATION) for _ in range(rng.randint(1, 3)))
+
+
+def _line(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.1:
+        return rng.choice(["", "   ", "\t"])
+    if kind < 0.2:
+        # 띄어쓰기 없이 긴 덩어리 (URL, 붙여 쓴 한글 등)
+        return rng.choice([_hangul, _ascii])(rng, rng.randint(20, 400))
+    words = []
+    for _ in range(rng.randint(1, 80)):
+        word = _word(rng)
+        if rng.random() < 0.15:
+            word += rng.choice([".", "!", "?", "다.", "요."])
+        words.append(word)
+    return rng.choice([" ", "  ", " \t"]).join(words)
+
+
+def _pages(rng: random.Random) -> List[Tuple[int, str]]:
+    pages = []
+    number = 0
+    for _ in range(rng.randint(0, 8)):
+        number += rng.randint(1, 3)  # 빈 페이지를 건너뛴 것처럼 번호가 띄엄띄엄일 수 있음
+        lines = [_line(rng) for _ in range(rng.randint(0, 12))]
+        pages.append((number, "\n".join(lines)))
+    return pages
+
+
+def _budget(rng: random.Random) -> Tuple[int, int]:
+    max_tokens = rng.choice([1, 2, 3, rng.randint(1, 20), rng.randint(20, 300)])
+    overlap = rng.choice([0, rng.randint(0, max_tokens), max_tokens, max_tokens * 2 + 1])
+    return max_tokens, overlap
+
+
+# ==========================
+# 규칙 확인
+# ==========================
+def _check(pages: List[Tuple[int, str]], max_tokens: int, overlap: int, label: str) -> None:
+    chunks = list(chunk_pages(pages, max_tokens, overlap, count_tokens=estimate_tokens))
+    overlap_budget = Chunker(max_tokens, overlap, estimate_tokens).overlap_tokens
+    page_numbers = [number for number, _ in pages]
+    previous = None
+    body = []
+
+    for position, chunk in enumerate(chunks):
+        where = f"{label} chunk {position}"
+        assert chunk.index == position, where
+
+        # 토큰 예산 + 빈 청크 없음
+        assert chunk.text.strip(), f"{where}: empty"
+        assert chunk.tokens <= max_tokens, f"{where}: {chunk.tokens} > {max_tokens}"
+        assert estimate_tokens(chunk.text) <= max_tokens, f"{where}: text over budget"
+
+        # 페이지 순서
+        assert chunk.page_number in page_numbers and chunk.page_end in page_numbers, where
+        assert chunk.page_number <= chunk.page_end, where
+        if previous is not None:
+            assert chunk.page_number >= previous.page_number, where
+            assert chunk.page_end >= previous.page_end, where
+
+        # 겹침 = 앞 청크 끝부분, 겹침 예산 안, 새 내용이 반드시 있음
+        if chunk.overlap_chars:
+            assert previous is not None, f"{where}: overlap on first chunk"
+            overlap_text = chunk.text[:chunk.overlap_chars].rstrip()
+            assert overlap_text, where
+            assert previous.text.endswith(overlap_text), f"{where}: overlap is not the previous tail"
+            assert estimate_tokens(overlap_text) <= overlap_budget, f"{where}: overlap over budget"
+        assert chunk.text[chunk.overlap_chars:].strip(), f"{where}: nothing but overlap"
+
+        body.append(_SPACES.sub("", chunk.text[chunk.overlap_chars:]))
+        previous = chunk
+
+    # 겹침을 뺀 청크를 이으면 원문 (공백 제외)
+    source = "".join(_SPACES.sub("", text) for _, text in pages)
+    assert "".join(body) == source, f"{label}: chunks do not reproduce the source"
+
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_random_pages(seed: int) -> None:
+    rng = random.Random(seed)
+    pages = _pages(rng)
+    max_tokens, overlap = _budget(rng)
+    _check(pages, max_tokens, overlap, f"seed={seed} max_tokens={max_tokens} overlap={overlap}")
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_one_token_budget(seed: int) -> None:
+    """max_tokens=1: 모든 청크가 글자 1개 수준까지 잘려도 규칙 유지 (겹침은 0으로 줄어듦)"""
+    pages = _pages(random.Random(seed))
+    _check(pages, 1, 5, f"seed={seed} max_tokens=1")
+    assert Chunker(1, 5, estimate_tokens).overlap_tokens == 0
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_overlap_over_half_budget(seed: int) -> None:
+    """겹침이 예산 절반을 넘으면 절반으로 줄임"""
+    rng = random.Random(seed)
+    max_tokens = rng.randint(2, 100)
+    overlap = rng.randint(max_tokens // 2 + 1, max_tokens * 3)
+    assert Chunker(max_tokens, overlap, estimate_tokens).overlap_tokens == max_tokens // 2
+    _check(_pages(rng), max_tokens, overlap, f"seed={seed} max_tokens={max_tokens} overlap={overlap}")
+
+
+def test_feed_streams_before_flush() -> None:
+    """다 찬 청크는 flush 전에 feed에서 바로 나옴"""
+    chunker = Chunker(10, 2, estimate_tokens)
+    emitted = list(chunker.feed(1, "\n".join(["가나다라마"] * 10)))
+    assert emitted
+    assert list(chunker.flush())
+
+
+def test_empty_input() -> None:
+    assert list(chunk_pages([], 10, 2)) == []
+    assert list(chunk_pages([(1, ""), (2, " \n\t\n")], 10, 2)) == []
+
+
+def test_non_positive_budget() -> None:
+    with pytest.raises(ValueError):
+        Chunker(0, 0)
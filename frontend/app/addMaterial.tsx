@@ -42,12 +42,17 @@ export default function AddMaterialScreen() {
   const [selectedFileName, setSelectedFileName] = useState<string | null>(null);
   const [isUploading, setIsUploading] = useState(false);
 
-  // 사용자 ID (실제로는 인증 시스템에서 가져와야 함)
-  const userId = 1;
+  // 로그인한 사용자 ID (서버는 토큰의 사용자와 다른 user_id를 거절)
+  const user = useStore((state) => state.user);
+  const userId = user?.id ?? 0;
 
   // DB에서 폴더 목록 가져오기
   useEffect(() => {
     const loadFolders = async () => {
+      if (!userId) {
+        setIsFoldersLoading(false);
+        return;
+      }
       try {
         setIsFoldersLoading(true);
         console.log('[폴더 로드] DB에서 폴더 목록 조회 중...');
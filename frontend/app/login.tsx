@@ -3,6 +3,7 @@ import { useState } from 'react';
 import { View, Text, TextInput, Pressable, StyleSheet, Alert, Platform } from 'react-native';
 import { useRouter } from 'expo-router';
 import { useStore } from '@/store/useStore';
+import { setAuthTokens } from '@/services/api';
 
 const API_BASE_URL =
     Platform.OS === 'android'
@@ -75,6 +76,9 @@ export default function LoginScreen() {
             // 여기까지 왔으면 성공
             console.log('[Login] 로그인 성공:', data);
 
+            // 이후 API 요청에 Authorization: Bearer 로 붙일 토큰 저장
+            setAuthTokens(data);
+
             setUser({
                 id: data.user_id,
                 email: data.email,
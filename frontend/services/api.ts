@@ -26,7 +26,7 @@ export const api = {
 
 /**
  * API 호출 헬퍼 함수
- * fetch를 래핑하여 에러 처리 및 JSON 파싱 자동화
+ * fetch를 래핑하여 인증 헤더 추가, 에러 처리 및 JSON 파싱 자동화
  */
 export async function apiRequest<T>(
   endpoint: string,
@@ -35,11 +35,11 @@ export async function apiRequest<T>(
   const url = `${API_BASE_URL}${endpoint}`;
 
   try {
-    const response = await fetch(url, {
+    const response = await authFetch(url, {
       ...options,
       headers: {
         'Content-Type': 'application/json',
-        ...options?.headers,
+        ...(options?.headers as Record<string, string> | undefined),
       },
     });
 
@@ -57,4 +57,112 @@ export async function apiRequest<T>(
     }
     throw new Error('알 수 없는 오류가 발생했습니다.');
   }
-}
\ No newline at end of file
+}
+
+/**
+ * 로그인 / 토큰 갱신 응답 (백엔드: backend/dto/user_dto.py의 LoginResponseDTO와 일치)
+ */
+export interface AuthTokens {
+  user_id: number;
+  email: string;
+  access_token: string;
+  refresh_token: string;
+  token_type: string;
+  expires_in: number; // access 토큰 유효 시간 (초)
+}
+
+// 현재 로그인 토큰 (앱 메모리에만 보관, 로그인할 때 setAuthTokens로 저장)
+let authTokens: AuthTokens | null = null;
+let accessExpiresAt = 0;
+// refresh 토큰은 1회용이라 동시에 여러 요청이 갱신하지 않도록 진행 중인 갱신을 공유
+let refreshing: Promise<boolean> | null = null;
+
+// 만료 이 시간(ms) 전이면 요청 전에 미리 갱신
+const REFRESH_MARGIN_MS = 30 * 1000;
+
+/**
+ * 로그인 / 토큰 갱신 응답 저장
+ */
+export function setAuthTokens(tokens: AuthTokens): void {
+  authTokens = tokens;
+  accessExpiresAt = Date.now() + tokens.expires_in * 1000;
+}
+
+/**
+ * 저장된 토큰 삭제 (로그아웃)
+ */
+export function clearAuthTokens(): void {
+  authTokens = null;
+  accessExpiresAt = 0;
+}
+
+/**
+ * Authorization 헤더 (토큰이 없으면 빈 객체)
+ */
+export function authHeaders(): Record<string, string> {
+  return authTokens ? { Authorization: `Bearer ${authTokens.access_token}` } : {};
+}
+
+/**
+ * refresh 토큰으로 새 토큰 쌍 발급 (실패하면 저장된 토큰 삭제)
+ * API: POST /api/v1/auth/refresh
+ */
+export function refreshAuthTokens(): Promise<boolean> {
+  if (!refreshing) {
+    refreshing = (async () => {
+      if (!authTokens) {
+        return false;
+      }
+      try {
+        const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ refresh_token: authTokens.refresh_token }),
+        });
+        if (!response.ok) {
+          clearAuthTokens();
+          return false;
+        }
+        setAuthTokens(await response.json());
+        return true;
+      } catch {
+        return false;
+      }
+    })().finally(() => {
+      refreshing = null;
+    });
+  }
+  return refreshing;
+}
+
+/**
+ * access 토큰이 곧 만료되면 요청 전에 갱신
+ * (본문을 다시 보낼 수 없는 업로드 등에서 401 재시도 대신 사용)
+ */
+export async function ensureFreshToken(): Promise<void> {
+  if (authTokens && Date.now() > accessExpiresAt - REFRESH_MARGIN_MS) {
+    await refreshAuthTokens();
+  }
+}
+
+/**
+ * fetch + Authorization 헤더
+ * 401이면 토큰을 한 번 갱신하고 다시 요청
+ */
+export async function authFetch(url: string, options?: RequestInit): Promise<Response> {
+  await ensureFreshToken();
+  const send = () =>
+    fetch(url, {
+      ...options,
+      headers: {
+        ...(options?.headers as Record<string, string> | undefined),
+        ...authHeaders(),
+      },
+    });
+
+  const response = await send();
+  if (response.status === 401 && authTokens && (await refreshAuthTokens())) {
+    return send();
+  }
+  return response;
+}
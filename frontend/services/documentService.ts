@@ -4,7 +4,7 @@
  */
 
 import axios from 'axios';
-import { api } from './api';
+import { api, authFetch, authHeaders, ensureFreshToken } from './api';
 import { DocumentDTO, DocumentListResponse } from './types';
 
 /**
@@ -61,10 +61,12 @@ export async function uploadDocument(
       formData.append('filename', customFilename);
     }
 
-    // axios를 사용하여 업로드
+    // axios를 사용하여 업로드 (FormData는 다시 보낼 수 없으므로 401 재시도 대신 미리 토큰 갱신)
+    await ensureFreshToken();
     const response = await axios.post<DocumentDTO>(url, formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
+        ...authHeaders(),
       },
       timeout: 30000, // 30초 타임아웃
     });
@@ -125,7 +127,7 @@ export async function getFolderDocuments(folderId: number): Promise<DocumentList
   try {
     console.log(`[API 호출] 폴더 ${folderId}의 문서 목록 조회 중...`);
 
-    const response = await fetch(url);
+    const response = await authFetch(url);
 
     if (!response.ok) {
       const errorData = await response.json().catch(() => ({}));
@@ -160,7 +162,7 @@ export async function deleteDocument(docId: number): Promise<{ message: string }
   try {
     console.log(`[API 호출] 문서 ${docId} 삭제 중...`);
 
-    const response = await fetch(url, {
+    const response = await authFetch(url, {
       method: 'DELETE',
     });
 
@@ -204,7 +206,7 @@ export async function renameDocument(docId: number, newName: string): Promise<Do
     console.log(`[API 호출] 문서 ${docId} 이름 변경 중...`);
     console.log('- 새 이름:', newName);
 
-    const response = await fetch(url, {
+    const response = await authFetch(url, {
       method: 'PATCH',
       headers: {
         'Content-Type': 'application/json',
@@ -231,9 +233,38 @@ export async function renameDocument(docId: number, newName: string): Promise<Do
   }
 }
 
+/**
+ * 문서 파일 URL (PDF 뷰어에서 직접 열기용)
+ * API: GET /api/v1/documents/{doc_id}/file
+ *
+ * 서버가 Range(206) / ETag(304)를 지원하므로 뷰어가 필요한 부분만 받아 간다.
+ *
+ * @param docId - 문서 ID
+ * @returns 파일 URL
+ */
+export function getDocumentFileUrl(docId: number): string {
+  return `${api.baseURL}/documents/${docId}/file`;
+}
+
+/**
+ * 문서 파일 요청 소스 (URL + Authorization 헤더)
+ * 뷰어 컴포넌트의 source({ uri, headers })로 넘기면 토큰을 붙여 요청한다.
+ *
+ * @param docId - 문서 ID
+ * @returns { uri, headers }
+ */
+export async function getDocumentFileSource(
+  docId: number
+): Promise<{ uri: string; headers: Record<string, string> }> {
+  await ensureFreshToken();
+  return { uri: getDocumentFileUrl(docId), headers: authHeaders() };
+}
+
 export const documentService = {
   uploadDocument,
   getFolderDocuments,
   deleteDocument,
   renameDocument,
+  getDocumentFileUrl,
+  getDocumentFileSource,
 };
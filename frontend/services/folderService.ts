@@ -3,6 +3,7 @@
 // services/folderService.ts
 import { Platform } from 'react-native';
 import { FolderDTO } from './types';
+import { authFetch } from './api';
 
 // Expo 환경변수(선택) → 없으면 플랫폼별 기본값 사용
 const API_BASE_URL: string =
@@ -18,7 +19,7 @@ export interface GetUserFoldersResponse {
 
 export const folderService = {
   async getUserFolders(userId: number): Promise<GetUserFoldersResponse> {
-    const res = await fetch(`${API_BASE_URL}/api/v1/folders/user/${userId}`);
+    const res = await authFetch(`${API_BASE_URL}/api/v1/folders/user/${userId}`);
     if (!res.ok) {
       throw new Error(`폴더 목록 조회 실패 (status: ${res.status})`);
     }
@@ -26,7 +27,7 @@ export const folderService = {
   },
 
   async createFolder(userId: number, folderName: string): Promise<FolderDTO> {
-    const res = await fetch(`${API_BASE_URL}/api/v1/folders`, {
+    const res = await authFetch(`${API_BASE_URL}/api/v1/folders`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({ user_id: userId, folder_name: folderName }),
@@ -47,7 +48,7 @@ export const folderService = {
   },
 
   async renameFolder(folderId: number, newName: string): Promise<FolderDTO> {
-    const res = await fetch(`${API_BASE_URL}/api/v1/folders/${folderId}/name`, {
+    const res = await authFetch(`${API_BASE_URL}/api/v1/folders/${folderId}/name`, {
       method: 'PATCH',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({ new_name: newName }),
@@ -68,7 +69,7 @@ export const folderService = {
   },
 
   async deleteFolder(folderId: number): Promise<void> {
-    const res = await fetch(`${API_BASE_URL}/api/v1/folders/${folderId}`, {
+    const res = await authFetch(`${API_BASE_URL}/api/v1/folders/${folderId}`, {
       method: 'DELETE',
     });
 